@@ -13,3 +13,11 @@ class AuthenticationConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "authentication"
+
+    def ready(self) -> None:
+        """
+        Connect signal receivers once all models are loaded.
+        """
+        from authentication.principal import connect_principal_signals
+
+        connect_principal_signals()
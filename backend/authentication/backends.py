@@ -0,0 +1,77 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Authentication backends for the authentication app.
+"""
+
+from typing import Any
+
+from django.contrib.auth.backends import BaseBackend
+from django.http import HttpRequest
+
+from authentication.models import UserModel
+
+
+class LoadedUserBackend(BaseBackend):
+    """
+    Check the password of a user that the caller already loaded.
+
+    Notes
+    -----
+    Sign in looks users up by username or email, so this backend spares
+    ``ModelBackend`` from looking them up a second time. It only handles calls of
+    ``authenticate`` with a ``user`` and lets other credentials fall through to the
+    next backend.
+    """
+
+    def authenticate(
+        self,
+        request: HttpRequest | None,
+        user: UserModel | None = None,
+        password: str | None = None,
+        **kwargs: Any,
+    ) -> UserModel | None:
+        """
+        Authenticate a loaded user with their password.
+
+        Parameters
+        ----------
+        request : HttpRequest | None
+            The current request.
+
+        user : UserModel | None, default=None
+            The user that signs in.
+
+        password : str | None, default=None
+            The password that was given.
+
+        **kwargs : Any
+            Other credentials, which this backend ignores.
+
+        Returns
+        -------
+        UserModel | None
+            The user if the password is correct and the user is active.
+        """
+        if user is None or password is None:
+            return None
+
+        if user.check_password(password) and user.is_active:
+            return user
+
+        return None
+
+    def get_user(self, user_id: Any) -> UserModel | None:
+        """
+        Return the user of a session.
+
+        Parameters
+        ----------
+        user_id : Any
+            The id of the user that is stored in the session.
+
+        Returns
+        -------
+        UserModel | None
+            The user, or None if there is no such user.
+        """
+        return UserModel.objects.filter(pk=user_id).first()
@@ -15,6 +15,7 @@ from django.contrib.auth.models import (
     PermissionsMixin,
 )
 from django.db import models
+from django.utils import timezone
 
 logger = logging.getLogger(__name__)
 
@@ -204,11 +205,20 @@ class SessionModel(models.Model):
     user = models.ForeignKey("authentication.UserModel", on_delete=models.CASCADE)
     # session_key = models.CharField(max_length=40, unique=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    last_activity = models.DateTimeField(auto_now=True)
+    # Written in bulk from the activity that requests buffer in memory.
+    last_activity = models.DateTimeField(default=timezone.now)
 
     def __str__(self) -> str:
         return f"Session {self.id} for {self.user.username}"
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "created_at"], name="session_user_created_idx"
+            ),
+            models.Index(fields=["last_activity"], name="session_last_activity_idx"),
+        ]
+
 
 # MARK: User
 
@@ -0,0 +1,304 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Resolve the users of JWT authenticated requests from a cache.
+
+The fields that permission checks read are cached per user for
+``AUTH_PRINCIPAL_CACHE_TTL`` seconds, so authenticated requests do not load the user
+from the database. The cached entry is dropped whenever the user is saved or
+deleted. Requests get a ``Principal`` that only loads the full user when a view
+reads one of its other fields or links it to another model.
+
+Principals are only cached when the cache is shared through Redis. Otherwise a
+worker would keep authenticating a deactivated user until the entry expires,
+since only the worker that saved the user drops its entry.
+"""
+
+from typing import Any, cast
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils.functional import LazyObject, empty
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+
+from authentication.models import UserModel
+from authentication.sessions import SESSION_ID_CLAIM, record_session_activity
+from core import custom_settings
+
+PRINCIPAL_KEY_PREFIX = "auth-principal"
+
+# The fields of a user that requests can read without loading the user.
+PRINCIPAL_FIELDS = ("id", "is_active", "is_staff", "is_superuser", "is_admin")
+
+# MARK: Principal
+
+
+class Principal(LazyObject):  # type: ignore[type-arg]
+    """
+    An authenticated user that is loaded from the database on first use.
+
+    Parameters
+    ----------
+    fields : dict[str, Any]
+        The ``PRINCIPAL_FIELDS`` of the user.
+
+    user : UserModel | None, default=None
+        The user if it was already loaded.
+
+    Notes
+    -----
+    The principal passes as a ``UserModel`` to ``isinstance`` checks and compares
+    equal to the user it stands for, so it can be compared with and assigned to
+    relations like ``created_by``.
+    """
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, fields: dict[str, Any], user: UserModel | None = None) -> None:
+        """
+        Create a principal from the cached fields of a user.
+
+        Parameters
+        ----------
+        fields : dict[str, Any]
+            The ``PRINCIPAL_FIELDS`` of the user.
+
+        user : UserModel | None, default=None
+            The user if it was already loaded.
+        """
+        super().__init__()
+        self.__dict__.update(fields)
+        self.__dict__["pk"] = fields["id"]
+        self.__dict__["_meta"] = UserModel._meta
+        if user is not None:
+            self._wrapped = user
+
+    def _setup(self) -> None:
+        """
+        Load the full user from the database.
+        """
+        self._wrapped = UserModel.objects.get(pk=self.pk)
+
+    @property  # type: ignore[misc]
+    def __class__(self) -> type[UserModel]:  # type: ignore[override]
+        """
+        Pass as a user to ``isinstance`` checks without loading the user.
+
+        Returns
+        -------
+        type[UserModel]
+            The user model.
+        """
+        return UserModel
+
+    def __eq__(self, other: object) -> bool:
+        """
+        Compare equal to the user that the principal stands for.
+
+        Parameters
+        ----------
+        other : object
+            The object to compare with.
+
+        Returns
+        -------
+        bool
+            Whether the other object is the same user, or NotImplemented if it is
+            not a model instance.
+        """
+        if isinstance(other, models.Model):
+            return other._meta.concrete_model is UserModel and other.pk == self.pk
+
+        return NotImplemented
+
+    def __ne__(self, other: object) -> bool:
+        """
+        Compare unequal to anything but the user that the principal stands for.
+
+        Parameters
+        ----------
+        other : object
+            The object to compare with.
+
+        Returns
+        -------
+        bool
+            Whether the other object is a different user, or NotImplemented if it
+            is not a model instance.
+        """
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self) -> int:
+        """
+        Hash like the user that the principal stands for.
+
+        Returns
+        -------
+        int
+            The hash of the primary key of the user.
+        """
+        return hash(self.pk)
+
+    def __bool__(self) -> bool:
+        """
+        Pass checks like ``request.user and request.user.is_authenticated``.
+
+        Returns
+        -------
+        bool
+            Always True, as for model instances.
+        """
+        return True
+
+    @property
+    def is_loaded(self) -> bool:
+        """
+        Whether the full user was loaded from the database.
+
+        Returns
+        -------
+        bool
+            True once a field other than ``PRINCIPAL_FIELDS`` was read.
+        """
+        return self._wrapped is not empty
+
+
+# MARK: Cache
+
+
+def _get_principal_key(user_id: Any) -> str:
+    """
+    Return the cache key of the principal of a user.
+
+    Parameters
+    ----------
+    user_id : Any
+        The id of the user.
+
+    Returns
+    -------
+    str
+        The cache key.
+    """
+    return f"{PRINCIPAL_KEY_PREFIX}:{user_id}"
+
+
+def _get_principal_cache() -> BaseCache | None:
+    """
+    Return the cache that principals are kept in.
+
+    Returns
+    -------
+    BaseCache | None
+        The principal cache, or None if principals are not cached because the cache
+        is not shared or tokens are checked for revocation.
+    """
+    if not settings.SHARED_CACHE or api_settings.CHECK_REVOKE_TOKEN:
+        return None
+
+    return caches[settings.PRINCIPAL_CACHE_ALIAS]
+
+
+def invalidate_principal(user_id: Any) -> None:
+    """
+    Drop the cached principal of a user now and again once the transaction commits.
+
+    Parameters
+    ----------
+    user_id : Any
+        The id of the user.
+
+    Notes
+    -----
+    The second deletion drops a principal that a concurrent request cached between
+    the write and the commit.
+    """
+    if (cache := _get_principal_cache()) is None:
+        return
+
+    key = _get_principal_key(user_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def invalidate_principal_on_change(
+    sender: type[UserModel], instance: UserModel, **kwargs: Any
+) -> None:
+    """
+    Drop the cached principal of a user that was saved or deleted.
+
+    Parameters
+    ----------
+    sender : type[UserModel]
+        The model class of the instance.
+
+    instance : UserModel
+        The user that was changed.
+
+    **kwargs : Any
+        Signal arguments.
+    """
+    if not kwargs.get("raw"):
+        invalidate_principal(instance.pk)
+
+
+def connect_principal_signals() -> None:
+    """
+    Connect the receivers that keep cached principals consistent with the users.
+    """
+    uid = "auth-principal-invalidation"
+    post_save.connect(
+        invalidate_principal_on_change, sender=UserModel, dispatch_uid=uid
+    )
+    post_delete.connect(
+        invalidate_principal_on_change, sender=UserModel, dispatch_uid=uid
+    )
+
+
+# MARK: Authentication
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    Authenticate JWTs with principals that are cached between requests.
+    """
+
+    def get_user(self, validated_token: Token) -> Principal:  # type: ignore[override]
+        """
+        Return the principal of the user that a validated token belongs to.
+
+        Parameters
+        ----------
+        validated_token : Token
+            The validated access token.
+
+        Returns
+        -------
+        Principal
+            The cached principal, or a principal of the user that was loaded and
+            checked by ``JWTAuthentication`` if it was not cached.
+        """
+        record_session_activity(validated_token.get(SESSION_ID_CLAIM))
+
+        cache = _get_principal_cache()
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if cache is not None and user_id is not None:
+            if fields := cache.get(_get_principal_key(user_id)):
+                return Principal(fields)
+
+        # Validates the claims and rejects unknown and inactive users.
+        user = cast(UserModel, super().get_user(validated_token))
+        fields = {field: getattr(user, field) for field in PRINCIPAL_FIELDS}
+        if cache is not None:
+            cache.set(
+                _get_principal_key(user.pk),
+                fields,
+                custom_settings.AUTH_PRINCIPAL_CACHE_TTL,
+            )
+
+        return Principal(fields, user)
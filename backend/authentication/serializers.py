@@ -5,12 +5,10 @@ Serializers for the authentication app.
 
 import logging
 import re
-from datetime import timedelta
 from typing import Any
 
 from django.contrib.auth import authenticate, get_user_model
 from rest_framework import serializers
-from rest_framework_simplejwt.tokens import RefreshToken
 
 from authentication.models import SessionModel, UserFlag, UserModel
 
@@ -155,7 +153,7 @@ class SignInSerializer(serializers.Serializer[UserModel]):
             )
 
         authenticated_user: UserModel = authenticate(
-            username=user,
+            user=user,
             password=data.get("password"),
         )  # type: ignore
 
@@ -179,21 +177,6 @@ class SignInSerializer(serializers.Serializer[UserModel]):
 
         data["user"] = authenticated_user
 
-        try:
-            refresh_token = RefreshToken.for_user(authenticated_user)
-            access_token = refresh_token.access_token
-            access_token.set_exp(lifetime=timedelta(minutes=5))
-
-            data["access"] = str(access_token)
-            data["refresh"] = str(refresh_token)
-            data["user"] = user
-            logger.info(f"User signed in successfully: {user.username} (ID: {user.id})")
-        except Exception as e:
-            logger.exception(
-                f"Failed to create/get authentication token for user: {user.username} (ID: {user.id}) - {str(e)}"
-            )
-            raise
-
         return data
 
 
@@ -0,0 +1,159 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Track the sessions that users create by signing in.
+
+Every sign in creates a ``SessionModel`` whose id is a claim of the tokens of the
+session. Authenticated requests record the activity of their session in memory
+and the pending timestamps are written with a single bulk update at most every
+``SESSION_ACTIVITY_FLUSH_INTERVAL`` seconds or once ``SESSION_ACTIVITY_BUFFER_SIZE``
+sessions are pending. Timestamps that are pending when a process exits are lost,
+so ``last_activity`` can lag behind by up to one interval.
+
+Flushes also schedule the ``prune_sessions`` task at most every
+``SESSION_PRUNE_INTERVAL`` seconds to delete sessions whose refresh tokens have
+expired.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from authentication.models import SessionModel
+from core import custom_settings
+
+logger = logging.getLogger(__name__)
+
+SESSION_ID_CLAIM = "session_id"
+PRUNE_KEY = "auth-session-prune"
+
+# Lifetime of the access tokens that are issued when signing in.
+ACCESS_TOKEN_LIFETIME = timedelta(minutes=5)
+
+# MARK: Tokens
+
+
+def get_session_tokens(session: SessionModel) -> tuple[str, str]:
+    """
+    Issue the tokens of a session.
+
+    Parameters
+    ----------
+    session : SessionModel
+        The session that was created for signing in.
+
+    Returns
+    -------
+    tuple[str, str]
+        The access and refresh token, which carry the id of the session. Access
+        tokens from refreshing and rotated refresh tokens inherit the claim.
+    """
+    refresh_token = RefreshToken.for_user(session.user)
+    refresh_token[SESSION_ID_CLAIM] = str(session.id)
+    access_token = refresh_token.access_token
+    access_token.set_exp(lifetime=ACCESS_TOKEN_LIFETIME)
+
+    return str(access_token), str(refresh_token)
+
+
+# MARK: Activity
+
+_activity_lock = threading.Lock()
+_activity: dict[str, datetime] = {}
+_last_flush = time.monotonic()
+
+
+def record_session_activity(session_id: Any) -> None:
+    """
+    Record that a session was used and flush the pending activity when it is due.
+
+    Parameters
+    ----------
+    session_id : Any
+        The id of the session, or None for tokens that were issued without one.
+    """
+    if session_id is None:
+        return
+
+    with _activity_lock:
+        _activity[str(session_id)] = timezone.now()
+        due = (
+            len(_activity) >= custom_settings.SESSION_ACTIVITY_BUFFER_SIZE
+            or time.monotonic() - _last_flush
+            >= custom_settings.SESSION_ACTIVITY_FLUSH_INTERVAL
+        )
+
+    if due:
+        flush_session_activity()
+
+
+def flush_session_activity() -> int:
+    """
+    Write the pending activity of sessions to the database.
+
+    Returns
+    -------
+    int
+        The number of sessions whose activity was pending.
+    """
+    global _last_flush
+    with _activity_lock:
+        pending = dict(_activity)
+        _activity.clear()
+        _last_flush = time.monotonic()
+
+    if pending:
+        # Sessions that were deleted in the meantime are skipped by the update.
+        SessionModel.objects.bulk_update(
+            [
+                SessionModel(id=session_id, last_activity=last_activity)
+                for session_id, last_activity in pending.items()
+            ],
+            ["last_activity"],
+        )
+
+    cache = caches[settings.AUTH_SESSION_CACHE_ALIAS]
+    if cache.add(PRUNE_KEY, True, custom_settings.SESSION_PRUNE_INTERVAL):
+        from authentication.tasks import prune_sessions
+        from core.tasks import enqueue_or_call
+
+        enqueue_or_call(prune_sessions)
+
+    return len(pending)
+
+
+def reset_session_activity() -> None:
+    """
+    Drop the pending activity of sessions without writing it.
+    """
+    global _last_flush
+    with _activity_lock:
+        _activity.clear()
+        _last_flush = time.monotonic()
+
+
+# MARK: Pruning
+
+
+def prune_stale_sessions() -> int:
+    """
+    Delete the sessions that were inactive for longer than refresh tokens live.
+
+    Returns
+    -------
+    int
+        The number of deleted sessions.
+    """
+    cutoff = timezone.now() - api_settings.REFRESH_TOKEN_LIFETIME
+    deleted, _ = SessionModel.objects.filter(last_activity__lt=cutoff).delete()
+    if deleted:
+        logger.info(f"Pruned {deleted} stale sessions.")
+
+    return deleted
@@ -1,13 +1,14 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 """
-Background tasks for authentication-related email workflows.
+Background tasks for authentication-related email workflows and session cleanup.
 """
 
 import logging
 
-from django.core.mail import EmailMessage
 from django.tasks import task
 
+from core.mail import queue_email
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,7 +21,7 @@ def email_user(
     cc: list[str] | None = None,
 ) -> int:
     """
-    Used to send emails to users asynchronously.
+    Queue an email to a user for batched delivery.
 
     Parameters
     ----------
@@ -34,7 +35,7 @@ def email_user(
         The subject of the email.
 
     message : str
-        The body of the email.
+        The HTML body of the email.
 
     cc : list[str], optional
         A list of email addresses to be added as CC recipients.
@@ -42,12 +43,30 @@ def email_user(
     Returns
     -------
     int
-        The number of successfully delivered messages (1 if successful, 0 otherwise).
+        The number of queued messages.
+
+    Notes
+    -----
+    Views queue emails with ``queue_email`` directly. This task delivers the emails
+    of tasks that were enqueued before emails were queued in the database.
     """
-    email = EmailMessage(
-        from_email=from_email, subject=subject, body=message, to=[to], cc=cc
+    logger.info(f"Background task: Queueing email to {to}")
+    email = queue_email(
+        from_email=from_email, to=[to], subject=subject, body=message, cc=cc, html=True
     )
-    email.content_subtype = "html"
+    return int(email is not None)
+
+
+@task
+def prune_sessions() -> int:
+    """
+    Delete the sessions that can no longer be used.
+
+    Returns
+    -------
+    int
+        The number of deleted sessions.
+    """
+    from authentication.sessions import prune_stale_sessions
 
-    logger.info(f"Background task: E-Mail Verification - Sending email to {to}")
-    return email.send()
+    return prune_stale_sessions()
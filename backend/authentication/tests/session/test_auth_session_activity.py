@@ -0,0 +1,57 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from authentication.factories import SessionFactory, UserFactory
+from authentication.models import SessionModel
+from authentication.sessions import flush_session_activity, prune_stale_sessions
+
+pytestmark = pytest.mark.django_db
+
+
+def _test_auth_session_activity_sign_in(client: APIClient) -> SessionModel:
+    plaintext_password = "Activist@123!?"
+    user = UserFactory(plaintext_password=plaintext_password, is_confirmed=True)
+    response = client.post(
+        path="/v1/auth/sign_in",
+        data={"username": user.username, "password": plaintext_password},
+    )
+    client.credentials(HTTP_AUTHORIZATION=f"Token {response.json()['access']}")
+
+    return SessionModel.objects.get(user=user)
+
+
+def test_auth_session_activity_flushed_in_bulk_ok_200():
+    clients = [APIClient(), APIClient()]
+    sessions = [_test_auth_session_activity_sign_in(client) for client in clients]
+    signed_in = {session.id: session.last_activity for session in sessions}
+
+    for client in clients:
+        response = client.get(path="/v1/auth/sessions")
+        assert response.status_code == status.HTTP_200_OK
+
+    # Requests only buffer their activity.
+    for session in SessionModel.objects.all():
+        assert session.last_activity == signed_in[session.id]
+
+    with CaptureQueriesContext(connection) as captured:
+        assert flush_session_activity() == 2
+
+    assert sum("UPDATE" in query["sql"] for query in captured.captured_queries) == 1
+    for session in SessionModel.objects.all():
+        assert session.last_activity > signed_in[session.id]
+
+
+def test_auth_session_activity_prune_stale_sessions():
+    stale = SessionFactory(last_activity=timezone.now() - timedelta(days=30))
+    active = SessionFactory()
+
+    assert prune_stale_sessions() == 1
+    assert not SessionModel.objects.filter(id=stale.id).exists()
+    assert SessionModel.objects.filter(id=active.id).exists()
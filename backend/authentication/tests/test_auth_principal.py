@@ -0,0 +1,90 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Tests for the cached principals of JWT authenticated requests.
+"""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from authentication.factories import UserFactory
+from authentication.models import UserModel
+from authentication.principal import PRINCIPAL_FIELDS, Principal
+from content.factories import ResourceFactory
+
+pytestmark = pytest.mark.django_db
+
+EVENTS_URL = "/v1/events/events"
+
+
+@pytest.fixture(autouse=True)
+def _shared_cache(settings) -> None:
+    """
+    Cache principals as with Redis.
+    """
+    settings.SHARED_CACHE = True
+
+
+def _test_auth_principal_client(user: UserModel) -> APIClient:
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {AccessToken.for_user(user)}")
+    return client
+
+
+def _test_auth_principal_user_queries(client: APIClient) -> int:
+    with CaptureQueriesContext(connection) as captured:
+        response = client.get(EVENTS_URL)
+
+    assert response.status_code == status.HTTP_200_OK
+    return sum(
+        'FROM "authentication_usermodel"' in query["sql"]
+        for query in captured.captured_queries
+    )
+
+
+def test_auth_principal_cached_between_requests_ok_200():
+    client = _test_auth_principal_client(UserFactory())
+
+    assert _test_auth_principal_user_queries(client) == 1
+    assert _test_auth_principal_user_queries(client) == 0
+
+
+def test_auth_principal_not_cached_without_shared_cache_ok_200(settings):
+    settings.SHARED_CACHE = False
+    client = _test_auth_principal_client(UserFactory())
+
+    assert _test_auth_principal_user_queries(client) == 1
+    assert _test_auth_principal_user_queries(client) == 1
+
+
+def test_auth_principal_invalidated_on_save_unauthorized_401():
+    user = UserFactory()
+    client = _test_auth_principal_client(user)
+    _test_auth_principal_user_queries(client)
+
+    user.is_active = False
+    user.save()
+
+    response = client.get(EVENTS_URL)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_auth_principal_stands_in_for_user():
+    user = UserFactory()
+    principal = Principal({field: getattr(user, field) for field in PRINCIPAL_FIELDS})
+
+    assert principal == user
+    assert user == principal
+    assert principal != UserFactory()
+    assert isinstance(principal, UserModel)
+    assert principal.is_authenticated
+    assert not principal.is_loaded
+
+    resource = ResourceFactory(created_by=principal)
+
+    assert resource.created_by_id == user.id
+    assert principal.username == user.username
+    assert principal.is_loaded
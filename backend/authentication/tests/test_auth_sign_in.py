@@ -2,10 +2,15 @@
 import logging
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
 
 from authentication.factories import UserFactory
+from authentication.models import SessionModel
+from authentication.sessions import SESSION_ID_CLAIM
 
 logger = logging.getLogger(__name__)
 
@@ -74,3 +79,23 @@ def test_auth_sign_in(client: APIClient) -> None:
         data={"email": "unknown_user@example.com", "password": "Password@123!?"},
     )
     assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_auth_sign_in_single_user_lookup_ok_200(client: APIClient) -> None:
+    plaintext_password = "Activist@123!?"
+    user = UserFactory(plaintext_password=plaintext_password, is_confirmed=True)
+
+    with CaptureQueriesContext(connection) as captured:
+        response = client.post(
+            path="/v1/auth/sign_in",
+            data={"username": user.username, "password": plaintext_password},
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    queries = [query["sql"] for query in captured.captured_queries]
+    assert sum('FROM "authentication_usermodel"' in sql for sql in queries) == 1
+    assert not any("django_session" in sql for sql in queries)
+
+    session = SessionModel.objects.get(user=user)
+    token = AccessToken(response.json()["access"])
+    assert token[SESSION_ID_CLAIM] == str(session.id)
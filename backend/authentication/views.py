@@ -8,7 +8,7 @@ import os
 import uuid
 
 import dotenv
-from django.contrib.auth import login, logout
+from django.contrib.auth import logout
 from django.core.exceptions import ValidationError
 from django.db.utils import IntegrityError, OperationalError
 from django.template.loader import render_to_string
@@ -38,9 +38,10 @@ from authentication.serializers import (
     UserFlagSerializers,
     UserSerializer,
 )
+from authentication.sessions import get_session_tokens
+from core.mail import queue_email
 from core.permissions import IsAdminStaffCreatorOrReadOnly
-
-from .tasks import email_user
+from core.throttling import AuthRateThrottle
 
 logger = logging.getLogger(__name__)
 
@@ -152,14 +153,13 @@ class SignUpView(APIView):
                 },
             )
 
-            logger.info(
-                f"Background task for Verification email enqueued, to {user.email}"
-            )
-            email_user.enqueue(
+            logger.info(f"Verification email queued, to {user.email}")
+            queue_email(
                 from_email=ACTIVIST_EMAIL,
-                to=user.email,
+                to=[user.email],
                 subject="Welcome to activist.org",
-                message=html_message,
+                body=html_message,
+                html=True,
             )
 
             user.save()
@@ -220,6 +220,7 @@ class SignUpView(APIView):
 class SignInView(APIView):
     serializer_class = SignInSerializer
     permission_classes = [AllowAny]
+    throttle_classes = [AuthRateThrottle]
 
     def post(self, request: Request) -> Response:
         logger.info("User login attempt")
@@ -227,16 +228,25 @@ class SignInView(APIView):
         serializer.is_valid(raise_exception=True)
 
         user = serializer.validated_data.get("user")
-        login(request, user)
 
-        SessionModel.objects.create(user=user)
+        # The API authenticates with the tokens of the session rather than with a
+        # Django session, so signing in only creates the session row.
+        session = SessionModel.objects.create(user=user)
+        try:
+            access, refresh = get_session_tokens(session)
+
+        except Exception as e:
+            logger.exception(
+                f"Failed to create/get authentication token for user: {user.username} (ID: {user.id}) - {str(e)}"
+            )
+            raise
 
         logger.info(f"User logged in successfully: {user.username} (ID: {user.id})")
 
         return Response(
             {
-                "access": serializer.validated_data.get("access"),
-                "refresh": serializer.validated_data.get("refresh"),
+                "access": access,
+                "refresh": refresh,
                 "message": "User was logged in successfully.",
             },
             status=status.HTTP_200_OK,
@@ -265,7 +275,11 @@ class SessionView(APIView):
             )
         user_id = request.user.id
 
-        session = SessionModel.objects.filter(user=user_id).latest("created_at")
+        session = (
+            SessionModel.objects.filter(user=user_id)
+            .select_related("user")
+            .latest("created_at")
+        )
 
         serializer = SessionSerializer(session)
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -277,6 +291,7 @@ class SessionView(APIView):
 class PasswordResetView(APIView):
     serializer_class = PasswordResetSerializer
     permission_classes = [AllowAny]
+    throttle_classes = [AuthRateThrottle]
     queryset = UserModel.objects.all()
 
     def post(self, request: Request) -> Response:
@@ -300,14 +315,15 @@ class PasswordResetView(APIView):
             context={"pwreset_link": pwreset_link},
         )
 
-        email_user.enqueue(
+        queue_email(
             from_email=ACTIVIST_EMAIL,
-            to=email,
+            to=[email],
             subject="Reset your password at activist.org",
-            message=html_message,
+            body=html_message,
+            html=True,
         )
 
-        logger.info(f"Password reset email sent to {email}")
+        logger.info(f"Password reset email queued to {email}")
 
         if user:
             user.verification_code = verification_code
@@ -4,9 +4,11 @@ A class for filtering groups based on user defined properties.
 """
 
 import django_filters
+from django.db.models import QuerySet
 
 from communities.groups.models import Group
 from communities.organizations.models import Organization
+from core.search import search_queryset
 
 
 class GroupFilter(django_filters.FilterSet):  # type: ignore[misc]
@@ -21,6 +23,45 @@ class GroupFilter(django_filters.FilterSet):  # type: ignore[misc]
         conjoined=False,
     )
 
+    q = django_filters.CharFilter(
+        method="filter_search",
+        label="Ranked search over name, tagline, location and description",
+    )
+
+    def filter_search(
+        self, queryset: QuerySet[Group], name: str, value: str
+    ) -> QuerySet[Group]:
+        """
+        Search groups by name, tagline, location and primary description.
+
+        Parameters
+        ----------
+        queryset : QuerySet[Group]
+            Base queryset of groups.
+
+        name : str
+            Filter field name (unused).
+
+        value : str
+            The search term.
+
+        Returns
+        -------
+        QuerySet[Group]
+            Matching groups, best matches first.
+        """
+        return search_queryset(
+            queryset,
+            value,
+            ranked_fields=[
+                ("name", 1.0),
+                ("tagline", 0.5),
+                ("location__address_or_name", 0.3),
+                ("location__city", 0.3),
+            ],
+            matched_fields=[("texts__description", {"texts__primary": True})],
+        )
+
     class Meta:
         model = Group
-        fields = ["linked_organizations"]
+        fields = ["linked_organizations", "q"]
@@ -9,6 +9,7 @@ from uuid import uuid4
 from django.db import models
 
 from content.models import Faq, Resource, SocialLink, Text
+from core.search import trigram_index
 
 # MARK: Group
 
@@ -42,6 +43,7 @@ class Group(models.Model):
     category = models.CharField(max_length=255)
     terms_checked = models.BooleanField(default=False)
     creation_date = models.DateTimeField(auto_now_add=True)
+    last_updated = models.DateTimeField(auto_now=True)
 
     topics = models.ManyToManyField("content.Topic", blank=True)
 
@@ -51,6 +53,12 @@ class Group(models.Model):
     def __str__(self) -> str:
         return self.name
 
+    class Meta:
+        indexes = [
+            trigram_index("name", "group_name_trgm_idx"),
+            trigram_index("tagline", "group_tagline_trgm_idx"),
+        ]
+
 
 # MARK: FAQ
 
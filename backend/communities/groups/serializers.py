@@ -22,7 +22,12 @@ from communities.groups.models import (
 )
 from communities.organizations.models import Organization
 from content.models import Location, Topic
-from content.serializers import LocationSerializer, TopicSerializer
+from content.serializers import (
+    LocationSerializer,
+    TopicSerializer,
+    TopicSlugRelatedField,
+)
+from core.expand import ExpandableFieldsMixin
 from events.serializers import EventSerializer
 
 logger = logging.getLogger(__name__)
@@ -79,7 +84,7 @@ class GroupResourceSerializer(serializers.ModelSerializer[GroupResource]):
     Serializer for GroupResource model data.
     """
 
-    topics = serializers.SlugRelatedField(
+    topics = TopicSlugRelatedField(
         queryset=Topic.objects.filter(active=True),
         many=True,
         slug_field="type",
@@ -280,7 +285,7 @@ class GroupPOSTSerializer(serializers.Serializer[Group]):
 # MARK: Group
 
 
-class GroupSerializer(serializers.ModelSerializer[Group]):
+class GroupSerializer(ExpandableFieldsMixin, serializers.ModelSerializer[Group]):
     """
     Serializer for Group model data.
     """
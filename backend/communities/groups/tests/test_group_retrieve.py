@@ -10,6 +10,7 @@ from django.test import Client
 from rest_framework import status
 
 from communities.groups.factories import GroupFactory
+from events.factories import EventFactory
 
 pytestmark = pytest.mark.django_db
 
@@ -62,3 +63,26 @@ def test_group_retrieve_not_found_404(client: Client):
 
     assert response.status_code == status.HTTP_404_NOT_FOUND
     assert response_body["detail"] == "Failed to retrieve the group."
+
+
+def test_group_retrieve_selects_fields_ok_200(client: Client) -> None:
+    """
+    Test retrieving only the requested fields of a group and its events.
+
+    Parameters
+    ----------
+    client : Client
+        A Django test client used to send HTTP requests to the application.
+    """
+    group = GroupFactory()
+    event = EventFactory(groups=[group])
+
+    response = client.get(
+        f"/v1/communities/groups/{group.id}", {"fields": "name,events.id,events.orgs"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    assert set(body) == {"name", "events"}
+    assert body["events"][0]["id"] == str(event.id)
+    assert set(body["events"][0]) == {"id", "orgs"}
@@ -43,8 +43,13 @@ from communities.groups.serializers import (
 )
 from content.models import Image
 from content.serializers import ImageSerializer
+from core import custom_settings
+from core.conditional import collection_version, conditional_get, entity_version
+from core.expand import PROJECTION_PARAMETERS, get_projection
 from core.paginator import CustomPagination
 from core.permissions import IsAdminStaffCreatorOrReadOnly
+from core.prefetch import prefetch_for_serializer
+from core.response_cache import cache_response
 
 logger = logging.getLogger("django")
 
@@ -80,6 +85,10 @@ class GroupAPIView(GenericAPIView[Group]):
     @extend_schema(
         responses={200: GroupSerializer(many=True)},
     )
+    @conditional_get(collection_version(Group))
+    @cache_response(
+        custom_settings.RESPONSE_CACHE_TTL_LIST, ("events", "organizations", "groups")
+    )
     def get(self, request: Request) -> Response:
         queryset = self.filter_queryset(self.get_queryset())
         page = self.paginate_queryset(queryset)
@@ -116,15 +125,23 @@ class GroupDetailAPIView(GenericAPIView[Group]):
     permission_classes = [IsAdminStaffCreatorOrReadOnly]
 
     @extend_schema(
+        parameters=PROJECTION_PARAMETERS,
         responses={
             200: GroupSerializer,
             400: OpenApiResponse(response={"detail": "Group ID is required"}),
             404: OpenApiResponse(response={"detail": "Failed to retrieve the group."}),
-        }
+        },
+    )
+    @conditional_get(entity_version(Group))
+    @cache_response(
+        custom_settings.RESPONSE_CACHE_TTL_DETAIL, ("events", "organizations", "groups")
     )
     def get(self, request: Request, id: str | UUID) -> Response:
+        projection = get_projection(request, custom_settings.SERIALIZER_DETAIL_DEPTH)
         try:
-            group = Group.objects.get(id=id)
+            group = prefetch_for_serializer(
+                Group.objects.all(), GroupSerializer, **projection
+            ).get(id=id)
 
         except Group.DoesNotExist as e:
             logger.exception(f"Failed to retrieve group with id {id}: {e}")
@@ -135,7 +152,7 @@ class GroupDetailAPIView(GenericAPIView[Group]):
 
         self.check_object_permissions(request, group)
 
-        serializer = GroupSerializer(group)
+        serializer = GroupSerializer(group, context=projection)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     @extend_schema(
@@ -9,7 +9,9 @@ import django_filters
 from django.db.models import QuerySet
 
 from communities.organizations.models import Organization
+from content.filters import TopicMultipleChoiceFilter
 from content.models import Topic
+from core.search import search_queryset
 
 
 class OrganizationFilter(django_filters.FilterSet):  # type: ignore[misc]
@@ -18,7 +20,7 @@ class OrganizationFilter(django_filters.FilterSet):  # type: ignore[misc]
     """
 
     name = django_filters.CharFilter(field_name="name", lookup_expr="icontains")
-    topics = django_filters.ModelMultipleChoiceFilter(
+    topics = TopicMultipleChoiceFilter(
         field_name="topics__type",  # simply "topics" if you want to filter by ID
         to_field_name="type",  # the field on Topic model to match against
         queryset=Topic.objects.all(),
@@ -34,6 +36,11 @@ class OrganizationFilter(django_filters.FilterSet):  # type: ignore[misc]
         lookup_expr="iexact",
     )
 
+    q = django_filters.CharFilter(
+        method="filter_search",
+        label="Ranked search over name, tagline, location and description",
+    )
+
     def filter_topics(
         self,
         queryset: QuerySet[Organization],
@@ -70,6 +77,40 @@ class OrganizationFilter(django_filters.FilterSet):  # type: ignore[misc]
 
         return queryset.filter(topics__type__in=types)
 
+    def filter_search(
+        self, queryset: QuerySet[Organization], name: str, value: str
+    ) -> QuerySet[Organization]:
+        """
+        Search organizations by name, tagline, location and primary description.
+
+        Parameters
+        ----------
+        queryset : QuerySet[Organization]
+            Base queryset of organizations.
+
+        name : str
+            Filter field name (unused).
+
+        value : str
+            The search term.
+
+        Returns
+        -------
+        QuerySet[Organization]
+            Matching organizations, best matches first.
+        """
+        return search_queryset(
+            queryset,
+            value,
+            ranked_fields=[
+                ("name", 1.0),
+                ("tagline", 0.5),
+                ("location__address_or_name", 0.3),
+                ("location__city", 0.3),
+            ],
+            matched_fields=[("texts__description", {"texts__primary": True})],
+        )
+
     class Meta:
         model = Organization
-        fields = ["name", "topics", "city", "country"]
+        fields = ["name", "topics", "city", "country", "q"]
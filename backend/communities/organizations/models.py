@@ -10,6 +10,7 @@ from django.db import models
 
 from authentication import enums
 from content.models import Faq, Resource, SocialLink, Text
+from core.search import trigram_index
 
 # MARK: Organization
 
@@ -45,6 +46,7 @@ class Organization(models.Model):
     )
     status_updated = models.DateTimeField(auto_now=True, null=True)
     acceptance_date = models.DateTimeField(blank=True, null=True)
+    last_updated = models.DateTimeField(auto_now=True)
     deletion_date = models.DateTimeField(blank=True, null=True)
 
     topics = models.ManyToManyField("content.Topic", blank=True)
@@ -60,6 +62,12 @@ class Organization(models.Model):
     def __str__(self) -> str:
         return self.name
 
+    class Meta:
+        indexes = [
+            trigram_index("name", "org_name_trgm_idx"),
+            trigram_index("tagline", "org_tagline_trgm_idx"),
+        ]
+
 
 # MARK: Application
 
@@ -24,7 +24,13 @@ from communities.organizations.models import (
     OrganizationText,
 )
 from content.models import Location, Topic
-from content.serializers import ImageSerializer, LocationSerializer, TopicSerializer
+from content.serializers import (
+    ImageSerializer,
+    LocationSerializer,
+    TopicSerializer,
+    TopicSlugRelatedField,
+)
+from core.expand import ExpandableFieldsMixin
 from events.serializers import EventSerializer
 
 logger = logging.getLogger(__name__)
@@ -81,7 +87,7 @@ class OrganizationResourceSerializer(serializers.ModelSerializer[OrganizationRes
     Serializer for OrganizationResource model data.
     """
 
-    topics = serializers.SlugRelatedField(
+    topics = TopicSlugRelatedField(
         queryset=Topic.objects.filter(active=True),
         many=True,
         slug_field="type",
@@ -264,7 +270,9 @@ class OrganizationPOSTSerializer(serializers.Serializer[Organization]):
                 raise e
 
 
-class OrganizationListSerializer(serializers.ModelSerializer[Organization]):
+class OrganizationListSerializer(
+    ExpandableFieldsMixin, serializers.ModelSerializer[Organization]
+):
     """
     Serializer for listing Organization model data.
     """
@@ -300,9 +308,15 @@ class OrganizationEventListSerializer(serializers.ModelSerializer[Organization])
         fields = ["id", "events"]
 
 
-class OrganizationSerializer(serializers.ModelSerializer[Organization]):
+class OrganizationSerializer(
+    ExpandableFieldsMixin, serializers.ModelSerializer[Organization]
+):
     """
     Serializer for Organization model data.
+
+    Detail views render nested objects up to ``SERIALIZER_DETAIL_DEPTH``, so that
+    the events of groups list the ids of their relations, and clients select the
+    fields they render with ``?fields=``.
     """
 
     texts = OrganizationTextSerializer(many=True, read_only=True)
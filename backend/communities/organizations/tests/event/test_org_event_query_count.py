@@ -0,0 +1,56 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Query count regression tests for the organization events endpoint.
+"""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+
+from communities.groups.factories import GroupFactory
+from communities.organizations.factories import OrganizationFactory
+from communities.organizations.views import OrganizationEventViewSet
+from events.factories import (
+    EventFactory,
+    EventFaqFactory,
+    EventResourceFactory,
+    EventTextFactory,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+def _test_org_event_query_count_make_events(org, count: int) -> None:
+    for _ in range(count):
+        event = EventFactory(orgs=[org], groups=[GroupFactory(org=org)])
+        EventTextFactory(event=event)
+        EventFaqFactory(event=event)
+        EventResourceFactory(event=event)
+
+
+def _test_org_event_query_count_list_queries(org_id) -> int:
+    request = APIRequestFactory().get("/organizations/events/")
+    view = OrganizationEventViewSet.as_view({"get": "list"})
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = view(request, org_id=org_id)
+
+    assert response.status_code == status.HTTP_200_OK
+    return len(ctx.captured_queries)
+
+
+def test_org_event_query_count_list_constant() -> None:
+    """
+    The number of queries for an organization's events does not grow with the events.
+    """
+    org = OrganizationFactory()
+
+    _test_org_event_query_count_make_events(org, 2)
+    queries_few_events = _test_org_event_query_count_list_queries(org.id)
+
+    _test_org_event_query_count_make_events(org, 6)
+    queries_many_events = _test_org_event_query_count_list_queries(org.id)
+
+    assert queries_few_events == queries_many_events
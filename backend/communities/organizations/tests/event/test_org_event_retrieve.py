@@ -151,3 +151,40 @@ def test_org_event_retrieve_end_date_only_filter_ok_200():
     returned_ids = {str(item["id"]) for item in response.data}
     assert str(keep.id) in returned_ids
     assert str(drop.id) not in returned_ids
+
+
+def test_org_event_retrieve_invalid_date_bad_request_400():
+    org = OrganizationFactory.create()
+    _test_org_event_retrieve_make_event(name="Any Event", org=org)
+
+    response = _test_org_event_retrieve_list(
+        org_id=org.id, params={"start_date": "2026-02-30"}
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_org_event_retrieve_range_between_times_filter_ok_200():
+    org = OrganizationFactory.create()
+    recurring = _test_org_event_retrieve_make_event(name="Monthly Meeting", org=org)
+    _test_org_event_retrieve_add_time(
+        recurring,
+        timezone.make_aware(datetime(2026, 1, 1, 18, 0)),
+        timezone.make_aware(datetime(2026, 1, 1, 20, 0)),
+    )
+    _test_org_event_retrieve_add_time(
+        recurring,
+        timezone.make_aware(datetime(2026, 3, 1, 18, 0)),
+        timezone.make_aware(datetime(2026, 3, 1, 20, 0)),
+    )
+
+    between = _test_org_event_retrieve_list(
+        org_id=org.id, params={"start_date": "2026-02-01", "end_date": "2026-02-07"}
+    )
+    on_time = _test_org_event_retrieve_list(
+        org_id=org.id, params={"start_date": "2026-03-01", "end_date": "2026-03-01"}
+    )
+
+    assert between.status_code == status.HTTP_200_OK
+    assert between.data == []
+    assert [str(item["id"]) for item in on_time.data] == [str(recurring.id)]
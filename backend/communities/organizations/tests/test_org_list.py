@@ -1,12 +1,39 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 import pytest
+from django.db import connection
 from django.test import Client
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 
+from communities.organizations.factories import (
+    OrganizationFactory,
+    OrganizationTextFactory,
+)
+
 pytestmark = pytest.mark.django_db
 
 
+def _test_org_list_queries(client: Client) -> int:
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(path="/v1/communities/organizations")
+
+    assert response.status_code == status.HTTP_200_OK
+    return len(ctx.captured_queries)
+
+
 def test_org_list_ok_200(client: Client) -> None:
     response = client.get(path="/v1/communities/organizations")
 
     assert response.status_code == status.HTTP_200_OK
+
+
+def test_org_list_query_count_constant_ok_200(client: Client) -> None:
+    for org in OrganizationFactory.create_batch(2):
+        OrganizationTextFactory(org=org)
+
+    queries_few_orgs = _test_org_list_queries(client)
+
+    for org in OrganizationFactory.create_batch(6):
+        OrganizationTextFactory(org=org)
+
+    assert _test_org_list_queries(client) == queries_few_orgs
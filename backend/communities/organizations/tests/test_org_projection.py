@@ -0,0 +1,94 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Tests for sparse fieldsets, expansions and the depth of organization payloads.
+"""
+
+import pytest
+from django.test import Client
+from rest_framework import status
+
+from communities.groups.factories import GroupFactory
+from communities.organizations.factories import OrganizationFactory
+from events.factories import EventFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _org_with_group_event() -> tuple:
+    org = OrganizationFactory()
+    group = GroupFactory(org=org)
+    event = EventFactory(orgs=[org], groups=[group])
+
+    return org, group, event
+
+
+def test_org_projection_detail_is_shallow_by_default(client: Client) -> None:
+    org, group, event = _org_with_group_event()
+
+    response = client.get(f"/v1/communities/organizations/{org.id}")
+
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    group_body = body["groups"][0]
+    assert group_body["org"]["id"] == str(org.id)
+    # Objects below the default depth are rendered as their ids.
+    assert group_body["events"][0]["orgs"] == [str(org.id)]
+    assert body["events"][0]["orgs"][0]["id"] == str(org.id)
+
+
+def test_org_projection_detail_selects_fields(client: Client) -> None:
+    org, group, _ = _org_with_group_event()
+
+    response = client.get(
+        f"/v1/communities/organizations/{org.id}",
+        {"fields": "id,iconUrl,groups.name,faqEntries"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    assert set(body) == {"id", "iconUrl", "groups", "faqEntries"}
+    assert body["groups"] == [{"name": group.name}]
+
+
+def test_org_projection_detail_depth_and_expand(client: Client) -> None:
+    org, group, event = _org_with_group_event()
+
+    response = client.get(f"/v1/communities/organizations/{org.id}", {"depth": 0})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["groups"] == [str(group.id)]
+
+    response = client.get(
+        f"/v1/communities/organizations/{org.id}",
+        {"depth": 1, "expand": "groups.events"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    group_body = response.json()["groups"][0]
+    assert group_body["org"] == str(org.id)
+    assert group_body["events"][0]["id"] == str(event.id)
+
+
+def test_org_projection_detail_invalid_depth_bad_request_400(client: Client) -> None:
+    org = OrganizationFactory()
+
+    for params in ({"depth": 9}, {"expand": "groups.events.orgs.groups"}):
+        response = client.get(f"/v1/communities/organizations/{org.id}", params)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_org_projection_event_list_selects_fields(client: Client) -> None:
+    org, _, event = _org_with_group_event()
+
+    response = client.get(
+        f"/v1/communities/organizations/{org.id}/events",
+        {"fields": "id,orgs.name"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    results = response.json()
+    assert results
+    assert all(
+        item == {"id": str(event.id), "orgs": [{"name": org.name}]} for item in results
+    )
@@ -0,0 +1,29 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Tests for the ranked ?q= search of the organization list.
+"""
+
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from communities.organizations.factories import OrganizationFactory
+
+pytestmark = pytest.mark.django_db
+
+ORGS_URL = "/v1/communities/organizations"
+
+
+def test_org_search_ok_200() -> None:
+    client = APIClient()
+    tagline_match = OrganizationFactory(name="Neighbours", tagline="Tenant union")
+    name_match = OrganizationFactory(name="Tenant union", tagline="")
+    OrganizationFactory(name="Chess club", tagline="")
+
+    response = client.get(ORGS_URL, {"q": "tenant union"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [org["id"] for org in response.json()["results"]] == [
+        str(name_match.id),
+        str(tagline_match.id),
+    ]
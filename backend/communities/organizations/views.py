@@ -7,13 +7,24 @@ API views for organization management.
 import logging
 import os
 from collections.abc import Sequence
+from datetime import datetime, time, timedelta
 from typing import Any
 from uuid import UUID
 
 from django.contrib.auth.models import AnonymousUser
-from django.db.models import Case, IntegerField, Q, QuerySet, Value, When
+from django.db.models import (
+    Case,
+    Exists,
+    IntegerField,
+    OuterRef,
+    Q,
+    QuerySet,
+    Value,
+    When,
+)
 from django.db.utils import IntegrityError, OperationalError
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import (
@@ -58,9 +69,14 @@ from communities.organizations.serializers import (
 )
 from content.models import Image
 from content.serializers import ImageSerializer
+from core import custom_settings
+from core.conditional import collection_version, conditional_get, entity_version
+from core.expand import PROJECTION_PARAMETERS, get_projection
 from core.paginator import CustomPagination
 from core.permissions import IsAdminStaffCreatorOrReadOnly
-from events.models import Event
+from core.prefetch import prefetch_for_serializer
+from core.response_cache import cache_response
+from events.models import Event, EventTime
 from events.serializers import EventSerializer
 
 logger = logging.getLogger(__name__)
@@ -76,7 +92,11 @@ class OrganizationAPIView(GenericAPIView[Organization]):
     filter_backends = [DjangoFilterBackend]
 
     def get_queryset(self) -> QuerySet[Organization]:
-        queryset = super().get_queryset().order_by("id")
+        queryset = prefetch_for_serializer(
+            super().get_queryset().order_by("id"),
+            OrganizationListSerializer,
+            **get_projection(self.request),
+        )
 
         if os.environ.get("ENVIRONMENT") != "development":
             return queryset
@@ -102,6 +122,10 @@ class OrganizationAPIView(GenericAPIView[Organization]):
         ],
         responses={200: OrganizationListSerializer(many=True)},
     )
+    @conditional_get(collection_version(Organization))
+    @cache_response(
+        custom_settings.RESPONSE_CACHE_TTL_LIST, ("events", "organizations", "groups")
+    )
     def get(self, request: Request) -> Response:
         queryset = self.filter_queryset(self.get_queryset())
         page = self.paginate_queryset(queryset)
@@ -270,6 +294,7 @@ class OrganizationDetailAPIView(APIView):
 
     @extend_schema(
         summary="Retrieve a single organization by ID",
+        parameters=PROJECTION_PARAMETERS,
         responses={
             200: OrganizationSerializer,
             400: OpenApiResponse(
@@ -296,6 +321,10 @@ class OrganizationDetailAPIView(APIView):
             ),
         },
     )
+    @conditional_get(entity_version(Organization))
+    @cache_response(
+        custom_settings.RESPONSE_CACHE_TTL_DETAIL, ("events", "organizations", "groups")
+    )
     def get(self, request: Request, id: None | UUID = None) -> Response:
         if id is None:
             return Response(
@@ -304,8 +333,13 @@ class OrganizationDetailAPIView(APIView):
             )
 
         try:
-            org = Organization.objects.get(id=id)
-            serializer = OrganizationSerializer(org)
+            projection = get_projection(
+                request, custom_settings.SERIALIZER_DETAIL_DEPTH
+            )
+            org = prefetch_for_serializer(
+                Organization.objects.all(), OrganizationSerializer, **projection
+            ).get(id=id)
+            serializer = OrganizationSerializer(org, context=projection)
             return Response(serializer.data, status=status.HTTP_200_OK)
 
         except Organization.DoesNotExist:
@@ -678,6 +712,34 @@ class OrganizationFaqViewSet(viewsets.ModelViewSet[OrganizationFaq]):
 # MARK: Events
 
 
+def _day_start(value: str | None) -> datetime | None:
+    """
+    Parse a date query parameter into the start of the day.
+
+    Parameters
+    ----------
+    value : str | None
+        The date in ISO format, if given.
+
+    Returns
+    -------
+    datetime | None
+        The start of the day in the current timezone.
+
+    Raises
+    ------
+    ValueError
+        If the value is not a valid date.
+    """
+    if not value:
+        return None
+
+    if (day := parse_date(value)) is None:
+        raise ValueError(f"Invalid date: {value}")
+
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
 @extend_schema(
     parameters=[
         OpenApiParameter(
@@ -706,29 +768,44 @@ class OrganizationEventViewSet(viewsets.ModelViewSet[Event]):
                 status=status.HTTP_200_OK,
             )
 
-        start = request.query_params.get("start_date")
-        end = request.query_params.get("end_date")
+        try:
+            start = _day_start(request.query_params.get("start_date"))
+            end = _day_start(request.query_params.get("end_date"))
+
+        except ValueError:
+            return Response(
+                {"detail": "Dates must be given as YYYY-MM-DD."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
         if name := request.query_params.get("name"):
             queryset = queryset.filter(name__icontains=name)
 
-        # Overlap logic: event interval intersects requested interval.
+        # Overlap logic: the span of the event intersects the requested days.
+        if start:
+            queryset = queryset.filter(last_end__gte=start)
+
+        if end:
+            queryset = queryset.filter(first_start__lt=end + timedelta(days=1))
+
         if start and end:
+            # The span only narrows down the events, one of their times has to
+            # intersect the requested days.
             queryset = queryset.filter(
-                times__start_time__date__lte=end,
-                times__end_time__date__gte=start,
+                Exists(
+                    EventTime.objects.filter(
+                        event=OuterRef("pk"),
+                        start_time__lt=end + timedelta(days=1),
+                        end_time__gte=start,
+                    )
+                )
             )
 
-        elif start:
-            queryset = queryset.filter(times__end_time__date__gte=start)
-
-        elif end:
-            queryset = queryset.filter(times__start_time__date__lte=end)
-
-        else:
-            # No date filters, return all events for the org.
-            queryset = queryset.filter(orgs__id=org_id)
-
-        queryset = queryset.order_by("times__start_time").distinct()
+        queryset = prefetch_for_serializer(
+            queryset.order_by("first_start", "id"),
+            EventSerializer,
+            **get_projection(request),
+        )
 
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
@@ -31,6 +31,7 @@ from communities.organizations.views import (
     OrganizationTextViewSet,
 )
 from communities.views import StatusViewSet
+from events.views import EventCalendarFeedAPIView
 
 app_name = "communities"
 
@@ -99,11 +100,21 @@ urlpatterns = [
     path("", include(router.urls)),
     path("groups", GroupAPIView.as_view()),
     path("groups/<uuid:id>", GroupDetailAPIView.as_view()),
+    path(
+        "groups/<uuid:id>/calendar",
+        EventCalendarFeedAPIView.as_view(),
+        {"scope": "groups"},
+    ),
     path("group_flags", GroupFlagAPIView.as_view()),
     path("group_flags/<uuid:id>", GroupFlagDetailAPIView.as_view()),
     path("group_texts/<uuid:id>", GroupTextViewSet.as_view()),
     path("organizations", OrganizationAPIView.as_view()),
     path("organizations/<uuid:id>", OrganizationDetailAPIView.as_view()),
+    path(
+        "organizations/<uuid:id>/calendar",
+        EventCalendarFeedAPIView.as_view(),
+        {"scope": "orgs"},
+    ),
     path("organization_flags", OrganizationFlagAPIView.as_view()),
     path(
         "organization_flags/<uuid:id>",
@@ -6,10 +6,25 @@ Test configurations used in all apps.
 from typing import cast
 
 import pytest
+from django.core.cache import caches
 from rest_framework.test import APIClient
 
 from authentication.factories import UserFactory
 from authentication.models import SessionModel, UserModel
+from authentication.sessions import reset_session_activity
+from content.topics import topic_registry
+
+
+@pytest.fixture(autouse=True)
+def clear_caches() -> None:
+    """
+    Clear all caches so that tests do not see responses, throttle history, session activity or topics of earlier tests.
+    """
+    for cache in caches.all():
+        cache.clear()
+
+    reset_session_activity()
+    topic_registry.clear()
 
 
 @pytest.fixture
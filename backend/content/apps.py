@@ -13,3 +13,11 @@ class contentConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "content"
+
+    def ready(self) -> None:
+        """
+        Connect the receivers of the topic registry once all models are loaded.
+        """
+        from content.topics import connect_topic_signals
+
+        connect_topic_signals()
@@ -0,0 +1,59 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Filters that are shared by the apps that relate to content.
+"""
+
+from typing import Any
+
+import django_filters
+from django import forms
+
+from content.models import Topic
+from content.topics import topic_registry
+
+
+class TopicMultipleChoiceField(forms.ModelMultipleChoiceField[Topic]):
+    """
+    A choice of topics by type that is validated against the topic registry.
+    """
+
+    def _check_values(self, value: Any) -> list[Topic]:
+        """
+        Resolve the selected topic types with the topic registry.
+
+        Parameters
+        ----------
+        value : Any
+            The selected topic types.
+
+        Returns
+        -------
+        list[Topic]
+            The topics in the order of the given types.
+
+        Raises
+        ------
+        forms.ValidationError
+            If a topic type is unknown.
+        """
+        topics = []
+        for topic_type in value:
+            topic = topic_registry.get(str(topic_type), active=False)
+            if topic is None:
+                raise forms.ValidationError(
+                    self.error_messages["invalid_choice"],
+                    code="invalid_choice",
+                    params={"value": topic_type},
+                )
+
+            topics.append(topic)
+
+        return topics
+
+
+class TopicMultipleChoiceFilter(django_filters.ModelMultipleChoiceFilter):  # type: ignore[misc]
+    """
+    Filter by topic types without querying the topics.
+    """
+
+    field_class = TopicMultipleChoiceField
@@ -14,6 +14,7 @@ from django.db import models
 from django.db.models.signals import post_delete
 from django.dispatch import receiver
 
+from core.search import trigram_index
 from utils.models import ISO_CHOICES
 
 # MARK: Discussion
@@ -126,6 +127,8 @@ class Image(models.Model):
         upload_to=set_filename_to_uuid,
         validators=[validate_image_file_extension],
     )
+    # Resized copies per rendition name, e.g. {"thumbnail": {"webp": ..., "jpeg": ...}}.
+    renditions = models.JSONField(default=dict, blank=True)
     creation_date = models.DateTimeField(auto_now_add=True)
 
     def __str__(self) -> str:
@@ -151,7 +154,7 @@ def delete_image_file(sender: type[Image], instance: Image, **kwargs: Any) -> No
     Notes
     -----
     This signal handler prevents orphaned files in the filesystem
-    when Image model instances are deleted.
+    when Image model instances are deleted, including derived renditions.
     """
     logger = logging.getLogger(__name__)
     if instance.file_object:
@@ -163,6 +166,20 @@ def delete_image_file(sender: type[Image], instance: Image, **kwargs: Any) -> No
                 f"Failed to delete image file for Image instance {instance.id}"
             )
 
+    storage = instance.file_object.storage
+    for rendition in (instance.renditions or {}).values():
+        for name in (rendition.get("webp"), rendition.get("jpeg")):
+            if not name:
+                continue
+
+            try:
+                storage.delete(name)
+
+            except Exception:
+                logger.exception(
+                    f"Failed to delete rendition {name} for Image instance {instance.id}"
+                )
+
 
 # MARK: Location
 
@@ -185,6 +202,12 @@ class Location(models.Model):
     def __str__(self) -> str:
         return str(self.id)
 
+    class Meta:
+        indexes = [
+            trigram_index("address_or_name", "location_address_trgm_idx"),
+            trigram_index("city", "location_city_trgm_idx"),
+        ]
+
 
 # MARK: Resource
 
@@ -332,3 +355,4 @@ class Text(models.Model):
 
     class Meta:
         abstract = False
+        indexes = [trigram_index("description", "text_description_trgm_idx")]
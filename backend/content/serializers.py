@@ -4,13 +4,11 @@ Serializers for the content app.
 """
 
 import logging
-from io import BytesIO
+import os
 from typing import Any
 
 from django.conf import settings
-from django.core.files.uploadedfile import InMemoryUploadedFile, UploadedFile
-from PIL import Image as PILImage
-from PIL import ImageOps
+from django.core.files.uploadedfile import UploadedFile
 from rest_framework import serializers
 
 from communities.groups.models import GroupImage
@@ -24,7 +22,11 @@ from content.models import (
     Resource,
     ResourceFlag,
     Topic,
+    set_filename_to_uuid,
 )
+from content.tasks import PENDING_DIR, process_image
+from content.topics import topic_registry
+from core.tasks import enqueue_or_call
 from events.models import Event
 from utils.utils import validate_creation_and_deprecation_dates
 
@@ -72,69 +74,42 @@ class FaqSerializer(serializers.ModelSerializer[Faq]):
 # MARK: Image
 
 
-def scrub_exif(image_file: InMemoryUploadedFile) -> InMemoryUploadedFile:
+def create_image(validated_data: dict[str, Any], upload: UploadedFile[bytes]) -> Image:
     """
-    Remove EXIF metadata from JPEGs and text metadata from PNGs.
-
-    This function helps protect user privacy by removing potentially
-    sensitive metadata from uploaded image files.
+    Create an Image for an upload and queue the upload for processing.
 
     Parameters
     ----------
-    image_file : InMemoryUploadedFile
-        The uploaded image file to be processed.
+    validated_data : dict[str, Any]
+        Dictionary containing validated data for creating the image.
+
+    upload : UploadedFile
+        The uploaded image file.
 
     Returns
     -------
-    InMemoryUploadedFile
-        Processed image file with metadata removed.
+    Image
+        The created Image, whose ``file_object`` points to where the processed
+        original will be saved.
 
     Notes
     -----
-    For JPEG files, the function converts to RGB and removes EXIF data.
-    For PNG files, it clears the metadata info dictionary.
-    Other file types are returned unchanged.
+    The upload is staged under a separate path and never returned by the API, since
+    its metadata (e.g. EXIF locations) is only removed by ``process_image``.
     """
-    try:
-        img: PILImage.Image = PILImage.open(image_file)
-        # Apply the orientation before stripping EXIF.
-        img = ImageOps.exif_transpose(img) or img
-        output_format = img.format
-
-        if output_format == "JPEG":
-            img = img.convert("RGB")
-
-        elif output_format == "PNG":
-            img = img.copy()
-            img.info = {}
-
-        else:
-            return image_file  # return as-is if it's not JPEG or PNG
-
-        # Save the cleaned image into a buffer.
-        output = BytesIO()
-        img.save(
-            output,
-            format=output_format,
-            quality=95 if output_format == "JPEG" else None,  # set JPEG quality
-            optimize=output_format == "JPEG",  # optimize JPEG
-        )
-        output.seek(0)
-
-        # Return a new InMemoryUploadedFile.
-        return InMemoryUploadedFile(
-            output,
-            image_file.field_name,  # use original field name
-            image_file.name,
-            f"image/{output_format.lower()}",
-            output.getbuffer().nbytes,
-            image_file.charset,  # preserve charset (if applicable)
-        )
-
-    except Exception as e:
-        logger.exception(f"Error scrubbing EXIF: {e}")
-
-        return image_file  # return original file in case of error
+    data = {key: value for key, value in validated_data.items() if key != "file_object"}
+    image = Image(**data)
+    storage = image.file_object.storage
+
+    final_name = set_filename_to_uuid(image, upload.name or "")
+    ext = os.path.splitext(final_name)[1]
+    staged_name = storage.save(f"{PENDING_DIR}/{image.id}{ext}", upload)
+
+    image.file_object.name = final_name
+    image.save()
+    enqueue_or_call(process_image, str(image.id), staged_name)
+
+    return image
 
 
 # MARK: Image
@@ -147,8 +122,8 @@ class ImageSerializer(serializers.ModelSerializer[Image]):
 
     class Meta:
         model = Image
-        fields = ["id", "file_object", "creation_date"]
-        read_only_fields = ["id", "creation_date"]
+        fields = ["id", "file_object", "renditions", "creation_date"]
+        read_only_fields = ["id", "renditions", "creation_date"]
 
     def validate(
         self, data: dict[str, UploadedFile[bytes]]
@@ -210,7 +185,8 @@ class ImageSerializer(serializers.ModelSerializer[Image]):
         -------
         dict[str, Any]
             The serialized representation of the image, with 'file_object'
-            as a relative path.
+            as a relative path and the relative paths of its renditions, which
+            are empty until the upload has been processed.
         """
         representation = super().to_representation(instance)
         if instance.file_object:
@@ -236,9 +212,9 @@ class ImageSerializer(serializers.ModelSerializer[Image]):
         Notes
         -----
         This method:
-        1. Processes the uploaded file to remove metadata
-        2. Creates the image record
-        3. Links the image to an organization or group carousel when
+        1. Creates the image record and queues the upload for metadata removal
+           and renditions
+        2. Links the image to an organization or group carousel when
            ``entity_type`` indicates those entity types
         """
         request = self.context["request"]
@@ -251,9 +227,7 @@ class ImageSerializer(serializers.ModelSerializer[Image]):
         entity_id = request.data.get("entity_id")
 
         for i, file_obj in enumerate(files):
-            file_data = validated_data.copy()
-            file_data["file_object"] = scrub_exif(file_obj)
-            image = super().create(file_data)
+            image = create_image(validated_data, file_obj)
             images.append(image)
             logger.info(f"Created Image instance with ID {image.id}")
 
@@ -288,8 +262,8 @@ class ImageIconSerializer(serializers.ModelSerializer[Image]):
 
     class Meta:
         model = Image
-        fields = ["id", "file_object", "creation_date"]
-        read_only_fields = ["id", "creation_date"]
+        fields = ["id", "file_object", "renditions", "creation_date"]
+        read_only_fields = ["id", "renditions", "creation_date"]
 
     def validate(
         self, data: dict[str, UploadedFile[bytes]]
@@ -351,7 +325,8 @@ class ImageIconSerializer(serializers.ModelSerializer[Image]):
         -------
         dict[str, Any]
             The serialized representation of the image, with 'file_object'
-            as a relative path.
+            as a relative path and the relative paths of its renditions, which
+            are empty until the upload has been processed.
         """
         representation = super().to_representation(instance)
         if instance.file_object:
@@ -377,9 +352,9 @@ class ImageIconSerializer(serializers.ModelSerializer[Image]):
         Notes
         -----
         This method:
-        1. Processes the uploaded file to remove metadata
-        2. Creates the image record
-        3. Associates the image as an icon with the requested entity type
+        1. Creates the image record and queues the upload for metadata removal
+           and renditions
+        2. Associates the image as an icon with the requested entity type
            (organization or event) when applicable
         """
         request = self.context["request"]
@@ -390,9 +365,7 @@ class ImageIconSerializer(serializers.ModelSerializer[Image]):
         if file_obj is None:
             raise serializers.ValidationError("No file was submitted.")
 
-        file_data = validated_data.copy()
-        file_data["file_object"] = scrub_exif(file_obj)
-        image = super().create(file_data)
+        image = create_image(validated_data, file_obj)
         logger.info(f"Created Image instance with ID {image.id}")
 
         if entity == "organization":
@@ -480,6 +453,39 @@ class ResourceFlagSerializer(serializers.ModelSerializer[ResourceFlag]):
 # MARK: Topic
 
 
+class TopicSlugRelatedField(serializers.SlugRelatedField[Topic]):
+    """
+    Relate topics by their type, looking them up in the topic registry.
+    """
+
+    def to_internal_value(self, data: Any) -> Topic:
+        """
+        Look up the active topic of a type.
+
+        Parameters
+        ----------
+        data : Any
+            The type of the topic.
+
+        Returns
+        -------
+        Topic
+            The topic.
+
+        Raises
+        ------
+        ValidationError
+            If there is no active topic of the type.
+        """
+        if not isinstance(data, str):
+            self.fail("invalid")
+
+        if (topic := topic_registry.get(data)) is None:
+            self.fail("does_not_exist", slug_name=self.slug_field, value=data)
+
+        return topic
+
+
 class TopicSerializer(serializers.ModelSerializer[Topic]):
     """
     Serializer for Topic model data.
@@ -0,0 +1,252 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Background tasks for processing uploaded images.
+
+Uploads are staged as they were sent and an ``Image`` points at the path that its
+processed original will have. The ``process_image`` task then removes metadata from
+the original and derives pre-sized WebP and JPEG renditions, so that requests don't
+wait for images to be decoded and re-encoded.
+"""
+
+import logging
+from io import BytesIO
+from typing import Any
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage
+from django.tasks import task
+from PIL import Image as PILImage
+from PIL import ImageOps
+
+from content.models import Image
+from core import custom_settings
+
+logger = logging.getLogger(__name__)
+
+PENDING_DIR = "images/pending"
+RENDITIONS_DIR = "images/renditions"
+
+# MARK: Processing
+
+
+def _replace(storage: Storage, name: str, content: bytes) -> None:
+    """
+    Write a file to a storage under an exact name, replacing any existing file.
+
+    Parameters
+    ----------
+    storage : Storage
+        The storage of the image files.
+
+    name : str
+        The name of the file.
+
+    content : bytes
+        The content of the file.
+    """
+    if storage.exists(name):
+        storage.delete(name)
+
+    storage.save(name, ContentFile(content))
+
+
+def scrub_metadata(img: PILImage.Image, output_format: str | None) -> bytes | None:
+    """
+    Remove EXIF metadata from JPEGs and text metadata from PNGs.
+
+    Parameters
+    ----------
+    img : PILImage.Image
+        The decoded image with its orientation already applied.
+
+    output_format : str | None
+        The format of the uploaded file.
+
+    Returns
+    -------
+    bytes | None
+        The re-encoded image, or None for formats other than JPEG and PNG, which
+        are kept as they were uploaded.
+    """
+    if output_format == "JPEG":
+        img = img.convert("RGB")
+
+    elif output_format == "PNG":
+        img = img.copy()
+        img.info = {}
+
+    else:
+        return None
+
+    output = BytesIO()
+    img.save(
+        output,
+        format=output_format,
+        quality=custom_settings.IMAGE_ORIGINAL_QUALITY
+        if output_format == "JPEG"
+        else None,
+        optimize=output_format == "JPEG",
+    )
+
+    return output.getvalue()
+
+
+def _flatten(img: PILImage.Image) -> PILImage.Image:
+    """
+    Convert an image to RGB, placing transparent areas on a white background.
+
+    Parameters
+    ----------
+    img : PILImage.Image
+        The image to convert.
+
+    Returns
+    -------
+    PILImage.Image
+        An RGB image that can be saved as JPEG.
+    """
+    if img.mode in ("RGBA", "LA", "P"):
+        img = img.convert("RGBA")
+        background = PILImage.new("RGB", img.size, "white")
+        background.paste(img, mask=img.getchannel("A"))
+        return background
+
+    return img.convert("RGB")
+
+
+def _to_webp_mode(img: PILImage.Image) -> PILImage.Image:
+    """
+    Convert an image to a mode that can be saved as WebP, keeping transparency.
+
+    Parameters
+    ----------
+    img : PILImage.Image
+        The image to convert.
+
+    Returns
+    -------
+    PILImage.Image
+        An RGB or RGBA image.
+    """
+    if img.mode in ("RGB", "RGBA"):
+        return img
+
+    if img.mode in ("LA", "P", "PA"):
+        return img.convert("RGBA")
+
+    return img.convert("RGB")
+
+
+def render_renditions(
+    img: PILImage.Image, image_id: str, storage: Storage
+) -> dict[str, dict[str, Any]]:
+    """
+    Save the renditions of an image as WebP and JPEG files.
+
+    Parameters
+    ----------
+    img : PILImage.Image
+        The decoded image with its orientation already applied.
+
+    image_id : str
+        The id of the image, which names the directory of its renditions.
+
+    storage : Storage
+        The storage of the image files.
+
+    Returns
+    -------
+    dict[str, dict[str, Any]]
+        The paths and dimensions of each rendition by rendition name.
+
+    Notes
+    -----
+    Images are only scaled down, so renditions of small images keep their size.
+    """
+    renditions: dict[str, dict[str, Any]] = {}
+    for name, box in custom_settings.IMAGE_RENDITIONS.items():
+        resized = img.copy()
+        resized.thumbnail(box, PILImage.Resampling.LANCZOS)
+
+        paths = {}
+        for fmt, ext, source in (
+            ("WEBP", "webp", _to_webp_mode(resized)),
+            ("JPEG", "jpeg", _flatten(resized)),
+        ):
+            output = BytesIO()
+            source.save(
+                output, format=fmt, quality=custom_settings.IMAGE_RENDITION_QUALITY
+            )
+            path = f"{RENDITIONS_DIR}/{image_id}/{name}.{ext}"
+            _replace(storage, path, output.getvalue())
+            paths[ext] = path
+
+        renditions[name] = {
+            **paths,
+            "width": resized.width,
+            "height": resized.height,
+        }
+
+    return renditions
+
+
+# MARK: Task
+
+
+@task
+def process_image(image_id: str, staged_name: str) -> dict[str, dict[str, Any]]:
+    """
+    Scrub a staged upload into the original of an image and derive its renditions.
+
+    Parameters
+    ----------
+    image_id : str
+        The id of the image that the upload belongs to.
+
+    staged_name : str
+        The storage name of the staged upload.
+
+    Returns
+    -------
+    dict[str, dict[str, Any]]
+        The renditions that were saved, empty if the upload could not be decoded.
+
+    Notes
+    -----
+    Uploads that can't be decoded are kept as they were sent, as was the case when
+    metadata was removed during the request.
+    """
+    image = Image.objects.filter(id=image_id).first()
+    storage = Image._meta.get_field("file_object").storage
+    original_name = image.file_object.name if image is not None else None
+    if image is None or not original_name:
+        # The image was deleted before it could be processed.
+        storage.delete(staged_name)
+        return {}
+
+    with storage.open(staged_name, "rb") as staged:
+        raw = staged.read()
+
+    renditions: dict[str, dict[str, Any]] = {}
+    try:
+        img: PILImage.Image = PILImage.open(BytesIO(raw))
+        output_format = img.format
+        # Apply the orientation before stripping EXIF.
+        img = ImageOps.exif_transpose(img) or img
+
+        scrubbed = scrub_metadata(img, output_format)
+        _replace(storage, original_name, scrubbed or raw)
+        renditions = render_renditions(img, image_id, storage)
+
+    except Exception as e:
+        logger.exception(f"Error processing image {image_id}: {e}")
+        _replace(storage, original_name, raw)
+
+    storage.delete(staged_name)
+
+    image.renditions = renditions
+    # Save rather than update so that cached payloads embedding the image refresh.
+    image.save(update_fields=["renditions"])
+    logger.info(f"Processed image {image_id} with renditions {list(renditions)}")
+
+    return renditions
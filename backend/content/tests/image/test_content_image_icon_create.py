@@ -1,6 +1,8 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 import io
 import time
+from pathlib import Path
+from typing import Any
 
 import pytest
 from django.core.files.uploadedfile import SimpleUploadedFile
@@ -12,6 +14,14 @@ from communities.organizations.factories import OrganizationFactory
 from content.factories import ImageFactory
 
 
+@pytest.fixture(autouse=True)
+def _media_root(settings: Any, tmp_path: Path) -> None:
+    """
+    Store uploaded images and their renditions in a temporary directory.
+    """
+    settings.MEDIA_ROOT = tmp_path
+
+
 def _make_icon_image_file():
     img = TestImage.new("RGB", (100, 100), color="red")
     img_file = io.BytesIO()
@@ -0,0 +1,199 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Testing for the background processing of uploaded images.
+"""
+
+import io
+import os
+from collections.abc import Generator
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image as TestImage
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from communities.organizations.factories import OrganizationFactory
+from content.models import Image
+from content.serializers import ImageIconSerializer
+from content.tasks import PENDING_DIR, process_image
+from core import custom_settings
+
+IMMEDIATE_TASKS = {
+    "default": {"BACKEND": "django.tasks.backends.immediate.ImmediateBackend"}
+}
+
+
+@pytest.fixture(autouse=True)
+def _media_root(settings: Any, tmp_path: Path) -> None:
+    """
+    Store uploaded images and their renditions in a temporary directory.
+    """
+    settings.MEDIA_ROOT = tmp_path
+
+
+def _jpeg_with_exif(size: tuple[int, int] = (2000, 1000)) -> SimpleUploadedFile:
+    """
+    Create a JPEG upload that carries EXIF metadata.
+    """
+    img = TestImage.new("RGB", size, color="red")
+    exif = TestImage.Exif()
+    exif[0x010F] = "Test Camera Maker"  # Make
+    img_file = io.BytesIO()
+    img.save(img_file, format="JPEG", exif=exif)
+
+    return SimpleUploadedFile(
+        "photo.jpg", img_file.getvalue(), content_type="image/jpeg"
+    )
+
+
+def _create(upload: SimpleUploadedFile) -> Image:
+    """
+    Create an image for an upload through the serializer.
+    """
+    request = type(
+        "Request",
+        (),
+        {
+            "data": {"entity_type": "user", "entity_id": "123"},
+            "FILES": {"file_object": upload},
+        },
+    )()
+    serializer = ImageIconSerializer(context={"request": request})
+    image: Image = serializer.create({"file_object": upload})
+
+    return image
+
+
+def _path(name: str) -> str:
+    return os.path.join(settings.MEDIA_ROOT, name)
+
+
+@pytest.fixture
+def _cleanup_images() -> Generator[None, None, None]:
+    """
+    Delete the files of images created by a test.
+    """
+    yield
+
+    for image in Image.objects.all():
+        image.delete()
+
+
+@pytest.mark.django_db
+def test_content_image_processing_is_deferred(
+    _cleanup_images: Any, settings: Any
+) -> None:
+    settings.TASKS = {"default": {"BACKEND": "django_tasks_db.DatabaseBackend"}}
+    image = _create(_jpeg_with_exif())
+
+    assert image.renditions == {}
+    # Only the staged upload exists until a worker processes it.
+    assert not os.path.exists(_path(image.file_object.name))
+
+    staged = _path(f"{PENDING_DIR}/{image.id}.jpg")
+    assert os.path.exists(staged)
+    os.remove(staged)
+
+
+@pytest.mark.django_db
+def test_content_image_processing_scrubs_original_and_renders(
+    settings: Any, _cleanup_images: Any
+) -> None:
+    settings.TASKS = IMMEDIATE_TASKS
+    image = _create(_jpeg_with_exif())
+    image.refresh_from_db()
+
+    with TestImage.open(_path(image.file_object.name)) as original:
+        assert not original.getexif()
+
+    assert set(image.renditions) == set(custom_settings.IMAGE_RENDITIONS)
+    for name, (max_width, max_height) in custom_settings.IMAGE_RENDITIONS.items():
+        rendition = image.renditions[name]
+        assert rendition["width"] <= max_width
+        assert rendition["height"] <= max_height
+        for fmt, path in (("WEBP", rendition["webp"]), ("JPEG", rendition["jpeg"])):
+            with TestImage.open(_path(path)) as rendered:
+                assert rendered.format == fmt
+                assert rendered.size == (rendition["width"], rendition["height"])
+
+    assert image.renditions["thumbnail"]["width"] == 160
+    assert not os.path.exists(_path(f"{PENDING_DIR}/{image.id}.jpg"))
+
+
+@pytest.mark.django_db
+def test_content_image_processing_keeps_undecodable_upload(
+    settings: Any, _cleanup_images: Any
+) -> None:
+    settings.TASKS = IMMEDIATE_TASKS
+    upload = SimpleUploadedFile("broken.png", b"not-an-image", content_type="image/png")
+    image = _create(upload)
+    image.refresh_from_db()
+
+    assert image.renditions == {}
+    with open(_path(image.file_object.name), "rb") as f:
+        assert f.read() == b"not-an-image"
+
+
+@pytest.mark.django_db
+def test_content_image_processing_skips_deleted_image(settings: Any) -> None:
+    image = _create(_jpeg_with_exif((50, 50)))
+    image_id = str(image.id)
+    staged_name = f"{PENDING_DIR}/{image_id}.jpg"
+    image.delete()
+
+    settings.TASKS = IMMEDIATE_TASKS
+    result = process_image.enqueue(image_id, staged_name)
+
+    assert result.return_value == {}
+    assert not os.path.exists(_path(staged_name))
+
+
+@pytest.mark.django_db
+def test_content_image_processing_delete_removes_renditions(settings: Any) -> None:
+    settings.TASKS = IMMEDIATE_TASKS
+    image = _create(_jpeg_with_exif((50, 50)))
+    image.refresh_from_db()
+    paths = [_path(r["webp"]) for r in image.renditions.values()]
+    assert all(os.path.exists(path) for path in paths)
+
+    image.delete()
+
+    assert not any(os.path.exists(path) for path in paths)
+
+
+@pytest.mark.django_db
+def test_content_image_processing_api_returns_renditions(
+    client: APIClient, settings: Any, _cleanup_images: Any
+) -> None:
+    settings.TASKS = IMMEDIATE_TASKS
+    org = OrganizationFactory()
+
+    with patch(
+        "core.filescan.scan_helpers.scan_file", return_value={"malware_detected": False}
+    ):
+        response = client.post(
+            "/v1/content/images",
+            {
+                "entity_id": str(org.id),
+                "entity_type": "organization",
+                "file_object": _jpeg_with_exif((800, 600)),
+            },
+            format="multipart",
+        )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    # Renditions are derived after the response has been built.
+    assert response.json()[0]["renditions"] == {}
+
+    image = Image.objects.get()
+    response = client.get(f"/v1/content/images/{image.id}")
+    renditions = response.json()["renditions"]
+
+    assert renditions["card"]["webp"] == image.renditions["card"]["webp"]
+    assert renditions["card"]["width"] == 480
+    assert renditions["hero"]["width"] == 800
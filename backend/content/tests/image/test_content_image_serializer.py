@@ -5,6 +5,8 @@ Testing for Image Serializers.
 
 import io
 import logging
+from pathlib import Path
+from typing import Any
 from unittest.mock import patch
 from uuid import uuid4
 
@@ -25,6 +27,14 @@ from events.models import Event
 MEDIA_ROOT = settings.MEDIA_ROOT  # ensure this points to the images folder
 
 
+@pytest.fixture(autouse=True)
+def _media_root(settings: Any, tmp_path: Path) -> None:
+    """
+    Store uploaded images and their renditions in a temporary directory.
+    """
+    settings.MEDIA_ROOT = tmp_path
+
+
 @pytest.mark.django_db
 def test_content_image_serializer_missing_entity_type() -> None:
     """
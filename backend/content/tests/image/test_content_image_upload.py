@@ -8,6 +8,7 @@ import os
 import uuid
 from collections.abc import Generator
 from datetime import datetime
+from pathlib import Path
 from typing import Any
 from unittest.mock import patch
 
@@ -39,6 +40,24 @@ def _mock_scan_file() -> Generator[None, None, None]:
         yield
 
 
+@pytest.fixture(autouse=True)
+def _process_images_immediately(settings: Any) -> None:
+    """
+    Process uploads within the request, as a task worker would after it.
+    """
+    settings.TASKS = {
+        "default": {"BACKEND": "django.tasks.backends.immediate.ImmediateBackend"}
+    }
+
+
+@pytest.fixture(autouse=True)
+def _media_root(settings: Any, tmp_path: Path) -> None:
+    """
+    Store uploaded images and their renditions in a temporary directory.
+    """
+    settings.MEDIA_ROOT = tmp_path
+
+
 @pytest.fixture
 def _image_with_file() -> Generator[Image, None, None]:
     """
@@ -207,6 +226,27 @@ def test_content_image_upload_create_single_file_view(client: APIClient) -> None
         os.remove(file_to_delete)
 
 
+@pytest.mark.django_db
+def test_content_image_upload_create_without_task_worker(
+    client: APIClient, settings: Any
+) -> None:
+    """
+    Test that uploads are processed within the request if no task worker runs.
+    """
+    settings.TASKS = {
+        "default": {"BACKEND": "django.tasks.backends.dummy.DummyBackend"}
+    }
+    data = _create_organization_and_image()
+
+    response = client.post("/v1/content/images", data, format="multipart")
+
+    assert response.status_code == status.HTTP_201_CREATED
+    image = Image.objects.get()
+    assert image.renditions
+    assert os.path.exists(image.file_object.path)
+    assert not os.listdir(os.path.join(settings.MEDIA_ROOT, "images", "pending"))
+
+
 @pytest.mark.django_db
 def test_content_image_upload_create_multiple_files_view(client: APIClient) -> None:
     """
@@ -62,3 +62,33 @@ def test_content_topic_api_list_no_topics():
 
     assert response.status_code == status.HTTP_200_OK
     assert len(response.data) == 0
+
+
+def test_content_topic_api_list_conditional(django_assert_num_queries):
+    """
+    Test that topics are served from the registry with long-lived cache headers.
+    """
+    client = APIClient()
+    TopicFactory(active=True, type="Environment")
+
+    response = client.get(path="/v1/content/topics")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "max-age=3600" in response["Cache-Control"]
+    assert "public" in response["Cache-Control"]
+
+    with django_assert_num_queries(0):
+        response = client.get(
+            path="/v1/content/topics", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    # Changing a topic reloads the registry and changes the version.
+    TopicFactory(active=True, type="Education")
+    response = client.get(
+        path="/v1/content/topics", HTTP_IF_NONE_MATCH=response["ETag"]
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data) == 2
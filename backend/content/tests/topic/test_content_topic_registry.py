@@ -0,0 +1,40 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+import pytest
+from django.utils import timezone
+
+from content.factories import TopicFactory
+from content.models import Topic
+from content.topics import topic_registry
+from core import custom_settings
+
+pytestmark = pytest.mark.django_db
+
+
+def test_content_topic_registry_lookups() -> None:
+    active = TopicFactory(active=True, type="Environment")
+    inactive = TopicFactory(active=False, type="Inactive")
+
+    assert topic_registry.get("Environment") == active
+    assert topic_registry.get("Inactive") is None
+    assert topic_registry.get("Inactive", active=False) == inactive
+    assert topic_registry.get_many(["Inactive", "Environment", "Unknown"]) == [active]
+    assert topic_registry.active() == [active]
+
+
+def test_content_topic_registry_reloaded_on_new_version(
+    monkeypatch, django_assert_num_queries
+) -> None:
+    monkeypatch.setattr(custom_settings, "TOPIC_REGISTRY_CHECK_INTERVAL", 0)
+    topic = TopicFactory(active=True, type="Environment")
+    assert topic_registry.get("Environment") == topic
+
+    # An unchanged version is checked without loading the topics again.
+    with django_assert_num_queries(1):
+        assert topic_registry.get("Environment") == topic
+
+    # Updates without signals, as seen by other processes, wait for the version.
+    Topic.objects.filter(pk=topic.pk).update(active=False)
+    assert topic_registry.get("Environment") == topic
+
+    Topic.objects.filter(pk=topic.pk).update(last_updated=timezone.now())
+    assert topic_registry.get("Environment") is None
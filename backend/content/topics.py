@@ -0,0 +1,255 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+A process-wide registry of topics.
+
+Topics rarely change but are read on many request paths, so each process loads
+them once and serves validators, filters and the topics endpoint from memory. The
+registry is versioned with the number of topics and the time of the latest change,
+which every process reads from the database. Changes in the same process drop the
+registry right away and other processes reload it once they see the new version,
+which they check at most every ``TOPIC_REGISTRY_CHECK_INTERVAL`` seconds.
+"""
+
+import hashlib
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from django.db import transaction
+from django.db.models import Count, Max
+from django.db.models.signals import post_delete, post_save
+
+from content.models import Topic
+from core import custom_settings
+from core.conditional import Version
+
+TOPICS_NAMESPACE = "topics"
+
+TopicVersion = tuple[int, datetime | None]
+
+# MARK: Registry
+
+
+@dataclass
+class _TopicState:
+    """
+    The topics that a process loaded for one version of the topics.
+
+    Attributes
+    ----------
+    version : TopicVersion
+        The number of topics and the time of the latest change when they were loaded.
+
+    checked_until : float
+        The monotonic time until which the version isn't checked again.
+
+    by_type : dict[str, Topic]
+        The topics by their types.
+
+    etag_key : str
+        A key that changes with any topic.
+
+    last_updated : datetime | None
+        The time of the latest change, or None if there are no topics.
+    """
+
+    version: TopicVersion
+    checked_until: float
+    by_type: dict[str, Topic]
+    etag_key: str
+    last_updated: datetime | None
+
+
+class TopicRegistry:
+    """
+    The topics of the database, loaded once per process and version.
+
+    Notes
+    -----
+    The topics are shared by all requests of a process and must not be modified.
+    """
+
+    def __init__(self) -> None:
+        """
+        Create a registry that loads the topics on the first lookup.
+        """
+        self._lock = threading.Lock()
+        self._state: _TopicState | None = None
+
+    def clear(self) -> None:
+        """
+        Drop the loaded topics so that the next lookup loads them again.
+        """
+        self._state = None
+
+    def _read_version(self) -> TopicVersion:
+        """
+        Read the version of the topics from the database.
+
+        Returns
+        -------
+        TopicVersion
+            The number of topics and the time of the latest change. Saving, creating
+            or deleting a topic changes it in every process.
+        """
+        aggregate = Topic.objects.aggregate(
+            count=Count("pk"), last_updated=Max("last_updated")
+        )
+        return aggregate["count"], aggregate["last_updated"]
+
+    def _load(self) -> _TopicState:
+        """
+        Load the topics and keep them with the version they were loaded at.
+
+        Returns
+        -------
+        _TopicState
+            The loaded topics.
+        """
+        with self._lock:
+            topics = list(Topic.objects.order_by("type"))
+            last_updated = max((t.last_updated for t in topics), default=None)
+            digest = hashlib.sha256(
+                "\n".join(
+                    f"{topic.id}:{topic.last_updated.isoformat()}" for topic in topics
+                ).encode()
+            ).hexdigest()
+            # The version describes the loaded topics, so a later change reloads them.
+            self._state = _TopicState(
+                version=(len(topics), last_updated),
+                checked_until=(
+                    time.monotonic() + custom_settings.TOPIC_REGISTRY_CHECK_INTERVAL
+                ),
+                by_type={topic.type: topic for topic in topics},
+                etag_key=f"{TOPICS_NAMESPACE}:{digest}",
+                last_updated=last_updated,
+            )
+
+        return self._state
+
+    def _get_state(self) -> _TopicState:
+        """
+        Return the loaded topics, reloading them if their version changed.
+
+        Returns
+        -------
+        _TopicState
+            The topics of the current version.
+        """
+        state = self._state
+        if state is not None and time.monotonic() < state.checked_until:
+            return state
+
+        if state is None or state.version != self._read_version():
+            return self._load()
+
+        state.checked_until = (
+            time.monotonic() + custom_settings.TOPIC_REGISTRY_CHECK_INTERVAL
+        )
+        return state
+
+    def get(self, topic_type: str, active: bool = True) -> Topic | None:
+        """
+        Look up a topic by its type.
+
+        Parameters
+        ----------
+        topic_type : str
+            The type of the topic.
+
+        active : bool, default=True
+            Whether only active topics are returned.
+
+        Returns
+        -------
+        Topic | None
+            The topic, or None if there is no such (active) topic.
+        """
+        topic = self._get_state().by_type.get(topic_type)
+        if topic is None or (active and not topic.active):
+            return None
+
+        return topic
+
+    def get_many(self, types: Iterable[str], active: bool = True) -> list[Topic]:
+        """
+        Look up topics by their types, skipping the unknown ones.
+
+        Parameters
+        ----------
+        types : Iterable[str]
+            The types of the topics.
+
+        active : bool, default=True
+            Whether only active topics are returned.
+
+        Returns
+        -------
+        list[Topic]
+            The topics in the order of the given types.
+        """
+        return [
+            topic
+            for topic_type in types
+            if (topic := self.get(topic_type, active)) is not None
+        ]
+
+    def active(self) -> list[Topic]:
+        """
+        Return the active topics.
+
+        Returns
+        -------
+        list[Topic]
+            The active topics ordered by type.
+        """
+        return [t for t in self._get_state().by_type.values() if t.active]
+
+    def version(self) -> Version | None:
+        """
+        Return the version of the topics for conditional requests.
+
+        Returns
+        -------
+        Version | None
+            A key that changes with any topic and the time of the latest change, or
+            None if there are no topics.
+        """
+        state = self._get_state()
+        if state.last_updated is None:
+            return None
+
+        return state.etag_key, state.last_updated
+
+
+topic_registry = TopicRegistry()
+
+# MARK: Invalidation
+
+
+def clear_topic_registry(sender: type[Topic], **kwargs: Any) -> None:
+    """
+    Drop the topic registry of this process now and once the transaction commits.
+
+    Parameters
+    ----------
+    sender : type[Topic]
+        The model class of the changed topic.
+
+    **kwargs : Any
+        Signal arguments.
+    """
+    topic_registry.clear()
+    transaction.on_commit(topic_registry.clear)
+
+
+def connect_topic_signals() -> None:
+    """
+    Connect the receivers that keep the topic registry consistent with the topics.
+    """
+    uid = "topic-registry"
+    post_save.connect(clear_topic_registry, sender=Topic, dispatch_uid=uid)
+    post_delete.connect(clear_topic_registry, sender=Topic, dispatch_uid=uid)
@@ -9,6 +9,8 @@ from uuid import UUID
 
 from django.db import IntegrityError, OperationalError
 from django.db.models import Q
+from django.http import HttpResponseBase
+from django.utils.cache import patch_cache_control
 from drf_spectacular.utils import OpenApiResponse, extend_schema
 from rest_framework import status, viewsets
 from rest_framework.generics import GenericAPIView
@@ -37,6 +39,9 @@ from content.serializers import (
     ResourceSerializer,
     TopicSerializer,
 )
+from content.topics import topic_registry
+from core import custom_settings
+from core.conditional import respond_conditionally
 from core.filescan import scan_uploads_and_rewind
 from core.paginator import CustomPagination
 from core.permissions import IsAdminStaffCreatorOrReadOnly
@@ -465,8 +470,33 @@ class TopicAPIView(GenericAPIView[Topic]):
     serializer_class = TopicSerializer
 
     @extend_schema(responses={200: TopicSerializer(many=True)})
-    def get(self, request: Request) -> Response:
-        queryset = self.filter_queryset(self.get_queryset()).filter(active=True)
-
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+    def get(self, request: Request) -> HttpResponseBase:
+        """
+        List the active topics from the topic registry.
+
+        Parameters
+        ----------
+        request : Request
+            The request.
+
+        Returns
+        -------
+        HttpResponseBase
+            The active topics, or 304 if the client has the current version. Clients
+            and proxies can cache the list for ``TOPICS_MAX_AGE`` seconds.
+        """
+
+        def get_response() -> Response:
+            serializer = self.get_serializer(topic_registry.active(), many=True)
+            return Response(serializer.data, status=status.HTTP_200_OK)
+
+        version = topic_registry.version()
+        response = (
+            get_response()
+            if version is None
+            else respond_conditionally(request, version, get_response)
+        )
+        patch_cache_control(
+            response, public=True, max_age=custom_settings.TOPICS_MAX_AGE
+        )
+        return response
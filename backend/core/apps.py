@@ -0,0 +1,32 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+App configuration for the core module.
+"""
+
+from django.apps import AppConfig
+from django.db.models.signals import pre_migrate
+
+
+class CoreConfig(AppConfig):
+    """
+    Class for configuring the core app.
+    """
+
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "core"
+
+    def ready(self) -> None:
+        """
+        Connect signal receivers and instrumentation once all models are loaded.
+        """
+        from core.conditional import connect_touch_signals
+        from core.db_pool import pool_metrics
+        from core.instrumentation import instrument_serializers, metrics
+        from core.response_cache.signals import connect_invalidation_signals
+        from core.search import enable_trigram_extension
+
+        connect_invalidation_signals()
+        connect_touch_signals()
+        instrument_serializers()
+        metrics.add_collector(pool_metrics)
+        pre_migrate.connect(enable_trigram_extension, sender=self)
@@ -0,0 +1,420 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Benchmarks of the main API endpoints against checked-in budgets.
+
+A fixed dataset is seeded through ``populate_db --bulk`` and every scenario sends the
+same request a number of times through the Django test client. The latency
+percentiles, the number of SQL queries and the size of the response are compared
+against the budgets in ``benchmark_budgets.json`` so that regressions fail the
+``benchmark_api`` command and the tests marked with ``benchmark``.
+
+Latencies depend on the machine, so the tests only compare them when
+``BENCHMARK_LATENCY_FACTOR`` is set. The query budgets of the organization and group
+details are higher than those of lists as they render nested groups and events up to
+``SERIALIZER_DETAIL_DEPTH``. That takes one query per relation and nesting level,
+which doesn't grow with the number of rows.
+
+Responses are not cached, and throttling history and buffered session activity are
+reset before every request, so that the budgets cover the work of the views rather
+than the response cache or periodic bookkeeping.
+"""
+
+import io
+import json
+import math
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, NotRequired, TypedDict
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from PIL import Image as PILImage
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from authentication.models import UserModel
+from authentication.sessions import flush_session_activity
+from communities.groups.models import Group
+from communities.organizations.models import Organization
+from content.models import Image, Topic
+from core.throttling import get_throttle_backend
+from events.models import Event
+
+BUDGETS_PATH = Path(__file__).resolve().parent / "benchmark_budgets.json"
+
+# Options of populate_db for the benchmark dataset.
+BENCHMARK_DATASET: dict[str, int] = {
+    "users": 100,
+    "orgs_per_user": 1,
+    "groups_per_org": 2,
+    "events_per_org": 5,
+    "events_per_group": 2,
+    "resources_per_entity": 2,
+    "faq_entries_per_entity": 2,
+    "seed": 0,
+}
+
+LATENCY_METRICS = ("p50_ms", "p95_ms", "p99_ms")
+
+# MARK: Types
+
+
+class BenchmarkRequest(TypedDict):
+    """
+    A request that is sent by a scenario.
+    """
+
+    method: str
+    path: str
+    data: NotRequired[dict[str, Any]]
+    format: NotRequired[str]
+    headers: NotRequired[dict[str, str]]
+
+
+class BenchmarkResult(TypedDict):
+    """
+    The measurements of a scenario.
+    """
+
+    status: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    queries: int
+    response_bytes: int
+
+
+# MARK: Scenarios
+
+
+def _first_id(model: Any) -> str:
+    """
+    Return the id of the first row of a model.
+
+    Parameters
+    ----------
+    model : Any
+        The model class.
+
+    Returns
+    -------
+    str
+        The lowest id of the model.
+    """
+    return str(model.objects.order_by("id").values_list("id", flat=True).first())
+
+
+def _authenticated_events_list() -> BenchmarkRequest:
+    """
+    Build a request for the events list that is authenticated as the first user.
+
+    Returns
+    -------
+    BenchmarkRequest
+        The request of the scenario.
+    """
+    user = UserModel.objects.earliest("id")
+    token = AccessToken.for_user(user)
+
+    return {
+        "method": "get",
+        "path": "/v1/events/events",
+        "headers": {"Authorization": f"Token {token}"},
+    }
+
+
+def _image_upload() -> BenchmarkRequest:
+    """
+    Build a request that uploads a JPEG for the first organization.
+
+    Returns
+    -------
+    BenchmarkRequest
+        The request of the scenario.
+    """
+    image_file = io.BytesIO()
+    PILImage.new("RGB", (800, 600), color="red").save(image_file, format="JPEG")
+
+    return {
+        "method": "post",
+        "path": "/v1/content/images",
+        "data": {
+            "entity_id": _first_id(Organization),
+            "entity_type": "organization",
+            "file_object": SimpleUploadedFile(
+                "benchmark.jpg", image_file.getvalue(), content_type="image/jpeg"
+            ),
+        },
+        "format": "multipart",
+    }
+
+
+SCENARIOS: dict[str, Callable[[], BenchmarkRequest]] = {
+    "events_list": lambda: {"method": "get", "path": "/v1/events/events"},
+    "events_list_authenticated": _authenticated_events_list,
+    "events_list_filtered": lambda: {
+        "method": "get",
+        "path": "/v1/events/events?type=action&location_type=physical&days_ahead=30",
+    },
+    "organizations_list": lambda: {
+        "method": "get",
+        "path": "/v1/communities/organizations",
+    },
+    "organizations_list_filtered": lambda: {
+        "method": "get",
+        "path": "/v1/communities/organizations?city=berlin&country=DE",
+    },
+    "organization_detail": lambda: {
+        "method": "get",
+        "path": f"/v1/communities/organizations/{_first_id(Organization)}",
+    },
+    "group_detail": lambda: {
+        "method": "get",
+        "path": f"/v1/communities/groups/{_first_id(Group)}",
+    },
+    "event_detail": lambda: {
+        "method": "get",
+        "path": f"/v1/events/events/{_first_id(Event)}",
+    },
+    "topics": lambda: {"method": "get", "path": "/v1/content/topics"},
+    "event_calendar": lambda: {
+        "method": "get",
+        "path": f"/v1/events/event_calendar?event_id={_first_id(Event)}",
+    },
+    "image_upload": _image_upload,
+}
+
+# MARK: Dataset
+
+
+def seed_benchmark_dataset() -> None:
+    """
+    Replace the data of the database with the benchmark dataset.
+    """
+    if not Topic.objects.exists():
+        call_command(
+            "loaddata", str(settings.BASE_DIR / "fixtures" / "topics.json"), verbosity=0
+        )
+
+    call_command("populate_db", bulk=True, stdout=io.StringIO(), **BENCHMARK_DATASET)
+
+
+# MARK: Run
+
+
+def percentile(values: list[float], q: float) -> float:
+    """
+    Return a percentile of values with the nearest-rank method.
+
+    Parameters
+    ----------
+    values : list[float]
+        The measured values.
+
+    q : float
+        The percentile between 0 and 100.
+
+    Returns
+    -------
+    float
+        The smallest value that at least ``q`` percent of the values are less than
+        or equal to.
+    """
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def run_scenario(
+    client: APIClient, scenario: Callable[[], BenchmarkRequest], runs: int, warmup: int
+) -> BenchmarkResult:
+    """
+    Send the request of a scenario repeatedly and measure it.
+
+    Parameters
+    ----------
+    client : APIClient
+        The client that sends the requests.
+
+    scenario : Callable[[], BenchmarkRequest]
+        The function that builds the request of the scenario.
+
+    runs : int
+        The number of measured requests.
+
+    warmup : int
+        The number of requests that are sent before measuring.
+
+    Returns
+    -------
+    BenchmarkResult
+        The latency percentiles in milliseconds, the largest number of queries and
+        the size of the last response in bytes.
+    """
+    latencies: list[float] = []
+    queries = 0
+    response: Any = None
+    for i in range(warmup + runs):
+        request = scenario()
+        caches["default"].clear()
+        get_throttle_backend().clear()
+        flush_session_activity()
+        # The query log is bounded, so a full log would hide the new queries.
+        connection.queries_log.clear()
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = getattr(client, request["method"])(
+                request["path"],
+                request.get("data"),
+                format=request.get("format"),
+                headers=request.get("headers"),
+            )
+            content = (
+                b"".join(response.streaming_content)
+                if response.streaming
+                else response.content
+            )
+            elapsed = time.perf_counter() - started
+
+        if i >= warmup:
+            latencies.append(elapsed * 1000)
+            queries = max(queries, len(captured))
+
+    return {
+        "status": response.status_code,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "queries": queries,
+        "response_bytes": len(content),
+    }
+
+
+def run_benchmarks(
+    runs: int, warmup: int = 2, names: list[str] | None = None
+) -> dict[str, BenchmarkResult]:
+    """
+    Run benchmark scenarios against the current database.
+
+    Parameters
+    ----------
+    runs : int
+        The number of measured requests per scenario.
+
+    warmup : int, default=2
+        The number of requests per scenario that are sent before measuring.
+
+    names : list[str] | None, default=None
+        The scenarios to run, None for all of them.
+
+    Returns
+    -------
+    dict[str, BenchmarkResult]
+        The measurements of each scenario.
+
+    Notes
+    -----
+    The filescan service is benchmarked on its own, so uploads get a clean verdict
+    without being sent to it. Images uploaded by the benchmark are deleted.
+    """
+    client = APIClient()
+    existing_images = set(Image.objects.values_list("id", flat=True))
+    results: dict[str, BenchmarkResult] = {}
+    try:
+        with (
+            override_settings(RESPONSE_CACHE_ENABLED=False),
+            patch(
+                "core.filescan.scan_helpers.scan_file",
+                return_value={"malware_detected": False},
+            ),
+        ):
+            for name in names or list(SCENARIOS):
+                results[name] = run_scenario(client, SCENARIOS[name], runs, warmup)
+
+    finally:
+        for image in Image.objects.exclude(id__in=existing_images):
+            image.delete()
+
+    return results
+
+
+# MARK: Budgets
+
+
+def load_budgets(path: Path = BUDGETS_PATH) -> dict[str, dict[str, float]]:
+    """
+    Load the budgets of the scenarios.
+
+    Parameters
+    ----------
+    path : Path, default=BUDGETS_PATH
+        The JSON file of the budgets.
+
+    Returns
+    -------
+    dict[str, dict[str, float]]
+        The maximum of each metric for each scenario.
+    """
+    with open(path, encoding="utf-8") as f:
+        budgets: dict[str, dict[str, float]] = json.load(f)
+
+    return budgets
+
+
+def compare_budgets(
+    results: dict[str, BenchmarkResult],
+    budgets: dict[str, dict[str, float]],
+    latency_factor: float | None = 1.0,
+) -> list[str]:
+    """
+    Compare the measurements of scenarios to their budgets.
+
+    Parameters
+    ----------
+    results : dict[str, BenchmarkResult]
+        The measurements of each scenario.
+
+    budgets : dict[str, dict[str, float]]
+        The maximum of each metric for each scenario.
+
+    latency_factor : float | None, default=1.0
+        The factor that latency budgets are scaled with for slower machines, or
+        None to only compare the queries and response sizes.
+
+    Returns
+    -------
+    list[str]
+        A description of every scenario that failed or exceeded a budget.
+    """
+    regressions = []
+    for name, result in results.items():
+        if result["status"] >= 400:
+            regressions.append(f"{name}: failed with status {result['status']}")
+
+        if name not in budgets:
+            regressions.append(f"{name}: has no budget")
+            continue
+
+        for metric, budget in budgets[name].items():
+            if metric not in LATENCY_METRICS:
+                limit = budget
+
+            elif latency_factor is None:
+                continue
+
+            else:
+                limit = budget * latency_factor
+
+            value = result[metric]  # type: ignore[literal-required]
+            if value > limit:
+                regressions.append(
+                    f"{name}: {metric} of {value:g} exceeds the budget of {limit:g}"
+                )
+
+    return regressions
@@ -0,0 +1,517 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Conditional GET support for entity endpoints.
+
+Events, organizations and groups carry a ``last_updated`` timestamp that is bumped
+whenever the entity, one of its children or an entity embedded in its payload
+changes. Which rows a payload includes is listed explicitly, so lookup tables that
+many entities share, like topics, never touch all of the entities that use them.
+The timestamp is cheap to read, so views derive strong ETags and
+``Last-Modified`` headers from it and answer ``If-None-Match`` and
+``If-Modified-Since`` requests with 304 before any serialization happens.
+"""
+
+import hashlib
+from collections.abc import Callable
+from datetime import datetime
+from functools import cache, wraps
+from typing import Any, TypeVar, cast
+
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.db.models import Count, Max
+from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.http import HttpResponseBase
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.request import Request
+
+TRACKED_APPS = ("communities", "content", "events")
+LAST_UPDATED_FIELD = "last_updated"
+
+# The relations of each entity to the children that its payload includes.
+PAYLOAD_CHILDREN = {
+    "events.Event": ("texts", "social_links", "resources", "faqs", "times"),
+    "communities.Organization": ("texts", "social_links", "resources", "faqs"),
+    "communities.Group": ("texts", "social_links", "resources", "faqs"),
+}
+# The entities whose payloads embed each entity, with the lookups from them to the
+# entity and whether they include the children of the entity or its fields only.
+PAYLOAD_EMBEDDERS = {
+    "events.Event": (
+        ("communities.Organization", "events", True),
+        ("communities.Organization", "groups__events", True),
+        ("communities.Group", "events", True),
+    ),
+    "communities.Organization": (
+        ("events.Event", "orgs", False),
+        ("communities.Group", "org", False),
+    ),
+    "communities.Group": (
+        ("communities.Organization", "groups", True),
+        ("events.Event", "groups", False),
+    ),
+}
+
+ViewMethod = TypeVar("ViewMethod", bound=Callable[..., Any])
+
+# A version is the key that identifies the state of a resource and its timestamp.
+Version = tuple[str, datetime]
+VersionFunc = Callable[..., Version | None]
+
+# MARK: Versions
+
+
+def _make_etag(request: Request, key: str) -> str:
+    """
+    Derive the ETag of a response from the version key of its resource.
+
+    Parameters
+    ----------
+    request : Request
+        The authenticated DRF request.
+
+    key : str
+        The version key of the requested resource.
+
+    Returns
+    -------
+    str
+        A quoted strong ETag that also varies with the query string, the
+        negotiated media type and the authenticated user.
+    """
+    user = request.user
+    parts = [
+        key,
+        request.get_full_path(),
+        str(getattr(request, "accepted_media_type", "")),
+        str(user.pk) if user is not None and user.is_authenticated else "",
+    ]
+
+    return quote_etag(hashlib.sha256("\n".join(parts).encode()).hexdigest())
+
+
+def entity_version(model: type[models.Model]) -> VersionFunc:
+    """
+    Build a version function for the detail endpoint of a model.
+
+    Parameters
+    ----------
+    model : type[models.Model]
+        A model with a ``last_updated`` field.
+
+    Returns
+    -------
+    VersionFunc
+        A function that returns the version of the entity with the ``id`` URL
+        kwarg, or None if there is no such entity.
+    """
+
+    def version(request: Request, *args: Any, **kwargs: Any) -> Version | None:
+        """
+        Return the version of the requested entity.
+
+        Parameters
+        ----------
+        request : Request
+            The authenticated DRF request.
+
+        *args : Any
+            Positional URL arguments of the view.
+
+        **kwargs : Any
+            Keyword URL arguments of the view.
+
+        Returns
+        -------
+        Version | None
+            The version of the entity, or None if there is no such entity.
+        """
+        if (pk := kwargs.get("id")) is None:
+            return None
+
+        try:
+            last_updated = (
+                model._default_manager.filter(pk=pk)
+                .values_list(LAST_UPDATED_FIELD, flat=True)
+                .first()
+            )
+
+        except (ValidationError, ValueError):
+            return None
+
+        if last_updated is None:
+            return None
+
+        return f"{pk}:{last_updated.isoformat()}", last_updated
+
+    return version
+
+
+def collection_version(
+    model: type[models.Model], volatile_params: tuple[str, ...] = ()
+) -> VersionFunc:
+    """
+    Build a version function for the list endpoint of a model.
+
+    Parameters
+    ----------
+    model : type[models.Model]
+        A model with a ``last_updated`` field.
+
+    volatile_params : tuple[str, ...], default=()
+        Query parameters whose results change with time rather than with the
+        data (e.g. rolling date windows). Requests using them get no version.
+
+    Returns
+    -------
+    VersionFunc
+        A function that returns the version of the whole table, which changes
+        whenever a row is changed, added or removed.
+    """
+
+    def version(request: Request, *args: Any, **kwargs: Any) -> Version | None:
+        """
+        Return the version of the table of the model.
+
+        Parameters
+        ----------
+        request : Request
+            The authenticated DRF request.
+
+        *args : Any
+            Positional URL arguments of the view.
+
+        **kwargs : Any
+            Keyword URL arguments of the view.
+
+        Returns
+        -------
+        Version | None
+            The version of the table, or None if the table is empty or the request
+            uses volatile parameters.
+        """
+        if any(param in request.query_params for param in volatile_params):
+            return None
+
+        stats = model._default_manager.aggregate(
+            last_updated=Max(LAST_UPDATED_FIELD), count=Count("pk")
+        )
+        if stats["last_updated"] is None:
+            return None
+
+        last_updated: datetime = stats["last_updated"]
+        return f"{stats['count']}:{last_updated.isoformat()}", last_updated
+
+    return version
+
+
+# MARK: Decorator
+
+
+def respond_conditionally(
+    request: Request, version: Version, get_response: Callable[[], HttpResponseBase]
+) -> HttpResponseBase:
+    """
+    Answer a conditional request from the version of its resource.
+
+    Parameters
+    ----------
+    request : Request
+        The authenticated DRF request.
+
+    version : Version
+        The version of the requested resource.
+
+    get_response : Callable[[], HttpResponseBase]
+        Produces the response if the client does not have the current version.
+
+    Returns
+    -------
+    HttpResponseBase
+        A 304 or 412 response if the conditions of the request decide it, else the
+        produced response, with the ``ETag`` and ``Last-Modified`` of the version.
+    """
+    key, last_updated = version
+    etag = _make_etag(request, key)
+    last_modified = int(last_updated.timestamp())
+    conditional = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    response = conditional if conditional is not None else get_response()
+    if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+
+    return response
+
+
+def conditional_get(version_func: VersionFunc) -> Callable[[ViewMethod], ViewMethod]:
+    """
+    Answer conditional requests to a view method from the version of its resource.
+
+    Parameters
+    ----------
+    version_func : VersionFunc
+        Returns the version of the requested resource given the request and the
+        URL arguments of the view.
+
+    Returns
+    -------
+    Callable[[ViewMethod], ViewMethod]
+        A decorator for the ``get`` method of an API view.
+
+    Notes
+    -----
+    The version is read before the view runs, so unchanged resources are answered
+    with 304 without loading or serializing them.
+    """
+
+    def decorator(view_method: ViewMethod) -> ViewMethod:
+        """
+        Wrap a view method so that it answers conditional requests.
+
+        Parameters
+        ----------
+        view_method : ViewMethod
+            The ``get`` method of an API view.
+
+        Returns
+        -------
+        ViewMethod
+            The wrapped view method.
+        """
+
+        @wraps(view_method)
+        def wrapper(self: Any, request: Request, *args: Any, **kwargs: Any) -> Any:
+            """
+            Answer the request from the version of its resource or run the view.
+
+            Parameters
+            ----------
+            self : Any
+                The API view.
+
+            request : Request
+                The authenticated DRF request.
+
+            *args : Any
+                Positional URL arguments of the view.
+
+            **kwargs : Any
+                Keyword URL arguments of the view.
+
+            Returns
+            -------
+            Any
+                The response of the view, or a 304 or 412 response.
+            """
+            version = version_func(request, *args, **kwargs)
+            if version is None:
+                return view_method(self, request, *args, **kwargs)
+
+            return respond_conditionally(
+                request, version, lambda: view_method(self, request, *args, **kwargs)
+            )
+
+        return cast(ViewMethod, wrapper)
+
+    return decorator
+
+
+# MARK: Invalidation
+
+
+@cache
+def _get_owners() -> dict[type[models.Model], list[tuple[type[models.Model], str]]]:
+    """
+    Map each child model to the entities whose payloads include its rows.
+
+    Returns
+    -------
+    dict[type[models.Model], list[tuple[type[models.Model], str]]]
+        For every child model and the models it inherits from, the owning entity
+        models and the lookups from them to the child.
+    """
+    owners: dict[type[models.Model], list[tuple[type[models.Model], str]]] = {}
+    for label, lookups in PAYLOAD_CHILDREN.items():
+        owner = apps.get_model(label)
+        for lookup in lookups:
+            child = owner._meta.get_field(lookup).related_model
+            # Rows of e.g. Faq share their primary keys with the EventFaq rows.
+            for model in [child, *child._meta.get_parent_list()]:
+                owners.setdefault(model, []).append((owner, lookup))
+
+    return owners
+
+
+def _touch_embedders(
+    model: type[models.Model], pks: set[Any], now: datetime, own_fields: bool
+) -> None:
+    """
+    Bump ``last_updated`` of the entities whose payloads embed changed entities.
+
+    Parameters
+    ----------
+    model : type[models.Model]
+        The model of the changed entities.
+
+    pks : set[Any]
+        The primary keys of the changed entities.
+
+    now : datetime
+        The new ``last_updated`` of the entities.
+
+    own_fields : bool
+        Whether fields of the entities changed rather than only their children, so
+        that entities that embed only the fields are touched as well.
+    """
+    for label, lookup, with_children in PAYLOAD_EMBEDDERS.get(model._meta.label, ()):
+        if own_fields or with_children:
+            apps.get_model(label)._default_manager.filter(
+                **{f"{lookup}__in": pks}
+            ).update(**{LAST_UPDATED_FIELD: now})
+
+
+def _touch_owners(model: type[models.Model], pks: set[Any], now: datetime) -> None:
+    """
+    Bump ``last_updated`` of the entities that own changed children.
+
+    Parameters
+    ----------
+    model : type[models.Model]
+        The model of the changed children.
+
+    pks : set[Any]
+        The primary keys of the changed children.
+
+    now : datetime
+        The new ``last_updated`` of the entities.
+    """
+    for owner, lookup in _get_owners().get(model, []):
+        owner_pks = set(
+            owner._default_manager.filter(**{f"{lookup}__in": pks}).values_list(
+                "pk", flat=True
+            )
+        )
+        if owner_pks:
+            owner._default_manager.filter(pk__in=owner_pks).update(
+                **{LAST_UPDATED_FIELD: now}
+            )
+            _touch_embedders(owner, owner_pks, now, own_fields=False)
+
+
+def touch_dependents(instance: models.Model) -> None:
+    """
+    Bump ``last_updated`` of the entities whose payloads include an instance.
+
+    Parameters
+    ----------
+    instance : models.Model
+        The instance that was changed.
+
+    Notes
+    -----
+    Children touch their owners and the entities that embed the owners with their
+    children, e.g. the text of an event touches the event and its organizations.
+    Entities touch the entities that embed them. Other models, including lookup
+    tables like topics, touch nothing.
+    """
+    model = type(instance)
+    if model._meta.label in PAYLOAD_EMBEDDERS:
+        _touch_embedders(model, {instance.pk}, timezone.now(), own_fields=True)
+
+    else:
+        _touch_owners(model, {instance.pk}, timezone.now())
+
+
+def _touch_related(
+    model: type[models.Model], pks: set[Any], now: datetime, own_fields: bool
+) -> None:
+    """
+    Bump ``last_updated`` of one side of a changed many-to-many relation.
+
+    Parameters
+    ----------
+    model : type[models.Model]
+        The model of the side.
+
+    pks : set[Any]
+        The primary keys of the rows of the side.
+
+    now : datetime
+        The new ``last_updated`` of the entities.
+
+    own_fields : bool
+        Whether the relation is a field of the side rather than a reverse relation.
+    """
+    if model._meta.label in PAYLOAD_EMBEDDERS:
+        model._default_manager.filter(pk__in=pks).update(**{LAST_UPDATED_FIELD: now})
+        _touch_embedders(model, pks, now, own_fields)
+
+    else:
+        _touch_owners(model, pks, now)
+
+
+def _touch_on_change(
+    sender: type[models.Model], instance: models.Model, **kwargs: Any
+) -> None:
+    """
+    Touch dependents of saved and deleted instances.
+
+    Parameters
+    ----------
+    sender : type[models.Model]
+        The model class of the instance.
+
+    instance : models.Model
+        The saved or deleted instance.
+
+    **kwargs : Any
+        Signal arguments.
+    """
+    if not kwargs.get("raw"):
+        touch_dependents(instance)
+
+
+def _touch_on_m2m_change(
+    sender: type[models.Model], instance: models.Model, **kwargs: Any
+) -> None:
+    """
+    Touch both sides of a changed many-to-many relation.
+
+    Parameters
+    ----------
+    sender : type[models.Model]
+        The through model of the relation.
+
+    instance : models.Model
+        The instance whose relation was changed.
+
+    **kwargs : Any
+        Signal arguments.
+    """
+    if not kwargs["action"].startswith("post_"):
+        return
+
+    now = timezone.now()
+    reverse = kwargs["reverse"]
+    _touch_related(type(instance), {instance.pk}, now, own_fields=not reverse)
+    if kwargs["pk_set"]:
+        _touch_related(kwargs["model"], set(kwargs["pk_set"]), now, own_fields=reverse)
+
+
+def connect_touch_signals() -> None:
+    """
+    Connect the receivers that keep ``last_updated`` of tracked entities current.
+    """
+    for label in TRACKED_APPS:
+        for model in apps.get_app_config(label).get_models(include_auto_created=True):
+            uid = f"conditional-touch-{model._meta.label_lower}"
+            post_save.connect(_touch_on_change, sender=model, dispatch_uid=uid)
+            # Relations of deleted rows are only queryable before the delete.
+            pre_delete.connect(_touch_on_change, sender=model, dispatch_uid=uid)
+            m2m_changed.connect(_touch_on_m2m_change, sender=model, dispatch_uid=uid)
@@ -12,3 +12,80 @@ please check the path: backend/core/settings.py
 
 PAGINATION_PAGE_SIZE = 20
 PAGINATION_MAX_PAGE_SIZE = 100
+# Number of seconds that counts requested with ?count=estimate are cached.
+PAGINATION_COUNT_CACHE_TTL = 60
+
+# MARK: Serialization
+
+# Depth of nested objects that detail views render before relations become ids.
+SERIALIZER_DETAIL_DEPTH = 2
+# Maximum depth that clients can request with ?depth= or dotted ?expand= paths.
+SERIALIZER_MAX_DEPTH = 3
+
+# MARK: Authentication
+
+# Number of seconds that the principals of JWT authenticated users stay cached when
+# the cache is shared through Redis.
+AUTH_PRINCIPAL_CACHE_TTL = 60
+# Number of seconds and of sessions after which buffered session activity is written.
+SESSION_ACTIVITY_FLUSH_INTERVAL = 60
+SESSION_ACTIVITY_BUFFER_SIZE = 500
+# Number of seconds between runs of the task that deletes expired sessions.
+SESSION_PRUNE_INTERVAL = 3600
+
+# MARK: Response Cache
+
+# Number of seconds that public read responses stay cached.
+RESPONSE_CACHE_TTL_LIST = 60
+RESPONSE_CACHE_TTL_DETAIL = 300
+
+# MARK: Topics
+
+# Number of seconds between checks of whether topics changed in another process.
+TOPIC_REGISTRY_CHECK_INTERVAL = 5
+# Number of seconds that clients and proxies may cache the list of topics.
+TOPICS_MAX_AGE = 3600
+
+# MARK: Throttling
+
+# Number of seconds between deletions of expired database throttle counters.
+THROTTLE_PRUNE_INTERVAL = 3600
+
+# MARK: Email
+
+# Number of seconds that queued emails wait to be delivered together.
+EMAIL_BATCH_DELAY = 5
+# Number of emails that are sent per batch over one connection to the mail server.
+EMAIL_BATCH_SIZE = 50
+# Number of attempts to send an email and seconds before the first retry, which doubles.
+EMAIL_MAX_ATTEMPTS = 5
+EMAIL_RETRY_DELAY = 60
+# Number of seconds during which identical security alerts are only sent once.
+SECURITY_ALERT_DEDUP_WINDOW = 600
+
+# MARK: Calendar
+
+# Number of events that are rendered per chunk of streamed iCalendar feeds.
+CALENDAR_FEED_CHUNK_SIZE = 100
+# Number of seconds that rendered feeds stay cached while their events are unchanged.
+CALENDAR_FEED_CACHE_TTL = 86400
+
+# MARK: Images
+
+# Bounding boxes (width, height) of the renditions derived from uploaded images.
+IMAGE_RENDITIONS = {
+    "thumbnail": (160, 160),
+    "card": (480, 480),
+    "hero": (1600, 1600),
+}
+IMAGE_RENDITION_QUALITY = 80
+IMAGE_ORIGINAL_QUALITY = 95
+
+# MARK: Instrumentation
+
+# Upper bounds of the buckets of the request latency histogram in seconds.
+METRICS_LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Upper bounds of the buckets of the SQL queries per request histogram.
+METRICS_QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+# Number of times a request can run the same SQL before it is reported as N+1.
+METRICS_REPEATED_QUERY_THRESHOLD = 5
@@ -0,0 +1,120 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Connection pools of the PostgreSQL databases.
+
+Databases with a ``pool`` in their ``OPTIONS`` share a psycopg connection pool per
+process, so requests borrow an open connection instead of connecting to PostgreSQL.
+The pools are opened when the WSGI or ASGI application is loaded and fill up in the
+background, and their wait times and saturation are exposed as metrics.
+"""
+
+from typing import Any
+
+from django.conf import settings
+from django.db import connections
+
+from core.instrumentation import format_labels
+
+# The metrics of a pool, their Prometheus types and the pool statistics they read.
+POOL_METRICS = (
+    ("activist_db_pool_size", "gauge", "pool_size", "Connections of the pool."),
+    (
+        "activist_db_pool_available",
+        "gauge",
+        "pool_available",
+        "Idle connections of the pool.",
+    ),
+    ("activist_db_pool_max", "gauge", "pool_max", "Maximum connections of the pool."),
+    (
+        "activist_db_pool_requests_waiting",
+        "gauge",
+        "requests_waiting",
+        "Requests waiting for a connection.",
+    ),
+    (
+        "activist_db_pool_requests_total",
+        "counter",
+        "requests_num",
+        "Connections requested from the pool.",
+    ),
+    (
+        "activist_db_pool_requests_queued_total",
+        "counter",
+        "requests_queued",
+        "Connection requests that had to wait for a connection.",
+    ),
+    (
+        "activist_db_pool_timeouts_total",
+        "counter",
+        "requests_errors",
+        "Connection requests that timed out or failed.",
+    ),
+)
+
+
+def get_pools() -> dict[str, Any]:
+    """
+    Return the connection pools of the databases that use pooling.
+
+    Returns
+    -------
+    dict[str, Any]
+        The ``psycopg_pool.ConnectionPool`` of each pooled database alias.
+    """
+    return {
+        alias: connections[alias].pool  # type: ignore[attr-defined]
+        for alias, database in settings.DATABASES.items()
+        if database.get("OPTIONS", {}).get("pool")
+    }
+
+
+def open_pools() -> None:
+    """
+    Open the connection pools without waiting for their minimum connections.
+    """
+    for pool in get_pools().values():
+        pool.open(wait=False)
+
+
+def pool_metrics() -> list[str]:
+    """
+    Render the statistics of the connection pools in the Prometheus text format.
+
+    Returns
+    -------
+    list[str]
+        The lines of the pool metrics, empty if no database uses pooling.
+    """
+    stats = {alias: pool.get_stats() for alias, pool in get_pools().items()}
+    if not stats:
+        return []
+
+    lines: list[str] = []
+    for name, kind, key, description in POOL_METRICS:
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(
+            f"{name}{format_labels(alias=alias)} {pool_stats.get(key, 0)}"
+            for alias, pool_stats in stats.items()
+        )
+
+    name = "activist_db_pool_saturation"
+    lines.append(f"# HELP {name} Share of the maximum connections that are in use.")
+    lines.append(f"# TYPE {name} gauge")
+    for alias, pool_stats in stats.items():
+        in_use = pool_stats.get("pool_size", 0) - pool_stats.get("pool_available", 0)
+        saturation = (
+            in_use / pool_stats["pool_max"] if pool_stats.get("pool_max") else 0
+        )
+        lines.append(f"{name}{format_labels(alias=alias)} {saturation:g}")
+
+    name = "activist_db_pool_wait_seconds_total"
+    lines.append(f"# HELP {name} Time that requests waited for a connection.")
+    lines.append(f"# TYPE {name} counter")
+    lines.extend(
+        f"{name}{format_labels(alias=alias)} "
+        f"{pool_stats.get('requests_wait_ms', 0) / 1000:g}"
+        for alias, pool_stats in stats.items()
+    )
+
+    return lines
@@ -0,0 +1,349 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Route the reads of safe requests to read replicas.
+
+The middleware picks a healthy replica for every GET, HEAD and OPTIONS request and
+the router sends the reads of the request to it. Writes always go to the primary
+and the rest of the request then reads from the primary as well. Clients that wrote
+are pinned to the primary for ``DATABASE_REPLICA_PIN_SECONDS`` so that they read
+their own writes while the replicas catch up.
+
+Replicas are checked at most every ``DATABASE_REPLICA_CHECK_INTERVAL`` seconds.
+Replicas that are down or lag more than ``DATABASE_REPLICA_MAX_LAG`` seconds behind
+are skipped, and requests read from the primary if no replica is healthy.
+
+Pins are kept in the routing cache, which every worker has to see for a pin to
+hold on the next request of the client. Replica reads are therefore disabled and
+all requests read from the primary unless the cache is shared through Redis.
+"""
+
+import hashlib
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable
+from contextvars import ContextVar
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections, models
+from django.http import HttpRequest, HttpResponseBase
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+PIN_KEY_PREFIX = "db-primary-pin"
+
+# Seconds that the replica is behind the primary, zero if it has replayed all WAL it
+# received and NULL if the database is not a standby.
+REPLICA_LAG_SQL = """
+SELECT CASE
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+END
+"""
+
+# The replica that the current request reads from, None for the primary.
+_read_alias: ContextVar[str | None] = ContextVar("read_alias", default=None)
+
+# MARK: Health
+
+_health_lock = threading.Lock()
+_health: dict[str, tuple[float, bool]] = {}
+
+
+def _check_replica(alias: str) -> bool:
+    """
+    Check whether a replica is reachable and up to date.
+
+    Parameters
+    ----------
+    alias : str
+        The database alias of the replica.
+
+    Returns
+    -------
+    bool
+        Whether the replica lags at most ``DATABASE_REPLICA_MAX_LAG`` seconds.
+    """
+    connection = connections[alias]
+    try:
+        if connection.vendor != "postgresql":
+            connection.ensure_connection()
+            return True
+
+        with connection.cursor() as cursor:
+            cursor.execute(REPLICA_LAG_SQL)
+            row = cursor.fetchone()
+
+    except DatabaseError as e:
+        logger.warning(f"Replica {alias} is unavailable: {e}")
+        return False
+
+    lag = float(row[0]) if row and row[0] is not None else 0.0
+    if lag > settings.DATABASE_REPLICA_MAX_LAG:
+        logger.warning(f"Replica {alias} lags {lag:.1f} seconds behind the primary.")
+        return False
+
+    return True
+
+
+def is_replica_healthy(alias: str) -> bool:
+    """
+    Return whether a replica was healthy when it was last checked.
+
+    Parameters
+    ----------
+    alias : str
+        The database alias of the replica.
+
+    Returns
+    -------
+    bool
+        Whether reads can be sent to the replica.
+    """
+    now = time.monotonic()
+    with _health_lock:
+        checked = _health.get(alias)
+
+    if checked and now - checked[0] < settings.DATABASE_REPLICA_CHECK_INTERVAL:
+        return checked[1]
+
+    healthy = _check_replica(alias)
+    with _health_lock:
+        _health[alias] = (now, healthy)
+
+    return healthy
+
+
+def reset_replica_health() -> None:
+    """
+    Forget the results of earlier checks so that replicas are checked again.
+    """
+    with _health_lock:
+        _health.clear()
+
+
+def choose_replica() -> str | None:
+    """
+    Choose a healthy replica at random.
+
+    Returns
+    -------
+    str | None
+        The alias of the replica, or None if no replica is healthy.
+    """
+    healthy = [a for a in settings.REPLICA_DATABASES if is_replica_healthy(a)]
+    return random.choice(healthy) if healthy else None
+
+
+# MARK: Pinning
+
+
+def _get_pin_key(request: HttpRequest) -> str:
+    """
+    Identify the client of a request for pinning it to the primary.
+
+    Parameters
+    ----------
+    request : HttpRequest
+        The request.
+
+    Returns
+    -------
+    str
+        A cache key derived from the credentials of the request, or from its
+        address for anonymous clients.
+    """
+    client = (
+        request.headers.get("Authorization")
+        or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+        or request.META.get("REMOTE_ADDR", "")
+    )
+    return f"{PIN_KEY_PREFIX}:{hashlib.sha256(client.encode()).hexdigest()}"
+
+
+def _get_pin_cache() -> BaseCache:
+    """
+    Return the cache that pins are kept in.
+
+    Returns
+    -------
+    BaseCache
+        The routing cache, which is shared by all workers.
+    """
+    return caches[settings.ROUTING_CACHE_ALIAS]
+
+
+# MARK: Router
+
+
+class ReplicaRouter:
+    """
+    Send the reads of safe requests to the replica chosen by the middleware.
+    """
+
+    def db_for_read(self, model: type[models.Model], **hints: Any) -> str | None:
+        """
+        Return the database that the current request reads from.
+
+        Parameters
+        ----------
+        model : type[models.Model]
+            The model that is read.
+
+        **hints : Any
+            Hints of the query, e.g. the instance it relates to.
+
+        Returns
+        -------
+        str | None
+            The alias of the chosen replica, or None to read from the primary.
+        """
+        return _read_alias.get()
+
+    def db_for_write(self, model: type[models.Model], **hints: Any) -> str:
+        """
+        Send writes to the primary, which the request then also reads from.
+
+        Parameters
+        ----------
+        model : type[models.Model]
+            The model that is written.
+
+        **hints : Any
+            Hints of the query, e.g. the instance it relates to.
+
+        Returns
+        -------
+        str
+            The alias of the primary.
+        """
+        # Read the writes of the request back from the primary.
+        _read_alias.set(None)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: models.Model, obj2: models.Model) -> bool | None:
+        """
+        Allow relations between rows of the primary and its replicas.
+
+        Parameters
+        ----------
+        obj1 : models.Model
+            An instance of the relation.
+
+        obj2 : models.Model
+            The other instance of the relation.
+
+        Returns
+        -------
+        bool | None
+            True if both instances come from the primary or a replica, else None to
+            leave the decision to other routers.
+        """
+        databases = {DEFAULT_DB_ALIAS, *settings.REPLICA_DATABASES}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+
+        return None
+
+    def allow_migrate(self, db: str, app_label: str, **hints: Any) -> bool:
+        """
+        Only migrate the primary, from which replicas receive the schema.
+
+        Parameters
+        ----------
+        db : str
+            The alias of the database.
+
+        app_label : str
+            The label of the app that is migrated.
+
+        **hints : Any
+            Hints of the migration, e.g. the model name.
+
+        Returns
+        -------
+        bool
+            Whether the database is not a replica.
+        """
+        return db not in settings.REPLICA_DATABASES
+
+
+# MARK: Middleware
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Choose the database that the reads of a request go to.
+
+    Parameters
+    ----------
+    get_response : Callable[[HttpRequest], HttpResponseBase]
+        The next middleware or the view.
+
+    Raises
+    ------
+    MiddlewareNotUsed
+        If no replicas are configured or the cache is not shared.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponseBase]) -> None:
+        """
+        Enable the middleware if replicas and a shared cache are configured.
+
+        Parameters
+        ----------
+        get_response : Callable[[HttpRequest], HttpResponseBase]
+            The next middleware or the view.
+
+        Raises
+        ------
+        MiddlewareNotUsed
+            If no replicas are configured or the cache is not shared.
+        """
+        if not settings.REPLICA_DATABASES:
+            raise MiddlewareNotUsed()
+
+        if not settings.SHARED_CACHE:
+            logger.warning(
+                "Reading from the primary only, as pinning clients to it requires "
+                "REDIS_URL."
+            )
+            raise MiddlewareNotUsed()
+
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        """
+        Handle a request with its reads routed to the chosen database.
+
+        Parameters
+        ----------
+        request : HttpRequest
+            The request to handle.
+
+        Returns
+        -------
+        HttpResponseBase
+            The response of the next middleware or the view.
+        """
+        pin_key = _get_pin_key(request)
+        alias = None
+        if request.method in SAFE_METHODS and not _get_pin_cache().get(pin_key):
+            alias = choose_replica()
+
+        token = _read_alias.set(alias)
+        try:
+            response = self.get_response(request)
+
+        finally:
+            _read_alias.reset(token)
+
+        if request.method not in SAFE_METHODS:
+            _get_pin_cache().set(pin_key, True, settings.DATABASE_REPLICA_PIN_SECONDS)
+
+        return response
@@ -0,0 +1,442 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Projections of serializers: expansions, sparse fieldsets and nesting depth.
+
+Serializers embed related entities in a compact form by default. Clients shape the
+representation with query parameters:
+
+- ``?expand=orgs,groups`` renders relations in their full form.
+- ``?fields=id,name,groups.name`` only renders the listed fields.
+- ``?depth=1`` renders nested serializers up to a depth and relations below it as
+  primary keys.
+
+Paths are dotted from the serializer of the view, e.g. ``?expand=events.orgs``
+expands the organizations of the events of an organization. Field names can be given
+in snake or camel case.
+"""
+
+from typing import Any
+
+from djangorestframework_camel_case.util import camel_to_underscore
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import serializers
+from rest_framework.request import Request
+
+from core import custom_settings
+
+EXPAND_QUERY_PARAM = "expand"
+FIELDS_QUERY_PARAM = "fields"
+DEPTH_QUERY_PARAM = "depth"
+
+SerializerField = serializers.Field[Any, Any, Any, Any]
+
+PROJECTION_PARAMETERS = [
+    OpenApiParameter(
+        name=EXPAND_QUERY_PARAM,
+        type=OpenApiTypes.STR,
+        description="Comma separated relations to render in full, e.g. events.orgs.",
+    ),
+    OpenApiParameter(
+        name=FIELDS_QUERY_PARAM,
+        type=OpenApiTypes.STR,
+        description="Comma separated fields to render, e.g. id,name,groups.name.",
+    ),
+    OpenApiParameter(
+        name=DEPTH_QUERY_PARAM,
+        type=OpenApiTypes.INT,
+        description=(
+            "Depth of nested objects below which relations are rendered as ids "
+            f"(0-{custom_settings.SERIALIZER_MAX_DEPTH})."
+        ),
+    ),
+]
+
+
+def _get_paths(request: Request | None, param: str) -> frozenset[str]:
+    """
+    Parse a comma separated query parameter of dotted paths.
+
+    Parameters
+    ----------
+    request : Request | None
+        The current request, if any.
+
+    param : str
+        The name of the query parameter.
+
+    Returns
+    -------
+    frozenset[str]
+        The paths given in the parameter.
+
+    Raises
+    ------
+    serializers.ValidationError
+        If a path is nested deeper than ``SERIALIZER_MAX_DEPTH``.
+    """
+    if request is None:
+        return frozenset()
+
+    # Clients see camel case field names, so accept them as well.
+    paths = frozenset(
+        camel_to_underscore(part.strip())
+        for value in request.query_params.getlist(param)
+        for part in value.split(",")
+        if part.strip()
+    )
+    if too_deep := sorted(
+        p for p in paths if p.count(".") >= custom_settings.SERIALIZER_MAX_DEPTH
+    ):
+        max_depth = custom_settings.SERIALIZER_MAX_DEPTH
+        raise serializers.ValidationError(
+            {param: [f"Paths can be at most {max_depth} levels deep: {too_deep}."]}
+        )
+
+    return paths
+
+
+def get_expand_params(request: Request | None) -> frozenset[str]:
+    """
+    Parse the comma separated ``expand`` query parameter of a request.
+
+    Parameters
+    ----------
+    request : Request | None
+        The current request, if any.
+
+    Returns
+    -------
+    frozenset[str]
+        The paths of the relations that should be rendered in full.
+    """
+    return _get_paths(request, EXPAND_QUERY_PARAM)
+
+
+def get_fields_params(request: Request | None) -> frozenset[str] | None:
+    """
+    Parse the comma separated ``fields`` query parameter of a request.
+
+    Parameters
+    ----------
+    request : Request | None
+        The current request, if any.
+
+    Returns
+    -------
+    frozenset[str] | None
+        The paths of the fields that should be rendered, or None for all fields.
+    """
+    return _get_paths(request, FIELDS_QUERY_PARAM) or None
+
+
+def get_depth_param(request: Request | None, default: int | None = None) -> int | None:
+    """
+    Parse the ``depth`` query parameter of a request.
+
+    Parameters
+    ----------
+    request : Request | None
+        The current request, if any.
+
+    default : int | None, default=None
+        The depth if the parameter is not given, None for no limit.
+
+    Returns
+    -------
+    int | None
+        The depth of nested serializers that are rendered.
+
+    Raises
+    ------
+    serializers.ValidationError
+        If the depth is not an integer between 0 and ``SERIALIZER_MAX_DEPTH``.
+    """
+    value = request.query_params.get(DEPTH_QUERY_PARAM) if request else None
+    if value is None:
+        return default
+
+    max_depth = custom_settings.SERIALIZER_MAX_DEPTH
+    if not value.isdigit() or int(value) > max_depth:
+        raise serializers.ValidationError(
+            {DEPTH_QUERY_PARAM: [f"Depth must be an integer from 0 to {max_depth}."]}
+        )
+
+    return int(value)
+
+
+def get_projection(
+    request: Request | None, default_depth: int | None = None
+) -> dict[str, Any]:
+    """
+    Parse the projection query parameters of a request into serializer context.
+
+    Parameters
+    ----------
+    request : Request | None
+        The current request, if any.
+
+    default_depth : int | None, default=None
+        The depth if the request does not set one, None for no limit.
+
+    Returns
+    -------
+    dict[str, Any]
+        The ``expand``, ``fields`` and ``depth`` context of serializers, which can
+        also be passed to ``prefetch_for_serializer`` as keyword arguments.
+    """
+    return {
+        "expand": get_expand_params(request),
+        "fields": get_fields_params(request),
+        "depth": get_depth_param(request, default_depth),
+    }
+
+
+def _relative(paths: frozenset[str], prefix: str) -> frozenset[str]:
+    """
+    Return the paths below a prefix relative to it.
+
+    Parameters
+    ----------
+    paths : frozenset[str]
+        Dotted paths from the root serializer.
+
+    prefix : str
+        The path of a nested serializer, empty for the root serializer.
+
+    Returns
+    -------
+    frozenset[str]
+        The remainders of the paths that start with the prefix.
+    """
+    if not prefix:
+        return paths
+
+    return frozenset(p[len(prefix) + 1 :] for p in paths if p.startswith(f"{prefix}."))
+
+
+def _heads(paths: frozenset[str]) -> frozenset[str]:
+    """
+    Return the first fields of dotted paths.
+
+    Parameters
+    ----------
+    paths : frozenset[str]
+        Dotted paths relative to a serializer.
+
+    Returns
+    -------
+    frozenset[str]
+        The fields of the serializer that the paths start with.
+    """
+    return frozenset(p.split(".", 1)[0] for p in paths)
+
+
+def _prune(value: Any, paths: frozenset[str]) -> Any:
+    """
+    Drop the keys of a representation that are not selected by paths.
+
+    Parameters
+    ----------
+    value : Any
+        A rendered object or list of objects.
+
+    paths : frozenset[str]
+        The selected fields relative to the value.
+
+    Returns
+    -------
+    Any
+        The value with only the selected fields.
+    """
+    if isinstance(value, list):
+        return [_prune(item, paths) for item in value]
+
+    if not isinstance(value, dict) or not paths:
+        return value
+
+    return {
+        key: _prune(item, _relative(paths, key))
+        for key, item in value.items()
+        if key in _heads(paths)
+    }
+
+
+def _collapse(field: SerializerField) -> SerializerField:
+    """
+    Replace a nested serializer with the primary keys of the objects it renders.
+
+    Parameters
+    ----------
+    field : SerializerField
+        A field of a serializer.
+
+    Returns
+    -------
+    SerializerField
+        A read only primary key field for nested serializers, else the field.
+    """
+    many = isinstance(field, serializers.ListSerializer)
+    nested = field.child if many else field  # type: ignore[attr-defined]
+    if not isinstance(nested, serializers.BaseSerializer) or field.source == "*":
+        return field
+
+    kwargs: dict[str, Any] = {"many": many, "read_only": True}
+    if field.source is not None:
+        kwargs["source"] = field.source
+
+    return serializers.PrimaryKeyRelatedField(**kwargs)
+
+
+class ExpandableFieldsMixin:
+    """
+    Apply the expansions, field selection and depth of a projection to a serializer.
+
+    Serializers list the fields that can be expanded in ``expandable_fields`` as a
+    mapping from field name to the serializer class and keyword arguments of the
+    expanded field. The projection is read from the ``expand``, ``fields`` and
+    ``depth`` keys of the context and falls back to the query parameters of
+    ``context["request"]``.
+
+    Nested serializers with this mixin apply the part of the projection below their
+    own path. Nested serializers without it are collapsed below the depth limit by
+    their parent, and their fields are selected after rendering.
+    """
+
+    expandable_fields: dict[str, tuple[type[SerializerField], dict[str, Any]]] = {}
+    context: dict[str, Any]
+    parent: Any
+    field_name: str | None
+
+    def get_path(self) -> str:
+        """
+        Return the dotted path of the serializer from the root serializer.
+
+        Returns
+        -------
+        str
+            The path, empty for the root serializer.
+        """
+        names = []
+        node: Any = self
+        while node.parent is not None:
+            if node.field_name:
+                names.append(node.field_name)
+
+            node = node.parent
+
+        return ".".join(reversed(names))
+
+    def get_expand(self) -> frozenset[str]:
+        """
+        Return the paths of the relations that should be rendered in full.
+
+        Returns
+        -------
+        frozenset[str]
+            The requested expansions relative to the root serializer.
+        """
+        if "expand" in self.context:
+            return frozenset(self.context["expand"])
+
+        return get_expand_params(self.context.get("request"))
+
+    def get_selected_fields(self) -> frozenset[str] | None:
+        """
+        Return the paths of the fields that should be rendered.
+
+        Returns
+        -------
+        frozenset[str] | None
+            The selected fields relative to the root serializer, None for all.
+        """
+        if "fields" in self.context:
+            fields = self.context["fields"]
+            return frozenset(fields) if fields is not None else None
+
+        return get_fields_params(self.context.get("request"))
+
+    def get_depth(self) -> int | None:
+        """
+        Return the depth of nested serializers that should be rendered.
+
+        Returns
+        -------
+        int | None
+            The depth, None for no limit.
+        """
+        if "depth" in self.context:
+            depth: int | None = self.context["depth"]
+            return depth
+
+        return get_depth_param(self.context.get("request"))
+
+    def _get_selection(self, path: str) -> frozenset[str]:
+        """
+        Return the fields that the request selects below a serializer.
+
+        Parameters
+        ----------
+        path : str
+            The path of the serializer, empty for the root serializer.
+
+        Returns
+        -------
+        frozenset[str]
+            The selected paths relative to the serializer, empty if all fields are
+            selected.
+        """
+        selected = self.get_selected_fields()
+        return _relative(selected, path) if selected is not None else frozenset()
+
+    def get_fields(self) -> dict[str, SerializerField]:
+        """
+        Return the serializer fields with the projection applied.
+
+        Returns
+        -------
+        dict[str, SerializerField]
+            The serializer fields.
+        """
+        fields: dict[str, SerializerField] = super().get_fields()  # type: ignore[misc]
+        path = self.get_path()
+
+        expand = _heads(_relative(self.get_expand(), path))
+        for name in expand & self.expandable_fields.keys():
+            field_class, kwargs = self.expandable_fields[name]
+            fields[name] = field_class(**kwargs)
+
+        if selection := self._get_selection(path):
+            fields = {k: v for k, v in fields.items() if k in _heads(selection)}
+
+        depth = self.get_depth()
+        level = path.count(".") + 1 if path else 0
+        if depth is not None and level >= depth:
+            fields = {k: v if k in expand else _collapse(v) for k, v in fields.items()}
+
+        return fields
+
+    def to_representation(self, instance: Any) -> Any:
+        """
+        Render an instance and select the fields of nested serializers.
+
+        Parameters
+        ----------
+        instance : Any
+            The instance to render.
+
+        Returns
+        -------
+        Any
+            The representation of the instance.
+        """
+        data = super().to_representation(instance)  # type: ignore[misc]
+        if not (selection := self._get_selection(self.get_path())):
+            return data
+
+        for name, field in self.fields.items():  # type: ignore[attr-defined]
+            nested = getattr(field, "child", field)
+            if name in data and not isinstance(nested, ExpandableFieldsMixin):
+                data[name] = _prune(data[name], _relative(selection, name))
+
+        return data
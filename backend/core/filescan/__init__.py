@@ -2,7 +2,19 @@
 Filescan client package. Re-export the public API.
 """
 
-from core.filescan.filescan_client import FilescanError, scan_file
-from core.filescan.scan_helpers import scan_uploads_and_rewind
+from core.filescan.filescan_client import (
+    FilescanBusyError,
+    FilescanError,
+    scan_batch,
+    scan_file,
+)
+from core.filescan.scan_helpers import scan_uploads, scan_uploads_and_rewind
 
-__all__ = ["FilescanError", "scan_file", "scan_uploads_and_rewind"]
+__all__ = [
+    "FilescanBusyError",
+    "FilescanError",
+    "scan_batch",
+    "scan_file",
+    "scan_uploads",
+    "scan_uploads_and_rewind",
+]
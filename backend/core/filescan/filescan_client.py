@@ -3,14 +3,18 @@
 Small HTTP client for the filescan service used by the backend.
 
 This module is the single place where the backend knows how to call the
-``/scan`` endpoint. Code that needs to talk to the filescan service
-should import and use ``scan_file`` instead of reimplementing the
-protocol.
+``/scan`` and ``/scan/batch`` endpoints. Code that needs to talk to the
+filescan service should import and use ``scan_file`` or ``scan_batch``
+instead of reimplementing the protocol. All calls share one pooled
+keep-alive client.
 """
 
 from __future__ import annotations
 
 import os
+import threading
+import time
+from collections.abc import Sequence
 from typing import IO, Any, cast
 
 import httpx
@@ -23,6 +27,35 @@ class FilescanError(Exception):
     """
 
 
+class FilescanBusyError(FilescanError):
+    """
+    Raised when the filescan service sheds a scan because it is overloaded.
+
+    Parameters
+    ----------
+    message : str
+        A description of the response of the service.
+
+    retry_after : float | None
+        The number of seconds after which the service asked to be called again.
+    """
+
+    def __init__(self, message: str, retry_after: float | None) -> None:
+        """
+        Create the error for a shed scan.
+
+        Parameters
+        ----------
+        message : str
+            A description of the response of the service.
+
+        retry_after : float | None
+            The number of seconds after which the service asked to be called again.
+        """
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
 def _build_scan_url() -> str:
     """
     Compute the URL for the scan endpoint.
@@ -47,9 +80,172 @@ def _build_scan_url() -> str:
 
 
 FILESCAN_URL = _build_scan_url()
+FILESCAN_BATCH_URL = FILESCAN_URL.rstrip("/") + "/batch"
+
+# Timeout of a single scan request and maximum number of pooled connections.
+FILESCAN_TIMEOUT = float(os.getenv("FILESCAN_TIMEOUT", "10"))
+FILESCAN_MAX_CONNECTIONS = int(os.getenv("FILESCAN_MAX_CONNECTIONS", "10"))
+# Number of times a shed scan is retried after the Retry-After of the service.
+FILESCAN_BUSY_RETRIES = int(os.getenv("FILESCAN_BUSY_RETRIES", "1"))
+# Statuses with which the service sheds scans under load.
+FILESCAN_BUSY_STATUSES = (429, 503)
+
+_client: httpx.Client | None = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> httpx.Client:
+    """
+    Return the process wide HTTP client for the filescan service.
+
+    Returns
+    -------
+    httpx.Client
+        A thread safe client that keeps connections to the service alive so
+        that consecutive scans skip the TCP handshake.
+    """
+    global _client
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=FILESCAN_MAX_CONNECTIONS,
+                        max_keepalive_connections=FILESCAN_MAX_CONNECTIONS,
+                    ),
+                    timeout=FILESCAN_TIMEOUT,
+                )
+
+    return _client
+
 
+def _get_headers() -> dict[str, str]:
+    """
+    Return the headers that authenticate the backend to the filescan service.
+
+    Returns
+    -------
+    dict[str, str]
+        The token header if ``FILESCAN_INTERNAL_TOKEN`` is set.
+    """
+    headers: dict[str, str] = {}
+    if token := os.getenv("FILESCAN_INTERNAL_TOKEN"):
+        headers["X-Filescan-Token"] = token
+
+    return headers
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    """
+    Return the number of seconds of the ``Retry-After`` header of a response.
+
+    Parameters
+    ----------
+    response : httpx.Response
+        A response of the filescan service.
 
-def scan_file(upload: UploadedFile[bytes]) -> dict[str, Any]:
+    Returns
+    -------
+    float | None
+        The delay in seconds, or None if the header is missing or not a number.
+    """
+    try:
+        return max(0.0, float(response.headers["Retry-After"]))
+
+    except (KeyError, ValueError):
+        return None
+
+
+def _rewind(files: Any) -> None:
+    """
+    Seek the file objects of multipart files back to their start.
+
+    Parameters
+    ----------
+    files : Any
+        The multipart files as a dict or list of ``(name, file object)`` values.
+    """
+    entries = files.values() if isinstance(files, dict) else (f for _, f in files)
+    for _, file_obj in entries:
+        file_obj.seek(0)
+
+
+def _post(url: str, files: Any, timeout: float) -> Any:
+    """
+    Post files to the filescan service and return the decoded JSON response.
+
+    Parameters
+    ----------
+    url : str
+        The endpoint to post to.
+
+    files : Any
+        The multipart files to send.
+
+    timeout : float
+        Number of seconds to wait for the response, including retries.
+
+    Returns
+    -------
+    Any
+        JSON response from the service.
+
+    Raises
+    ------
+    FilescanBusyError
+        If the service is still overloaded after ``FILESCAN_BUSY_RETRIES`` retries
+        or asks to retry later than the timeout allows.
+
+    FilescanError
+        On network error or other non-200 responses.
+
+    Notes
+    -----
+    A service that sheds load answers 429 or 503 with ``Retry-After``. The scan is
+    retried after that delay as long as it fits within the timeout, so that short
+    bursts are absorbed without failing the upload.
+    """
+    deadline = time.monotonic() + timeout
+    retries = 0
+    while True:
+        try:
+            response = get_client().post(
+                url,
+                files=files,
+                headers=_get_headers(),
+                timeout=max(deadline - time.monotonic(), 0.1),
+            )
+
+        except httpx.RequestError as exc:
+            raise FilescanError(f"Could not reach filescan service: {exc}") from exc
+
+        if response.status_code == 200:
+            return response.json()
+
+        retry_after = _retry_after(response)
+        if response.status_code not in FILESCAN_BUSY_STATUSES or retry_after is None:
+            raise FilescanError(
+                f"Filescan returned {response.status_code}: {response.text}"
+            )
+
+        if (
+            retries >= FILESCAN_BUSY_RETRIES
+            or time.monotonic() + retry_after >= deadline
+        ):
+            raise FilescanBusyError(
+                f"Filescan is overloaded ({response.status_code}): {response.text}",
+                retry_after,
+            )
+
+        retries += 1
+        time.sleep(retry_after)
+        _rewind(files)
+
+
+def scan_file(
+    upload: UploadedFile[bytes], timeout: float = FILESCAN_TIMEOUT
+) -> dict[str, Any]:
     """
     Call the filescan service with the uploaded file and return its JSON response.
 
@@ -58,6 +254,9 @@ def scan_file(upload: UploadedFile[bytes]) -> dict[str, Any]:
     upload : UploadedFile
         The uploaded file to send to the filescan service.
 
+    timeout : float, default=FILESCAN_TIMEOUT
+        Number of seconds to wait for the response.
+
     Returns
     -------
     dict of str to Any
@@ -65,28 +264,56 @@ def scan_file(upload: UploadedFile[bytes]) -> dict[str, Any]:
 
     Raises
     ------
+    FilescanBusyError
+        If the service is overloaded and sheds the scan.
+
     FilescanError
         On network error or non-200 response.
     """
-    try:
-        file_obj = cast(IO[bytes], upload.file)
-        headers: dict[str, str] = {}
-        if token := os.getenv("FILESCAN_INTERNAL_TOKEN"):
-            headers["X-Filescan-Token"] = token
-
-        response = httpx.post(
-            FILESCAN_URL,
-            files={"file": (upload.name, file_obj)},
-            headers=headers,
-            timeout=10.0,
-        )
+    file_obj = cast(IO[bytes], upload.file)
+
+    return cast(
+        dict[str, Any],
+        _post(FILESCAN_URL, {"file": (upload.name, file_obj)}, timeout),
+    )
+
+
+def scan_batch(
+    uploads: Sequence[UploadedFile[bytes]], timeout: float = FILESCAN_TIMEOUT
+) -> list[dict[str, Any]]:
+    """
+    Scan several uploads with a single call to the ``/scan/batch`` endpoint.
 
-    except httpx.RequestError as exc:
-        raise FilescanError(f"Could not reach filescan service: {exc}") from exc
+    Parameters
+    ----------
+    uploads : Sequence[UploadedFile]
+        The uploaded files to send to the filescan service.
+
+    timeout : float, default=FILESCAN_TIMEOUT
+        Number of seconds to wait for the response.
+
+    Returns
+    -------
+    list of dict of str to Any
+        The scan result of each upload in the order of the uploads.
 
-    if response.status_code != 200:
+    Raises
+    ------
+    FilescanBusyError
+        If the service is overloaded and sheds the scan.
+
+    FilescanError
+        On network error, non-200 response or a result count mismatch.
+    """
+    files = [
+        ("files", (upload.name, cast(IO[bytes], upload.file))) for upload in uploads
+    ]
+    results = cast(
+        list[dict[str, Any]], _post(FILESCAN_BATCH_URL, files, timeout)["results"]
+    )
+    if len(results) != len(uploads):
         raise FilescanError(
-            f"Filescan returned {response.status_code}: {response.text}"
+            f"Filescan returned {len(results)} results for {len(uploads)} files"
         )
 
-    return cast(dict[str, Any], response.json())
+    return results
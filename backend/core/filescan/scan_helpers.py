@@ -3,17 +3,89 @@
 View-layer helper: scan uploads and rewind on success.
 """
 
-from collections.abc import Iterable
+import math
+import os
+import time
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any
 
 from django.core.files.uploadedfile import UploadedFile
 from rest_framework import status
 from rest_framework.response import Response
 
-from core.filescan.filescan_client import FilescanError, scan_file
+from core.filescan.filescan_client import (
+    FILESCAN_TIMEOUT,
+    FilescanBusyError,
+    FilescanError,
+    scan_batch,
+    scan_file,
+)
 
 # User-facing messages for scan failures.
 FILESCAN_MSG_REJECTED = "The uploaded file was rejected by the security scan."
 FILESCAN_MSG_COULD_NOT_SCAN = "The file could not be scanned. Please try again later."
+FILESCAN_MSG_BUSY = "Too many files are being scanned. Please try again shortly."
+
+# Overall number of seconds that scanning all files of a request may take.
+FILESCAN_DEADLINE = float(os.getenv("FILESCAN_DEADLINE", "15"))
+# Maximum number of files of a request that are scanned at the same time.
+FILESCAN_MAX_CONCURRENCY = int(os.getenv("FILESCAN_MAX_CONCURRENCY", "4"))
+# Scan multi-file uploads with one call to the service's /scan/batch endpoint.
+FILESCAN_USE_BATCH = os.getenv("FILESCAN_USE_BATCH") == "True"
+
+
+def scan_uploads(
+    uploads: Sequence[UploadedFile[bytes]], deadline: float = FILESCAN_DEADLINE
+) -> list[dict[str, Any]]:
+    """
+    Scan all uploads of a request concurrently within an overall deadline.
+
+    Parameters
+    ----------
+    uploads : Sequence[UploadedFile]
+        Uploaded file objects to scan.
+
+    deadline : float, default=FILESCAN_DEADLINE
+        Number of seconds after which scanning is given up.
+
+    Returns
+    -------
+    list of dict of str to Any
+        The scan result of each upload in the order of the uploads.
+
+    Raises
+    ------
+    FilescanError
+        If a scan fails or the deadline passes before all scans finished.
+    """
+    timeout = min(FILESCAN_TIMEOUT, deadline)
+    if len(uploads) == 1:
+        return [scan_file(uploads[0], timeout=timeout)]
+
+    if FILESCAN_USE_BATCH:
+        return scan_batch(uploads, timeout=deadline)
+
+    started = time.monotonic()
+    executor = ThreadPoolExecutor(
+        max_workers=min(len(uploads), FILESCAN_MAX_CONCURRENCY),
+        thread_name_prefix="filescan",
+    )
+    try:
+        futures = [
+            executor.submit(scan_file, upload, timeout=timeout) for upload in uploads
+        ]
+        _, pending = wait(futures, timeout=deadline)
+        if pending:
+            raise FilescanError(
+                f"Scanning {len(uploads)} files exceeded the deadline of "
+                f"{deadline}s after {time.monotonic() - started:.1f}s"
+            )
+
+        return [future.result() for future in futures]
+
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
 
 
 def scan_uploads_and_rewind(uploads: Iterable[UploadedFile[bytes]]) -> Response | None:
@@ -28,26 +100,41 @@ def scan_uploads_and_rewind(uploads: Iterable[UploadedFile[bytes]]) -> Response
     Returns
     -------
     Response or None
-        None if all scans pass (and uploads are rewound); otherwise a 400 Response.
-        Caller can then safely pass request.data to the serializer when None.
+        None if all scans pass (and uploads are rewound); a 503 Response with
+        ``Retry-After`` if the filescan service is overloaded; otherwise a 400
+        Response. Caller can then safely pass request.data to the serializer when
+        None.
     """
-    if not uploads:
+    upload_list = list(uploads)
+    if not upload_list:
         return None
 
     try:
-        for upload in uploads:
-            result = scan_file(upload)
-            if result.get("malware_detected"):
-                return Response(
-                    {"nonFieldErrors": [FILESCAN_MSG_REJECTED]},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-
-        for upload in uploads:
+        results = scan_uploads(upload_list)
+        if any(result.get("malware_detected") for result in results):
+            return Response(
+                {"nonFieldErrors": [FILESCAN_MSG_REJECTED]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        for upload in upload_list:
             upload.seek(0)
 
         return None
 
+    except FilescanBusyError as exc:
+        # Pass the backpressure of the service on so that clients back off.
+        headers = (
+            {"Retry-After": str(math.ceil(exc.retry_after))}
+            if exc.retry_after is not None
+            else None
+        )
+        return Response(
+            {"nonFieldErrors": [FILESCAN_MSG_BUSY]},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers=headers,
+        )
+
     except FilescanError:
         return Response(
             {"nonFieldErrors": [FILESCAN_MSG_COULD_NOT_SCAN]},
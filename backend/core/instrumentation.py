@@ -0,0 +1,641 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Per-request instrumentation and an internal endpoint that exposes it to Prometheus.
+
+The middleware measures the latency, the number and duration of SQL queries, the
+time spent in serializers and the size of the response of every request, and adds
+them to metrics of the route that handled it. Requests that run the same SQL many
+times, which usually means an N+1 query, are logged and counted.
+
+Metrics are kept in the memory of each process. With several workers, every scrape
+reports the worker that answered it.
+"""
+
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from contextlib import ExitStack
+from contextvars import ContextVar
+from typing import Any
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpRequest, HttpResponse, HttpResponseBase
+from rest_framework import serializers
+
+from core import custom_settings
+
+logger = logging.getLogger(__name__)
+
+# Label of requests that did not match a route.
+UNMATCHED_ROUTE = "unmatched"
+
+# MARK: Histogram
+
+
+class Histogram:
+    """
+    Observations counted in cumulative buckets, as Prometheus histograms are.
+
+    Parameters
+    ----------
+    buckets : Iterable[float]
+        The upper bounds of the buckets in ascending order.
+    """
+
+    def __init__(self, buckets: Iterable[float]) -> None:
+        """
+        Create a histogram without observations.
+
+        Parameters
+        ----------
+        buckets : Iterable[float]
+            The upper bounds of the buckets in ascending order.
+        """
+        self.buckets = list(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """
+        Count an observation in its bucket and in the sum of observations.
+
+        Parameters
+        ----------
+        value : float
+            The observed value.
+        """
+        self.count += 1
+        self.sum += value
+        if (i := bisect_left(self.buckets, value)) < len(self.buckets):
+            self.counts[i] += 1
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        """
+        Return the number of observations up to each bucket.
+
+        Returns
+        -------
+        list[tuple[str, int]]
+            The upper bound of each bucket including ``+Inf`` and its count.
+        """
+        result = []
+        total = 0
+        for bound, count in zip(self.buckets, self.counts, strict=True):
+            total += count
+            result.append((f"{bound:g}", total))
+
+        result.append(("+Inf", self.count))
+        return result
+
+
+# MARK: Request Stats
+
+
+class RequestStats:
+    """
+    The cost of the request that is currently handled.
+    """
+
+    def __init__(self) -> None:
+        """
+        Create the stats of a request that has not run any queries yet.
+        """
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serializer_seconds = 0.0
+        self.serializing = False
+        self.shapes: Counter[str] = Counter()
+
+    def repeated_queries(self) -> dict[str, int]:
+        """
+        Return the SQL statements that ran suspiciously often.
+
+        Returns
+        -------
+        dict[str, int]
+            The parametrized SQL of statements that ran at least
+            ``METRICS_REPEATED_QUERY_THRESHOLD`` times and how often they ran.
+        """
+        threshold = custom_settings.METRICS_REPEATED_QUERY_THRESHOLD
+        return {sql: n for sql, n in self.shapes.items() if n >= threshold}
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar(
+    "request_stats", default=None
+)
+
+
+def _record_query(
+    execute: Callable[..., Any],
+    sql: str,
+    params: Any,
+    many: bool,
+    context: dict[str, Any],
+) -> Any:
+    """
+    Time a query and count its parametrized SQL as a database execute wrapper.
+
+    Parameters
+    ----------
+    execute : Callable[..., Any]
+        The next wrapper or the execution of the query.
+
+    sql : str
+        The SQL of the query with placeholders for its parameters.
+
+    params : Any
+        The parameters of the query.
+
+    many : bool
+        Whether the query is run with ``executemany``.
+
+    context : dict[str, Any]
+        The connection and cursor of the query.
+
+    Returns
+    -------
+    Any
+        The result of the execution.
+    """
+    stats = _request_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+
+    finally:
+        stats.db_seconds += time.perf_counter() - started
+        stats.queries += 1
+        stats.shapes[sql] += 1
+
+
+def _timed_data(data: property) -> property:
+    """
+    Wrap the ``data`` property of a serializer class to time serialization.
+
+    Parameters
+    ----------
+    data : property
+        The original property.
+
+    Returns
+    -------
+    property
+        A property that adds the time of outermost serializers to the request.
+    """
+    fget = data.fget
+    assert fget is not None
+
+    def timed(self: Any) -> Any:
+        """
+        Return the data of a serializer and time it if it's the outermost one.
+
+        Parameters
+        ----------
+        self : Any
+            The serializer.
+
+        Returns
+        -------
+        Any
+            The serialized data.
+        """
+        stats = _request_stats.get()
+        if stats is None or stats.serializing:
+            return fget(self)
+
+        stats.serializing = True
+        started = time.perf_counter()
+        try:
+            return fget(self)
+
+        finally:
+            stats.serializer_seconds += time.perf_counter() - started
+            stats.serializing = False
+
+    return property(timed)
+
+
+def instrument_serializers() -> None:
+    """
+    Time the serialization of responses if metrics are enabled.
+
+    Notes
+    -----
+    Views serialize through ``serializer.data``, while nested serializers are
+    rendered through ``to_representation``, so only outermost serializers are
+    timed.
+    """
+    if not settings.METRICS_ENABLED:
+        return
+
+    for serializer_class in (serializers.Serializer, serializers.ListSerializer):
+        setattr(serializer_class, "data", _timed_data(vars(serializer_class)["data"]))
+
+
+# MARK: Registry
+
+
+def format_labels(**labels: str) -> str:
+    """
+    Format the labels of a sample in the Prometheus text format.
+
+    Parameters
+    ----------
+    **labels : str
+        The names and values of the labels.
+
+    Returns
+    -------
+    str
+        The labels in braces with escaped values.
+    """
+    escaped = (
+        f'{k}="{v.replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for k, v in labels.items()
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+class MetricsRegistry:
+    """
+    The metrics of all requests handled by the process.
+    """
+
+    def __init__(self) -> None:
+        """
+        Create a registry without metrics or collectors.
+        """
+        self._lock = threading.Lock()
+        self.collectors: list[Callable[[], list[str]]] = []
+        self.reset()
+
+    def add_collector(self, collector: Callable[[], list[str]]) -> None:
+        """
+        Add a function that renders metrics that are read when scraped.
+
+        Parameters
+        ----------
+        collector : Callable[[], list[str]]
+            Returns lines in the Prometheus text format.
+        """
+        if collector not in self.collectors:
+            self.collectors.append(collector)
+
+    def reset(self) -> None:
+        """
+        Drop the metrics of all requests recorded so far.
+        """
+        with self._lock:
+            self.requests: Counter[tuple[str, str, str]] = Counter()
+            self.latency: defaultdict[tuple[str, str], Histogram] = defaultdict(
+                lambda: Histogram(custom_settings.METRICS_LATENCY_BUCKETS)
+            )
+            self.queries: defaultdict[tuple[str, str], Histogram] = defaultdict(
+                lambda: Histogram(custom_settings.METRICS_QUERY_COUNT_BUCKETS)
+            )
+            self.db_seconds: defaultdict[tuple[str, str], float] = defaultdict(float)
+            self.serializer_seconds: defaultdict[tuple[str, str], float] = defaultdict(
+                float
+            )
+            self.response_bytes: Counter[tuple[str, str]] = Counter()
+            self.repeated_queries: Counter[tuple[str, str]] = Counter()
+
+    def record(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        seconds: float,
+        stats: RequestStats,
+    ) -> None:
+        """
+        Add a handled request to the metrics of its route.
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method of the request.
+
+        route : str
+            The route pattern that handled the request.
+
+        status : int
+            The status code of the response.
+
+        seconds : float
+            The time it took to produce the response.
+
+        stats : RequestStats
+            The queries and serialization of the request.
+        """
+        key = (method, route)
+        with self._lock:
+            self.requests[(method, route, str(status))] += 1
+            self.latency[key].observe(seconds)
+            self.queries[key].observe(stats.queries)
+            self.db_seconds[key] += stats.db_seconds
+            self.serializer_seconds[key] += stats.serializer_seconds
+            if stats.repeated_queries():
+                self.repeated_queries[key] += 1
+
+    def add_response_bytes(self, method: str, route: str, size: int) -> None:
+        """
+        Add the size of a response body to the metrics of its route.
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method of the request.
+
+        route : str
+            The route pattern that handled the request.
+
+        size : int
+            The number of bytes of the body.
+        """
+        with self._lock:
+            self.response_bytes[(method, route)] += size
+
+    def render(self) -> str:
+        """
+        Render the metrics in the Prometheus text format.
+
+        Returns
+        -------
+        str
+            The exposition of all metrics.
+        """
+        lines: list[str] = []
+
+        def header(name: str, kind: str, description: str) -> None:
+            """
+            Add the help and type lines of a metric.
+
+            Parameters
+            ----------
+            name : str
+                The name of the metric.
+
+            kind : str
+                The Prometheus type of the metric.
+
+            description : str
+                The help text of the metric.
+            """
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def histograms(
+            name: str, description: str, values: dict[tuple[str, str], Histogram]
+        ) -> None:
+            """
+            Add the buckets, sum and count of histograms by route.
+
+            Parameters
+            ----------
+            name : str
+                The name of the metric.
+
+            description : str
+                The help text of the metric.
+
+            values : dict[tuple[str, str], Histogram]
+                The histograms by method and route.
+            """
+            header(name, "histogram", description)
+            for (method, route), histogram in sorted(values.items()):
+                for bound, count in histogram.cumulative():
+                    labels = format_labels(method=method, route=route, le=bound)
+                    lines.append(f"{name}_bucket{labels} {count}")
+
+                labels = format_labels(method=method, route=route)
+                lines.append(f"{name}_sum{labels} {histogram.sum}")
+                lines.append(f"{name}_count{labels} {histogram.count}")
+
+        def counters(
+            name: str, description: str, values: Mapping[tuple[str, str], float]
+        ) -> None:
+            """
+            Add the values of counters by route.
+
+            Parameters
+            ----------
+            name : str
+                The name of the metric.
+
+            description : str
+                The help text of the metric.
+
+            values : Mapping[tuple[str, str], float]
+                The values by method and route.
+            """
+            header(name, "counter", description)
+            for (method, route), value in sorted(values.items()):
+                lines.append(
+                    f"{name}{format_labels(method=method, route=route)} {value}"
+                )
+
+        with self._lock:
+            header(
+                "activist_http_requests_total", "counter", "Requests handled by route."
+            )
+            for (method, route, status), count in sorted(self.requests.items()):
+                labels = format_labels(method=method, route=route, status=status)
+                lines.append(f"activist_http_requests_total{labels} {count}")
+
+            histograms(
+                "activist_http_request_duration_seconds",
+                "Time to produce responses by route.",
+                self.latency,
+            )
+            histograms(
+                "activist_db_queries_per_request",
+                "SQL queries run per request by route.",
+                self.queries,
+            )
+            counters(
+                "activist_db_query_duration_seconds_total",
+                "Time spent running SQL queries by route.",
+                self.db_seconds,
+            )
+            counters(
+                "activist_serializer_duration_seconds_total",
+                "Time spent serializing responses by route.",
+                self.serializer_seconds,
+            )
+            counters(
+                "activist_http_response_bytes_total",
+                "Bytes of response bodies by route.",
+                self.response_bytes,
+            )
+            counters(
+                "activist_db_repeated_query_requests_total",
+                "Requests that ran the same SQL repeatedly, likely N+1 queries.",
+                self.repeated_queries,
+            )
+
+        for collector in self.collectors:
+            lines.extend(collector())
+
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+# MARK: Middleware
+
+
+class InstrumentationMiddleware:
+    """
+    Record the cost of every request in the metrics of its route.
+
+    Parameters
+    ----------
+    get_response : Callable[[HttpRequest], HttpResponseBase]
+        The next middleware or the view.
+
+    Raises
+    ------
+    MiddlewareNotUsed
+        If ``METRICS_ENABLED`` is off.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponseBase]) -> None:
+        """
+        Enable the middleware if metrics are enabled.
+
+        Parameters
+        ----------
+        get_response : Callable[[HttpRequest], HttpResponseBase]
+            The next middleware or the view.
+
+        Raises
+        ------
+        MiddlewareNotUsed
+            If ``METRICS_ENABLED`` is off.
+        """
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed()
+
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        """
+        Handle a request and record its cost.
+
+        Parameters
+        ----------
+        request : HttpRequest
+            The request to handle.
+
+        Returns
+        -------
+        HttpResponseBase
+            The response of the next middleware or the view.
+        """
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(_record_query))
+
+                response = self.get_response(request)
+
+        finally:
+            _request_stats.reset(token)
+
+        seconds = time.perf_counter() - started
+        match = request.resolver_match
+        route = match.route if match else UNMATCHED_ROUTE
+        method = request.method or ""
+        metrics.record(method, route, response.status_code, seconds, stats)
+
+        if repeated := stats.repeated_queries():
+            sql, count = max(repeated.items(), key=lambda item: item[1])
+            logger.warning(
+                f"Repeated query on {method} /{route}: ran {count} times: {sql[:300]}"
+            )
+
+        if response.streaming:
+            # Streamed bodies are counted as they are sent.
+            response.streaming_content = _count_bytes(  # type: ignore[attr-defined]
+                response.streaming_content,  # type: ignore[attr-defined]
+                method,
+                route,
+            )
+
+        else:
+            metrics.add_response_bytes(method, route, len(response.content))  # type: ignore[attr-defined]
+
+        return response
+
+
+def _count_bytes(content: Iterable[bytes], method: str, route: str) -> Iterator[bytes]:
+    """
+    Pass on the chunks of a streamed body and record its size once it was sent.
+
+    Parameters
+    ----------
+    content : Iterable[bytes]
+        The chunks of the body.
+
+    method : str
+        The HTTP method of the request.
+
+    route : str
+        The route pattern that handled the request.
+
+    Yields
+    ------
+    bytes
+        The chunks of the body.
+    """
+    size = 0
+    try:
+        for chunk in content:
+            size += len(chunk)
+            yield chunk
+
+    finally:
+        metrics.add_response_bytes(method, route, size)
+
+
+# MARK: Endpoint
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """
+    Expose the metrics of the process in the Prometheus text format.
+
+    Parameters
+    ----------
+    request : HttpRequest
+        The scrape request with the ``INTERNAL_METRICS_TOKEN`` in the
+        ``X-Internal-Token`` header or as a bearer token.
+
+    Returns
+    -------
+    HttpResponse
+        The metrics, or 403 if the token is missing or wrong.
+    """
+    expected = settings.INTERNAL_METRICS_TOKEN
+    provided = request.headers.get("X-Internal-Token") or request.headers.get(
+        "Authorization", ""
+    ).removeprefix("Bearer ")
+    if not expected or provided != expected:
+        return HttpResponse(status=403)
+
+    return HttpResponse(
+        metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -9,7 +9,6 @@ import logging
 from typing import Any
 
 from django.conf import settings
-from django.core.mail import send_mail
 from django.http import HttpRequest
 from django.utils.dateparse import parse_datetime
 from rest_framework import status
@@ -18,6 +17,8 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from core import custom_settings
+from core.mail import queue_email
 from core.serializers import SecurityEventEnvelopeSerializer
 
 logger = logging.getLogger(__name__)
@@ -65,19 +66,22 @@ class SecurityEventIngestView(APIView):
 
     def post(self, request: Request) -> Response:
         """
-        Handle a posted security event envelope.
+        Handle a posted security event envelope or a batch of envelopes.
 
         Parameters
         ----------
         request : Request
-            DRF Request containing the JSON security event envelope in its body.
+            DRF Request containing the JSON security event envelope, or a JSON
+            array of envelopes, in its body.
 
         Returns
         -------
         Response
             A DRF Response with an appropriate status code:
             403 if unauthorized, 400 on validation errors, and 204 on success
-            for supported event types.
+            for supported event types. Batches return 200 with the status and
+            detail of each envelope in ``results`` so that senders only retry
+            the envelopes that failed.
         """
         if not self._authenticate(request._request):
             return Response(
@@ -85,7 +89,36 @@ class SecurityEventIngestView(APIView):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        if not isinstance(request.data, dict):
+        if isinstance(request.data, list):
+            results = []
+            for body in request.data:
+                response = self._handle_envelope(body)
+                result: dict[str, Any] = {"status": response.status_code}
+                if response.data is not None:
+                    result.update(response.data)
+
+                results.append(result)
+
+            return Response({"results": results}, status=status.HTTP_200_OK)
+
+        return self._handle_envelope(request.data)
+
+    def _handle_envelope(self, body: Any) -> Response:
+        """
+        Validate a security event envelope and dispatch it by type.
+
+        Parameters
+        ----------
+        body : Any
+            The decoded JSON envelope.
+
+        Returns
+        -------
+        Response
+            A DRF Response with 400 on validation errors or the response of the
+            handler of the event type.
+        """
+        if not isinstance(body, dict):
             return Response(
                 {
                     "detail": "Invalid payload format for request. Expected a JSON object."
@@ -93,8 +126,6 @@ class SecurityEventIngestView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        body: dict[str, Any] = request.data
-
         event_type = body.get("type")
         occurred_at = body.get("occurred_at")
         source = body.get("source")
@@ -131,7 +162,7 @@ class SecurityEventIngestView(APIView):
         payload: dict[str, Any],
     ) -> Response:
         """
-        Handle a malware_quarantined event and send an operator alert email.
+        Handle a malware_quarantined event and queue an operator alert email.
 
         Parameters
         ----------
@@ -146,8 +177,8 @@ class SecurityEventIngestView(APIView):
         -------
         Response
             A DRF Response indicating the outcome: 400 if required fields are
-            missing, 500 if alert dispatch fails, and 204 when the alert email
-            is sent successfully.
+            missing, 500 if the alert can't be queued, and 204 when the alert
+            email is queued or an identical alert was queued recently.
         """
         filename = payload.get("filename")
         quarantine_id = payload.get("quarantine_id")
@@ -192,22 +223,23 @@ class SecurityEventIngestView(APIView):
 
         message = "\n".join(lines)
 
+        # Senders retry events, so identical alerts are only sent once per window.
         try:
-            send_mail(
-                subject=subject,
-                message=message,
+            queue_email(
                 from_email=from_email,
-                recipient_list=list(recipients),
-                fail_silently=False,
+                to=list(recipients),
+                subject=subject,
+                body=message,
+                dedup_window=custom_settings.SECURITY_ALERT_DEDUP_WINDOW,
             )
         except Exception as exc:
-            logger.error(f"Failed to send malware_quarantined alert email: {exc}")
+            logger.error(f"Failed to queue malware_quarantined alert email: {exc}")
             return Response(
                 {"detail": "Failed to dispatch security alert."},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
         logger.info(
-            f"Dispatched malware_quarantined alert email for filename={filename} quarantine_id={quarantine_id}"
+            f"Queued malware_quarantined alert email for filename={filename} quarantine_id={quarantine_id}"
         )
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,264 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Queue emails in the database and deliver them in batches from the task worker.
+
+``queue_email`` stores an ``OutboundEmail`` and schedules the ``deliver_emails``
+task, which runs at most once every ``EMAIL_BATCH_DELAY`` seconds on backends that
+can defer tasks so that messages that are queued close together are delivered
+together. Without a task worker the emails are delivered within the request that
+queued them. Deliveries drain the due messages in batches of ``EMAIL_BATCH_SIZE`` over
+a single connection to the mail server instead of connecting once per message.
+
+Messages that fail to send are retried after ``EMAIL_RETRY_DELAY`` seconds, with
+the delay doubling on every attempt, and are kept with the status ``failed`` after
+``EMAIL_MAX_ATTEMPTS`` attempts.
+"""
+
+import hashlib
+import json
+import logging
+import math
+from datetime import UTC, datetime, timedelta
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from core import custom_settings
+from core.models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+DELIVERY_KEY = "email-delivery"
+DEDUP_KEY_PREFIX = "email-dedup"
+
+# MARK: Queue
+
+
+def _get_mail_cache() -> BaseCache:
+    """
+    Return the cache that dropped duplicates and scheduled deliveries are kept in.
+
+    Returns
+    -------
+    BaseCache
+        The mail cache.
+    """
+    return caches[settings.MAIL_CACHE_ALIAS]
+
+
+def queue_email(
+    from_email: str,
+    to: list[str],
+    subject: str,
+    body: str,
+    cc: list[str] | None = None,
+    html: bool = False,
+    dedup_window: int | None = None,
+) -> OutboundEmail | None:
+    """
+    Queue an email and schedule its delivery.
+
+    Parameters
+    ----------
+    from_email : str
+        The email address of the sender.
+
+    to : list[str]
+        The email addresses of the recipients.
+
+    subject : str
+        The subject of the email.
+
+    body : str
+        The body of the email.
+
+    cc : list[str] | None, default=None
+        The email addresses of the CC recipients.
+
+    html : bool, default=False
+        Whether the body is HTML rather than plain text.
+
+    dedup_window : int | None, default=None
+        The number of seconds during which identical emails are dropped.
+
+    Returns
+    -------
+    OutboundEmail | None
+        The queued email, or None if an identical email was queued within the
+        ``dedup_window``.
+    """
+    cc = cc or []
+    if dedup_window is not None:
+        content = json.dumps([from_email, to, cc, subject, body, html])
+        digest = hashlib.sha256(content.encode()).hexdigest()
+        if not _get_mail_cache().add(
+            f"{DEDUP_KEY_PREFIX}:{digest}", True, dedup_window
+        ):
+            logger.info(f"Dropped duplicate email '{subject}' to {', '.join(to)}")
+            return None
+
+    email = OutboundEmail.objects.create(
+        from_email=from_email, to=to, cc=cc, subject=subject, body=body, html=html
+    )
+    schedule_delivery()
+
+    return email
+
+
+def schedule_delivery(run_after: datetime | None = None) -> None:
+    """
+    Enqueue the ``deliver_emails`` task unless a delivery is already scheduled.
+
+    Parameters
+    ----------
+    run_after : datetime | None, default=None
+        The earliest time of the delivery, or None to deliver the emails that are
+        due now. Deliveries are rounded up to multiples of ``EMAIL_BATCH_DELAY``
+        seconds so that one delivery sends the emails that were queued close
+        together.
+
+    Notes
+    -----
+    Backends that can't defer tasks deliver right away and retry failed emails
+    when the next email is queued. The dummy backend never runs tasks, so the
+    emails are then delivered within the current request.
+    """
+    from core.tasks import deliver_emails, enqueue_or_call, runs_tasks
+
+    if (
+        not runs_tasks(deliver_emails)
+        or not deliver_emails.get_backend().supports_defer
+    ):
+        if run_after is None:
+            enqueue_or_call(deliver_emails)
+
+        return
+
+    delay = max(1, custom_settings.EMAIL_BATCH_DELAY)
+    timestamp = (run_after or timezone.now()).timestamp()
+    slot = math.ceil(timestamp / delay) * delay
+    timeout = slot - timezone.now().timestamp() + 1
+    if _get_mail_cache().add(f"{DELIVERY_KEY}:{slot}", True, max(1, timeout)):
+        deliver_emails.using(run_after=datetime.fromtimestamp(slot, tz=UTC)).enqueue()
+
+
+# MARK: Delivery
+
+
+def _record_failure(email: OutboundEmail, exc: Exception) -> None:
+    """
+    Schedule the retry of an email that failed to send, or give up on it.
+
+    Parameters
+    ----------
+    email : OutboundEmail
+        The email that failed to send.
+
+    exc : Exception
+        The error of the attempt.
+    """
+    email.attempts += 1
+    email.last_error = str(exc)
+    if email.attempts >= custom_settings.EMAIL_MAX_ATTEMPTS:
+        email.status = OutboundEmail.Status.FAILED
+        logger.error(
+            f"Gave up on email {email.id} after {email.attempts} attempts: {exc}"
+        )
+
+    else:
+        delay = custom_settings.EMAIL_RETRY_DELAY * 2 ** (email.attempts - 1)
+        email.next_attempt = timezone.now() + timedelta(seconds=delay)
+        logger.warning(f"Failed to send email {email.id}, retrying in {delay}s: {exc}")
+
+
+def _send_batch(batch: list[OutboundEmail]) -> int:
+    """
+    Send a batch of emails over one connection to the mail server.
+
+    Parameters
+    ----------
+    batch : list[OutboundEmail]
+        The emails to send.
+
+    Returns
+    -------
+    int
+        The number of sent emails.
+    """
+    connection = get_connection()
+    sent: list[int] = []
+    failed: list[OutboundEmail] = []
+    try:
+        for email in batch:
+            message = EmailMessage(
+                subject=email.subject,
+                body=email.body,
+                from_email=email.from_email,
+                to=email.to,
+                cc=email.cc,
+                connection=connection,
+            )
+            if email.html:
+                message.content_subtype = "html"
+
+            try:
+                # Opens the connection for the first email and after failures.
+                connection.open()
+                message.send()
+
+            except Exception as exc:
+                _record_failure(email, exc)
+                failed.append(email)
+                connection.close()
+
+            else:
+                sent.append(email.id)
+
+    finally:
+        connection.close()
+
+    OutboundEmail.objects.filter(id__in=sent).delete()
+    OutboundEmail.objects.bulk_update(
+        failed, ["status", "attempts", "last_error", "next_attempt"]
+    )
+    return len(sent)
+
+
+def deliver_queued_emails() -> int:
+    """
+    Send the emails that are due in batches and schedule the retries.
+
+    Returns
+    -------
+    int
+        The number of sent emails.
+    """
+    sent = 0
+    while True:
+        # Concurrent deliveries skip the batches that are being sent.
+        with transaction.atomic():
+            batch = list(
+                OutboundEmail.objects.select_for_update(skip_locked=True)
+                .filter(
+                    status=OutboundEmail.Status.PENDING,
+                    next_attempt__lte=timezone.now(),
+                )
+                .order_by("next_attempt", "id")[: custom_settings.EMAIL_BATCH_SIZE]
+            )
+            if not batch:
+                break
+
+            sent += _send_batch(batch)
+
+    if retry := (
+        OutboundEmail.objects.filter(status=OutboundEmail.Status.PENDING)
+        .order_by("next_attempt")
+        .values_list("next_attempt", flat=True)
+        .first()
+    ):
+        schedule_delivery(run_after=retry)
+
+    return sent
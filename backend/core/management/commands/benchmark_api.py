@@ -0,0 +1,129 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Classes controlling the CLI command to benchmark the API against its budgets.
+"""
+
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import TypedDict, Unpack
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmark import (
+    BUDGETS_PATH,
+    SCENARIOS,
+    compare_budgets,
+    load_budgets,
+    run_benchmarks,
+    seed_benchmark_dataset,
+)
+
+# MARK: Utils and Types
+
+
+class Options(TypedDict):
+    """
+    Options available to the benchmark_api management CLI command.
+    """
+
+    runs: int
+    warmup: int
+    scenario: list[str] | None
+    budgets: str
+    latency_factor: float
+    skip_populate: bool
+
+
+class Command(BaseCommand):
+    """
+    The benchmark_api CLI command for measuring endpoints and checking their budgets.
+
+    Notes
+    -----
+    The command replaces the data of the database with the benchmark dataset unless
+    ``--skip-populate`` is passed, so only run it against a disposable database.
+    """
+
+    help = "Benchmark the main API endpoints and fail if they exceed their budgets"
+
+    # MARK: Arguments
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """
+        Add arguments into the parser.
+
+        Parameters
+        ----------
+        parser : ArgumentParser
+            A parser for passing CLI arguments to the command.
+        """
+        parser.add_argument("--runs", type=int, default=50)
+        parser.add_argument("--warmup", type=int, default=3)
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            choices=list(SCENARIOS),
+            help="Only run the given scenario, can be passed multiple times",
+        )
+        parser.add_argument("--budgets", type=str, default=str(BUDGETS_PATH))
+        parser.add_argument(
+            "--latency-factor",
+            type=float,
+            default=1.0,
+            help="Scale latency budgets, e.g. 2 on a machine that is twice as slow",
+        )
+        parser.add_argument(
+            "--skip-populate",
+            action="store_true",
+            help="Reuse the benchmark dataset of an earlier run",
+        )
+
+    # MARK: Handle
+
+    def handle(self, *args: str, **options: Unpack[Options]) -> None:
+        """
+        Handle arguments passed to the parser.
+
+        Parameters
+        ----------
+        *args : str
+            Optional string arguments.
+
+        **options : Unpack[Options]
+            Options that control the scenarios, runs and budgets.
+
+        Raises
+        ------
+        CommandError
+            If a scenario failed or exceeded its budget.
+        """
+        if not options["skip_populate"]:
+            self.stdout.write("Seeding the benchmark dataset...")
+            seed_benchmark_dataset()
+
+        results = run_benchmarks(
+            runs=options["runs"], warmup=options["warmup"], names=options["scenario"]
+        )
+
+        self.stdout.write(
+            f"\n{'scenario':<30}{'status':>7}{'p50 ms':>10}{'p95 ms':>10}"
+            f"{'p99 ms':>10}{'queries':>9}{'bytes':>10}"
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<30}{result['status']:>7}{result['p50_ms']:>10.2f}"
+                f"{result['p95_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+                f"{result['queries']:>9}{result['response_bytes']:>10}"
+            )
+
+        regressions = compare_budgets(
+            results,
+            load_budgets(Path(options["budgets"])),
+            latency_factor=options["latency_factor"],
+        )
+        if regressions:
+            raise CommandError(
+                "Benchmarks exceeded their budgets:\n" + "\n".join(regressions)
+            )
+
+        self.stdout.write(self.style.SUCCESS("\nAll benchmarks are within budget."))
@@ -0,0 +1,133 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Classes controlling the CLI command to compare new and pooled database connections.
+"""
+
+import statistics
+import time
+from argparse import ArgumentParser
+from collections.abc import Callable
+from typing import TypedDict, Unpack
+
+import psycopg
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from psycopg_pool import ConnectionPool
+
+# MARK: Utils and Types
+
+
+class Options(TypedDict):
+    """
+    Options available to the benchmark_db_connections management CLI command.
+    """
+
+    database: str
+    runs: int
+
+
+def _time_requests(request: Callable[[], None], runs: int) -> list[float]:
+    """
+    Time a simulated request a number of times.
+
+    Parameters
+    ----------
+    request : Callable[[], None]
+        Acquires a connection and runs a query as a request would.
+
+    runs : int
+        Number of requests.
+
+    Returns
+    -------
+    list[float]
+        The duration of each request in milliseconds.
+    """
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        request()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return timings
+
+
+class Command(BaseCommand):
+    """
+    The benchmark_db_connections CLI command for measuring the saving of pooling.
+
+    Notes
+    -----
+    Every simulated request runs ``SELECT 1``, once on a new connection as with
+    ``CONN_MAX_AGE = 0`` and once on a connection borrowed from a pool.
+    """
+
+    help = "Compare the latency of new and pooled database connections per request"
+
+    # MARK: Arguments
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """
+        Add arguments into the parser.
+
+        Parameters
+        ----------
+        parser : ArgumentParser
+            A parser for passing CLI arguments to the command.
+        """
+        parser.add_argument("--database", type=str, default="default")
+        parser.add_argument("--runs", type=int, default=200)
+
+    # MARK: Handle
+
+    def handle(self, *args: str, **options: Unpack[Options]) -> None:
+        """
+        Handle arguments passed to the parser.
+
+        Parameters
+        ----------
+        *args : str
+            Optional string arguments.
+
+        **options : Unpack[Options]
+            Options that control the database and number of requests.
+        """
+        connection = connections[options["database"]]
+        if connection.vendor != "postgresql":
+            raise CommandError(
+                "benchmark_db_connections requires a PostgreSQL database."
+            )
+
+        runs = options["runs"]
+        params = connection.get_connection_params()
+
+        def connect_request() -> None:
+            """
+            Run a query over a connection that is opened for it.
+            """
+            with psycopg.connect(**params) as conn:
+                conn.execute("SELECT 1")
+
+        with ConnectionPool(kwargs=params, min_size=1, max_size=1) as pool:
+
+            def pooled_request() -> None:
+                """
+                Run a query over a connection that is borrowed from the pool.
+                """
+                with pool.connection() as conn:
+                    conn.execute("SELECT 1")
+
+            cases = [
+                ("new connection", _time_requests(connect_request, runs)),
+                ("pooled connection", _time_requests(pooled_request, runs)),
+            ]
+
+        self.stdout.write(f"Requests: {runs}")
+        for label, timings in cases:
+            p95 = statistics.quantiles(timings, n=20)[-1] if runs > 1 else timings[0]
+            self.stdout.write(
+                f"{label}: p50 {statistics.median(timings):.2f} ms, p95 {p95:.2f} ms"
+            )
+
+        saving = statistics.median(cases[0][1]) - statistics.median(cases[1][1])
+        self.stdout.write(f"\nPooling saves {saving:.2f} ms per request at the median.")
@@ -0,0 +1,186 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Classes controlling the CLI command to compare search query plans with and without trigram indexes.
+"""
+
+import json
+from argparse import ArgumentParser
+from typing import Any, TypedDict, Unpack
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import QuerySet
+
+from communities.groups.filters import GroupFilter
+from communities.groups.models import Group
+from communities.organizations.filters import OrganizationFilter
+from communities.organizations.models import Organization
+from events.filters import EventFilters
+from events.models import Event
+
+# MARK: Utils and Types
+
+
+class Options(TypedDict):
+    """
+    Options available to the benchmark_search management CLI command.
+    """
+
+    term: str
+    runs: int
+
+
+def _collect_scans(plan: dict[str, Any]) -> list[str]:
+    """
+    Collect the scan nodes of a query plan.
+
+    Parameters
+    ----------
+    plan : dict[str, Any]
+        A node of a JSON query plan.
+
+    Returns
+    -------
+    list[str]
+        Descriptions of the scans in the plan, e.g. ``Seq Scan on events_event``.
+    """
+    scans = []
+    if "Scan" in plan["Node Type"]:
+        target = plan.get("Index Name") or plan.get("Relation Name", "")
+        scans.append(f"{plan['Node Type']} on {target}")
+
+    for child in plan.get("Plans", []):
+        scans.extend(_collect_scans(child))
+
+    return scans
+
+
+class Command(BaseCommand):
+    """
+    The benchmark_search CLI command for comparing sequential scan and trigram index plans.
+
+    Notes
+    -----
+    Planners prefer sequential scans on small tables, so run this against a database
+    populated via ``populate_db`` with a realistic number of users and entities.
+    """
+
+    help = "Compare search query plans with and without trigram indexes"
+
+    # MARK: Arguments
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """
+        Add arguments into the parser.
+
+        Parameters
+        ----------
+        parser : ArgumentParser
+            A parser for passing CLI arguments to the command.
+        """
+        parser.add_argument("--term", type=str, default="climate")
+        parser.add_argument("--runs", type=int, default=3)
+
+    # MARK: Explain
+
+    def _explain(
+        self, queryset: QuerySet[Any], use_indexes: bool, runs: int
+    ) -> tuple[float, list[str]]:
+        """
+        Run a queryset under EXPLAIN ANALYZE and return its fastest execution.
+
+        Parameters
+        ----------
+        queryset : QuerySet[Any]
+            The queryset to benchmark.
+
+        use_indexes : bool
+            Whether the planner may use index scans.
+
+        runs : int
+            Number of times the query is executed.
+
+        Returns
+        -------
+        tuple[float, list[str]]
+            The fastest execution time in milliseconds and the scans of its plan.
+        """
+        sql, params = queryset.query.sql_with_params()
+        timings = []
+        scans: list[str] = []
+        for _ in range(runs):
+            with transaction.atomic(), connection.cursor() as cursor:
+                if not use_indexes:
+                    cursor.execute("SET LOCAL enable_indexscan = off")
+                    cursor.execute("SET LOCAL enable_bitmapscan = off")
+
+                cursor.execute(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}", params)
+                result = cursor.fetchone()[0]
+
+            plan = (json.loads(result) if isinstance(result, str) else result)[0]
+            timings.append(plan["Execution Time"])
+            scans = _collect_scans(plan["Plan"])
+
+        return min(timings), scans
+
+    # MARK: Handle
+
+    def handle(self, *args: str, **options: Unpack[Options]) -> None:
+        """
+        Handle arguments passed to the parser.
+
+        Parameters
+        ----------
+        *args : str
+            Optional string arguments.
+
+        **options : Unpack[Options]
+            Options that control the search term and number of runs.
+        """
+        if connection.vendor != "postgresql":
+            raise CommandError("benchmark_search requires a PostgreSQL database.")
+
+        term = options["term"]
+        runs = options["runs"]
+        cases: list[tuple[str, QuerySet[Any]]] = [
+            (
+                "events ?name",
+                EventFilters({"name": term}, queryset=Event.objects.all()).qs,
+            ),
+            (
+                "events ?location",
+                EventFilters({"location": term}, queryset=Event.objects.all()).qs,
+            ),
+            ("events ?q", EventFilters({"q": term}, queryset=Event.objects.all()).qs),
+            (
+                "organizations ?name",
+                OrganizationFilter(
+                    {"name": term}, queryset=Organization.objects.all()
+                ).qs,
+            ),
+            (
+                "organizations ?city",
+                OrganizationFilter(
+                    {"city": term}, queryset=Organization.objects.all()
+                ).qs,
+            ),
+            (
+                "organizations ?q",
+                OrganizationFilter({"q": term}, queryset=Organization.objects.all()).qs,
+            ),
+            ("groups ?q", GroupFilter({"q": term}, queryset=Group.objects.all()).qs),
+        ]
+
+        self.stdout.write(
+            f"Events: {Event.objects.count()}, "
+            f"organizations: {Organization.objects.count()}, "
+            f"groups: {Group.objects.count()}"
+        )
+        for label, queryset in cases:
+            scan_ms, scan_plan = self._explain(queryset, use_indexes=False, runs=runs)
+            index_ms, index_plan = self._explain(queryset, use_indexes=True, runs=runs)
+            self.stdout.write(
+                f"\n{label}={term!r}: scan {scan_ms:.2f} ms, index {index_ms:.2f} ms"
+            )
+            self.stdout.write(f"  scan plan:  {', '.join(scan_plan)}")
+            self.stdout.write(f"  index plan: {', '.join(index_plan)}")
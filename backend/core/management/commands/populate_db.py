@@ -9,15 +9,16 @@ from argparse import ArgumentParser
 from typing import TypedDict, Unpack
 
 import yaml
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 
 from authentication.factories import UserFactory
 from authentication.models import UserModel
 from communities.groups.models import Group
 from communities.organizations.models import Organization
-from content.models import Topic
-from events.models import Event
+from content.models import Location, Topic
+from events.models import Event, EventTime
 
+from .populate_db_utils.populate_bulk import populate_bulk
 from .populate_db_utils.populate_org_events import create_org_events
 from .populate_db_utils.populate_org_group_event import create_group_events
 from .populate_db_utils.populate_org_groups import create_org_groups
@@ -40,6 +41,9 @@ class Options(TypedDict):
     faq_entries_per_entity: int
     yaml_data_to_assign: str
     skip_if_populated: bool
+    bulk: bool
+    seed: int
+    workers: int
 
 
 class Command(BaseCommand):
@@ -79,6 +83,23 @@ class Command(BaseCommand):
             action="store_true",
             help="Leave the database untouched if it already contains data, so restarts don't wipe local work",
         )
+        parser.add_argument(
+            "--bulk",
+            action="store_true",
+            help="Generate rows in memory and write them with bulk inserts to create load test datasets",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Seed of the data generated with --bulk",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of threads writing chunks of data in parallel with --bulk",
+        )
 
     def _skip_population_if_requested(self, skip_if_populated: bool) -> bool:
         """
@@ -142,6 +163,54 @@ class Command(BaseCommand):
 
         return []
 
+    def _write_totals(
+        self,
+        users: int,
+        orgs: int,
+        groups: int,
+        events: int,
+        social_links: int,
+        resources: int,
+        faq_entries: int,
+    ) -> None:
+        """
+        Write the number of entities and content created.
+
+        Parameters
+        ----------
+        users : int
+            The number of users created.
+
+        orgs : int
+            The number of organizations created.
+
+        groups : int
+            The number of groups created.
+
+        events : int
+            The number of events created.
+
+        social_links : int
+            The number of social links created.
+
+        resources : int
+            The number of resources created.
+
+        faq_entries : int
+            The number of FAQ entries created.
+        """
+        self.stdout.write(
+            self.style.ERROR(
+                f"Number of users created: {users}\n"
+                f"Number of organizations created: {orgs}\n"
+                f"Number of groups created: {groups}\n"
+                f"Number of events created: {events}\n"
+                f"Number of social links created: {social_links}\n"
+                f"Number of resources created: {resources}\n"
+                f"Number of FAQ entries created: {faq_entries}\n"
+            )
+        )
+
     def handle(self, *args: str, **options: Unpack[Options]) -> None:
         """
         Handle arguments passed to the parser.
@@ -167,6 +236,9 @@ class Command(BaseCommand):
         num_resources_per_entity = options["resources_per_entity"]
         num_faq_entries_per_entity = options["faq_entries_per_entity"]
 
+        if options.get("bulk", False) and options["yaml_data_to_assign"]:
+            raise CommandError("--bulk can't be combined with --yaml-data-to-assign.")
+
         # MARK: Load Data
 
         assigned_org_fields = self._load_assigned_org_fields(
@@ -180,6 +252,31 @@ class Command(BaseCommand):
         Organization.objects.all().delete()
         Group.objects.all().delete()
         Event.objects.all().delete()
+        # Locations and times are referenced by the deleted entities, not the reverse.
+        Location.objects.filter(
+            organization__isnull=True,
+            group__isnull=True,
+            event__isnull=True,
+            resource__isnull=True,
+        ).delete()
+        EventTime.objects.filter(event__isnull=True).delete()
+
+        # MARK: Bulk
+
+        if options.get("bulk", False):
+            totals = populate_bulk(
+                num_users=num_users,
+                num_orgs_per_user=num_orgs_per_user,
+                num_groups_per_org=num_groups_per_org,
+                num_events_per_org=num_events_per_org,
+                num_events_per_group=num_events_per_group,
+                num_resources_per_entity=num_resources_per_entity,
+                num_faq_entries_per_entity=num_faq_entries_per_entity,
+                seed=options.get("seed", 0),
+                workers=options.get("workers", 1),
+            )
+            self._write_totals(**totals)
+            return
 
         topics = Topic.objects.all()
 
@@ -309,16 +406,14 @@ class Command(BaseCommand):
                 + (num_orgs_per_user * num_groups_per_org * num_events_per_group)
             )
 
-            self.stdout.write(
-                self.style.ERROR(
-                    f"Number of users created: {num_users}\n"
-                    f"Number of organizations created: {n_orgs_created}\n"
-                    f"Number of groups created: {n_groups_created}\n"
-                    f"Number of events created: {n_events_created}\n"
-                    f"Number of social links created: {n_social_links}\n"
-                    f"Number of resources created: {n_resources}\n"
-                    f"Number of FAQ entries created: {n_faq_entries}\n"
-                )
+            self._write_totals(
+                users=num_users,
+                orgs=n_orgs_created,
+                groups=n_groups_created,
+                events=n_events_created,
+                social_links=n_social_links,
+                resources=n_resources,
+                faq_entries=n_faq_entries,
             )
 
         except TypeError as error:
@@ -0,0 +1,759 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Populate the database with large amounts of data using bulk inserts.
+
+Users are split into chunks that are generated in memory together with their
+organizations, groups, events and content. Each chunk is written in one transaction
+with a ``bulk_create`` per table, including the through tables of many-to-many
+relations. Chunks are seeded from the seed of the run and their index, so that a
+run creates the same rows regardless of the number of workers writing them.
+"""
+
+import datetime
+import random
+import uuid
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from django.contrib.auth.hashers import make_password
+from django.db import connections, models, router, transaction
+from django.utils import timezone
+
+from authentication.models import UserModel
+from communities.groups.models import (
+    Group,
+    GroupFaq,
+    GroupResource,
+    GroupSocialLink,
+    GroupText,
+)
+from communities.models import StatusType
+from communities.organizations.models import (
+    Organization,
+    OrganizationFaq,
+    OrganizationResource,
+    OrganizationSocialLink,
+    OrganizationText,
+)
+from content.models import Location, Resource, Topic
+from events.models import (
+    Event,
+    EventFaq,
+    EventResource,
+    EventSocialLink,
+    EventText,
+    EventTime,
+)
+
+from .populate_orgs import get_topic_label
+
+ModelT = TypeVar("ModelT", bound=models.Model)
+
+BULK_BATCH_SIZE = 2000
+BULK_USERS_PER_CHUNK = 100
+
+# Latitude, longitude, bounding box, display name, country code and city.
+LOCATIONS = [
+    (
+        "52.510885",
+        "13.3989367",
+        ["52.3382448", "52.6755087", "13.0883450", "13.7611609"],
+        "Berlin, Germany",
+        "DE",
+        "Berlin",
+    ),
+    (
+        "48.8534951",
+        "2.3483915",
+        ["48.8155755", "48.9021560", "2.2241220", "2.4697602"],
+        "Paris, Ile-de-France, Metropolitan France, France",
+        "FR",
+        "Paris",
+    ),
+    (
+        "38.8950368",
+        "-77.0365427",
+        ["38.7916303", "38.9959680", "-77.1197949", "-76.9093660"],
+        "Washington, District of Columbia, United States",
+        "US",
+        "Washington, D.C.",
+    ),
+    (
+        "55.625578",
+        "37.6063916",
+        ["55.1421745", "56.0212238", "36.8031012", "37.9674277"],
+        "Moscow, Central Federal District, Russia",
+        "RU",
+        "Moscow",
+    ),
+    (
+        "40.190632",
+        "116.412144",
+        ["39.1707096", "41.0595584", "115.4172086", "117.7371243"],
+        "Beijing, China",
+        "CN",
+        "Beijing",
+    ),
+]
+
+LOREM = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua enim ad minim veniam quis nostrud "
+    "exercitation ullamco laboris nisi aliquip ex ea commodo consequat"
+).split()
+
+# The key of each entity in its content models and the text, social link, FAQ and
+# resource models.
+CONTENT_MODELS: dict[type[models.Model], tuple[str, tuple[type[models.Model], ...]]] = {
+    Organization: (
+        "org",
+        (
+            OrganizationText,
+            OrganizationSocialLink,
+            OrganizationFaq,
+            OrganizationResource,
+        ),
+    ),
+    Group: ("group", (GroupText, GroupSocialLink, GroupFaq, GroupResource)),
+    Event: ("event", (EventText, EventSocialLink, EventFaq, EventResource)),
+}
+
+# The models counted in each of the totals that are reported.
+TOTALS: dict[str, tuple[type[models.Model], ...]] = {
+    "users": (UserModel,),
+    "orgs": (Organization,),
+    "groups": (Group,),
+    "events": (Event,),
+    "social_links": (OrganizationSocialLink, GroupSocialLink, EventSocialLink),
+    "resources": (OrganizationResource, GroupResource, EventResource),
+    "faq_entries": (OrganizationFaq, GroupFaq, EventFaq),
+}
+
+
+# MARK: Write
+
+
+def bulk_create_rows(
+    model: type[models.Model], objs: list[Any], batch_size: int, using: str
+) -> None:
+    """
+    Insert rows of a model in batches.
+
+    Parameters
+    ----------
+    model : type[models.Model]
+        The model of the rows.
+
+    objs : list[Any]
+        The unsaved instances of the model with their primary keys set.
+
+    batch_size : int
+        The maximum number of rows per insert statement.
+
+    using : str
+        The alias of the database to write to.
+
+    Notes
+    -----
+    ``bulk_create`` doesn't support multi-table inheritance, so the rows of the
+    parent table are created first and the rows of the child table are inserted
+    with the same primary keys, as ``Model.save()`` does for a single instance.
+    """
+    if not model._meta.parents:
+        model._base_manager.using(using).bulk_create(objs, batch_size=batch_size)
+        return
+
+    ((parent, link),) = model._meta.parents.items()
+    assert link is not None
+    parent._base_manager.using(using).bulk_create(
+        [
+            parent(**{f.attname: getattr(obj, f.attname) for f in parent._meta.fields})
+            for obj in objs
+        ],
+        batch_size=batch_size,
+    )
+
+    for obj in objs:
+        setattr(obj, link.attname, obj.id)
+
+    # The same internal insert that Model.save() uses for the table of each model.
+    fields = model._meta.local_concrete_fields
+    for start in range(0, len(objs), batch_size):
+        model._base_manager._insert(  # type: ignore[attr-defined]
+            objs[start : start + batch_size], fields=fields, using=using
+        )
+
+
+# MARK: Chunk
+
+
+class BulkChunk:
+    """
+    The rows of a range of users and the entities and content they created.
+
+    Parameters
+    ----------
+    seed : int
+        The seed of the run.
+
+    index : int
+        The index of the chunk within the run.
+
+    topics : list[Topic]
+        The topics that are assigned to users and their entities.
+
+    status : StatusType
+        The status of the generated organizations.
+
+    password : str
+        The password hash of the generated users.
+    """
+
+    def __init__(
+        self,
+        seed: int,
+        index: int,
+        topics: list[Topic],
+        status: StatusType,
+        password: str,
+    ) -> None:
+        """
+        Create an empty chunk with a random generator seeded by the run and index.
+
+        Parameters
+        ----------
+        seed : int
+            The seed of the run.
+
+        index : int
+            The index of the chunk within the run.
+
+        topics : list[Topic]
+            The topics that are assigned to users and their entities.
+
+        status : StatusType
+            The status of the generated organizations.
+
+        password : str
+            The password hash of the generated users.
+        """
+        self.rng = random.Random(f"{seed}:{index}")
+        self.topics = topics
+        self.status = status
+        self.password = password
+        self.now = timezone.now().replace(minute=0, second=0, microsecond=0)
+        # Entities are added before the rows that reference them, so tables are
+        # written in the order their models are first added.
+        self.rows: dict[type[models.Model], list[Any]] = defaultdict(list)
+
+    # MARK: Rows
+
+    def new_id(self) -> uuid.UUID:
+        """
+        Return a UUID that is reproducible for the seed of the run.
+
+        Returns
+        -------
+        uuid.UUID
+            A version 4 UUID drawn from the random generator of the chunk.
+        """
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def text(self, n_words: int) -> str:
+        """
+        Return a sentence of placeholder words.
+
+        Parameters
+        ----------
+        n_words : int
+            The number of words of the sentence.
+
+        Returns
+        -------
+        str
+            The capitalized sentence ending with a period.
+        """
+        return " ".join(self.rng.choices(LOREM, k=n_words)).capitalize() + "."
+
+    def add(self, obj: ModelT) -> ModelT:
+        """
+        Add an unsaved instance to the rows that the chunk writes.
+
+        Parameters
+        ----------
+        obj : ModelT
+            The instance to write.
+
+        Returns
+        -------
+        ModelT
+            The instance, so that it can be referenced by later rows.
+        """
+        self.rows[type(obj)].append(obj)
+        return obj
+
+    def link(self, relation: Any, source: models.Model, target: models.Model) -> None:
+        """
+        Add a row to the through table of a many-to-many relation.
+
+        Parameters
+        ----------
+        relation : Any
+            The many-to-many descriptor, e.g. ``Event.orgs``.
+
+        source : models.Model
+            The instance of the model that defines the relation.
+
+        target : models.Model
+            The related instance.
+        """
+        field = relation.field
+        self.add(
+            field.remote_field.through(
+                **{
+                    field.m2m_field_name(): source,
+                    field.m2m_reverse_field_name(): target,
+                }
+            )
+        )
+
+    def location(self) -> Location:
+        """
+        Add a location picked from the sample locations.
+
+        Returns
+        -------
+        Location
+            The added location.
+        """
+        lat, lon, bbox, address_or_name, country_code, city = self.rng.choice(LOCATIONS)
+        return self.add(
+            Location(
+                id=self.new_id(),
+                lat=lat,
+                lon=lon,
+                bbox=bbox,
+                address_or_name=address_or_name,
+                country_code=country_code,
+                city=city,
+            )
+        )
+
+    def content(
+        self,
+        entity: models.Model,
+        user: UserModel,
+        topic: Topic | None,
+        num_faq_entries: int,
+        num_resources: int,
+    ) -> None:
+        """
+        Add the text, social links, FAQ entries and resources of an entity.
+
+        Parameters
+        ----------
+        entity : models.Model
+            The organization, group or event.
+
+        user : UserModel
+            The user that created the entity.
+
+        topic : Topic | None
+            The topic of the resources.
+
+        num_faq_entries : int
+            The number of FAQ entries of the entity.
+
+        num_resources : int
+            The number of resources of the entity.
+        """
+        key, (text_model, link_model, faq_model, resource_model) = CONTENT_MODELS[
+            type(entity)
+        ]
+        self.add(
+            text_model(
+                id=self.new_id(),
+                iso="en",
+                primary=True,
+                description=self.text(60),
+                get_involved=self.text(20),
+                get_involved_url="https://activist.org/",
+                **{key: entity},
+            )
+        )
+
+        for s in range(3):
+            self.add(
+                link_model(
+                    id=self.new_id(),
+                    link="https://www.activist.org",
+                    label=f"Social Link {s}",
+                    order=s,
+                    **{key: entity},
+                )
+            )
+
+        for i in range(num_faq_entries):
+            self.add(
+                faq_model(
+                    id=self.new_id(),
+                    iso="en",
+                    primary=i == 0,
+                    question=self.text(8),
+                    answer=self.text(30),
+                    order=i,
+                    **{key: entity},
+                )
+            )
+
+        for i in range(num_resources):
+            resource = self.add(
+                resource_model(
+                    id=self.new_id(),
+                    created_by=user,
+                    name=self.text(4),
+                    description=self.text(30),
+                    url="https://www.activist.org",
+                    order=i,
+                    is_private=False,
+                    terms_checked=True,
+                    **{key: entity},
+                )
+            )
+            if topic is not None:
+                self.link(Resource.topics, resource, topic)
+
+    # MARK: Entities
+
+    def event(
+        self,
+        user: UserModel,
+        topic: Topic | None,
+        org: Organization,
+        group: Group | None,
+    ) -> Event:
+        """
+        Add an event with a time for an organization and optionally a group.
+
+        Parameters
+        ----------
+        user : UserModel
+            The user that created the event.
+
+        topic : Topic | None
+            The topic of the event.
+
+        org : Organization
+            The organization of the event.
+
+        group : Group | None
+            The group of the event, if any.
+
+        Returns
+        -------
+        Event
+            The event.
+        """
+        topic_name = get_topic_label(topic) if topic is not None else "Activism"
+        event_type = self.rng.choice(["learn", "action"])
+        location_type = self.rng.choice(["online", "physical"])
+        verb = "Learning about" if event_type == "learn" else "Fighting for"
+
+        # Mostly upcoming events with some in the past, between 8 AM and 8 PM.
+        start_time = self.now + datetime.timedelta(
+            days=self.rng.randint(-30, 90), hours=self.rng.randint(8, 20)
+        )
+        time = self.add(
+            EventTime(
+                id=self.new_id(),
+                start_time=start_time,
+                end_time=start_time + datetime.timedelta(hours=self.rng.randint(1, 8)),
+            )
+        )
+
+        event = self.add(
+            Event(
+                id=self.new_id(),
+                created_by=user,
+                name=f"{topic_name} Event",
+                tagline=f"{verb} {topic_name}",
+                type=event_type,
+                location_type=location_type,
+                online_location_link=(
+                    f"https://activist.org/test-online-event/{topic_name.lower()}"
+                    if location_type == "online"
+                    else None
+                ),
+                physical_location=(
+                    self.location() if location_type == "physical" else None
+                ),
+                terms_checked=True,
+                # Bulk inserts do not send the signals that keep the window current.
+                first_start=time.start_time,
+                last_end=time.end_time,
+                next_start=time.start_time if time.start_time >= self.now else None,
+            )
+        )
+
+        self.link(Event.orgs, event, org)
+        if group is not None:
+            self.link(Event.groups, event, group)
+
+        self.link(Event.times, event, time)
+        if topic is not None:
+            self.link(Event.topics, event, topic)
+
+        return event
+
+    def populate(
+        self,
+        user_indexes: range,
+        num_orgs_per_user: int,
+        num_groups_per_org: int,
+        num_events_per_org: int,
+        num_events_per_group: int,
+        num_resources_per_entity: int,
+        num_faq_entries_per_entity: int,
+    ) -> None:
+        """
+        Generate the rows of users and everything they created.
+
+        Parameters
+        ----------
+        user_indexes : range
+            The indexes of the users of the chunk within the run.
+
+        num_orgs_per_user : int
+            The number of organizations created by each user.
+
+        num_groups_per_org : int
+            The number of groups of each organization.
+
+        num_events_per_org : int
+            The number of events of each organization.
+
+        num_events_per_group : int
+            The number of events of each group.
+
+        num_resources_per_entity : int
+            The number of resources of each entity.
+
+        num_faq_entries_per_entity : int
+            The number of FAQ entries of each entity.
+        """
+        content = {
+            "num_faq_entries": num_faq_entries_per_entity,
+            "num_resources": num_resources_per_entity,
+        }
+
+        for u in user_indexes:
+            user = self.add(
+                UserModel(
+                    id=self.new_id(),
+                    username=f"activist_{u}",
+                    name=f"Activist {u}",
+                    email=f"activist_{u}@activist.org",
+                    password=self.password,
+                    # Confirm activist_0 for testing purposes.
+                    is_confirmed=u == 0,
+                )
+            )
+            topic = self.rng.choice(self.topics) if self.topics else None
+            topic_name = get_topic_label(topic) if topic is not None else "Activism"
+            if topic is not None:
+                self.link(UserModel.topics, user, topic)
+
+            for o in range(num_orgs_per_user):
+                org = self.add(
+                    Organization(
+                        id=self.new_id(),
+                        created_by=user,
+                        name=f"organization_{user.username}_o{o}",
+                        tagline=f"Fighting for {topic_name.lower()}",
+                        location=self.location(),
+                        status=self.status,
+                        terms_checked=True,
+                        acceptance_date=self.now,
+                    )
+                )
+                if topic is not None:
+                    self.link(Organization.topics, org, topic)
+
+                self.content(org, user, topic, **content)
+
+                for _ in range(num_events_per_org):
+                    event = self.event(user, topic, org, None)
+                    self.content(event, user, topic, **content)
+
+                for g in range(num_groups_per_org):
+                    group = self.add(
+                        Group(
+                            id=self.new_id(),
+                            org=org,
+                            created_by=user,
+                            name=f"{org.name}:g{g}",
+                            tagline=f"Fighting for {topic_name.lower()}",
+                            location=self.location(),
+                            category=self.rng.choice(LOREM),
+                            terms_checked=True,
+                        )
+                    )
+                    if topic is not None:
+                        self.link(Group.topics, group, topic)
+
+                    self.content(group, user, topic, **content)
+
+                    for _ in range(num_events_per_group):
+                        event = self.event(user, topic, org, group)
+                        self.content(event, user, topic, **content)
+
+    def write(self, batch_size: int) -> Counter[str]:
+        """
+        Insert the rows of the chunk in one transaction.
+
+        Parameters
+        ----------
+        batch_size : int
+            The maximum number of rows per insert statement.
+
+        Returns
+        -------
+        Counter[str]
+            The number of rows created for each of the reported totals.
+        """
+        using = router.db_for_write(Event)
+        with transaction.atomic(using=using):
+            # Through tables reference rows of several models, so they come last.
+            for model in sorted(self.rows, key=lambda m: bool(m._meta.auto_created)):
+                bulk_create_rows(model, self.rows[model], batch_size, using)
+
+        return Counter(
+            {
+                name: sum(len(self.rows[model]) for model in counted)
+                for name, counted in TOTALS.items()
+            }
+        )
+
+
+# MARK: Populate
+
+
+def populate_bulk(
+    *,
+    num_users: int,
+    num_orgs_per_user: int,
+    num_groups_per_org: int,
+    num_events_per_org: int,
+    num_events_per_group: int,
+    num_resources_per_entity: int,
+    num_faq_entries_per_entity: int,
+    seed: int = 0,
+    workers: int = 1,
+    batch_size: int = BULK_BATCH_SIZE,
+) -> Counter[str]:
+    """
+    Create users, their entities and content with bulk inserts.
+
+    Parameters
+    ----------
+    num_users : int
+        The number of users to create.
+
+    num_orgs_per_user : int
+        The number of organizations created by each user.
+
+    num_groups_per_org : int
+        The number of groups of each organization.
+
+    num_events_per_org : int
+        The number of events of each organization.
+
+    num_events_per_group : int
+        The number of events of each group.
+
+    num_resources_per_entity : int
+        The number of resources of each entity.
+
+    num_faq_entries_per_entity : int
+        The number of FAQ entries of each entity.
+
+    seed : int, default=0
+        The seed that the generated data is derived from.
+
+    workers : int, default=1
+        The number of threads that generate and write chunks in parallel, each with
+        its own database connection.
+
+    batch_size : int, default=BULK_BATCH_SIZE
+        The maximum number of rows per insert statement.
+
+    Returns
+    -------
+    Counter[str]
+        The number of users, orgs, groups, events, social links, resources and FAQ
+        entries created.
+    """
+    topics = list(Topic.objects.order_by("type"))
+    status, _ = StatusType.objects.get_or_create(name="Active")
+    # Hashing is deliberately slow, so all users share the hash of one password.
+    password = make_password("password")
+
+    def run(start: int) -> Counter[str]:
+        """
+        Generate and write the chunk that starts with a user.
+
+        Parameters
+        ----------
+        start : int
+            The index of the first user of the chunk.
+
+        Returns
+        -------
+        Counter[str]
+            The number of entities created for the chunk.
+        """
+        chunk = BulkChunk(seed, start // BULK_USERS_PER_CHUNK, topics, status, password)
+        chunk.populate(
+            range(start, min(start + BULK_USERS_PER_CHUNK, num_users)),
+            num_orgs_per_user=num_orgs_per_user,
+            num_groups_per_org=num_groups_per_org,
+            num_events_per_org=num_events_per_org,
+            num_events_per_group=num_events_per_group,
+            num_resources_per_entity=num_resources_per_entity,
+            num_faq_entries_per_entity=num_faq_entries_per_entity,
+        )
+        return chunk.write(batch_size)
+
+    def run_in_thread(start: int) -> Counter[str]:
+        """
+        Run a chunk in a worker thread and close the connections of the thread.
+
+        Parameters
+        ----------
+        start : int
+            The index of the first user of the chunk.
+
+        Returns
+        -------
+        Counter[str]
+            The number of entities created for the chunk.
+        """
+        try:
+            return run(start)
+
+        finally:
+            connections.close_all()
+
+    starts = range(0, num_users, BULK_USERS_PER_CHUNK)
+    totals: Counter[str] = Counter({name: 0 for name in TOTALS})
+    if workers <= 1:
+        for start in starts:
+            totals.update(run(start))
+
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for counts in pool.map(run_in_thread, starts):
+                totals.update(counts)
+
+    return totals
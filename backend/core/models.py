@@ -0,0 +1,77 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Models for the core app.
+"""
+
+from django.db import models
+from django.utils import timezone
+
+# MARK: Throttle Counter
+
+
+class ThrottleCounter(models.Model):
+    """
+    The request counts of a client in the current and previous throttle window.
+
+    Notes
+    -----
+    Rows are written by ``DatabaseThrottleBackend`` with a single upsert per
+    request and each client has one row that is reused across windows.
+    """
+
+    key = models.CharField(max_length=255, primary_key=True)
+    window_index = models.BigIntegerField()
+    count = models.PositiveIntegerField(default=0)
+    previous_count = models.PositiveIntegerField(default=0)
+    expires = models.FloatField(db_index=True)
+
+    def __str__(self) -> str:
+        return f"{self.key}: {self.count}"
+
+
+# MARK: Outbound Email
+
+
+class OutboundEmail(models.Model):
+    """
+    An email that is queued for delivery by the ``deliver_emails`` task.
+
+    Notes
+    -----
+    Messages that fail to send are retried with exponential backoff until
+    ``EMAIL_MAX_ATTEMPTS`` attempts were made. Sent messages are deleted.
+    """
+
+    class Status(models.TextChoices):
+        """
+        The delivery states of a queued email.
+        """
+
+        PENDING = "pending"
+        FAILED = "failed"
+
+    from_email = models.CharField(max_length=255)
+    to = models.JSONField(default=list)
+    cc = models.JSONField(default=list)
+    subject = models.CharField(max_length=998)
+    body = models.TextField()
+    html = models.BooleanField(default=False)
+    status = models.CharField(
+        max_length=16, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt = models.DateTimeField(default=timezone.now)
+    creation_date = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["next_attempt"],
+                condition=models.Q(status="pending"),
+                name="outbound_email_pending_idx",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.subject} to {', '.join(self.to)}"
@@ -3,16 +3,413 @@
 Provides classes for pagination control.
 """
 
+import hashlib
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections.abc import Sequence
+from datetime import date
+from typing import Any
+from uuid import UUID
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models import Q, QuerySet
 from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from rest_framework.views import APIView
 
 from core import custom_settings
 
 
+def _encode_value(value: Any) -> Any:
+    """
+    Convert an ordering value into a JSON compatible value.
+
+    Parameters
+    ----------
+    value : Any
+        The value of an ordering field of a row.
+
+    Returns
+    -------
+    Any
+        The value in a form that filters on the field accept.
+    """
+    if isinstance(value, UUID):
+        return str(value)
+
+    if isinstance(value, date):
+        return value.isoformat()
+
+    return value
+
+
 class CustomPagination(pagination.PageNumberPagination):
     """
     Class to provide custom pagination given page size parameters.
+
+    Notes
+    -----
+    Clients opt into keyset pagination with ``?pagination=cursor``. Pages are then
+    addressed by an opaque cursor that encodes the ordering values of the last row
+    of the previous page, so that deep pages are filtered by an indexed range
+    rather than skipped over with ``OFFSET``. The count is skipped in this mode
+    unless requested via ``?count=exact`` or ``?count=estimate``, the latter being
+    a count that is cached for ``PAGINATION_COUNT_CACHE_TTL`` seconds.
+
+    Querysets ordered by related lookups or expressions fall back to page numbers.
     """
 
     page_size = custom_settings.PAGINATION_PAGE_SIZE
     page_size_query_param = "page_size"
     max_page_size = custom_settings.PAGINATION_MAX_PAGE_SIZE
+
+    mode_query_param = "pagination"
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+
+    keyset = False
+    ordering: list[str]
+    count: int | None
+    next_url: str | None
+    previous_url: str | None
+
+    # MARK: Keyset
+
+    def _get_ordering(self, queryset: QuerySet[Any]) -> list[str] | None:
+        """
+        Return the ordering of a queryset with a unique tiebreaker.
+
+        Parameters
+        ----------
+        queryset : QuerySet[Any]
+            The queryset to paginate.
+
+        Returns
+        -------
+        list[str] | None
+            The ordering fields, or None if the ordering cannot be used as a key.
+        """
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+        if not all(
+            isinstance(field, str) and "__" not in field and field != "?"
+            for field in ordering
+        ):
+            return None
+
+        pk_names = {"pk", queryset.model._meta.pk.name}
+        if not ordering or ordering[-1].lstrip("-") not in pk_names:
+            ordering.append("pk")
+
+        return ordering
+
+    def _decode_cursor(self, request: Request) -> tuple[list[Any], bool] | None:
+        """
+        Decode the cursor of a request.
+
+        Parameters
+        ----------
+        request : Request
+            The current request.
+
+        Returns
+        -------
+        tuple[list[Any], bool] | None
+            The ordering values of the row to continue from and whether to page
+            backwards, or None for the first page.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode()))
+            return list(cursor["v"]), bool(cursor["r"])
+
+        except (TypeError, ValueError, KeyError):
+            raise NotFound("Invalid cursor.") from None
+
+    def _encode_cursor(self, row: Any, reverse: bool) -> str:
+        """
+        Encode a cursor that continues from a row.
+
+        Parameters
+        ----------
+        row : Any
+            The last row before the page that the cursor points to.
+
+        reverse : bool
+            Whether the cursor pages backwards.
+
+        Returns
+        -------
+        str
+            The opaque cursor.
+        """
+        values = [
+            _encode_value(getattr(row, field.lstrip("-"))) for field in self.ordering
+        ]
+        cursor = json.dumps({"v": values, "r": reverse}, separators=(",", ":"))
+
+        return urlsafe_b64encode(cursor.encode()).decode()
+
+    def _get_cursor_url(self, request: Request, row: Any, reverse: bool) -> str:
+        """
+        Return the URL of the current request with a cursor that continues from a row.
+
+        Parameters
+        ----------
+        request : Request
+            The current request.
+
+        row : Any
+            The last row before the page that the URL points to.
+
+        reverse : bool
+            Whether the cursor pages backwards.
+
+        Returns
+        -------
+        str
+            The absolute URL of the page.
+        """
+        url = request.build_absolute_uri()
+        url = remove_query_param(url, "page")
+
+        return replace_query_param(
+            url, self.cursor_query_param, self._encode_cursor(row, reverse)
+        )
+
+    def _seek(self, values: Sequence[Any], reverse: bool) -> Q:
+        """
+        Build the filter selecting the rows after the given ordering values.
+
+        Parameters
+        ----------
+        values : Sequence[Any]
+            The ordering values of the row to continue from.
+
+        reverse : bool
+            Whether to select the rows before the given values instead.
+
+        Returns
+        -------
+        Q
+            A filter of the form ``(a > x) OR (a = x AND b > y) OR ...``.
+        """
+        if len(values) != len(self.ordering):
+            raise NotFound("Invalid cursor.")
+
+        seek = Q()
+        equal: dict[str, Any] = {}
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip("-")
+            ascending = field.startswith("-") == reverse
+            lookup = f"{name}__gt" if ascending else f"{name}__lt"
+            seek |= Q(**equal, **{lookup: value})
+            equal[name] = value
+
+        return seek
+
+    def _get_count(self, queryset: QuerySet[Any], request: Request) -> int | None:
+        """
+        Return the count requested by the client in keyset mode.
+
+        Parameters
+        ----------
+        queryset : QuerySet[Any]
+            The filtered queryset before any cursor is applied.
+
+        request : Request
+            The current request.
+
+        Returns
+        -------
+        int | None
+            The exact or cached count, or None if no count was requested.
+        """
+        mode = request.query_params.get(self.count_query_param)
+        if mode == "exact":
+            return queryset.count()
+
+        if mode == "estimate":
+            query = str(queryset.query).encode()
+            key = f"pagination-count:{hashlib.sha256(query).hexdigest()}"
+            count: int | None = cache.get_or_set(
+                key, queryset.count, custom_settings.PAGINATION_COUNT_CACHE_TTL
+            )
+            return count
+
+        return None
+
+    def _paginate_keyset(
+        self, queryset: QuerySet[Any], request: Request, ordering: list[str]
+    ) -> list[Any]:
+        """
+        Return the page of a queryset that the cursor of a request points to.
+
+        Parameters
+        ----------
+        queryset : QuerySet[Any]
+            The queryset to paginate.
+
+        request : Request
+            The current request.
+
+        ordering : list[str]
+            The ordering fields of the queryset.
+
+        Returns
+        -------
+        list[Any]
+            The rows of the page.
+        """
+        self.ordering = ordering
+        self.count = self._get_count(queryset, request)
+
+        page_size = self.get_page_size(request) or self.page_size
+        cursor = self._decode_cursor(request)
+        reverse = cursor[1] if cursor else False
+
+        if cursor is not None:
+            try:
+                queryset = queryset.filter(self._seek(cursor[0], reverse))
+
+            except (ValidationError, ValueError):
+                # The values of the cursor don't fit the ordering fields.
+                raise NotFound("Invalid cursor.") from None
+
+        if reverse:
+            ordering = [
+                field[1:] if field.startswith("-") else f"-{field}"
+                for field in ordering
+            ]
+
+        rows = list(queryset.order_by(*ordering)[: page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+
+        has_next = cursor is not None if reverse else has_more
+        has_previous = has_more if reverse else cursor is not None
+        self.next_url = (
+            self._get_cursor_url(request, rows[-1], False)
+            if rows and has_next
+            else None
+        )
+        self.previous_url = (
+            self._get_cursor_url(request, rows[0], True)
+            if rows and has_previous
+            else None
+        )
+
+        return rows
+
+    # MARK: Pagination
+
+    def paginate_queryset(
+        self, queryset: Any, request: Request, view: APIView | None = None
+    ) -> list[Any] | None:
+        """
+        Paginate a queryset by keyset if the request asks for a cursor.
+
+        Parameters
+        ----------
+        queryset : Any
+            The queryset or sequence to paginate.
+
+        request : Request
+            The current request.
+
+        view : APIView | None, default=None
+            The view that is paginating.
+
+        Returns
+        -------
+        list[Any] | None
+            The rows of the page, or None if pagination is disabled.
+        """
+        self.keyset = False
+        wants_keyset = (
+            request.query_params.get(self.mode_query_param) == "cursor"
+            or self.cursor_query_param in request.query_params
+        )
+        if wants_keyset and isinstance(queryset, QuerySet):
+            if (ordering := self._get_ordering(queryset)) is not None:
+                self.keyset = True
+                return self._paginate_keyset(queryset, request, ordering)
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data: Any) -> Response:
+        """
+        Wrap the serialized rows of a page with its count and links.
+
+        Parameters
+        ----------
+        data : Any
+            The serialized rows of the page.
+
+        Returns
+        -------
+        Response
+            The paginated response.
+        """
+        if not self.keyset:
+            return super().get_paginated_response(data)
+
+        return Response(
+            {
+                "count": self.count,
+                "next": self.next_url,
+                "previous": self.previous_url,
+                "results": data,
+            }
+        )
+
+    def get_schema_operation_parameters(self, view: Any) -> list[dict[str, Any]]:
+        """
+        Describe the pagination query parameters for the API schema.
+
+        Parameters
+        ----------
+        view : Any
+            The view whose operation is described.
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            The page number parameters and the cursor pagination parameters.
+        """
+        parameters = super().get_schema_operation_parameters(view)
+        parameters.extend(
+            [
+                {
+                    "name": self.mode_query_param,
+                    "required": False,
+                    "in": "query",
+                    "description": "Set to 'cursor' to use keyset pagination.",
+                    "schema": {"type": "string", "enum": ["cursor"]},
+                },
+                {
+                    "name": self.cursor_query_param,
+                    "required": False,
+                    "in": "query",
+                    "description": "The pagination cursor value.",
+                    "schema": {"type": "string"},
+                },
+                {
+                    "name": self.count_query_param,
+                    "required": False,
+                    "in": "query",
+                    "description": "Include an exact or cached count with cursor pagination.",
+                    "schema": {"type": "string", "enum": ["exact", "estimate"]},
+                },
+            ]
+        )
+
+        return parameters
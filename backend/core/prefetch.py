@@ -0,0 +1,234 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Query planning for serializers with nested relations.
+
+The planner walks the fields of a serializer, maps each relational field onto the
+model relation it reads from and derives the ``select_related`` paths and
+``Prefetch`` objects needed so that serializing a queryset costs a constant number
+of queries regardless of how many rows are on the page.
+"""
+
+from functools import lru_cache
+from typing import Any, TypeVar
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.db.models import Prefetch, QuerySet
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField, RelatedField
+
+ModelT = TypeVar("ModelT", bound=models.Model)
+
+# Plans are trees: (select_related paths, [(prefetch path, model, sub-plan), ...]).
+PrefetchPlan = tuple[tuple[str, ...], tuple[tuple[str, Any, Any], ...]]
+
+
+def _get_relation(model: type[models.Model], source: str) -> Any | None:
+    """
+    Return the model relation a serializer field reads from, if any.
+
+    Parameters
+    ----------
+    model : type[models.Model]
+        The model the serializer is bound to.
+
+    source : str
+        The attribute name the field reads from.
+
+    Returns
+    -------
+    Any | None
+        The relational model field, or None if the source is not a relation.
+    """
+    try:
+        field = model._meta.get_field(source)
+
+    except FieldDoesNotExist:
+        return None
+
+    return field if field.is_relation else None
+
+
+def _plan_fields(
+    fields: Any, model: type[models.Model], max_depth: int
+) -> PrefetchPlan:
+    """
+    Build the plan for a set of bound serializer fields on a given model.
+
+    Parameters
+    ----------
+    fields : Any
+        The bound fields of the serializer being planned.
+
+    model : type[models.Model]
+        The model the serializer is bound to.
+
+    max_depth : int
+        Remaining nesting depth that the planner will descend into.
+
+    Returns
+    -------
+    PrefetchPlan
+        The select_related paths and prefetch tree for the fields.
+    """
+    select_related: list[str] = []
+    prefetches: list[tuple[str, Any, Any]] = []
+
+    for field in fields.values():
+        if field.write_only or field.source == "*" or len(field.source_attrs) != 1:
+            continue
+
+        source = field.source_attrs[0]
+        relation = _get_relation(model, source)
+        if relation is None:
+            continue
+
+        related_model = relation.related_model
+        nested = field.child if isinstance(field, serializers.ListSerializer) else field
+        if isinstance(nested, serializers.ModelSerializer) and max_depth > 0:
+            sub_plan = _plan_fields(nested.fields, related_model, max_depth - 1)
+
+        else:
+            sub_plan = ((), ())
+
+        if relation.many_to_many or relation.one_to_many:
+            if isinstance(
+                field, (serializers.ListSerializer, ManyRelatedField)
+            ) or isinstance(nested, serializers.ModelSerializer):
+                prefetches.append((source, related_model, sub_plan))
+
+            continue
+
+        # Primary key fields read the local ``<name>_id`` column without a query.
+        if isinstance(field, RelatedField) and not isinstance(
+            field, serializers.SlugRelatedField
+        ):
+            continue
+
+        sub_select, sub_prefetches = sub_plan
+        select_related.append(source)
+        select_related.extend(f"{source}__{path}" for path in sub_select)
+        prefetches.extend(
+            (f"{source}__{path}", sub_model, plan)
+            for path, sub_model, plan in sub_prefetches
+        )
+
+    return tuple(select_related), tuple(prefetches)
+
+
+@lru_cache(maxsize=256)
+def plan_prefetch(
+    serializer_class: type[serializers.ModelSerializer[Any]],
+    expand: frozenset[str] = frozenset(),
+    fields: frozenset[str] | None = None,
+    depth: int | None = None,
+    max_depth: int = 4,
+) -> PrefetchPlan:
+    """
+    Plan the related loads needed to serialize instances with a serializer.
+
+    Parameters
+    ----------
+    serializer_class : type[serializers.ModelSerializer[Any]]
+        The serializer whose nested fields should be inspected.
+
+    expand : frozenset[str], default=frozenset()
+        Relations that the serializer will render in their expanded form.
+
+    fields : frozenset[str] | None, default=None
+        Fields that the serializer will render, None for all fields.
+
+    depth : int | None, default=None
+        Depth of nested serializers that will be rendered, None for no limit.
+
+    max_depth : int, default=4
+        Maximum depth of nested serializers to descend into.
+
+    Returns
+    -------
+    PrefetchPlan
+        The select_related paths and prefetch tree for the serializer.
+
+    Notes
+    -----
+    Plans are cached per serializer class and projection as serializer fields are
+    static otherwise. The cache is bounded as projections come from clients.
+    """
+    model = serializer_class.Meta.model
+    serializer = serializer_class(
+        context={"expand": expand, "fields": fields, "depth": depth}
+    )
+
+    return _plan_fields(serializer.fields, model, max_depth)
+
+
+def _build_prefetches(plan: PrefetchPlan) -> list[Prefetch[Any]]:
+    """
+    Convert the prefetch tree of a plan into Prefetch objects.
+
+    Parameters
+    ----------
+    plan : PrefetchPlan
+        A plan as returned by ``plan_prefetch``.
+
+    Returns
+    -------
+    list[Prefetch[Any]]
+        Prefetch objects with querysets that load their own nested relations.
+    """
+    prefetches = []
+    for path, model, sub_plan in plan[1]:
+        queryset = model._default_manager.all()
+        sub_select, _ = sub_plan
+        if sub_select:
+            queryset = queryset.select_related(*sub_select)
+
+        if sub_prefetches := _build_prefetches(sub_plan):
+            queryset = queryset.prefetch_related(*sub_prefetches)
+
+        prefetches.append(Prefetch(path, queryset=queryset))
+
+    return prefetches
+
+
+def prefetch_for_serializer(
+    queryset: QuerySet[ModelT],
+    serializer_class: type[serializers.ModelSerializer[Any]],
+    expand: frozenset[str] = frozenset(),
+    fields: frozenset[str] | None = None,
+    depth: int | None = None,
+) -> QuerySet[ModelT]:
+    """
+    Apply the select_related and prefetch_related calls a serializer needs.
+
+    Parameters
+    ----------
+    queryset : QuerySet[ModelT]
+        The queryset that will be passed to the serializer.
+
+    serializer_class : type[serializers.ModelSerializer[Any]]
+        The serializer that will render the queryset.
+
+    expand : frozenset[str], default=frozenset()
+        Relations that the serializer will render in their expanded form.
+
+    fields : frozenset[str] | None, default=None
+        Fields that the serializer will render, None for all fields.
+
+    depth : int | None, default=None
+        Depth of nested serializers that will be rendered, None for no limit.
+
+    Returns
+    -------
+    QuerySet[ModelT]
+        The queryset with the planned related loads applied.
+    """
+    plan = plan_prefetch(serializer_class, expand, fields, depth)
+    select_related, _ = plan
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+
+    if prefetches := _build_prefetches(plan):
+        queryset = queryset.prefetch_related(*prefetches)
+
+    return queryset
@@ -0,0 +1,17 @@
+"""
+Response cache package. Re-export the public API.
+"""
+
+from core.response_cache.cache import (
+    build_cache_key,
+    cache_response,
+    get_response_cache,
+    invalidate_namespaces,
+)
+
+__all__ = [
+    "build_cache_key",
+    "cache_response",
+    "get_response_cache",
+    "invalidate_namespaces",
+]
@@ -0,0 +1,252 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Cache rendered responses of public read endpoints.
+
+Responses are stored in the cache configured under ``RESPONSE_CACHE_ALIAS``, which
+is a local-memory cache by default and Redis when ``REDIS_URL`` is set. Every
+cached view belongs to one or more namespaces (e.g. ``events``). Each namespace has
+a version number that is part of the cache key, so bumping the version invalidates
+every response in the namespace without having to enumerate keys.
+
+Versions are only bumped in the cache of the process that changed a model, so
+``RESPONSE_CACHE_ENABLED`` is only on when the cache is shared by all processes.
+Otherwise other processes would keep serving stale responses until they expire.
+"""
+
+import hashlib
+import logging
+from collections.abc import Callable, Iterable
+from functools import wraps
+from typing import Any, TypeVar, cast
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE_VERSION_PREFIX = "response-cache-version"
+
+ViewMethod = TypeVar("ViewMethod", bound=Callable[..., Any])
+
+
+def get_response_cache() -> BaseCache:
+    """
+    Return the cache backend used for responses.
+
+    Returns
+    -------
+    BaseCache
+        The cache configured under ``RESPONSE_CACHE_ALIAS``.
+    """
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def _get_namespace_versions(namespaces: Iterable[str]) -> list[int]:
+    """
+    Return the current version of each namespace.
+
+    Parameters
+    ----------
+    namespaces : Iterable[str]
+        The namespaces to look up.
+
+    Returns
+    -------
+    list[int]
+        The versions in the order of the given namespaces.
+    """
+    keys = [f"{NAMESPACE_VERSION_PREFIX}:{ns}" for ns in namespaces]
+    versions = get_response_cache().get_many(keys)
+
+    return [versions.get(key, 0) for key in keys]
+
+
+def invalidate_namespaces(namespaces: Iterable[str]) -> None:
+    """
+    Invalidate all cached responses of the given namespaces.
+
+    Parameters
+    ----------
+    namespaces : Iterable[str]
+        The namespaces whose cached responses are now stale.
+    """
+    response_cache = get_response_cache()
+    for ns in namespaces:
+        key = f"{NAMESPACE_VERSION_PREFIX}:{ns}"
+        try:
+            response_cache.incr(key)
+
+        except ValueError:
+            # The version is missing or was evicted, so start a new one.
+            response_cache.set(key, 1, timeout=None)
+
+
+def _get_auth_state(request: Request) -> str:
+    """
+    Describe the authentication state of a request for use in a cache key.
+
+    Parameters
+    ----------
+    request : Request
+        The authenticated DRF request.
+
+    Returns
+    -------
+    str
+        ``anon`` for anonymous requests, otherwise the id of the user.
+    """
+    user = request.user
+    if user is None or not user.is_authenticated:
+        return "anon"
+
+    return f"user:{user.pk}"
+
+
+def build_cache_key(request: Request, namespaces: Iterable[str]) -> str:
+    """
+    Build the cache key of a request.
+
+    Parameters
+    ----------
+    request : Request
+        The authenticated DRF request.
+
+    namespaces : Iterable[str]
+        The namespaces that the response belongs to.
+
+    Returns
+    -------
+    str
+        A key derived from the host, the path, the normalized query parameters,
+        the authentication state, the negotiated media type and namespace versions.
+
+    Notes
+    -----
+    The host is part of the key as responses contain absolute URLs, e.g. the links
+    to the next and previous pages of paginated lists.
+    """
+    namespaces = tuple(namespaces)
+    query = "&".join(
+        f"{param}={value}"
+        for param in sorted(request.query_params)
+        for value in sorted(request.query_params.getlist(param))
+    )
+    parts = [
+        request.get_host(),
+        request.path,
+        query,
+        _get_auth_state(request),
+        str(getattr(request, "accepted_media_type", "")),
+    ]
+    digest = hashlib.sha256("\n".join(parts).encode()).hexdigest()
+    versions = ".".join(
+        f"{ns}{version}"
+        for ns, version in zip(namespaces, _get_namespace_versions(namespaces))
+    )
+
+    return f"response:{versions}:{digest}"
+
+
+def cache_response(
+    ttl: int, namespaces: Iterable[str]
+) -> Callable[[ViewMethod], ViewMethod]:
+    """
+    Cache successful responses of a view method.
+
+    Parameters
+    ----------
+    ttl : int
+        Number of seconds a response stays cached.
+
+    namespaces : Iterable[str]
+        The namespaces whose invalidation should drop the cached response.
+
+    Returns
+    -------
+    Callable[[ViewMethod], ViewMethod]
+        A decorator for the ``get`` method of an API view.
+    """
+    namespaces = tuple(namespaces)
+
+    def decorator(view_method: ViewMethod) -> ViewMethod:
+        """
+        Wrap a view method so that its successful responses are cached.
+
+        Parameters
+        ----------
+        view_method : ViewMethod
+            The ``get`` method of an API view.
+
+        Returns
+        -------
+        ViewMethod
+            The view method that serves cached responses when there are any.
+        """
+
+        @wraps(view_method)
+        def wrapper(self: Any, request: Request, *args: Any, **kwargs: Any) -> Any:
+            """
+            Serve a cached response or cache the response of the view method.
+
+            Parameters
+            ----------
+            self : Any
+                The view instance.
+
+            request : Request
+                The authenticated DRF request.
+
+            *args : Any
+                Positional URL arguments of the view.
+
+            **kwargs : Any
+                Keyword URL arguments of the view.
+
+            Returns
+            -------
+            Any
+                The cached response with ``X-Cache: HIT``, or the response of the
+                view method with ``X-Cache: MISS`` if it is cached now.
+            """
+            if not settings.RESPONSE_CACHE_ENABLED:
+                return view_method(self, request, *args, **kwargs)
+
+            response_cache = get_response_cache()
+            key = build_cache_key(request, namespaces)
+            if (cached := response_cache.get(key)) is not None:
+                content, content_type = cached
+                response = HttpResponse(content, content_type=content_type)
+                response["X-Cache"] = "HIT"
+                return response
+
+            response = view_method(self, request, *args, **kwargs)
+            if (
+                isinstance(response, Response)
+                and response.status_code == status.HTTP_200_OK
+            ):
+
+                def store(rendered: Response) -> None:
+                    """
+                    Cache the content of a response once it is rendered.
+
+                    Parameters
+                    ----------
+                    rendered : Response
+                        The rendered response.
+                    """
+                    response_cache.set(
+                        key, (rendered.content, rendered["Content-Type"]), ttl
+                    )
+
+                response.add_post_render_callback(store)
+                response["X-Cache"] = "MISS"
+
+            return response
+
+        return cast(ViewMethod, wrapper)
+
+    return decorator
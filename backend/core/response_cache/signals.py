@@ -0,0 +1,71 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Invalidate cached responses when the models they render change.
+"""
+
+from typing import Any
+
+from django.apps import apps
+from django.db import models, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from core.response_cache.cache import invalidate_namespaces
+
+# Events, organizations and groups embed each other along with their content, so a
+# change to any model of these apps invalidates all three namespaces.
+COMMUNITY_APPS = ("communities", "content", "events")
+COMMUNITY_NAMESPACES = ("events", "organizations", "groups")
+TOPIC_NAMESPACES = ("topics", *COMMUNITY_NAMESPACES)
+
+
+def _invalidate(namespaces: tuple[str, ...]) -> None:
+    """
+    Invalidate namespaces now and again once the current transaction commits.
+
+    Parameters
+    ----------
+    namespaces : tuple[str, ...]
+        The namespaces to invalidate.
+
+    Notes
+    -----
+    The second invalidation drops responses that a concurrent request cached
+    between the write and the commit.
+    """
+    invalidate_namespaces(namespaces)
+    transaction.on_commit(lambda: invalidate_namespaces(namespaces))
+
+
+def invalidate_on_change(sender: type[models.Model], **kwargs: Any) -> None:
+    """
+    Invalidate the namespaces that render the changed model.
+
+    Parameters
+    ----------
+    sender : type[models.Model]
+        The model class (or through model for M2M changes) that was changed.
+
+    **kwargs : Any
+        Signal arguments.
+    """
+    if kwargs.get("raw") or kwargs.get("action", "post_").startswith("pre_"):
+        # Skip fixture loading and the pre-change half of M2M signals.
+        return
+
+    if sender._meta.label_lower == "content.topic":
+        _invalidate(TOPIC_NAMESPACES)
+
+    else:
+        _invalidate(COMMUNITY_NAMESPACES)
+
+
+def connect_invalidation_signals() -> None:
+    """
+    Connect the receivers that keep the response cache consistent with the models.
+    """
+    for label in COMMUNITY_APPS:
+        for model in apps.get_app_config(label).get_models(include_auto_created=True):
+            uid = f"response-cache-{model._meta.label_lower}"
+            post_save.connect(invalidate_on_change, sender=model, dispatch_uid=uid)
+            post_delete.connect(invalidate_on_change, sender=model, dispatch_uid=uid)
+            m2m_changed.connect(invalidate_on_change, sender=model, dispatch_uid=uid)
@@ -0,0 +1,123 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Trigram backed text search for events, organizations and groups.
+
+Name, tagline, location and primary text columns carry GIN indexes over
+``UPPER(column) gin_trgm_ops``. Postgres uses them for the ``UPPER(column) LIKE
+UPPER('%term%')`` queries that Django generates for ``icontains``, so the existing
+substring filters and the ranked ``?q=`` search avoid sequential scans.
+"""
+
+import operator
+from collections.abc import Sequence
+from functools import reduce
+from typing import Any, TypeVar, cast
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connections, models
+from django.db.models import Expression, Q, QuerySet, Value
+from django.db.models.functions import Coalesce, Upper
+
+ModelT = TypeVar("ModelT", bound=models.Model)
+
+
+def trigram_index(field: str, name: str) -> GinIndex:
+    """
+    Build a trigram GIN index that serves case insensitive substring lookups.
+
+    Parameters
+    ----------
+    field : str
+        The text field to index.
+
+    name : str
+        The name of the index.
+
+    Returns
+    -------
+    GinIndex
+        An index over ``UPPER(field)`` with the ``gin_trgm_ops`` operator class.
+    """
+    return GinIndex(OpClass(Upper(field), name="gin_trgm_ops"), name=name)
+
+
+def search_queryset(
+    queryset: QuerySet[ModelT],
+    query: str,
+    ranked_fields: Sequence[tuple[str, float]],
+    matched_fields: Sequence[tuple[str, dict[str, Any]]] = (),
+) -> QuerySet[ModelT]:
+    """
+    Filter a queryset to rows matching a search term, best matches first.
+
+    Parameters
+    ----------
+    queryset : QuerySet[ModelT]
+        The queryset to search.
+
+    query : str
+        The search term.
+
+    ranked_fields : Sequence[tuple[str, float]]
+        Single valued fields that are matched and contribute their trigram word
+        similarity with the given weight to the rank.
+
+    matched_fields : Sequence[tuple[str, dict[str, Any]]], default=()
+        Additional fields that are matched but not ranked, e.g. multi valued
+        relations, each with conditions that restrict the joined rows.
+
+    Returns
+    -------
+    QuerySet[ModelT]
+        The matching rows annotated with ``search_rank`` and ordered by it.
+    """
+    query = query.strip()
+    if not query:
+        return queryset
+
+    matches = Q()
+    for field, _ in ranked_fields:
+        matches |= Q(**{f"{field}__icontains": query})
+
+    for field, conditions in matched_fields:
+        matches |= Q(**conditions, **{f"{field}__icontains": query})
+
+    # Match in a subquery so that joins over multi valued relations don't
+    # duplicate rows of the outer query.
+    model = queryset.model
+    matching = model._default_manager.filter(matches).values("pk")
+
+    # word_similarity() is strict, so fields of missing relations (e.g. the
+    # location of online events) would otherwise turn the whole rank into NULL.
+    rank: Expression = reduce(
+        operator.add,
+        [
+            Coalesce(TrigramWordSimilarity(query, field), Value(0.0)) * Value(weight)
+            for field, weight in ranked_fields
+        ],
+    )
+
+    ranked = queryset.filter(pk__in=matching).annotate(search_rank=rank)
+
+    return cast("QuerySet[ModelT]", ranked.order_by("-search_rank", "pk"))
+
+
+def enable_trigram_extension(using: str = "default", **kwargs: Any) -> None:
+    """
+    Create the pg_trgm extension before migrations create trigram indexes.
+
+    Parameters
+    ----------
+    using : str, default="default"
+        The alias of the database being migrated.
+
+    **kwargs : Any
+        Further arguments of the pre_migrate signal.
+    """
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
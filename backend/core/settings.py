@@ -13,6 +13,7 @@ import os
 import sys
 from datetime import timedelta
 from pathlib import Path
+from typing import Any
 
 import django
 import django_stubs_ext
@@ -86,6 +87,8 @@ INSTALLED_APPS = [
 # MARK: Middleware
 
 MIDDLEWARE = [
+    "core.instrumentation.InstrumentationMiddleware",
+    "core.db_routing.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -128,7 +131,21 @@ TEMPLATES = [
 # MARK: Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
-DATABASES = {
+# Connections are pooled per process by psycopg. Without the pool, connections are
+# kept open for DATABASE_CONN_MAX_AGE seconds instead. Health checks drop broken
+# connections before they are handed to a request in both cases.
+DATABASE_POOL_ENABLED = os.getenv("DATABASE_POOL_ENABLED", "True") == "True"
+DATABASE_POOL_OPTIONS = {
+    "min_size": int(os.getenv("DATABASE_POOL_MIN_SIZE", "2")),
+    "max_size": int(os.getenv("DATABASE_POOL_MAX_SIZE", "10")),
+    # Seconds that a request waits for a free connection before failing.
+    "timeout": float(os.getenv("DATABASE_POOL_TIMEOUT", "10")),
+    # Seconds after which idle connections above min_size are closed.
+    "max_idle": float(os.getenv("DATABASE_POOL_MAX_IDLE", "300")),
+    "max_lifetime": float(os.getenv("DATABASE_POOL_MAX_LIFETIME", "3600")),
+}
+
+DATABASES: dict[str, dict[str, Any]] = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
         "NAME": DATABASE_NAME,
@@ -136,9 +153,38 @@ DATABASES = {
         "PASSWORD": DATABASE_PASSWORD,
         "HOST": DATABASE_HOST,
         "PORT": DATABASE_PORT,
+        "CONN_MAX_AGE": (
+            0
+            if DATABASE_POOL_ENABLED
+            else int(os.getenv("DATABASE_CONN_MAX_AGE", "60"))
+        ),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {"pool": DATABASE_POOL_OPTIONS} if DATABASE_POOL_ENABLED else {},
     },
 }
 
+# Read replicas as space separated host or host:port values. Safe requests read from
+# a healthy replica and clients that wrote read from the primary for a while, which
+# needs the shared cache of REDIS_URL.
+DATABASE_REPLICA_HOSTS = os.getenv("DATABASE_REPLICA_HOSTS", "").split()
+REPLICA_DATABASES = []
+for i, replica in enumerate(DATABASE_REPLICA_HOSTS, start=1):
+    replica_host, _, replica_port = replica.partition(":")
+    DATABASES[f"replica_{i}"] = {
+        **DATABASES["default"],
+        "HOST": replica_host,
+        "PORT": replica_port or DATABASE_PORT,
+        "TEST": {"MIRROR": "default"},
+    }
+    REPLICA_DATABASES.append(f"replica_{i}")
+
+DATABASE_ROUTERS = ["core.db_routing.ReplicaRouter"]
+DATABASE_REPLICA_PIN_SECONDS = int(os.getenv("DATABASE_REPLICA_PIN_SECONDS", "5"))
+DATABASE_REPLICA_MAX_LAG = float(os.getenv("DATABASE_REPLICA_MAX_LAG", "5"))
+DATABASE_REPLICA_CHECK_INTERVAL = float(
+    os.getenv("DATABASE_REPLICA_CHECK_INTERVAL", "5")
+)
+
 
 # MARK: Pass Validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -159,6 +205,10 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 AUTH_USER_MODEL = "authentication.UserModel"
+AUTHENTICATION_BACKENDS = [
+    "authentication.backends.LoadedUserBackend",
+    "django.contrib.auth.backends.ModelBackend",
+]
 
 # MARK: I18n
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
@@ -223,6 +273,77 @@ SECURITY_ALERT_RECIPIENTS = tuple(
 )
 SECURITY_ALERT_FROM_EMAIL = os.getenv("SECURITY_ALERT_FROM_EMAIL", EMAIL_HOST_USER)
 
+# MARK: Metrics
+
+# Per-request metrics exposed on /internal/metrics to scrapers with the token.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True") == "True"
+INTERNAL_METRICS_TOKEN = os.getenv("INTERNAL_METRICS_TOKEN")
+
+# MARK: Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# Caches are backed by Redis when REDIS_URL is set and by process memory otherwise.
+# Entries in process memory are only seen and invalidated by the process that wrote
+# them, so features that rely on invalidation only cache when the cache is shared.
+REDIS_URL = os.getenv("REDIS_URL")
+SHARED_CACHE = bool(REDIS_URL)
+RESPONSE_CACHE_ALIAS = "responses"
+RESPONSE_CACHE_ENABLED = (
+    os.getenv("RESPONSE_CACHE_ENABLED", "True") == "True" and SHARED_CACHE
+)
+THROTTLE_CACHE_ALIAS = "throttle"
+ROUTING_CACHE_ALIAS = "routing"
+PRINCIPAL_CACHE_ALIAS = "principals"
+AUTH_SESSION_CACHE_ALIAS = "auth_sessions"
+MAIL_CACHE_ALIAS = "mail"
+
+
+def _get_cache_config(alias: str) -> dict[str, str]:
+    """
+    Return the configuration of a cache that is shared when Redis is configured.
+
+    Parameters
+    ----------
+    alias : str
+        The alias of the cache, which separates its keys from other caches.
+
+    Returns
+    -------
+    dict[str, str]
+        The configuration of a Redis cache if ``REDIS_URL`` is set and of a local
+        memory cache otherwise.
+    """
+    if REDIS_URL:
+        return {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+            "KEY_PREFIX": f"activist-{alias}",
+        }
+
+    return {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": alias,
+    }
+
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    RESPONSE_CACHE_ALIAS: _get_cache_config(RESPONSE_CACHE_ALIAS),
+    THROTTLE_CACHE_ALIAS: _get_cache_config(THROTTLE_CACHE_ALIAS),
+    ROUTING_CACHE_ALIAS: _get_cache_config(ROUTING_CACHE_ALIAS),
+    PRINCIPAL_CACHE_ALIAS: _get_cache_config(PRINCIPAL_CACHE_ALIAS),
+    AUTH_SESSION_CACHE_ALIAS: _get_cache_config(AUTH_SESSION_CACHE_ALIAS),
+    MAIL_CACHE_ALIAS: _get_cache_config(MAIL_CACHE_ALIAS),
+}
+
+# MARK: Throttling
+
+# Request counts are kept in the throttle cache, which is shared between processes
+# when REDIS_URL is set. Installs without Redis can count in the database instead
+# with "core.throttling.DatabaseThrottleBackend".
+THROTTLE_BACKEND = os.getenv("THROTTLE_BACKEND", "core.throttling.CacheThrottleBackend")
+
 # MARK: REST Framework
 
 REST_FRAMEWORK = {
@@ -230,16 +351,16 @@ REST_FRAMEWORK = {
     "DEFAULT_THROTTLE_CLASSES": []
     if DEBUG
     else [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "core.throttling.AnonRateThrottle",
+        "core.throttling.UserRateThrottle",
     ],
-    "DEFAULT_THROTTLE_RATES": {"anon": "150/min", "user": "200/min"},
+    "DEFAULT_THROTTLE_RATES": {"anon": "150/min", "user": "200/min", "auth": "10/min"},
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "DEFAULT_PAGINATION_ORDERS_OBJECTS": False,
     "PAGE_SIZE": 20,
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "authentication.principal.CachedJWTAuthentication",
     ),
     "EXCEPTION_HANDLER": "core.exception_handler.bad_request_logger",
     "DEFAULT_RENDERER_CLASSES": (
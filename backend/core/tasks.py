@@ -0,0 +1,72 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Background tasks for delivering queued emails and a helper for enqueuing tasks.
+"""
+
+from __future__ import annotations
+
+from typing import Any, ParamSpec
+
+from django.tasks import Task, task
+from django.tasks.backends.dummy import DummyBackend
+
+from core.mail import deliver_queued_emails
+
+P = ParamSpec("P")
+
+
+@task
+def deliver_emails() -> int:
+    """
+    Send the queued emails that are due.
+
+    Returns
+    -------
+    int
+        The number of sent emails.
+    """
+    return deliver_queued_emails()
+
+
+def runs_tasks(task: Task[P, Any]) -> bool:
+    """
+    Return whether the backend of a task runs the tasks that are enqueued.
+
+    Parameters
+    ----------
+    task : Task[P, Any]
+        The task to check.
+
+    Returns
+    -------
+    bool
+        False for the dummy backend, which only records enqueued tasks.
+    """
+    return not isinstance(task.get_backend(), DummyBackend)
+
+
+def enqueue_or_call(task: Task[P, Any], *args: P.args, **kwargs: P.kwargs) -> None:
+    """
+    Enqueue a task, or run it right away if its backend never runs tasks.
+
+    Parameters
+    ----------
+    task : Task[P, Any]
+        The task to run.
+
+    *args : Any
+        Positional arguments of the task.
+
+    **kwargs : Any
+        Keyword arguments of the task.
+
+    Notes
+    -----
+    The dummy backend only records enqueued tasks, so work that requests rely on
+    (e.g. removing the metadata of uploads) would otherwise never happen.
+    """
+    if runs_tasks(task):
+        task.enqueue(*args, **kwargs)
+
+    else:
+        task.call(*args, **kwargs)
@@ -0,0 +1,111 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Tests for the API benchmarks and their budgets.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from rest_framework import status
+
+from communities.organizations.factories import OrganizationFactory
+from core.benchmark import (
+    compare_budgets,
+    load_budgets,
+    percentile,
+    run_benchmarks,
+    seed_benchmark_dataset,
+)
+from events.factories import EventFactory
+
+
+def test_benchmark_percentile() -> None:
+    values = [float(v) for v in range(1, 101)]
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([3.0], 99) == 3
+
+
+def test_benchmark_compare_budgets_reports_regressions() -> None:
+    result = {
+        "status": status.HTTP_200_OK,
+        "p50_ms": 5.0,
+        "p95_ms": 12.0,
+        "p99_ms": 20.0,
+        "queries": 4,
+        "response_bytes": 100,
+    }
+    budgets = {"topics": {"p95_ms": 10, "queries": 4, "response_bytes": 100}}
+
+    assert compare_budgets({"topics": result}, budgets) == [
+        "topics: p95_ms of 12 exceeds the budget of 10"
+    ]
+    assert compare_budgets({"topics": result}, budgets, latency_factor=2) == []
+    assert compare_budgets(
+        {"topics": {**result, "queries": 5}}, budgets, latency_factor=None
+    ) == ["topics: queries of 5 exceeds the budget of 4"]
+    assert compare_budgets(
+        {"events_list": {**result, "status": status.HTTP_500_INTERNAL_SERVER_ERROR}},
+        budgets,
+    ) == [
+        "events_list: failed with status 500",
+        "events_list: has no budget",
+    ]
+
+
+@pytest.mark.django_db
+def test_benchmark_run_records_metrics() -> None:
+    EventFactory(orgs=[OrganizationFactory()])
+
+    results = run_benchmarks(
+        runs=3, warmup=1, names=["topics", "event_calendar", "image_upload"]
+    )
+
+    assert set(results) == {"topics", "event_calendar", "image_upload"}
+    assert results["event_calendar"]["status"] == status.HTTP_200_OK
+    assert results["event_calendar"]["queries"] > 0
+    assert results["image_upload"]["status"] == status.HTTP_201_CREATED
+    for result in results.values():
+        assert 0 < result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"]
+        assert result["response_bytes"] > 0
+
+
+@pytest.mark.django_db
+def test_benchmark_api_command_fails_over_budget(tmp_path: Path) -> None:
+    budgets = tmp_path / "budgets.json"
+    budgets.write_text(json.dumps({"topics": {"queries": 0}}))
+
+    with pytest.raises(CommandError, match="topics: queries of 1 exceeds"):
+        call_command(
+            "benchmark_api",
+            runs=1,
+            warmup=0,
+            scenario=["topics"],
+            budgets=str(budgets),
+            skip_populate=True,
+        )
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_benchmark_api_within_budgets() -> None:
+    seed_benchmark_dataset()
+
+    results = run_benchmarks(runs=20)
+    # Latencies of shared CI runners vary too much for the budgets of a fixed machine.
+    factor = os.environ.get("BENCHMARK_LATENCY_FACTOR")
+
+    assert (
+        compare_budgets(
+            results,
+            load_budgets(),
+            latency_factor=float(factor) if factor else None,
+        )
+        == []
+    )
@@ -0,0 +1,154 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from communities.groups.factories import GroupFactory
+from communities.organizations.factories import OrganizationFactory
+from content.factories import TopicFactory
+from content.models import Topic
+from events.factories import EventFactory, EventTextFactory
+
+pytestmark = pytest.mark.django_db
+
+EVENTS_URL = "/v1/events/events"
+
+
+def test_conditional_detail_not_modified() -> None:
+    client = APIClient()
+    event = EventFactory()
+
+    response = client.get(f"{EVENTS_URL}/{event.id}")
+    etag = response["ETag"]
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(f"{EVENTS_URL}/{event.id}", HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response["ETag"] == etag
+    assert len(ctx.captured_queries) == 1
+
+
+def test_conditional_detail_if_modified_since() -> None:
+    client = APIClient()
+    event = EventFactory()
+
+    response = client.get(f"{EVENTS_URL}/{event.id}")
+    response = client.get(
+        f"{EVENTS_URL}/{event.id}",
+        HTTP_IF_MODIFIED_SINCE=response["Last-Modified"],
+    )
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+def test_conditional_detail_changes_with_children() -> None:
+    client = APIClient()
+    event = EventFactory()
+    etag = client.get(f"{EVENTS_URL}/{event.id}")["ETag"]
+
+    EventTextFactory(event=event)
+    response = client.get(f"{EVENTS_URL}/{event.id}", HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"] != etag
+
+
+def test_conditional_detail_changes_with_embedded_entities() -> None:
+    client = APIClient()
+    org = OrganizationFactory()
+    event = EventFactory(orgs=[org])
+    etag = client.get(f"{EVENTS_URL}/{event.id}")["ETag"]
+
+    org.tagline = "A new tagline"
+    org.save()
+    response = client.get(f"{EVENTS_URL}/{event.id}", HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_conditional_detail_changes_with_m2m() -> None:
+    client = APIClient()
+    event = EventFactory()
+    etag = client.get(f"{EVENTS_URL}/{event.id}")["ETag"]
+
+    event.groups.add(GroupFactory())
+    response = client.get(f"{EVENTS_URL}/{event.id}", HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_conditional_detail_varies_with_expand() -> None:
+    client = APIClient()
+    event = EventFactory()
+
+    compact = client.get(f"{EVENTS_URL}/{event.id}")
+    expanded = client.get(f"{EVENTS_URL}/{event.id}", {"expand": "orgs"})
+
+    assert compact["ETag"] != expanded["ETag"]
+
+
+def test_conditional_list_not_modified() -> None:
+    client = APIClient()
+    EventFactory()
+    etag = client.get(EVENTS_URL)["ETag"]
+
+    response = client.get(EVENTS_URL, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    EventFactory()
+    response = client.get(EVENTS_URL, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_conditional_list_skips_volatile_params() -> None:
+    client = APIClient()
+    EventFactory()
+
+    response = client.get(EVENTS_URL, {"days_ahead": 7})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "ETag" not in response
+
+
+def test_conditional_missing_entity() -> None:
+    client = APIClient()
+
+    response = client.get("/v1/communities/groups/00000000-0000-0000-0000-000000000000")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert "ETag" not in response
+
+
+def test_conditional_detail_changes_with_nested_children() -> None:
+    client = APIClient()
+    org = OrganizationFactory()
+    event = EventFactory(orgs=[org])
+    url = f"/v1/communities/organizations/{org.id}"
+    etag = client.get(url)["ETag"]
+
+    EventTextFactory(event=event)
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"] != etag
+
+
+def test_conditional_detail_unchanged_by_events_with_the_same_topic() -> None:
+    client = APIClient()
+    topic = TopicFactory()
+    event = EventFactory()
+    other = EventFactory(orgs=[OrganizationFactory()])
+    event.topics.add(topic)
+    other.topics.add(topic)
+    etag = client.get(f"{EVENTS_URL}/{other.id}")["ETag"]
+    topic_last_updated = Topic.objects.get(pk=topic.pk).last_updated
+
+    event.name = "A new name"
+    event.save()
+    response = client.get(f"{EVENTS_URL}/{other.id}", HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert Topic.objects.get(pk=topic.pk).last_updated == topic_last_updated
@@ -0,0 +1,33 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from unittest.mock import MagicMock, patch
+
+from core.db_pool import get_pools, pool_metrics
+from core.instrumentation import metrics
+
+
+def test_db_pool_metrics_rendered() -> None:
+    pool = MagicMock()
+    pool.get_stats.return_value = {
+        "pool_max": 10,
+        "pool_size": 4,
+        "pool_available": 1,
+        "requests_num": 20,
+        "requests_wait_ms": 1500,
+    }
+
+    with patch("core.db_pool.get_pools", return_value={"default": pool}):
+        body = metrics.render()
+
+    assert 'activist_db_pool_size{alias="default"} 4' in body
+    assert 'activist_db_pool_requests_total{alias="default"} 20' in body
+    assert 'activist_db_pool_timeouts_total{alias="default"} 0' in body
+    assert 'activist_db_pool_saturation{alias="default"} 0.3' in body
+    assert 'activist_db_pool_wait_seconds_total{alias="default"} 1.5' in body
+
+
+def test_db_pool_metrics_without_pools(settings) -> None:
+    settings.DATABASES = {"default": {**settings.DATABASES["default"], "OPTIONS": {}}}
+
+    assert get_pools() == {}
+    assert pool_metrics() == []
@@ -0,0 +1,91 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from collections.abc import Iterator
+from unittest.mock import patch
+
+import pytest
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest, HttpResponse
+from django.test import RequestFactory
+
+from core.db_routing import (
+    ReplicaRouter,
+    ReplicaRoutingMiddleware,
+    _check_replica,
+    reset_replica_health,
+)
+from events.models import Event
+
+router = ReplicaRouter()
+
+
+@pytest.fixture(autouse=True)
+def replicas(settings) -> Iterator[None]:
+    settings.REPLICA_DATABASES = ["replica_1"]
+    settings.SHARED_CACHE = True
+    reset_replica_health()
+    yield
+    reset_replica_health()
+
+
+def _test_db_routing_read_alias(method: str = "get", write: bool = False, **headers):
+    """
+    Send a request through the middleware and return the alias its reads use.
+    """
+    aliases = []
+
+    def view(request: HttpRequest) -> HttpResponse:
+        if write:
+            router.db_for_write(Event)
+
+        aliases.append(router.db_for_read(Event))
+        return HttpResponse()
+
+    request = getattr(RequestFactory(), method)("/v1/events/events", headers=headers)
+    ReplicaRoutingMiddleware(view)(request)
+    return aliases[0]
+
+
+def test_db_routing_safe_request_reads_replica() -> None:
+    with patch("core.db_routing._check_replica", return_value=True):
+        assert _test_db_routing_read_alias() == "replica_1"
+        assert _test_db_routing_read_alias(write=True) is None
+        assert _test_db_routing_read_alias("post") is None
+
+    assert router.db_for_read(Event) is None
+    assert router.db_for_write(Event) == "default"
+
+
+def test_db_routing_write_pins_client() -> None:
+    with patch("core.db_routing._check_replica", return_value=True):
+        _test_db_routing_read_alias("post", Authorization="Bearer writer")
+
+        assert _test_db_routing_read_alias(Authorization="Bearer writer") is None
+        assert _test_db_routing_read_alias(Authorization="Bearer reader") == (
+            "replica_1"
+        )
+
+
+def test_db_routing_unhealthy_replica_reads_primary(settings) -> None:
+    settings.DATABASE_REPLICA_CHECK_INTERVAL = 60
+    with patch("core.db_routing._check_replica", return_value=False) as check:
+        assert _test_db_routing_read_alias() is None
+        assert _test_db_routing_read_alias() is None
+
+    # Health is checked once per interval rather than on every request.
+    assert check.call_count == 1
+
+
+def test_db_routing_without_shared_cache_reads_primary(settings) -> None:
+    settings.SHARED_CACHE = False
+
+    with pytest.raises(MiddlewareNotUsed):
+        ReplicaRoutingMiddleware(lambda request: HttpResponse())
+
+    assert router.db_for_read(Event) is None
+
+
+@pytest.mark.django_db
+def test_db_routing_check_primary_is_healthy() -> None:
+    # The primary is not a standby, so it has no lag.
+    assert _check_replica("default")
@@ -0,0 +1,130 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+import threading
+import time
+from collections.abc import Callable, Generator
+
+import httpx
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework import status
+
+from core.filescan import FilescanError, filescan_client, scan_helpers
+from core.filescan.scan_helpers import scan_uploads, scan_uploads_and_rewind
+
+Handler = Callable[[httpx.Request], httpx.Response]
+
+
+@pytest.fixture
+def mock_filescan(monkeypatch) -> Generator[Callable[[Handler], None], None, None]:
+    """
+    Route filescan client requests to a handler instead of the network.
+    """
+
+    def install(handler: Handler) -> None:
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(filescan_client, "_client", client)
+
+    yield install
+
+
+def _uploads(count: int) -> list[SimpleUploadedFile]:
+    return [SimpleUploadedFile(f"image_{i}.png", b"data") for i in range(count)]
+
+
+def test_filescan_client_reuses_pooled_client() -> None:
+    assert filescan_client.get_client() is filescan_client.get_client()
+
+
+def test_filescan_client_scans_uploads_concurrently(mock_filescan) -> None:
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+
+        return httpx.Response(200, json={"malware_detected": False})
+
+    mock_filescan(handler)
+    results = scan_uploads(_uploads(4))
+
+    assert len(results) == 4
+    assert peak > 1
+
+
+def test_filescan_client_deadline_exceeded(mock_filescan) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        time.sleep(0.3)
+        return httpx.Response(200, json={"malware_detected": False})
+
+    mock_filescan(handler)
+
+    with pytest.raises(FilescanError):
+        scan_uploads(_uploads(3), deadline=0.05)
+
+
+def test_filescan_client_rejects_batch_with_malware(mock_filescan) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        detected = b'filename="image_2.png"' in request.content
+        return httpx.Response(200, json={"malware_detected": detected})
+
+    mock_filescan(handler)
+    response = scan_uploads_and_rewind(_uploads(3))
+
+    assert response is not None
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_filescan_client_batch_endpoint(mock_filescan, monkeypatch) -> None:
+    urls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        urls.append(str(request.url))
+        results = [{"malware_detected": False}] * 3
+        return httpx.Response(200, json={"results": results})
+
+    mock_filescan(handler)
+    monkeypatch.setattr(scan_helpers, "FILESCAN_USE_BATCH", True)
+    uploads = _uploads(3)
+
+    assert scan_uploads_and_rewind(uploads) is None
+    assert urls == [filescan_client.FILESCAN_BATCH_URL]
+    assert all(upload.tell() == 0 for upload in uploads)
+
+
+def test_filescan_client_retries_after_shed_scan(mock_filescan) -> None:
+    bodies = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(request.read())
+        if len(bodies) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+
+        return httpx.Response(200, json={"malware_detected": False})
+
+    mock_filescan(handler)
+
+    assert scan_uploads_and_rewind(_uploads(1)) is None
+    assert len(bodies) == 2
+    # The upload was rewound so that the retry sent the whole file again.
+    assert all(b'filename="image_0.png"' in body for body in bodies)
+    assert all(b"\r\n\r\ndata\r\n" in body for body in bodies)
+
+
+def test_filescan_client_passes_on_backpressure(mock_filescan) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(503, headers={"Retry-After": "30"})
+
+    mock_filescan(handler)
+    response = scan_uploads_and_rewind(_uploads(1))
+
+    assert response is not None
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.headers["Retry-After"] == "30"
@@ -0,0 +1,97 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from collections.abc import Iterator
+
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.instrumentation import Histogram, RequestStats, metrics
+from events.factories import EventFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics() -> Iterator[None]:
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_instrumentation_histogram_cumulative() -> None:
+    histogram = Histogram([0.1, 1.0])
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+
+    assert histogram.cumulative() == [("0.1", 2), ("1", 3), ("+Inf", 4)]
+    assert histogram.sum == pytest.approx(3.65)
+
+
+def test_instrumentation_metrics_rejects_without_token(
+    api_client: APIClient, settings
+) -> None:
+    settings.INTERNAL_METRICS_TOKEN = "secret-token"
+
+    response = api_client.get("/internal/metrics")
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    response = api_client.get("/internal/metrics", HTTP_X_INTERNAL_TOKEN="wrong")
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    settings.INTERNAL_METRICS_TOKEN = None
+    response = api_client.get("/internal/metrics", HTTP_X_INTERNAL_TOKEN="")
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_instrumentation_metrics_records_route(api_client: APIClient, settings) -> None:
+    settings.INTERNAL_METRICS_TOKEN = "secret-token"
+    settings.RESPONSE_CACHE_ENABLED = False
+    EventFactory.create_batch(2)
+
+    response = api_client.get("/v1/events/events")
+    assert response.status_code == status.HTTP_200_OK
+
+    response = api_client.get(
+        "/internal/metrics", HTTP_AUTHORIZATION="Bearer secret-token"
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+
+    body = response.content.decode()
+    labels = 'method="GET",route="v1/events/events"'
+    assert f'activist_http_requests_total{{{labels},status="200"}} 1' in body
+    assert (
+        f'activist_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1' in body
+    )
+    assert f"activist_db_queries_per_request_count{{{labels}}} 1" in body
+
+    (serializer_line,) = [
+        line
+        for line in body.splitlines()
+        if line.startswith(f"activist_serializer_duration_seconds_total{{{labels}}}")
+    ]
+    assert float(serializer_line.split()[-1]) > 0
+
+    (bytes_line,) = [
+        line
+        for line in body.splitlines()
+        if line.startswith(f"activist_http_response_bytes_total{{{labels}}}")
+    ]
+    assert int(bytes_line.split()[-1]) > 0
+
+
+def test_instrumentation_repeated_queries() -> None:
+    stats = RequestStats()
+    stats.shapes['SELECT * FROM "events_event" WHERE "id" = %s'] += 5
+    stats.shapes['SELECT * FROM "content_topic"'] += 1
+
+    assert stats.repeated_queries() == {
+        'SELECT * FROM "events_event" WHERE "id" = %s': 5
+    }
+
+    metrics.record("GET", "v1/events/events", 200, 0.1, stats)
+    assert (
+        'activist_db_repeated_query_requests_total{method="GET",'
+        'route="v1/events/events"} 1'
+    ) in metrics.render()
@@ -4,11 +4,17 @@ import json
 from typing import Any
 
 import pytest
+from django.core import mail
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from core.mail import deliver_queued_emails
+
 pytestmark = pytest.mark.django_db
 
+# Leave the alerts to a task worker, as in deployments.
+TASK_WORKER = {"default": {"BACKEND": "django_tasks_db.DatabaseBackend"}}
+
 
 def _base_envelope() -> dict[str, Any]:
     return {
@@ -43,40 +49,59 @@ def test_security_events_ingest_rejects_without_token(
 
 
 def test_security_events_ingest_sends_email_for_malware_quarantined(
-    api_client: APIClient, settings, monkeypatch
+    api_client: APIClient, settings
 ) -> None:
     settings.INTERNAL_EVENTS_TOKEN = "secret-token"
     settings.SECURITY_ALERT_RECIPIENTS = ("ops@example.com",)
     settings.SECURITY_ALERT_FROM_EMAIL = "alerts@example.com"
+    settings.TASKS = TASK_WORKER
 
-    sent: dict[str, Any] = {}
+    envelope = _base_envelope()
 
-    def fake_send_mail(
-        subject: str,
-        message: str,
-        from_email: str,
-        recipient_list,
-        fail_silently: bool = False,
-    ) -> int:
-        sent["subject"] = subject
-        sent["message"] = message
-        sent["from_email"] = from_email
-        sent["recipient_list"] = list(recipient_list)
-        return 1
+    for _ in range(2):
+        response = api_client.post(
+            "/internal/security-events",
+            data=json.dumps(envelope),
+            content_type="application/json",
+            HTTP_X_INTERNAL_TOKEN="secret-token",
+        )
+        assert response.status_code == status.HTTP_204_NO_CONTENT
 
-    monkeypatch.setattr("core.internal_events.send_mail", fake_send_mail)
+    # The alert is sent by the task worker and the retried event is dropped.
+    assert len(mail.outbox) == 0
+    assert deliver_queued_emails() == 1
 
-    envelope = _base_envelope()
+    sent = mail.outbox[0]
+    assert sent.from_email == "alerts@example.com"
+    assert "eicar.txt" in sent.body
+    assert "abc123" in sent.body
+    assert sent.to == ["ops@example.com"]
+
+
+def test_security_events_ingest_reports_status_per_envelope_in_batch(
+    api_client: APIClient, settings
+) -> None:
+    settings.INTERNAL_EVENTS_TOKEN = "secret-token"
+    settings.SECURITY_ALERT_RECIPIENTS = ("ops@example.com",)
+    settings.SECURITY_ALERT_FROM_EMAIL = "alerts@example.com"
+    settings.TASKS = TASK_WORKER
+
+    invalid = _base_envelope()
+    invalid["occurred_at"] = "not-a-date"
 
     response = api_client.post(
         "/internal/security-events",
-        data=json.dumps(envelope),
+        data=json.dumps([_base_envelope(), invalid, "not-an-envelope"]),
         content_type="application/json",
         HTTP_X_INTERNAL_TOKEN="secret-token",
     )
 
-    assert response.status_code == status.HTTP_204_NO_CONTENT
-    assert sent["from_email"] == "alerts@example.com"
-    assert "eicar.txt" in sent["message"]
-    assert "abc123" in sent["message"]
-    assert sent["recipient_list"] == ["ops@example.com"]
+    assert response.status_code == status.HTTP_200_OK
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == [
+        status.HTTP_204_NO_CONTENT,
+        status.HTTP_400_BAD_REQUEST,
+        status.HTTP_400_BAD_REQUEST,
+    ]
+    assert results[1]["detail"] == "Invalid or missing occurred_at."
+    assert deliver_queued_emails() == 1
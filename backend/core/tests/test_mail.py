@@ -0,0 +1,71 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from datetime import timedelta
+from smtplib import SMTPException
+from unittest.mock import patch
+
+import pytest
+from django.core import mail
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+from core import custom_settings
+from core.mail import deliver_queued_emails, queue_email
+from core.models import OutboundEmail
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def task_worker(settings) -> None:
+    """
+    Leave deliveries to a task worker, as in deployments.
+    """
+    settings.TASKS = {"default": {"BACKEND": "django_tasks_db.DatabaseBackend"}}
+
+
+def test_mail_delivered_in_batches_over_one_connection(monkeypatch) -> None:
+    monkeypatch.setattr(custom_settings, "EMAIL_BATCH_SIZE", 2)
+    for i in range(5):
+        queue_email("a@example.com", [f"user{i}@example.com"], "Hello", "<p>Hi</p>")
+
+    with patch("core.mail.get_connection", wraps=get_connection) as connect:
+        assert deliver_queued_emails() == 5
+
+    assert connect.call_count == 3
+    assert [m.to for m in mail.outbox] == [[f"user{i}@example.com"] for i in range(5)]
+    assert not OutboundEmail.objects.exists()
+
+
+def test_mail_delivered_without_task_worker(settings) -> None:
+    settings.TASKS = {
+        "default": {"BACKEND": "django.tasks.backends.dummy.DummyBackend"}
+    }
+    queue_email("a@example.com", ["user@example.com"], "Hello", "Hi")
+
+    assert [m.to for m in mail.outbox] == [["user@example.com"]]
+    assert not OutboundEmail.objects.exists()
+
+
+def test_mail_failed_delivery_retried_with_backoff(monkeypatch) -> None:
+    monkeypatch.setattr(custom_settings, "EMAIL_MAX_ATTEMPTS", 2)
+    queue_email("a@example.com", ["user@example.com"], "Hello", "Hi")
+
+    with patch.object(EmailMessage, "send", side_effect=SMTPException("down")):
+        assert deliver_queued_emails() == 0
+
+    email = OutboundEmail.objects.get()
+    assert email.attempts == 1
+    assert email.last_error == "down"
+    assert email.next_attempt > timezone.now() + timedelta(seconds=30)
+
+    # Retries wait for their backoff.
+    assert deliver_queued_emails() == 0
+
+    OutboundEmail.objects.update(next_attempt=timezone.now())
+    with patch.object(EmailMessage, "send", side_effect=SMTPException("down")):
+        assert deliver_queued_emails() == 0
+
+    email.refresh_from_db()
+    assert email.status == OutboundEmail.Status.FAILED
+    assert len(mail.outbox) == 0
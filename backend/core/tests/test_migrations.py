@@ -0,0 +1,18 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db
+def test_migrations_include_core_models(settings) -> None:
+    # Tests build the schema without migrations, so check that they are generated.
+    settings.MIGRATION_MODULES = {}
+    out = StringIO()
+
+    call_command("makemigrations", dry_run=True, stdout=out)
+
+    assert "Migrations for 'core'" in out.getvalue()
+    assert "ThrottleCounter" in out.getvalue()
+    assert "OutboundEmail" in out.getvalue()
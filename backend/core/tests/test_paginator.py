@@ -0,0 +1,122 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from communities.organizations.factories import OrganizationFactory
+from events.factories import EventFactory
+
+pytestmark = pytest.mark.django_db
+
+EVENTS_URL = "/v1/events/events"
+
+
+def _test_paginator_collect(client: APIClient, url: str, params=None) -> list[str]:
+    ids = []
+    while url:
+        response = client.get(url, params)
+        assert response.status_code == status.HTTP_200_OK
+        body = response.json()
+        ids.extend(item["id"] for item in body["results"])
+        url, params = body["next"], None
+
+    return ids
+
+
+def test_paginator_cursor_walks_all_rows_in_order() -> None:
+    client = APIClient()
+    org = OrganizationFactory()
+    events = [EventFactory(orgs=[org]) for _ in range(7)]
+
+    ids = _test_paginator_collect(
+        client, EVENTS_URL, {"pagination": "cursor", "page_size": 3}
+    )
+
+    assert ids == sorted(str(event.id) for event in events)
+
+
+def test_paginator_cursor_previous_page() -> None:
+    client = APIClient()
+    org = OrganizationFactory()
+    for _ in range(5):
+        EventFactory(orgs=[org])
+
+    first = client.get(EVENTS_URL, {"pagination": "cursor", "page_size": 2}).json()
+    second = client.get(first["next"]).json()
+    back = client.get(second["previous"]).json()
+
+    assert first["previous"] is None
+    assert back["results"] == first["results"]
+    assert back["previous"] is None
+
+
+def test_paginator_cursor_count_modes() -> None:
+    client = APIClient()
+    org = OrganizationFactory()
+    for _ in range(3):
+        EventFactory(orgs=[org])
+
+    params = {"pagination": "cursor", "page_size": 2}
+    assert client.get(EVENTS_URL, params).json()["count"] is None
+    assert client.get(EVENTS_URL, {**params, "count": "exact"}).json()["count"] == 3
+    assert client.get(EVENTS_URL, {**params, "count": "estimate"}).json()["count"] == 3
+
+
+def test_paginator_cursor_deep_page_query_count() -> None:
+    client = APIClient()
+    org = OrganizationFactory()
+    for _ in range(6):
+        EventFactory(orgs=[org])
+
+    params = {"pagination": "cursor", "page_size": 2}
+    with CaptureQueriesContext(connection) as ctx_first:
+        first = client.get(EVENTS_URL, params).json()
+
+    last_url = client.get(first["next"]).json()["next"]
+    with CaptureQueriesContext(connection) as ctx_last:
+        client.get(last_url)
+
+    assert len(ctx_last.captured_queries) == len(ctx_first.captured_queries)
+    assert not any("OFFSET" in query["sql"] for query in ctx_last.captured_queries)
+
+
+def test_paginator_invalid_cursor_not_found() -> None:
+    response = APIClient().get(EVENTS_URL, {"cursor": "not-a-cursor"})
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_paginator_cursor_invalid_values_not_found() -> None:
+    client = APIClient()
+    for _ in range(2):
+        EventFactory()
+
+    params = {"pagination": "cursor", "page_size": 1}
+    next_url = client.get(EVENTS_URL, params).json()["next"]
+    cursor = json.loads(
+        urlsafe_b64decode(parse_qs(urlparse(next_url).query)["cursor"][0])
+    )
+    cursor["v"] = ["not-a-value"] * len(cursor["v"])
+    encoded = urlsafe_b64encode(json.dumps(cursor).encode()).decode()
+
+    response = client.get(EVENTS_URL, {**params, "cursor": encoded})
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_paginator_page_number_mode_unchanged() -> None:
+    client = APIClient()
+    org = OrganizationFactory()
+    for _ in range(3):
+        EventFactory(orgs=[org])
+
+    body = client.get(EVENTS_URL, {"page_size": 2, "page": 2}).json()
+
+    assert body["count"] == 3
+    assert len(body["results"]) == 1
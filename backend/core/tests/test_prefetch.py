@@ -0,0 +1,75 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+from django.db.models import Prefetch
+
+from core.prefetch import plan_prefetch, prefetch_for_serializer
+from events.models import Event
+from events.serializers import EventSerializer, EventTextSerializer
+
+
+def _prefetch_paths(plan) -> set[str]:
+    return {path for path, _, _ in plan[1]}
+
+
+def test_plan_prefetch_event_serializer_relations() -> None:
+    select_related, prefetches = plan_prefetch(EventSerializer)
+
+    assert set(select_related) == {"physical_location", "icon_url"}
+    assert {
+        "texts",
+        "social_links",
+        "resources",
+        "faqs",
+        "orgs",
+        "groups",
+        "topics",
+        "times",
+    } <= _prefetch_paths((select_related, prefetches))
+
+
+def test_plan_prefetch_nested_relations() -> None:
+    _, prefetches = plan_prefetch(EventSerializer)
+    nested = {path: plan for path, _, plan in prefetches}
+
+    # Resources render their topics through a slug field.
+    assert "topics" in _prefetch_paths(nested["resources"])
+    # Compact organizations only need their icon.
+    assert nested["orgs"] == (("icon_url",), ())
+
+
+def test_plan_prefetch_expanded_relations() -> None:
+    _, prefetches = plan_prefetch(EventSerializer, frozenset({"orgs"}))
+    nested = {path: plan for path, _, plan in prefetches}
+
+    # Expanded organizations render their own many-to-many ids.
+    assert "topics" in _prefetch_paths(nested["orgs"])
+
+
+def test_plan_prefetch_skips_primary_key_relations() -> None:
+    select_related, prefetches = plan_prefetch(EventTextSerializer)
+
+    assert select_related == ()
+    assert prefetches == ()
+
+
+def test_prefetch_for_serializer_applies_plan() -> None:
+    queryset = prefetch_for_serializer(Event.objects.all(), EventSerializer)
+
+    assert queryset.query.select_related == {"physical_location": {}, "icon_url": {}}
+    assert all(isinstance(p, Prefetch) for p in queryset._prefetch_related_lookups)
+
+
+def test_plan_prefetch_collapsed_relations() -> None:
+    _, prefetches = plan_prefetch(EventSerializer, depth=0)
+
+    # Relations below the depth are rendered as ids without nested loads.
+    assert all(plan == ((), ()) for _, _, plan in prefetches)
+    assert "orgs" in _prefetch_paths(((), prefetches))
+
+
+def test_plan_prefetch_selected_fields() -> None:
+    select_related, prefetches = plan_prefetch(
+        EventSerializer, fields=frozenset({"name", "orgs.name"})
+    )
+
+    assert select_related == ()
+    assert _prefetch_paths((select_related, prefetches)) == {"orgs"}
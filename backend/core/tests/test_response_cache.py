@@ -0,0 +1,121 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from communities.organizations.factories import OrganizationFactory
+from content.factories import TopicFactory
+from events.factories import EventFactory
+
+pytestmark = pytest.mark.django_db
+
+EVENTS_URL = "/v1/events/events"
+
+
+@pytest.fixture(autouse=True)
+def enable_response_cache(settings) -> None:
+    """
+    Enable the response cache, which the tests share as they run in one process.
+    """
+    settings.RESPONSE_CACHE_ENABLED = True
+
+
+def test_response_cache_hit_on_repeated_get() -> None:
+    client = APIClient()
+    EventFactory()
+
+    first = client.get(EVENTS_URL)
+    second = client.get(EVENTS_URL)
+
+    assert first.status_code == status.HTTP_200_OK
+    assert first["X-Cache"] == "MISS"
+    assert second["X-Cache"] == "HIT"
+    assert second.content == first.content
+
+
+def test_response_cache_key_normalizes_query_params() -> None:
+    client = APIClient()
+    EventFactory()
+
+    client.get(f"{EVENTS_URL}?page_size=5&page=1")
+    response = client.get(f"{EVENTS_URL}?page=1&page_size=5")
+
+    assert response["X-Cache"] == "HIT"
+
+
+def test_response_cache_separates_hosts() -> None:
+    client = APIClient()
+    EventFactory()
+    client.get(EVENTS_URL, HTTP_HOST="activist.org")
+
+    response = client.get(EVENTS_URL, HTTP_HOST="localhost")
+
+    assert response["X-Cache"] == "MISS"
+
+
+def test_response_cache_separates_auth_states(authenticated_client) -> None:
+    client, _ = authenticated_client
+    EventFactory()
+
+    APIClient().get(EVENTS_URL)
+    response = client.get(EVENTS_URL)
+
+    assert response["X-Cache"] == "MISS"
+
+
+def test_response_cache_invalidated_on_save() -> None:
+    client = APIClient()
+    event = EventFactory()
+    client.get(f"{EVENTS_URL}/{event.id}")
+
+    event.name = "Renamed event"
+    event.save()
+    response = client.get(f"{EVENTS_URL}/{event.id}")
+
+    assert response["X-Cache"] == "MISS"
+    assert response.json()["name"] == "Renamed event"
+
+
+def test_response_cache_invalidated_by_embedded_model() -> None:
+    client = APIClient()
+    org = OrganizationFactory()
+    event = EventFactory(orgs=[org])
+    client.get(f"{EVENTS_URL}/{event.id}")
+
+    org.name = "Renamed organization"
+    org.save()
+    response = client.get(f"{EVENTS_URL}/{event.id}")
+
+    assert response["X-Cache"] == "MISS"
+    assert response.json()["orgs"][0]["name"] == "Renamed organization"
+
+
+def test_response_cache_invalidated_on_topic_change() -> None:
+    client = APIClient()
+    EventFactory()
+    client.get(EVENTS_URL)
+
+    TopicFactory(type="education", active=True)
+    response = client.get(EVENTS_URL)
+
+    assert response["X-Cache"] == "MISS"
+
+
+def test_response_cache_skips_errors() -> None:
+    client = APIClient()
+
+    client.get(f"{EVENTS_URL}/00000000-0000-0000-0000-000000000000")
+    response = client.get(f"{EVENTS_URL}/00000000-0000-0000-0000-000000000000")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert "X-Cache" not in response
+
+
+def test_response_cache_disabled(settings) -> None:
+    settings.RESPONSE_CACHE_ENABLED = False
+    client = APIClient()
+
+    client.get(EVENTS_URL)
+    response = client.get(EVENTS_URL)
+
+    assert "X-Cache" not in response
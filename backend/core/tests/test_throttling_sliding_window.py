@@ -0,0 +1,60 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+import pytest
+from django.test import RequestFactory
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.test import APIClient
+
+from core.throttling import AnonRateThrottle, AuthRateThrottle
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.mark.parametrize(
+    "backend",
+    [
+        "core.throttling.CacheThrottleBackend",
+        "core.throttling.DatabaseThrottleBackend",
+    ],
+)
+def test_throttling_sliding_window(backend: str, settings) -> None:
+    settings.THROTTLE_BACKEND = backend
+    request = Request(RequestFactory().get("/v1/communities/organizations"))
+    now = 600.0
+
+    def allow() -> tuple[bool, float | None]:
+        throttle = AnonRateThrottle()
+        throttle.rate = "3/min"
+        throttle.num_requests, throttle.duration = throttle.parse_rate(throttle.rate)
+        throttle.timer = lambda: now
+        return throttle.allow_request(request, None), throttle.wait()
+
+    assert [allow()[0] for _ in range(3)] == [True, True, True]
+    allowed, wait = allow()
+    assert not allowed
+    assert wait == 60
+
+    # Half of the previous window still counts, 4 * 0.5 + 1 = 3.
+    now += 90
+    assert allow()[0]
+    assert not allow()[0]
+
+
+@pytest.mark.enable_throttling
+def test_throttling_sliding_window_auth_endpoints_too_many_requests_429(
+    monkeypatch,
+) -> None:
+    monkeypatch.setattr(AuthRateThrottle, "THROTTLE_RATES", {"auth": "2/min"})
+    client = APIClient()
+    data = {"username": "unknown", "password": "wrong"}
+
+    for _ in range(2):
+        response = client.post(path="/v1/auth/sign_in", data=data)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = client.post(path="/v1/auth/sign_in", data=data)
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    # The limit is shared by the auth endpoints.
+    response = client.post(path="/v1/auth/pwreset", data={"email": "a@b.com"})
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
@@ -0,0 +1,366 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Throttles that count requests in a shared store with atomic increments.
+
+DRF's throttles keep the times of recent requests of each client as a list in the
+default cache, which is local to each process and rewritten on every check. These
+throttles use a sliding window counter instead. The requests of the current and the
+previous fixed window are counted with atomic increments, and the count of the
+previous window is weighted by how much of it still overlaps the sliding window.
+
+Every check costs a constant number of operations on the backend that is set via
+``THROTTLE_BACKEND``:
+
+- ``CacheThrottleBackend`` counts in the cache under ``THROTTLE_CACHE_ALIAS``, which
+  is Redis when ``REDIS_URL`` is set and process memory otherwise.
+- ``DatabaseThrottleBackend`` counts with a single upsert into the
+  ``ThrottleCounter`` table, so installs without Redis share limits across
+  processes.
+
+Throttled requests count towards the limit as well, so clients that keep retrying
+stay throttled until they slow down.
+"""
+
+import time
+from functools import cache
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.module_loading import import_string
+from rest_framework import throttling
+from rest_framework.request import Request
+
+from core import custom_settings
+from core.models import ThrottleCounter
+
+# MARK: Backends
+
+
+class ThrottleBackend:
+    """
+    A store of the request counts of throttled clients.
+    """
+
+    def increment(self, key: str, window_index: int, period: int) -> tuple[int, int]:
+        """
+        Count a request of a client.
+
+        Parameters
+        ----------
+        key : str
+            The throttle scope and identity of the client.
+
+        window_index : int
+            The index of the fixed window that the request falls into.
+
+        period : int
+            The length of the windows in seconds.
+
+        Returns
+        -------
+        tuple[int, int]
+            The count of the current window including the request and the count of
+            the previous window.
+        """
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """
+        Forget the counts of all clients.
+        """
+        raise NotImplementedError
+
+
+class CacheThrottleBackend(ThrottleBackend):
+    """
+    Count requests in the cache under ``THROTTLE_CACHE_ALIAS``.
+    """
+
+    @property
+    def cache(self) -> BaseCache:
+        """
+        Return the throttle cache of the current thread.
+
+        Returns
+        -------
+        BaseCache
+            The cache under ``THROTTLE_CACHE_ALIAS``, whose connections are local
+            to each thread.
+        """
+        return caches[settings.THROTTLE_CACHE_ALIAS]
+
+    def increment(self, key: str, window_index: int, period: int) -> tuple[int, int]:
+        """
+        Count a request of a client.
+
+        Parameters
+        ----------
+        key : str
+            The throttle scope and identity of the client.
+
+        window_index : int
+            The index of the fixed window that the request falls into.
+
+        period : int
+            The length of the windows in seconds.
+
+        Returns
+        -------
+        tuple[int, int]
+            The count of the current window including the request and the count of
+            the previous window.
+        """
+        current_key = f"{key}:{window_index}"
+        try:
+            current = self.cache.incr(current_key)
+
+        except ValueError:
+            # Another process can create the counter between the two calls.
+            if self.cache.add(current_key, 1, 2 * period):
+                current = 1
+
+            else:
+                current = self.cache.incr(current_key)
+
+        previous: int = self.cache.get(f"{key}:{window_index - 1}", 0)
+        return current, previous
+
+    def clear(self) -> None:
+        """
+        Forget the counts of all clients.
+        """
+        self.cache.clear()
+
+
+class DatabaseThrottleBackend(ThrottleBackend):
+    """
+    Count requests with an upsert into the ``ThrottleCounter`` table.
+
+    Notes
+    -----
+    The counters are written to the primary directly rather than through the
+    database routers, which would send the remaining reads of the request to the
+    primary as well. Expired rows are deleted every ``THROTTLE_PRUNE_INTERVAL``
+    seconds.
+    """
+
+    _next_prune = 0.0
+
+    def _get_upsert_sql(self) -> str:
+        """
+        Build the upsert that counts a request and rolls the windows of a counter.
+
+        Returns
+        -------
+        str
+            The SQL, with the key, the window index and the expiry as parameters.
+        """
+        quote = connections[DEFAULT_DB_ALIAS].ops.quote_name
+        table = quote(ThrottleCounter._meta.db_table)
+        key, window, count, previous, expires = (
+            quote(field)
+            for field in ("key", "window_index", "count", "previous_count", "expires")
+        )
+        return f"""
+            INSERT INTO {table} ({key}, {window}, {count}, {previous}, {expires})
+            VALUES (%s, %s, 1, 0, %s)
+            ON CONFLICT ({key}) DO UPDATE SET
+                {previous} = CASE
+                    WHEN {table}.{window} = EXCLUDED.{window} THEN {table}.{previous}
+                    WHEN {table}.{window} = EXCLUDED.{window} - 1 THEN {table}.{count}
+                    ELSE 0
+                END,
+                {count} = CASE
+                    WHEN {table}.{window} = EXCLUDED.{window} THEN {table}.{count} + 1
+                    ELSE 1
+                END,
+                {window} = EXCLUDED.{window},
+                {expires} = EXCLUDED.{expires}
+            RETURNING {count}, {previous}
+        """
+
+    def increment(self, key: str, window_index: int, period: int) -> tuple[int, int]:
+        """
+        Count a request of a client.
+
+        Parameters
+        ----------
+        key : str
+            The throttle scope and identity of the client.
+
+        window_index : int
+            The index of the fixed window that the request falls into.
+
+        period : int
+            The length of the windows in seconds.
+
+        Returns
+        -------
+        tuple[int, int]
+            The count of the current window including the request and the count of
+            the previous window.
+        """
+        # The counts are needed until the next window has passed as well.
+        expires = (window_index + 2) * period
+        with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+            cursor.execute(self._get_upsert_sql(), [key, window_index, expires])
+            current, previous = cursor.fetchone()
+
+        now = time.monotonic()
+        if now >= DatabaseThrottleBackend._next_prune:
+            DatabaseThrottleBackend._next_prune = (
+                now + custom_settings.THROTTLE_PRUNE_INTERVAL
+            )
+            # Expiry times are on the clock of the throttles, like the windows.
+            ThrottleCounter.objects.using(DEFAULT_DB_ALIAS).filter(
+                expires__lt=window_index * period
+            ).delete()
+
+        return current, previous
+
+    def clear(self) -> None:
+        """
+        Forget the counts of all clients.
+        """
+        ThrottleCounter.objects.using(DEFAULT_DB_ALIAS).all().delete()
+
+
+@cache
+def _load_throttle_backend(path: str) -> ThrottleBackend:
+    """
+    Create the throttle backend of a path once per process.
+
+    Parameters
+    ----------
+    path : str
+        The dotted path of the backend class.
+
+    Returns
+    -------
+    ThrottleBackend
+        The backend.
+    """
+    backend: ThrottleBackend = import_string(path)()
+    return backend
+
+
+def get_throttle_backend() -> ThrottleBackend:
+    """
+    Return the throttle backend that is set via ``THROTTLE_BACKEND``.
+
+    Returns
+    -------
+    ThrottleBackend
+        The backend that throttles count requests with.
+    """
+    return _load_throttle_backend(settings.THROTTLE_BACKEND)
+
+
+# MARK: Throttles
+
+
+class SlidingWindowRateThrottle(throttling.SimpleRateThrottle):
+    """
+    Limit the rate of requests with a sliding window counter.
+    """
+
+    num_requests: int
+    duration: int
+    wait_seconds: float | None = None
+
+    def allow_request(self, request: Request, view: Any) -> bool:
+        """
+        Count a request and check whether it is within the rate of its client.
+
+        Parameters
+        ----------
+        request : Request
+            The request.
+
+        view : Any
+            The view that handles the request.
+
+        Returns
+        -------
+        bool
+            Whether the weighted count of the sliding window is within the rate.
+        """
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        window_index, offset = divmod(self.timer(), self.duration)
+        current, previous = get_throttle_backend().increment(
+            self.key, int(window_index), self.duration
+        )
+        overlap = 1 - offset / self.duration
+        if previous * overlap + current <= self.num_requests:
+            return True
+
+        if current < self.num_requests and previous:
+            # The previous window slides out until the request fits.
+            wait = self.duration * (1 - (self.num_requests - current) / previous)
+            self.wait_seconds = max(0.0, wait - offset)
+
+        else:
+            self.wait_seconds = self.duration - offset
+
+        return False
+
+    def wait(self) -> float | None:
+        """
+        Return the number of seconds until the last refused request would fit.
+
+        Returns
+        -------
+        float | None
+            The number of seconds, or None if no request was refused.
+        """
+        return self.wait_seconds
+
+
+class AnonRateThrottle(SlidingWindowRateThrottle, throttling.AnonRateThrottle):
+    """
+    Limit the rate of anonymous requests per IP address.
+    """
+
+
+class UserRateThrottle(SlidingWindowRateThrottle, throttling.UserRateThrottle):
+    """
+    Limit the rate of authenticated requests per user.
+    """
+
+
+class AuthRateThrottle(SlidingWindowRateThrottle):
+    """
+    Limit the rate of sign in and password reset attempts per IP address.
+    """
+
+    scope = "auth"
+
+    def get_cache_key(self, request: Request, view: Any) -> str:
+        """
+        Return the key that the attempts of a client are counted under.
+
+        Parameters
+        ----------
+        request : Request
+            The request.
+
+        view : Any
+            The view that handles the request.
+
+        Returns
+        -------
+        str
+            The key of the IP address of the client, shared by all auth endpoints.
+        """
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": self.get_ident(request),
+        }
@@ -27,6 +27,7 @@ from django.contrib import admin
 from django.urls import include, path
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
+from core.instrumentation import metrics_view
 from core.internal_events import SecurityEventIngestView
 
 ADMIN_PATH = os.getenv("ADMIN_PATH")
@@ -42,6 +43,7 @@ urlpatterns = [
         SecurityEventIngestView.as_view(),
         name="security-events-ingest",
     ),
+    path("internal/metrics", metrics_view, name="metrics"),
     # MARK: API Documentation
     path("v1/schema/", SpectacularAPIView.as_view(), name="schema"),
     path(
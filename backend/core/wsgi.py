@@ -15,3 +15,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
 
 application = get_wsgi_application()
+
+# Import after the application so that the apps are loaded.
+from core.db_pool import open_pools  # noqa: E402
+
+open_pools()
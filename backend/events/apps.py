@@ -4,6 +4,7 @@ App configuration for the events module.
 """
 
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class EventsConfig(AppConfig):
@@ -13,3 +14,11 @@ class EventsConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "events"
+
+    def ready(self) -> None:
+        """
+        Fill in the time windows of existing events once migrations have run.
+        """
+        from events.models import backfill_time_windows
+
+        post_migrate.connect(backfill_time_windows, sender=self)
@@ -0,0 +1,259 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Exports of events in the iCalendar format.
+
+Feeds are streamed, so large calendars are rendered a chunk of events at a time
+instead of being built in memory. Every occurrence of an event is a VEVENT of its
+own. Rendered feeds are cached under the version of their events, so a cached feed
+is served until one of its events changes.
+"""
+
+import hashlib
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from typing import Any
+
+from django.conf import settings
+from django.db.models import Count, Max, Prefetch, QuerySet
+from icalendar import Event as ICalEvent
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+
+from core import custom_settings
+from core.conditional import Version
+from core.response_cache import get_response_cache
+from events.filters import EventFilters
+from events.models import Event, EventTime
+
+CALENDAR_CONTENT_TYPE = "text/calendar"
+CALENDAR_PRODID = "-//Activist//EN"
+
+# Query parameters whose feeds change with time rather than with the data.
+VOLATILE_FEED_PARAMS = ("days_ahead",)
+
+# MARK: Events
+
+
+def build_vevents(event: Event) -> list[ICalEvent]:
+    """
+    Build the VEVENTs of the occurrences of an event.
+
+    Parameters
+    ----------
+    event : Event
+        The event with its times.
+
+    Returns
+    -------
+    list[ICalEvent]
+        One VEVENT per time of the event, or a single VEVENT without dates for
+        events without times.
+    """
+    location = (
+        event.online_location_link
+        if event.location_type == "online"
+        else event.physical_location
+    )
+    times: list[EventTime | None] = list(event.times.all()) or [None]
+
+    vevents = []
+    for time in times:
+        vevent = ICalEvent()
+        vevent.add("summary", event.name)
+        vevent.add("description", event.tagline or "")
+        if time is not None:
+            vevent.add("dtstart", time.start_time)
+            vevent.add("dtend", time.end_time)
+
+        vevent.add("location", location)
+        vevent.add("uid", f"{event.id}-{time.id}" if time is not None else event.id)
+        vevent.add("dtstamp", event.last_updated)
+        vevents.append(vevent)
+
+    return vevents
+
+
+# MARK: Feeds
+
+
+def get_feed_queryset(
+    request: Request, scope: str | None = None, id: Any = None
+) -> QuerySet[Event]:
+    """
+    Return the events of a feed.
+
+    Parameters
+    ----------
+    request : Request
+        The request with the ``EventFilters`` query parameters of the feed.
+
+    scope : str | None, default=None
+        The relation that limits the feed to an entity, e.g. ``orgs``.
+
+    id : Any, default=None
+        The id of the entity that the feed is limited to.
+
+    Returns
+    -------
+    QuerySet[Event]
+        The matching events that have times, ordered by their first start.
+
+    Raises
+    ------
+    ValidationError
+        If the query parameters are invalid.
+    """
+    queryset = Event.objects.all()
+    if scope is not None:
+        queryset = queryset.filter(**{scope: id})
+
+    filterset = EventFilters(request.query_params, queryset=queryset, request=request)
+    if not filterset.is_valid():
+        raise ValidationError(filterset.errors)
+
+    # Filters through relations can repeat events, so select them by id instead.
+    return Event.objects.filter(
+        id__in=filterset.qs.values("id"), first_start__isnull=False
+    ).order_by("first_start", "id")
+
+
+def get_feed_version(request: Request, queryset: QuerySet[Event]) -> Version | None:
+    """
+    Return the version of a feed.
+
+    Parameters
+    ----------
+    request : Request
+        The request of the feed.
+
+    queryset : QuerySet[Event]
+        The events of the feed.
+
+    Returns
+    -------
+    Version | None
+        A version that changes whenever an event of the feed is changed, added or
+        removed, or None for empty feeds and feeds of rolling date windows.
+    """
+    if any(param in request.query_params for param in VOLATILE_FEED_PARAMS):
+        return None
+
+    stats = queryset.aggregate(last_updated=Max("last_updated"), count=Count("pk"))
+    if stats["last_updated"] is None:
+        return None
+
+    last_updated: datetime = stats["last_updated"]
+    return f"feed:{stats['count']}:{last_updated.isoformat()}", last_updated
+
+
+def iter_feed(queryset: QuerySet[Event], name: str | None = None) -> Iterator[bytes]:
+    """
+    Render a feed a chunk of events at a time.
+
+    Parameters
+    ----------
+    queryset : QuerySet[Event]
+        The events of the feed.
+
+    name : str | None, default=None
+        The name that calendar clients show for the feed.
+
+    Yields
+    ------
+    bytes
+        The header of the calendar, the VEVENTs of every ``CALENDAR_FEED_CHUNK_SIZE``
+        events and the footer of the calendar.
+    """
+    header = f"BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:{CALENDAR_PRODID}\r\n"
+    if name:
+        header += f"X-WR-CALNAME:{name}\r\n"
+
+    yield header.encode()
+
+    chunk_size = custom_settings.CALENDAR_FEED_CHUNK_SIZE
+    events = queryset.select_related("physical_location").prefetch_related(
+        Prefetch("times", queryset=EventTime.objects.order_by("start_time", "id"))
+    )
+    chunk: list[bytes] = []
+    for i, event in enumerate(events.iterator(chunk_size=chunk_size), start=1):
+        chunk.extend(vevent.to_ical() for vevent in build_vevents(event))
+        if i % chunk_size == 0:
+            yield b"".join(chunk)
+            chunk = []
+
+    if chunk:
+        yield b"".join(chunk)
+
+    yield b"END:VCALENDAR\r\n"
+
+
+def get_feed_cache_key(request: Request, version: Version) -> str:
+    """
+    Build the cache key of a rendered feed.
+
+    Parameters
+    ----------
+    request : Request
+        The request of the feed.
+
+    version : Version
+        The version of the events of the feed.
+
+    Returns
+    -------
+    str
+        A key derived from the path, the query string and the version.
+    """
+    digest = hashlib.sha256(
+        f"{request.get_full_path()}\n{version[0]}".encode()
+    ).hexdigest()
+    return f"calendar-feed:{digest}"
+
+
+def get_cached_feed(key: str) -> bytes | None:
+    """
+    Return a cached feed.
+
+    Parameters
+    ----------
+    key : str
+        The cache key of the feed.
+
+    Returns
+    -------
+    bytes | None
+        The rendered feed, or None if it is not cached or caching is disabled.
+    """
+    if not settings.RESPONSE_CACHE_ENABLED:
+        return None
+
+    cached: bytes | None = get_response_cache().get(key)
+    return cached
+
+
+def cache_feed(chunks: Iterable[bytes], key: str) -> Iterator[bytes]:
+    """
+    Pass through the chunks of a feed and cache the feed once it is complete.
+
+    Parameters
+    ----------
+    chunks : Iterable[bytes]
+        The rendered chunks of the feed.
+
+    key : str
+        The cache key of the feed.
+
+    Yields
+    ------
+    bytes
+        The chunks of the feed.
+    """
+    rendered = []
+    for chunk in chunks:
+        rendered.append(chunk)
+        yield chunk
+
+    if settings.RESPONSE_CACHE_ENABLED:
+        get_response_cache().set(
+            key, b"".join(rendered), custom_settings.CALENDAR_FEED_CACHE_TTL
+        )
@@ -8,11 +8,14 @@ from datetime import timedelta
 from typing import Any
 
 import django_filters
+from django.db.models import Exists, OuterRef, Q
 from django.db.models.query import QuerySet
 from django.utils import timezone
 
+from content.filters import TopicMultipleChoiceFilter
 from content.models import Topic
-from events.models import Event
+from core.search import search_queryset
+from events.models import Event, EventTime
 
 
 class EventFilters(django_filters.FilterSet):  # type: ignore[misc]
@@ -21,7 +24,7 @@ class EventFilters(django_filters.FilterSet):  # type: ignore[misc]
     """
 
     name = django_filters.CharFilter(field_name="name", lookup_expr="icontains")
-    topics = django_filters.ModelMultipleChoiceFilter(
+    topics = TopicMultipleChoiceFilter(
         field_name="topics__type",  # simply "topics" if you want to filter by ID
         to_field_name="type",  # the field on Topic model to match against
         queryset=Topic.objects.all(),
@@ -49,6 +52,11 @@ class EventFilters(django_filters.FilterSet):  # type: ignore[misc]
 
     id = django_filters.CharFilter(method="filter_ids")
 
+    q = django_filters.CharFilter(
+        method="filter_search",
+        label="Ranked search over name, tagline, location and description",
+    )
+
     def filter_topics(
         self,
         queryset: QuerySet[Any, Any],
@@ -166,9 +174,48 @@ class EventFilters(django_filters.FilterSet):  # type: ignore[misc]
 
         end = now if days_ahead_int == 0 else now + timedelta(days=days_ahead_int)
 
-        return queryset.filter(
-            times__start_time__gte=now, times__start_time__lte=end
-        ).distinct()
+        # next_start only moves on when the times of an event change, so events
+        # whose stored next occurrence has passed are checked against their times.
+        passed = Q(next_start__lt=now, last_end__gte=now) & Exists(
+            EventTime.objects.filter(
+                event=OuterRef("pk"), start_time__gte=now, start_time__lte=end
+            )
+        )
+        return queryset.filter(Q(next_start__gte=now, next_start__lte=end) | passed)
+
+    def filter_search(
+        self, queryset: QuerySet[Any, Any], name: str, value: str
+    ) -> QuerySet[Any, Any]:
+        """
+        Search events by name, tagline, location and primary description.
+
+        Parameters
+        ----------
+        queryset : QuerySet[Any, Any]
+            Base queryset of events.
+
+        name : str
+            Filter field name (unused).
+
+        value : str
+            The search term.
+
+        Returns
+        -------
+        QuerySet[Any, Any]
+            Matching events, best matches first.
+        """
+        return search_queryset(
+            queryset,
+            value,
+            ranked_fields=[
+                ("name", 1.0),
+                ("tagline", 0.5),
+                ("physical_location__address_or_name", 0.3),
+                ("physical_location__city", 0.3),
+            ],
+            matched_fields=[("texts__description", {"texts__primary": True})],
+        )
 
     class Meta:
         model = Event
@@ -179,5 +226,6 @@ class EventFilters(django_filters.FilterSet):  # type: ignore[misc]
             "type",
             "location_type",
             "location",
+            "q",
             "days_ahead",
         ]
@@ -3,13 +3,20 @@
 Models for the events app.
 """
 
+from collections.abc import Iterable
+from datetime import datetime
 from typing import Any
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import DEFAULT_DB_ALIAS, models
+from django.db.models import Max, Min, Q
+from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
 
 from content.models import Faq, Resource, SocialLink, Text
+from core.search import trigram_index
 
 # MARK: Event
 
@@ -52,8 +59,14 @@ class Event(models.Model):
     )
     is_private = models.BooleanField(default=False)
     times = models.ManyToManyField("events.EventTime", blank=True)
+    # The span and next occurrence of the times, kept current when the times change
+    # so that date queries and ordering do not need to join the times.
+    first_start = models.DateTimeField(blank=True, null=True, editable=False)
+    last_end = models.DateTimeField(blank=True, null=True, editable=False)
+    next_start = models.DateTimeField(blank=True, null=True, editable=False)
     terms_checked = models.BooleanField(default=False)
     creation_date = models.DateTimeField(auto_now_add=True)
+    last_updated = models.DateTimeField(auto_now=True)
     deletion_date = models.DateTimeField(blank=True, null=True)
 
     discussions = models.ManyToManyField("content.Discussion", blank=True)
@@ -80,14 +93,29 @@ class Event(models.Model):
 
         Notes
         -----
-        This method calls clean() before saving to ensure data validation.
+        This method calls clean() before saving to ensure data validation. The time
+        window of existing events is recomputed so that saving an instance loaded
+        before its times changed does not overwrite the current window.
         """
         self.clean()
+        if not self._state.adding:
+            for field, value in get_time_windows([self.pk])[self.pk].items():
+                setattr(self, field, value)
+
         super().save(*args, **kwargs)
 
     def __str__(self) -> str:
         return self.name
 
+    class Meta:
+        indexes = [
+            trigram_index("name", "event_name_trgm_idx"),
+            trigram_index("tagline", "event_tagline_trgm_idx"),
+            models.Index(fields=["first_start"], name="event_first_start_idx"),
+            models.Index(fields=["last_end"], name="event_last_end_idx"),
+            models.Index(fields=["next_start"], name="event_next_start_idx"),
+        ]
+
 
 # MARK: Time
 
@@ -118,6 +146,199 @@ class EventTime(models.Model):
         return f"{self.start_time} - {self.end_time}"
 
 
+# MARK: Time Window
+
+TIME_WINDOW_FIELDS = ("first_start", "last_end", "next_start")
+BACKFILL_BATCH_SIZE = 1000
+
+
+def get_time_windows(
+    event_ids: Iterable[UUID], exclude_time: UUID | None = None
+) -> dict[UUID, dict[str, datetime | None]]:
+    """
+    Compute the time window columns of events from their times.
+
+    Parameters
+    ----------
+    event_ids : Iterable[UUID]
+        The events to compute the windows of.
+
+    exclude_time : UUID | None, default=None
+        A time that is ignored because it is about to be deleted or unlinked.
+
+    Returns
+    -------
+    dict[UUID, dict[str, datetime | None]]
+        The first start, last end and next start from now of each event, which are
+        None for events without times.
+    """
+    windows = {event_id: dict.fromkeys(TIME_WINDOW_FIELDS) for event_id in event_ids}
+    times = EventTime.objects.filter(event__in=list(windows))
+    if exclude_time is not None:
+        times = times.exclude(pk=exclude_time)
+
+    for row in times.values("event").annotate(
+        first_start=Min("start_time"),
+        last_end=Max("end_time"),
+        next_start=Min("start_time", filter=Q(start_time__gte=timezone.now())),
+    ):
+        windows[row["event"]] = {
+            "first_start": row["first_start"],
+            "last_end": row["last_end"],
+            "next_start": row["next_start"],
+        }
+
+    return windows
+
+
+def update_time_windows(
+    event_ids: Iterable[UUID], exclude_time: UUID | None = None
+) -> dict[UUID, dict[str, datetime | None]]:
+    """
+    Store the time window columns of events.
+
+    Parameters
+    ----------
+    event_ids : Iterable[UUID]
+        The events to update.
+
+    exclude_time : UUID | None, default=None
+        A time that is ignored because it is about to be deleted or unlinked.
+
+    Returns
+    -------
+    dict[UUID, dict[str, datetime | None]]
+        The stored windows of each event.
+    """
+    if windows := get_time_windows(event_ids, exclude_time):
+        Event.objects.bulk_update(
+            [Event(id=event_id, **window) for event_id, window in windows.items()],
+            TIME_WINDOW_FIELDS,
+        )
+
+    return windows
+
+
+def backfill_time_windows(using: str = DEFAULT_DB_ALIAS, **kwargs: Any) -> None:
+    """
+    Store the time windows of events that have times but no windows yet.
+
+    Parameters
+    ----------
+    using : str, default=DEFAULT_DB_ALIAS
+        The alias of the database being migrated.
+
+    **kwargs : Any
+        Further arguments of the post_migrate signal.
+
+    Notes
+    -----
+    Events that were created before the window columns existed are filled in after
+    migrations run, so date queries and the calendar feed include them.
+    """
+    # Migrations to an older state may lack the columns.
+    if (state := kwargs.get("apps")) is not None:
+        try:
+            fields = {f.name for f in state.get_model("events", "Event")._meta.fields}
+
+        except LookupError:
+            return
+
+        if not fields.issuperset(TIME_WINDOW_FIELDS):
+            return
+
+    event_ids = list(
+        Event.objects.using(using)
+        .filter(first_start__isnull=True, times__isnull=False)
+        .values_list("id", flat=True)
+        .distinct()
+    )
+    for i in range(0, len(event_ids), BACKFILL_BATCH_SIZE):
+        update_time_windows(event_ids[i : i + BACKFILL_BATCH_SIZE])
+
+
+@receiver(m2m_changed, sender=Event.times.through)
+def update_time_windows_on_link(
+    sender: type[models.Model], instance: Event | EventTime, **kwargs: Any
+) -> None:
+    """
+    Update the time windows of events whose times were added, removed or cleared.
+
+    Parameters
+    ----------
+    sender : type[models.Model]
+        The through model of ``Event.times``.
+
+    instance : Event | EventTime
+        The event whose times or the time whose events were changed.
+
+    **kwargs : Any
+        Signal arguments.
+    """
+    action = kwargs["action"]
+    if isinstance(instance, Event):
+        if action.startswith("post_"):
+            window = update_time_windows([instance.pk])[instance.pk]
+            for field, value in window.items():
+                setattr(instance, field, value)
+
+    elif action in ("post_add", "post_remove"):
+        update_time_windows(kwargs["pk_set"])
+
+    elif action == "pre_clear":
+        # The events of the time are unknown once they are cleared.
+        update_time_windows(
+            instance.event_set.values_list("id", flat=True), exclude_time=instance.pk
+        )
+
+
+@receiver(post_save, sender=EventTime)
+def update_time_windows_on_save(
+    sender: type[EventTime], instance: EventTime, **kwargs: Any
+) -> None:
+    """
+    Update the time windows of the events of a changed time.
+
+    Parameters
+    ----------
+    sender : type[EventTime]
+        The model class of the instance.
+
+    instance : EventTime
+        The saved time.
+
+    **kwargs : Any
+        Signal arguments.
+    """
+    # New times do not belong to events until they are linked.
+    if not kwargs.get("raw") and not kwargs.get("created"):
+        update_time_windows(instance.event_set.values_list("id", flat=True))
+
+
+@receiver(pre_delete, sender=EventTime)
+def update_time_windows_on_delete(
+    sender: type[EventTime], instance: EventTime, **kwargs: Any
+) -> None:
+    """
+    Update the time windows of the events of a time that is deleted.
+
+    Parameters
+    ----------
+    sender : type[EventTime]
+        The model class of the instance.
+
+    instance : EventTime
+        The time that is deleted.
+
+    **kwargs : Any
+        Signal arguments.
+    """
+    # The links of the time are only queryable before the delete.
+    update_time_windows(
+        instance.event_set.values_list("id", flat=True), exclude_time=instance.pk
+    )
+
+
 # MARK: Attendee
 
 
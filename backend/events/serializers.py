@@ -22,7 +22,10 @@ from content.serializers import (
     ImageSerializer,
     LocationSerializer,
     TopicSerializer,
+    TopicSlugRelatedField,
 )
+from content.topics import topic_registry
+from core.expand import ExpandableFieldsMixin
 from events.models import (
     Event,
     EventFaq,
@@ -91,7 +94,7 @@ class EventResourceSerializer(serializers.ModelSerializer[EventResource]):
     Serializer for EventResource model data.
     """
 
-    topics = serializers.SlugRelatedField(
+    topics = TopicSlugRelatedField(
         queryset=Topic.objects.filter(active=True),
         many=True,
         slug_field="type",
@@ -210,6 +213,18 @@ class EventTextSerializer(serializers.ModelSerializer[EventText]):
 
 
 class EventOrganizationSerializer(serializers.ModelSerializer[Organization]):
+    """
+    Compact serializer for organizations embedded in event payloads.
+    """
+
+    icon_url = ImageSerializer(read_only=True)
+
+    class Meta:
+        model = Organization
+        fields = ["id", "name", "tagline", "icon_url"]
+
+
+class EventOrganizationExpandedSerializer(serializers.ModelSerializer[Organization]):
     """
     Serializer for Organization model data specific to events.
     """
@@ -223,6 +238,18 @@ class EventOrganizationSerializer(serializers.ModelSerializer[Organization]):
 
 
 class EventGroupSerializer(serializers.ModelSerializer[Group]):
+    """
+    Compact serializer for groups embedded in event payloads.
+    """
+
+    icon_url = ImageSerializer(read_only=True)
+
+    class Meta:
+        model = Group
+        fields = ["id", "name", "tagline", "icon_url"]
+
+
+class EventGroupExpandedSerializer(serializers.ModelSerializer[Group]):
     """
     Serializer for Group model data specific to events.
     """
@@ -352,7 +379,7 @@ class EventPOSTSerializer(serializers.Serializer[Any]):
                 )
 
         if topics:
-            query_topics = Topic.objects.filter(type__in=topics, active=True)
+            query_topics = topic_registry.get_many(dict.fromkeys(topics))
 
             if len(query_topics) != len(topics):
                 raise serializers.ValidationError(
@@ -438,9 +465,12 @@ class EventPOSTSerializer(serializers.Serializer[Any]):
 # MARK: Event
 
 
-class EventSerializer(serializers.ModelSerializer[Event]):
+class EventSerializer(ExpandableFieldsMixin, serializers.ModelSerializer[Event]):
     """
     Serializer for Event model data.
+
+    Organizations and groups are embedded in a compact form unless requested in
+    full via ``?expand=orgs,groups``.
     """
 
     texts = EventTextSerializer(many=True, read_only=True)
@@ -455,6 +485,14 @@ class EventSerializer(serializers.ModelSerializer[Event]):
 
     icon_url = ImageSerializer(required=False)
 
+    expandable_fields = {
+        "orgs": (
+            EventOrganizationExpandedSerializer,
+            {"many": True, "read_only": True},
+        ),
+        "groups": (EventGroupExpandedSerializer, {"many": True, "read_only": True}),
+    }
+
     class Meta:
         model = Event
 
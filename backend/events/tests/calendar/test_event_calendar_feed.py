@@ -0,0 +1,111 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+from datetime import timedelta
+from uuid import uuid4
+
+import pytest
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from communities.organizations.factories import OrganizationFactory
+from events.factories import EventFactory, EventTimeFactory
+
+pytestmark = pytest.mark.django_db
+
+FEED_URL = "/v1/events/event_calendar/feed"
+
+
+def _test_event_calendar_feed_times(*days: int) -> list:
+    now = timezone.now()
+    return [
+        EventTimeFactory(
+            start_time=now + timedelta(days=day),
+            end_time=now + timedelta(days=day, hours=2),
+        )
+        for day in days
+    ]
+
+
+def _test_event_calendar_feed_content(response) -> bytes:
+    if response.streaming:
+        return b"".join(response.streaming_content)
+
+    return response.content
+
+
+def test_event_calendar_feed_every_occurrence_ok_200():
+    client = APIClient()
+    recurring = EventFactory(times=_test_event_calendar_feed_times(1, 8, 15))
+    single = EventFactory(times=_test_event_calendar_feed_times(3))
+    EventFactory(times=[])
+
+    response = client.get(FEED_URL)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.streaming
+    assert response["Content-Type"] == "text/calendar"
+    assert response["X-Cache"] == "MISS"
+
+    content = _test_event_calendar_feed_content(response)
+    assert content.startswith(b"BEGIN:VCALENDAR\r\n")
+    assert content.endswith(b"END:VCALENDAR\r\n")
+    assert content.count(b"BEGIN:VEVENT") == 4
+    assert content.count(f"UID:{recurring.id}-".encode()) == 3
+    assert content.count(f"UID:{single.id}-".encode()) == 1
+
+
+def test_event_calendar_feed_cached_until_event_changes_ok_200(settings):
+    settings.RESPONSE_CACHE_ENABLED = True
+    client = APIClient()
+    event = EventFactory(name="Old Name", times=_test_event_calendar_feed_times(1))
+
+    first = client.get(FEED_URL)
+    first_content = _test_event_calendar_feed_content(first)
+
+    second = client.get(FEED_URL)
+    assert second["X-Cache"] == "HIT"
+    assert second.content == first_content
+    assert second["ETag"] == first["ETag"]
+
+    event.name = "New Name"
+    event.save()
+
+    third = client.get(FEED_URL)
+    assert third["X-Cache"] == "MISS"
+    assert third["ETag"] != first["ETag"]
+    assert b"SUMMARY:New Name" in _test_event_calendar_feed_content(third)
+
+
+def test_event_calendar_feed_not_modified_304():
+    client = APIClient()
+    EventFactory(times=_test_event_calendar_feed_times(1))
+
+    response = client.get(FEED_URL)
+    _test_event_calendar_feed_content(response)
+
+    response = client.get(FEED_URL, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+def test_event_calendar_feed_org_scope_ok_200():
+    client = APIClient()
+    org = OrganizationFactory(name="Climate Org")
+    org_event = EventFactory(times=_test_event_calendar_feed_times(2))
+    org_event.orgs.set([org])
+    other_event = EventFactory(times=_test_event_calendar_feed_times(2))
+
+    response = client.get(f"/v1/communities/organizations/{org.id}/calendar")
+
+    assert response.status_code == status.HTTP_200_OK
+    content = _test_event_calendar_feed_content(response)
+    assert b"X-WR-CALNAME:Climate Org - activist" in content
+    assert str(org_event.id).encode() in content
+    assert str(other_event.id).encode() not in content
+
+
+def test_event_calendar_feed_org_not_found_404():
+    client = APIClient()
+
+    response = client.get(f"/v1/communities/organizations/{uuid4()}/calendar")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
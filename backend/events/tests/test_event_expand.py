@@ -0,0 +1,51 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Tests for compact and expanded organizations and groups in event payloads.
+"""
+
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from communities.groups.factories import GroupFactory
+from events.factories import EventFactory
+
+pytestmark = pytest.mark.django_db
+
+COMPACT_KEYS = {"id", "name", "tagline", "iconUrl"}
+
+
+def test_event_expand_list_compact_by_default_ok_200() -> None:
+    client = APIClient()
+    EventFactory(groups=[GroupFactory()])
+
+    response = client.get("/v1/events/events")
+
+    assert response.status_code == status.HTTP_200_OK
+    event = response.json()["results"][0]
+    assert set(event["orgs"][0]) == COMPACT_KEYS
+    assert set(event["groups"][0]) == COMPACT_KEYS
+
+
+def test_event_expand_list_orgs_and_groups_ok_200() -> None:
+    client = APIClient()
+    EventFactory(groups=[GroupFactory()])
+
+    response = client.get("/v1/events/events", {"expand": "orgs,groups"})
+
+    assert response.status_code == status.HTTP_200_OK
+    event = response.json()["results"][0]
+    assert {"status", "location", "topics"} <= set(event["orgs"][0])
+    assert {"org", "location", "category"} <= set(event["groups"][0])
+
+
+def test_event_expand_detail_only_requested_relation_ok_200() -> None:
+    client = APIClient()
+    event = EventFactory(groups=[GroupFactory()])
+
+    response = client.get(f"/v1/events/events/{event.id}", {"expand": "groups"})
+
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    assert set(body["orgs"][0]) == COMPACT_KEYS
+    assert "category" in body["groups"][0]
@@ -9,10 +9,12 @@ from datetime import timezone as dt_timezone
 from unittest.mock import patch
 
 import pytest
+from django.core.management.sql import emit_post_migrate_signal
 from rest_framework import status
 from rest_framework.test import APIClient
 
 from events.factories import EventFactory, EventTimeFactory
+from events.models import Event
 
 pytestmark = pytest.mark.django_db
 
@@ -204,6 +206,105 @@ def test_event_filters_days_ahead_ignores_non_positive_values(mock_now) -> None:
     assert str(event_future.id) not in ids
 
 
+def test_event_filters_days_ahead_after_next_occurrence_passed() -> None:
+    """
+    days_ahead finds later occurrences of events whose stored next occurrence has
+    passed since their times were last changed.
+    """
+    client = APIClient()
+
+    with patch("django.utils.timezone.now", return_value=FIXED_NOW):
+        recurring = EventFactory.create(
+            times=[
+                EventTimeFactory(
+                    start_time=FIXED_NOW + timedelta(days=1),
+                    end_time=FIXED_NOW + timedelta(days=1, hours=2),
+                ),
+                EventTimeFactory(
+                    start_time=FIXED_NOW + timedelta(days=5),
+                    end_time=FIXED_NOW + timedelta(days=5, hours=2),
+                ),
+            ]
+        )
+        passed = EventFactory.create(
+            times=[
+                EventTimeFactory(
+                    start_time=FIXED_NOW + timedelta(days=1),
+                    end_time=FIXED_NOW + timedelta(days=1, hours=2),
+                )
+            ]
+        )
+
+    recurring.refresh_from_db()
+    assert recurring.next_start == FIXED_NOW + timedelta(days=1)
+
+    with patch("django.utils.timezone.now", return_value=FIXED_NOW + timedelta(days=2)):
+        response = client.get(f"{EVENTS_URL}?days_ahead=10")
+
+    assert response.status_code == status.HTTP_200_OK
+
+    ids = {item["id"] for item in response.data["results"]}
+
+    assert str(recurring.id) in ids
+    assert str(passed.id) not in ids
+
+
+@patch("django.utils.timezone.now", return_value=FIXED_NOW)
+def test_event_filters_time_window_follows_times(mock_now) -> None:
+    """
+    The time window columns of events are kept current when their times change.
+    """
+    early = EventTimeFactory(
+        start_time=FIXED_NOW - timedelta(days=1),
+        end_time=FIXED_NOW - timedelta(hours=20),
+    )
+    late = EventTimeFactory(
+        start_time=FIXED_NOW + timedelta(days=3),
+        end_time=FIXED_NOW + timedelta(days=3, hours=2),
+    )
+    event = EventFactory.create(times=[early, late])
+
+    assert event.first_start == early.start_time
+    assert event.last_end == late.end_time
+    assert event.next_start == late.start_time
+
+    late.start_time = FIXED_NOW + timedelta(days=2)
+    late.save()
+    event.refresh_from_db()
+    assert event.next_start == FIXED_NOW + timedelta(days=2)
+
+    late.delete()
+    event.refresh_from_db()
+    assert event.last_end == early.end_time
+    assert event.next_start is None
+
+    event.times.clear()
+    event.save()
+    event.refresh_from_db()
+    assert event.first_start is None
+    assert event.last_end is None
+
+
+@patch("django.utils.timezone.now", return_value=FIXED_NOW)
+def test_event_filters_time_window_backfilled_after_migrate(mock_now) -> None:
+    """
+    Events without stored time windows get them once migrations have run.
+    """
+    time = EventTimeFactory(
+        start_time=FIXED_NOW + timedelta(days=1),
+        end_time=FIXED_NOW + timedelta(days=1, hours=2),
+    )
+    event = EventFactory.create(times=[time])
+    Event.objects.update(first_start=None, last_end=None, next_start=None)
+
+    emit_post_migrate_signal(verbosity=0, interactive=False, db="default")
+
+    event.refresh_from_db()
+    assert event.first_start == time.start_time
+    assert event.last_end == time.end_time
+    assert event.next_start == time.start_time
+
+
 def test_event_filters_id_handles_single_id() -> None:
     """
     A single valid uuid passed as an id parameter
@@ -0,0 +1,108 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Query count regression tests for the event list and detail endpoints.
+"""
+
+from uuid import uuid4
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from communities.groups.factories import GroupFactory
+from content.factories import TopicFactory
+from events.factories import (
+    EventFactory,
+    EventFaqFactory,
+    EventResourceFactory,
+    EventSocialLinkFactory,
+    EventTextFactory,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+def _test_event_query_count_make_events(count: int) -> None:
+    for _ in range(count):
+        topic = TopicFactory(type=f"topic_{uuid4().hex}")
+        event = EventFactory()
+        event.topics.add(topic)
+        event.groups.add(GroupFactory())
+        EventTextFactory(event=event)
+        EventSocialLinkFactory(event=event)
+        EventFaqFactory(event=event)
+        resource = EventResourceFactory(event=event)
+        resource.topics.add(topic)
+
+
+def _test_event_query_count_list_queries(client: APIClient) -> int:
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get("/v1/events/events", {"page_size": 50})
+
+    assert response.status_code == status.HTTP_200_OK
+    return len(ctx.captured_queries)
+
+
+def test_event_query_count_list_constant() -> None:
+    """
+    The number of queries for an event page does not grow with the page size.
+    """
+    client = APIClient()
+
+    _test_event_query_count_make_events(2)
+    queries_small_page = _test_event_query_count_list_queries(client)
+
+    _test_event_query_count_make_events(6)
+    queries_large_page = _test_event_query_count_list_queries(client)
+
+    assert queries_small_page == queries_large_page
+
+
+def test_event_query_count_list_filtered_constant() -> None:
+    """
+    Filtering the event list does not reintroduce per-row queries.
+    """
+    client = APIClient()
+    _test_event_query_count_make_events(4)
+
+    with CaptureQueriesContext(connection) as ctx_unfiltered:
+        client.get("/v1/events/events")
+
+    with CaptureQueriesContext(connection) as ctx_filtered:
+        response = client.get("/v1/events/events", {"days_ahead": 365})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(ctx_filtered.captured_queries) <= len(ctx_unfiltered.captured_queries)
+
+
+def _test_event_query_count_make_detail_event(children: int):
+    event = EventFactory(groups=[GroupFactory() for _ in range(children)])
+    for _ in range(children):
+        EventTextFactory(event=event)
+        EventSocialLinkFactory(event=event)
+        EventFaqFactory(event=event)
+        EventResourceFactory(event=event)
+
+    return event
+
+
+def test_event_query_count_detail_constant() -> None:
+    """
+    The number of queries for an event detail does not grow with its children.
+    """
+    client = APIClient()
+
+    small_event = _test_event_query_count_make_detail_event(1)
+    with CaptureQueriesContext(connection) as ctx_small:
+        response = client.get(f"/v1/events/events/{small_event.id}")
+
+    assert response.status_code == status.HTTP_200_OK
+
+    large_event = _test_event_query_count_make_detail_event(4)
+    with CaptureQueriesContext(connection) as ctx_large:
+        response = client.get(f"/v1/events/events/{large_event.id}")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(ctx_large.captured_queries) == len(ctx_small.captured_queries)
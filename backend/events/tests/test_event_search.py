@@ -0,0 +1,81 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Tests for the ranked ?q= search of the event list.
+"""
+
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from content.factories import EventLocationFactory
+from events.factories import EventFactory, EventTextFactory
+
+pytestmark = pytest.mark.django_db
+
+EVENTS_URL = "/v1/events/events"
+
+
+def _test_event_search_ids(client: APIClient, query: str) -> list[str]:
+    response = client.get(EVENTS_URL, {"q": query})
+
+    assert response.status_code == status.HTTP_200_OK
+    return [event["id"] for event in response.json()["results"]]
+
+
+def test_event_search_ranks_name_matches_first() -> None:
+    client = APIClient()
+    tagline_match = EventFactory(name="Weekly meetup", tagline="Climate strike prep")
+    name_match = EventFactory(name="Climate strike", tagline="")
+    EventFactory(name="Book club", tagline="Reading together")
+
+    ids = _test_event_search_ids(client, "climate strike")
+
+    assert ids == [str(name_match.id), str(tagline_match.id)]
+
+
+def test_event_search_matches_location() -> None:
+    client = APIClient()
+    event = EventFactory(
+        name="Assembly", physical_location=EventLocationFactory(city="Valparaiso")
+    )
+    EventFactory(name="Other")
+
+    assert _test_event_search_ids(client, "valparaiso") == [str(event.id)]
+
+
+def test_event_search_matches_primary_description_once() -> None:
+    client = APIClient()
+    event = EventFactory(name="Assembly")
+    EventTextFactory(event=event, primary=True, description="Bring a bicycle")
+    EventTextFactory(event=event, primary=False, description="Bicycle repair")
+    secondary_only = EventFactory(name="Workshop")
+    EventTextFactory(event=secondary_only, primary=False, description="Bicycle")
+
+    assert _test_event_search_ids(client, "bicycle") == [str(event.id)]
+
+
+def test_event_search_blank_query_returns_all() -> None:
+    client = APIClient()
+    EventFactory()
+    EventFactory()
+
+    assert len(_test_event_search_ids(client, " ")) == 2
+
+
+def test_event_search_ranks_online_events_by_name() -> None:
+    client = APIClient()
+    online = EventFactory(
+        name="Weekly call",
+        tagline="Climate strike",
+        location_type="online",
+        physical_location=None,
+    )
+    name_match = EventFactory(
+        name="Climate strike",
+        tagline="",
+        physical_location=EventLocationFactory(city="Valparaiso"),
+    )
+
+    ids = _test_event_search_ids(client, "climate strike")
+
+    assert ids == [str(name_match.id), str(online.id)]
@@ -9,6 +9,7 @@ from rest_framework.routers import DefaultRouter
 from events.views import (
     EventAPIView,
     EventCalendarAPIView,
+    EventCalendarFeedAPIView,
     EventDetailAPIView,
     EventFaqViewSet,
     EventFlagAPIView,
@@ -44,5 +45,6 @@ urlpatterns = [
     path("event_flags", EventFlagAPIView.as_view()),
     path("event_flags/<uuid:id>", EventFlagDetailAPIView.as_view()),
     path("event_calendar", EventCalendarAPIView.as_view()),
+    path("event_calendar/feed", EventCalendarFeedAPIView.as_view()),
     path("event_texts/<uuid:id>", EventTextViewSet.as_view()),
 ]
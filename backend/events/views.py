@@ -13,12 +13,11 @@ from uuid import UUID
 from django.core.exceptions import ValidationError
 from django.db.models import Case, IntegerField, Q, QuerySet, Value, When
 from django.db.utils import IntegrityError, OperationalError
-from django.http import HttpResponse
+from django.http import HttpResponse, HttpResponseBase, StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema
 from icalendar import Calendar
-from icalendar import Event as ICalEvent
 from rest_framework import status, viewsets
 from rest_framework.generics import GenericAPIView
 from rest_framework.permissions import (
@@ -31,8 +30,31 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from authentication.models import UserModel
+from communities.groups.models import Group
+from communities.organizations.models import Organization
+from core import custom_settings
+from core.conditional import (
+    collection_version,
+    conditional_get,
+    entity_version,
+    respond_conditionally,
+)
+from core.expand import PROJECTION_PARAMETERS, get_projection
 from core.paginator import CustomPagination
 from core.permissions import IsAdminStaffCreatorOrReadOnly
+from core.prefetch import prefetch_for_serializer
+from core.response_cache import cache_response
+from events.calendar import (
+    CALENDAR_CONTENT_TYPE,
+    CALENDAR_PRODID,
+    build_vevents,
+    cache_feed,
+    get_cached_feed,
+    get_feed_cache_key,
+    get_feed_queryset,
+    get_feed_version,
+    iter_feed,
+)
 from events.filters import EventFilters
 from events.models import (
     Event,
@@ -66,7 +88,11 @@ class EventAPIView(GenericAPIView[Event]):
     permission_classes = [IsAuthenticatedOrReadOnly]
 
     def get_queryset(self) -> QuerySet[Event]:
-        queryset = super().get_queryset().order_by("id")
+        queryset = prefetch_for_serializer(
+            super().get_queryset().order_by("id"),
+            EventSerializer,
+            **get_projection(self.request),
+        )
 
         # E2E: only in development or CI — put activist_0's events last so
         # member permission tests (open first event, assert no add/edit) are deterministic.
@@ -123,18 +149,24 @@ class EventAPIView(GenericAPIView[Event]):
                 many=True,
                 description="Filter by topic type (e.g. from Topic.model type).",
             ),
+            *PROJECTION_PARAMETERS,
         ],
         responses={200: EventSerializer(many=True)},
     )
+    @conditional_get(collection_version(Event, volatile_params=("days_ahead",)))
+    @cache_response(
+        custom_settings.RESPONSE_CACHE_TTL_LIST, ("events", "organizations", "groups")
+    )
     def get(self, request: Request) -> Response:
         queryset = self.filter_queryset(self.get_queryset())
         page = self.paginate_queryset(queryset)
+        context = self.get_serializer_context()
 
         if page is not None:
-            serializer = self.serializer_class(page, many=True)
+            serializer = self.serializer_class(page, many=True, context=context)
             return self.get_paginated_response(serializer.data)
 
-        serializer = self.serializer_class(queryset, many=True)
+        serializer = self.serializer_class(queryset, many=True, context=context)
         return Response(serializer.data)
 
     @extend_schema(
@@ -190,11 +222,18 @@ class EventDetailAPIView(APIView):
         return [AllowAny()]
 
     @extend_schema(
+        parameters=[
+            *PROJECTION_PARAMETERS,
+        ],
         responses={
             200: EventSerializer,
             400: OpenApiResponse(response={"detail": "Event ID is required."}),
             404: OpenApiResponse(response={"detail": "Event Not Found."}),
-        }
+        },
+    )
+    @conditional_get(entity_version(Event))
+    @cache_response(
+        custom_settings.RESPONSE_CACHE_TTL_DETAIL, ("events", "organizations", "groups")
     )
     def get(self, request: Request, id: None | UUID = None) -> Response:
         if id is None:
@@ -204,8 +243,13 @@ class EventDetailAPIView(APIView):
             )
 
         try:
-            event = self.queryset.get(id=id)
-            serializer = self.serializer_class(event)
+            projection = get_projection(
+                request, custom_settings.SERIALIZER_DETAIL_DEPTH
+            )
+            event = prefetch_for_serializer(
+                self.queryset, self.serializer_class, **projection
+            ).get(id=id)
+            serializer = self.serializer_class(event, context=projection)
             return Response(serializer.data, status=status.HTTP_200_OK)
 
         except Event.DoesNotExist as e:
@@ -778,27 +822,10 @@ class EventCalendarAPIView(APIView):
             return Response(status=status.HTTP_404_NOT_FOUND)
 
         cal = Calendar()
-        cal.add("prodid", "-//Activist//EN")
+        cal.add("prodid", CALENDAR_PRODID)
         cal.add("version", "2.0")
-        ical_event = ICalEvent()
-        ical_event.add("summary", event.name)
-        ical_event.add("description", event.tagline or "")
-
-        # Get the first event time if available.
-        if first_time := event.times.first():
-            ical_event.add("dtstart", first_time.start_time)
-            ical_event.add("dtend", first_time.end_time)
-
-        ical_event.add(
-            "location",
-            (
-                event.online_location_link
-                if event.location_type == "online"
-                else event.physical_location
-            ),
-        )
-        ical_event.add("uid", event.id)
-        cal.add_component(ical_event)
+        for vevent in build_vevents(event):
+            cal.add_component(vevent)
 
         # Convert to lower camel case.
         event_name = re.sub(r"[\t\n\r\f\v]+", " ", event.name)
@@ -806,9 +833,69 @@ class EventCalendarAPIView(APIView):
             "".join(filter(str.isalnum, event_name)).replace(" ", "_").lower()
         )
 
-        response = HttpResponse(cal.to_ical(), content_type="text/calendar")
+        response = HttpResponse(cal.to_ical(), content_type=CALENDAR_CONTENT_TYPE)
         response["Content-Disposition"] = (
             f"attachment; filename=activist_event_{event_file_identifier}.ics"
         )
 
         return response
+
+
+class EventCalendarFeedAPIView(GenericAPIView[Event]):
+    """
+    Subscribable iCalendar feed of the events matching the event filters.
+
+    The feed is limited to the events of an organization or group when the view is
+    routed with a ``scope`` of ``orgs`` or ``groups`` and the ``id`` of the entity.
+    """
+
+    queryset = Event.objects.all()
+    filterset_class = EventFilters
+    filter_backends = [DjangoFilterBackend]
+    permission_classes = [AllowAny]
+    scope_models: dict[str, Any] = {"orgs": Organization, "groups": Group}
+
+    @extend_schema(
+        responses={
+            200: OpenApiResponse(
+                description="iCalendar (.ics) feed with every occurrence of the events.",
+            ),
+            304: OpenApiResponse(description="The feed has not changed."),
+            404: OpenApiResponse(description="Organization or group not found."),
+        },
+    )
+    def get(
+        self, request: Request, scope: str | None = None, id: UUID | None = None
+    ) -> HttpResponseBase:
+        name = "activist"
+        if scope is not None:
+            entity = self.scope_models[scope].objects.filter(id=id).first()
+            if entity is None:
+                return Response(status=status.HTTP_404_NOT_FOUND)
+
+            name = f"{entity.name} - activist"
+
+        queryset = get_feed_queryset(request, scope, id)
+        if (version := get_feed_version(request, queryset)) is None:
+            return StreamingHttpResponse(
+                iter_feed(queryset, name), content_type=CALENDAR_CONTENT_TYPE
+            )
+
+        key = get_feed_cache_key(request, version)
+
+        def render() -> HttpResponseBase:
+            if (cached := get_cached_feed(key)) is not None:
+                response: HttpResponseBase = HttpResponse(
+                    cached, content_type=CALENDAR_CONTENT_TYPE
+                )
+                response["X-Cache"] = "HIT"
+                return response
+
+            response = StreamingHttpResponse(
+                cache_feed(iter_feed(queryset, name), key),
+                content_type=CALENDAR_CONTENT_TYPE,
+            )
+            response["X-Cache"] = "MISS"
+            return response
+
+        return respond_conditionally(request, version, render)
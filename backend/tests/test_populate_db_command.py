@@ -230,3 +230,71 @@ def test_populate_db_command_with_yaml_data_to_assign():
     group_event = Event.objects.get(name="Assigned Group Event")
     assert group_event.tagline == "Assigned group event tagline"
     assert group_event.type == "action"
+
+
+@pytest.mark.django_db
+def test_populate_db_command_bulk():
+    """
+    Test that the bulk mode creates the same entities and content as the default mode.
+    """
+    call_command("flush", "--noinput")
+    call_command("loaddata", "fixtures/topics.json")
+
+    call_command(
+        "populate_db",
+        users=2,
+        orgs_per_user=2,
+        groups_per_org=2,
+        events_per_org=2,
+        events_per_group=2,
+        resources_per_entity=2,
+        faq_entries_per_entity=2,
+        bulk=True,
+    )
+    assert UserModel.objects.count() == 2
+    assert UserModel.objects.get(username="activist_0").check_password("password")
+
+    # Entities
+
+    assert Organization.objects.count() == 4
+    assert Group.objects.count() == 8
+    assert Event.objects.count() == 24  # orgs*events_per_org + groups*events_per_group
+    assert Event.objects.filter(groups__isnull=False).count() == 16
+    assert Event.objects.filter(orgs__isnull=True).count() == 0
+    assert Event.objects.filter(times__isnull=True).count() == 0
+
+    # Content
+
+    assert OrganizationResource.objects.count() == 8
+    assert GroupResource.objects.count() == 16
+    assert EventResource.objects.count() == 48
+
+    assert OrganizationFaq.objects.count() == 8
+    assert GroupFaq.objects.count() == 16
+    assert EventFaq.objects.count() == 48
+
+    assert OrganizationSocialLink.objects.count() == 12
+    assert GroupSocialLink.objects.count() == 24
+    assert EventSocialLink.objects.count() == 72
+
+    org = Organization.objects.get(name="organization_activist_0_o0")
+    assert org.texts.get().primary
+    assert org.topics.get() == UserModel.objects.get(username="activist_0").topics.get()
+
+
+@pytest.mark.django_db
+def test_populate_db_command_bulk_is_deterministic():
+    """
+    Test that bulk runs with the same seed create the same rows.
+    """
+    call_command("flush", "--noinput")
+    call_command("loaddata", "fixtures/topics.json")
+
+    def populate(seed: int) -> list[tuple[str, str, str]]:
+        call_command("populate_db", users=3, events_per_org=3, bulk=True, seed=seed)
+        return sorted(Event.objects.values_list("id", "type", "orgs__name"))
+
+    first = populate(seed=1)
+
+    assert populate(seed=1) == first
+    assert populate(seed=2) != first
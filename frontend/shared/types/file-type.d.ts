@@ -1,7 +1,18 @@
 // SPDX-License-Identifier: AGPL-3.0-or-later
+export interface ContentImageRendition {
+  webp: string;
+  jpeg: string;
+  width: number;
+  height: number;
+}
+
 export interface ContentImage {
   id: string;
   fileObject: string;
+  // Empty until the upload has been processed in the background.
+  renditions?: Partial<
+    Record<"thumbnail" | "card" | "hero", ContentImageRendition>
+  >;
   creation_date: string;
   sequence_index?: number;
 }
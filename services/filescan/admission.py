@@ -0,0 +1,317 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Admission control for scans.
+
+Every scan holds a spool file, a ClamAV session and worker threads, so the service
+bounds the number of scans and the number of bytes that are scanned at the same
+time. Scans that don't fit wait in a bounded first-in, first-out queue. When the
+queue is full or a scan waited too long, the request is shed right away with a
+``Retry-After`` hint so that callers back off instead of piling up.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+
+class Overloaded(Exception):
+    """
+    Raised when a scan is not admitted.
+
+    Parameters
+    ----------
+    detail : str
+        The reason the scan was shed.
+
+    status_code : int
+        429 if the wait queue is full and 503 if the scan waited too long.
+
+    retry_after : int
+        The number of seconds after which the caller should try again.
+    """
+
+    def __init__(self, detail: str, status_code: int, retry_after: int) -> None:
+        """
+        Create the error for a shed scan.
+
+        Parameters
+        ----------
+        detail : str
+            The reason the scan was shed.
+
+        status_code : int
+            429 if the wait queue is full and 503 if the scan waited too long.
+
+        retry_after : int
+            The number of seconds after which the caller should try again.
+        """
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+# A waiting request: its number of files, its size and the future it waits on.
+_Waiter = tuple[int, int, "asyncio.Future[None]"]
+
+
+class AdmissionController:
+    """
+    Bound the scans and scanned bytes in flight with a bounded wait queue.
+
+    Parameters
+    ----------
+    max_in_flight : int
+        The maximum number of files that are scanned at the same time.
+
+    max_in_flight_bytes : int
+        The maximum total size of the files that are scanned at the same time.
+
+    max_queue : int
+        The maximum number of requests that wait to be admitted.
+
+    queue_timeout : float
+        The maximum number of seconds that a request waits to be admitted.
+
+    retry_after : int
+        The number of seconds that shed requests are told to wait.
+
+    Notes
+    -----
+    A request that is larger than the limits on its own is admitted once nothing
+    else is in flight, so that large uploads are slowed down rather than refused.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        max_in_flight_bytes: int,
+        max_queue: int,
+        queue_timeout: float,
+        retry_after: int,
+    ) -> None:
+        """
+        Create a controller with nothing in flight.
+
+        Parameters
+        ----------
+        max_in_flight : int
+            The maximum number of files that are scanned at the same time.
+
+        max_in_flight_bytes : int
+            The maximum total size of the files that are scanned at the same time.
+
+        max_queue : int
+            The maximum number of requests that wait to be admitted.
+
+        queue_timeout : float
+            The maximum number of seconds that a request waits to be admitted.
+
+        retry_after : int
+            The number of seconds that shed requests are told to wait.
+        """
+        self.max_in_flight = max_in_flight
+        self.max_in_flight_bytes = max_in_flight_bytes
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.in_flight_bytes = 0
+        self.admitted = 0
+        self.shed = 0
+        self.wait_seconds_total = 0.0
+        self._waiters: deque[_Waiter] = deque()
+
+    @property
+    def queued(self) -> int:
+        """
+        Return the number of requests that wait to be admitted.
+
+        Returns
+        -------
+        int
+            The number of waiting requests.
+        """
+        return len(self._waiters)
+
+    def _fits(self, slots: int, size: int) -> bool:
+        """
+        Return whether a request fits next to the scans in flight.
+
+        Parameters
+        ----------
+        slots : int
+            The number of files of the request.
+
+        size : int
+            The total size of the files of the request in bytes.
+
+        Returns
+        -------
+        bool
+            Whether the request can be admitted now.
+        """
+        if self.in_flight == 0:
+            return True
+
+        return (
+            self.in_flight + slots <= self.max_in_flight
+            and self.in_flight_bytes + size <= self.max_in_flight_bytes
+        )
+
+    def _take(self, slots: int, size: int) -> None:
+        """
+        Count an admitted request as in flight.
+
+        Parameters
+        ----------
+        slots : int
+            The number of files of the request.
+
+        size : int
+            The total size of the files of the request in bytes.
+        """
+        self.in_flight += slots
+        self.in_flight_bytes += size
+        self.admitted += 1
+
+    def _release(self, slots: int, size: int) -> None:
+        """
+        Stop counting a finished request as in flight and admit waiting requests.
+
+        Parameters
+        ----------
+        slots : int
+            The number of files of the request.
+
+        size : int
+            The total size of the files of the request in bytes.
+        """
+        self.in_flight -= slots
+        self.in_flight_bytes -= size
+        self._wake()
+
+    def _wake(self) -> None:
+        """
+        Admit waiting requests in order for as long as they fit.
+        """
+        while self._waiters and self._fits(*self._waiters[0][:2]):
+            waiter_slots, waiter_size, future = self._waiters.popleft()
+            if not future.done():
+                self._take(waiter_slots, waiter_size)
+                future.set_result(None)
+
+    async def _acquire(self, slots: int, size: int) -> None:
+        """
+        Wait until a request is admitted.
+
+        Parameters
+        ----------
+        slots : int
+            The number of files of the request.
+
+        size : int
+            The total size of the files of the request in bytes.
+
+        Raises
+        ------
+        Overloaded
+            If the wait queue is full or the request waited too long.
+        """
+        if not self._waiters and self._fits(slots, size):
+            self._take(slots, size)
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            self.shed += 1
+            raise Overloaded(
+                "Too many scans are waiting; try again later.", 429, self.retry_after
+            )
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        waiter: _Waiter = (slots, size, future)
+        self._waiters.append(waiter)
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.queue_timeout)
+
+        except asyncio.TimeoutError:
+            if not future.done():
+                self._waiters.remove(waiter)
+                future.cancel()
+                self._wake()
+                self.shed += 1
+                raise Overloaded(
+                    "Timed out waiting for a scan slot; try again later.",
+                    503,
+                    self.retry_after,
+                ) from None
+
+        except asyncio.CancelledError:
+            # The client went away; give the slot back if it was granted.
+            if future.done() and not future.cancelled():
+                self._release(slots, size)
+
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+                self._wake()
+
+            future.cancel()
+            raise
+
+        self.wait_seconds_total += time.monotonic() - started
+
+    @asynccontextmanager
+    async def admit(self, size: int, slots: int = 1) -> AsyncIterator[None]:
+        """
+        Hold capacity for a request for the duration of an ``async with`` block.
+
+        Parameters
+        ----------
+        size : int
+            The total size of the files of the request in bytes.
+
+        slots : int, default=1
+            The number of files of the request.
+
+        Yields
+        ------
+        None
+            Control once the request is admitted.
+
+        Raises
+        ------
+        Overloaded
+            If the wait queue is full or the request waited too long.
+        """
+        await self._acquire(slots, size)
+        try:
+            yield
+
+        finally:
+            self._release(slots, size)
+
+    def stats(self) -> dict[str, float | int]:
+        """
+        Return the current load and queueing statistics.
+
+        Returns
+        -------
+        dict[str, float | int]
+            Scans and bytes in flight, the queue depth, the number of admitted and
+            shed requests and the average time that admitted requests waited.
+        """
+        return {
+            "in_flight": self.in_flight,
+            "in_flight_bytes": self.in_flight_bytes,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "wait_seconds_avg": self.wait_seconds_total / self.admitted
+            if self.admitted
+            else 0.0,
+        }
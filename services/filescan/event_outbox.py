@@ -0,0 +1,477 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+An outbox that delivers security events to the backend in the background.
+
+Scans hand envelopes to the outbox and return immediately. Each envelope is written
+to a small spool directory and put on a bounded queue. A background task takes
+envelopes off the queue, posts them to the backend in batches over a shared
+``httpx.AsyncClient`` and retries failed deliveries with exponential backoff. Spool
+files are only removed once the backend accepted or rejected an envelope, so alerts
+that were not delivered before a restart are sent when the service starts again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import uuid
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+SPOOL_SUFFIX = ".json"
+
+# Statuses after which a delivery is retried. Authorization failures are retried as
+# they are fixed by configuring the token, which should not cost operators alerts.
+RETRYABLE_STATUSES = {401, 403, 408, 429}
+
+
+def get_outbox_dir() -> str | None:
+    """
+    Return the directory that undelivered security events are spooled to.
+
+    Returns
+    -------
+    str | None
+        The value of ``FILESCAN_OUTBOX_DIR``, or None to only hold events in memory.
+    """
+    if outbox_dir := os.getenv("FILESCAN_OUTBOX_DIR"):
+        os.makedirs(outbox_dir, exist_ok=True)
+        return outbox_dir
+
+    return None
+
+
+def _is_retryable(status_code: int) -> bool:
+    """
+    Return whether a delivery that failed with a status should be retried.
+
+    Parameters
+    ----------
+    status_code : int
+        The HTTP status of the response of the backend.
+
+    Returns
+    -------
+    bool
+        Whether the envelope should be sent again.
+    """
+    return status_code >= 500 or status_code in RETRYABLE_STATUSES
+
+
+class EventOutbox:
+    """
+    A bounded queue of security event envelopes with a background sender.
+
+    Parameters
+    ----------
+    spool_dir : str | None
+        The directory that envelopes are spooled to until they are delivered, or
+        None to only hold them in memory.
+
+    max_size : int, default=1000
+        The maximum number of envelopes waiting in memory. Further envelopes are
+        only spooled and are picked up once the queue has drained.
+
+    batch_size : int, default=50
+        The maximum number of envelopes per request to the backend.
+
+    initial_backoff : float, default=0.5
+        The number of seconds before the first retry of a failed delivery.
+
+    max_backoff : float, default=60.0
+        The maximum number of seconds between retries.
+
+    transport : httpx.AsyncBaseTransport | None, default=None
+        The transport of the HTTP client, e.g. a mock transport in tests.
+    """
+
+    def __init__(
+        self,
+        spool_dir: str | None,
+        max_size: int = 1000,
+        batch_size: int = 50,
+        initial_backoff: float = 0.5,
+        max_backoff: float = 60.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        """
+        Create an empty outbox whose sender runs once it is started.
+
+        Parameters
+        ----------
+        spool_dir : str | None
+            The directory that envelopes are spooled to until they are delivered, or
+            None to only hold them in memory.
+
+        max_size : int, default=1000
+            The maximum number of envelopes waiting in memory. Further envelopes are
+            only spooled and are picked up once the queue has drained.
+
+        batch_size : int, default=50
+            The maximum number of envelopes per request to the backend.
+
+        initial_backoff : float, default=0.5
+            The number of seconds before the first retry of a failed delivery.
+
+        max_backoff : float, default=60.0
+            The maximum number of seconds between retries.
+
+        transport : httpx.AsyncBaseTransport | None, default=None
+            The transport of the HTTP client, e.g. a mock transport in tests.
+        """
+        self.spool_dir = spool_dir
+        self.batch_size = batch_size
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.transport = transport
+        self.dropped = 0
+        self._queue: asyncio.Queue[tuple[str, dict[str, Any]]] = asyncio.Queue(max_size)
+        self._queued: set[str] = set()
+        self._overflowed = False
+        self._client: httpx.AsyncClient | None = None
+        self._sender: asyncio.Task[None] | None = None
+
+    def __len__(self) -> int:
+        """
+        Return the number of envelopes waiting in memory.
+
+        Returns
+        -------
+        int
+            The number of queued envelopes, not counting only spooled ones.
+        """
+        return self._queue.qsize()
+
+    # MARK: Spool
+
+    def _spool_path(self, event_id: str) -> str:
+        """
+        Return the path that an envelope is spooled to.
+
+        Parameters
+        ----------
+        event_id : str
+            The id of the event of the envelope.
+
+        Returns
+        -------
+        str
+            The path of the spool file.
+        """
+        assert self.spool_dir is not None
+        return os.path.join(self.spool_dir, f"{event_id}{SPOOL_SUFFIX}")
+
+    def _write_spool(self, event_id: str, envelope: dict[str, Any]) -> bool:
+        """
+        Write an envelope to the spool directory.
+
+        Parameters
+        ----------
+        event_id : str
+            The id of the envelope within the outbox.
+
+        envelope : dict[str, Any]
+            The security event envelope.
+
+        Returns
+        -------
+        bool
+            Whether the envelope was written.
+        """
+        if self.spool_dir is None:
+            return False
+
+        path = self._spool_path(event_id)
+        try:
+            # Write to a temporary name first so that restarts never load partial files.
+            with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+                json.dump(envelope, f)
+
+            os.replace(f"{path}.tmp", path)
+
+        except OSError as exc:
+            logger.error(f"Failed to spool security event id={event_id} error={exc}")
+            return False
+
+        return True
+
+    def _remove_spool(self, event_id: str) -> None:
+        """
+        Remove the spool file of a delivered or rejected envelope if there is one.
+
+        Parameters
+        ----------
+        event_id : str
+            The id of the event of the envelope.
+        """
+        if self.spool_dir is None:
+            return
+
+        try:
+            os.remove(self._spool_path(event_id))
+
+        except FileNotFoundError:
+            pass
+
+    def _load_spool(self) -> None:
+        """
+        Queue spooled envelopes that are not queued yet, oldest first.
+        """
+        if self.spool_dir is None:
+            return
+
+        entries = []
+        with os.scandir(self.spool_dir) as it:
+            for entry in it:
+                if entry.name.endswith(SPOOL_SUFFIX):
+                    entries.append((entry.stat().st_mtime, entry))
+
+        self._overflowed = False
+        for _, entry in sorted(entries, key=lambda item: item[0]):
+            event_id = entry.name.removesuffix(SPOOL_SUFFIX)
+            if event_id in self._queued:
+                continue
+
+            try:
+                with open(entry.path, encoding="utf-8") as f:
+                    envelope = json.load(f)
+
+            except (OSError, ValueError) as exc:
+                logger.error(
+                    f"Skipping unreadable spooled security event {entry.path}: {exc}"
+                )
+                continue
+
+            if not self._put(event_id, envelope):
+                self._overflowed = True
+                break
+
+    # MARK: Queue
+
+    def _put(self, event_id: str, envelope: dict[str, Any]) -> bool:
+        """
+        Queue an envelope in memory unless the queue is full.
+
+        Parameters
+        ----------
+        event_id : str
+            The id of the event of the envelope.
+
+        envelope : dict[str, Any]
+            The security event envelope.
+
+        Returns
+        -------
+        bool
+            Whether the envelope was queued.
+        """
+        try:
+            self._queue.put_nowait((event_id, envelope))
+
+        except asyncio.QueueFull:
+            return False
+
+        self._queued.add(event_id)
+        return True
+
+    def enqueue(self, envelope: dict[str, Any]) -> None:
+        """
+        Hand an envelope to the outbox without waiting for its delivery.
+
+        Parameters
+        ----------
+        envelope : dict[str, Any]
+            The security event envelope.
+
+        Notes
+        -----
+        If the queue is full, spooled envelopes wait on disk until the queue has
+        drained, while envelopes that could not be spooled are dropped and logged.
+        """
+        event_id = uuid.uuid4().hex
+        spooled = self._write_spool(event_id, envelope)
+        if self._put(event_id, envelope):
+            return
+
+        if spooled:
+            self._overflowed = True
+            logger.warning(
+                f"Security event outbox is full; spooled event id={event_id}"
+            )
+
+        else:
+            self.dropped += 1
+            logger.error(
+                f"Security event outbox is full; dropped event type={envelope.get('type')}"
+            )
+
+    async def flush(self) -> None:
+        """
+        Wait until every queued envelope was delivered or rejected.
+        """
+        await self._queue.join()
+
+    # MARK: Delivery
+
+    async def _post(self, batch: list[tuple[str, dict[str, Any]]]) -> list[bool]:
+        """
+        Post a batch of envelopes to the backend once.
+
+        Parameters
+        ----------
+        batch : list[tuple[str, dict[str, Any]]]
+            The ids and envelopes to send.
+
+        Returns
+        -------
+        list[bool]
+            Whether each envelope has to be sent again.
+        """
+        assert self._client is not None
+        backend_url = os.getenv("ALERTS_BACKEND_URL")
+        if not backend_url:
+            logger.error(
+                "ALERTS_BACKEND_URL is not configured; cannot post security events."
+            )
+            return [True] * len(batch)
+
+        headers: dict[str, str] = {"Content-Type": "application/json"}
+        if token := os.getenv("ALERTS_BACKEND_TOKEN"):
+            headers["X-Internal-Token"] = token
+
+        try:
+            response = await self._client.post(
+                backend_url, json=[envelope for _, envelope in batch], headers=headers
+            )
+
+        except httpx.RequestError as exc:
+            logger.error(f"Error posting {len(batch)} security events error={exc}")
+            return [True] * len(batch)
+
+        if response.status_code >= 400:
+            logger.error(
+                f"Failed to post {len(batch)} security events "
+                f"status={response.status_code} body={response.text}"
+            )
+            return [_is_retryable(response.status_code)] * len(batch)
+
+        try:
+            statuses = [int(r["status"]) for r in response.json()["results"]]
+
+        except (ValueError, KeyError, TypeError):
+            statuses = [response.status_code] * len(batch)
+
+        retry = []
+        for (event_id, envelope), status in zip(batch, statuses, strict=False):
+            if status >= 400:
+                logger.error(
+                    f"Backend rejected security event id={event_id} "
+                    f"type={envelope.get('type')} status={status}"
+                )
+
+            retry.append(_is_retryable(status))
+
+        # Envelopes without a result are treated as not delivered.
+        retry.extend([True] * (len(batch) - len(statuses)))
+        logger.info(
+            f"Posted {len(batch) - sum(retry)} of {len(batch)} security events "
+            f"status={response.status_code}"
+        )
+        return retry
+
+    async def _deliver(self, batch: list[tuple[str, dict[str, Any]]]) -> None:
+        """
+        Post a batch until every envelope was delivered or rejected.
+
+        Parameters
+        ----------
+        batch : list[tuple[str, dict[str, Any]]]
+            The ids and envelopes to send.
+        """
+        attempt = 0
+        try:
+            while batch:
+                retry = await self._post(batch)
+                pending = []
+                for item, should_retry in zip(batch, retry, strict=True):
+                    if should_retry:
+                        pending.append(item)
+                        continue
+
+                    event_id, _ = item
+                    self._remove_spool(event_id)
+                    self._queued.discard(event_id)
+                    self._queue.task_done()
+
+                batch = pending
+                if batch:
+                    await asyncio.sleep(
+                        min(self.initial_backoff * 2**attempt, self.max_backoff)
+                    )
+                    attempt += 1
+
+        except asyncio.CancelledError:
+            # The envelopes stay spooled so that the next start queues them again.
+            for event_id, _ in batch:
+                self._queued.discard(event_id)
+                self._queue.task_done()
+
+            raise
+
+    async def _run(self) -> None:
+        """
+        Take batches off the queue and deliver them until cancelled.
+        """
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+
+                except asyncio.QueueEmpty:
+                    break
+
+            await self._deliver(batch)
+            if self._overflowed and self._queue.empty():
+                self._load_spool()
+
+    # MARK: Lifecycle
+
+    async def start(self) -> None:
+        """
+        Queue spooled envelopes and start the background sender.
+        """
+        if self._sender is not None:
+            return
+
+        self._load_spool()
+        self._client = httpx.AsyncClient(timeout=5.0, transport=self.transport)
+        self._sender = asyncio.create_task(self._run(), name="security-event-outbox")
+
+    async def stop(self) -> None:
+        """
+        Stop the background sender and close its client.
+
+        Notes
+        -----
+        Envelopes that were not delivered yet remain in the spool directory and are
+        sent after the next start.
+        """
+        if self._sender is not None:
+            self._sender.cancel()
+            try:
+                await self._sender
+
+            except asyncio.CancelledError:
+                pass
+
+            self._sender = None
+
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
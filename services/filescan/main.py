@@ -7,27 +7,77 @@ import asyncio
 import logging
 import os
 import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, File, HTTPException, Request, UploadFile
-from fastapi.responses import JSONResponse
-
-from notification_helpers import notify_malware_quarantined
-from scanners.clamav import scan_with_clamav
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from admission import AdmissionController, Overloaded
+from notification_helpers import notify_malware_quarantined, outbox
+from scanners import ByteStream
+from scanners.clamav import (
+    check_clamav,
+    get_pool,
+    scan_with_clamav,
+    verdict_cache,
+)
 from scanners.csam import scan_with_csam
+from spool_helpers import (
+    TeeReader,
+    create_spool_file,
+    move_to_quarantine,
+    remove_spool_file,
+)
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 QUARANTINE_DIR = os.getenv("FILESCAN_QUARANTINE_DIR", "/var/filescan/quarantine")
 
+admission = AdmissionController(
+    max_in_flight=int(os.getenv("FILESCAN_MAX_IN_FLIGHT", "16")),
+    max_in_flight_bytes=int(
+        os.getenv("FILESCAN_MAX_IN_FLIGHT_BYTES", str(256 * 1024 * 1024))
+    ),
+    max_queue=int(os.getenv("FILESCAN_MAX_QUEUE", "64")),
+    queue_timeout=float(os.getenv("FILESCAN_QUEUE_TIMEOUT", "10")),
+    retry_after=int(os.getenv("FILESCAN_RETRY_AFTER", "2")),
+)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    """
+    Run the security event outbox for the lifetime of the application.
+
+    Parameters
+    ----------
+    _app : FastAPI
+        The filescan application.
+
+    Yields
+    ------
+    None
+        Control to the application while the outbox delivers events.
+    """
+    await outbox.start()
+    try:
+        yield
+
+    finally:
+        await outbox.stop()
+
+
 app = FastAPI(
     title="File Scan Service",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 
 @app.get("/health")
-async def healthcheck() -> dict[str, str]:
+async def healthcheck() -> dict[str, object]:
     """
     Liveness/readiness probe.
 
@@ -37,48 +87,86 @@ async def healthcheck() -> dict[str, str]:
 
     Returns
     -------
-    dict[str, str]
-        ``{"status": "ok"}`` after a successful empty ClamAV scan confirms
-        the daemon is reachable.
+    dict[str, object]
+        ``{"status": "ok"}`` after a recent liveness check of the ClamAV session
+        pool confirmed the daemon is reachable, with the load of the service under
+        ``admission`` (scans and bytes in flight, queue depth and wait time).
     """
     try:
-        # Use a tiny, empty scan to verify that the ClamAV daemon is up.
-        # scan_with_clamav will raise RuntimeError if the daemon is unavailable.
-        await scan_with_clamav(b"")
+        # check_clamav will raise RuntimeError if the daemon is unavailable.
+        await check_clamav()
 
     except RuntimeError as exc:
         # Surface scanner unavailability as a 503 so orchestrators know
         # the service is not yet ready.
         raise HTTPException(status_code=503, detail=str(exc)) from exc
 
-    return {"status": "ok"}
+    return {"status": "ok", "admission": admission.stats()}
 
 
-@app.post("/scan")
-async def scan_file(
-    request: Request, file: UploadFile | None = File(None)
-) -> JSONResponse:
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> str:
     """
-    Scan a file that has been sent to the filescan service.
+    Expose scanner metrics in the Prometheus text format.
+
+    Returns
+    -------
+    str
+        Counters and gauges of the ClamAV verdict cache and session pool, of the
+        security event outbox and of admission control.
+    """
+    lookups = verdict_cache.hits + verdict_cache.misses
+    hit_ratio = verdict_cache.hits / lookups if lookups else 0.0
+    pool = get_pool()
+    lines = [
+        "# HELP filescan_verdict_cache_hits_total Scans answered from the verdict cache.",
+        "# TYPE filescan_verdict_cache_hits_total counter",
+        f"filescan_verdict_cache_hits_total {verdict_cache.hits}",
+        "# HELP filescan_verdict_cache_misses_total Scans not found in the verdict cache.",
+        "# TYPE filescan_verdict_cache_misses_total counter",
+        f"filescan_verdict_cache_misses_total {verdict_cache.misses}",
+        "# HELP filescan_verdict_cache_hit_ratio Share of cache lookups that were hits.",
+        "# TYPE filescan_verdict_cache_hit_ratio gauge",
+        f"filescan_verdict_cache_hit_ratio {hit_ratio}",
+        "# HELP filescan_verdict_cache_entries Verdicts currently cached.",
+        "# TYPE filescan_verdict_cache_entries gauge",
+        f"filescan_verdict_cache_entries {len(verdict_cache)}",
+        "# HELP filescan_clamd_up Whether the last clamd liveness check succeeded.",
+        "# TYPE filescan_clamd_up gauge",
+        f"filescan_clamd_up {int(pool.alive)}",
+        "# HELP filescan_outbox_pending Security events waiting to be delivered.",
+        "# TYPE filescan_outbox_pending gauge",
+        f"filescan_outbox_pending {len(outbox)}",
+        "# HELP filescan_outbox_dropped_total Security events dropped by a full outbox.",
+        "# TYPE filescan_outbox_dropped_total counter",
+        f"filescan_outbox_dropped_total {outbox.dropped}",
+        "# HELP filescan_scans_in_flight Files currently being scanned.",
+        "# TYPE filescan_scans_in_flight gauge",
+        f"filescan_scans_in_flight {admission.in_flight}",
+        "# HELP filescan_scan_queue_depth Scan requests waiting to be admitted.",
+        "# TYPE filescan_scan_queue_depth gauge",
+        f"filescan_scan_queue_depth {admission.queued}",
+        "# HELP filescan_scans_shed_total Scan requests shed under load.",
+        "# TYPE filescan_scans_shed_total counter",
+        f"filescan_scans_shed_total {admission.shed}",
+    ]
+
+    return "\n".join(lines) + "\n"
+
+
+def _check_token(request: Request) -> None:
+    """
+    Reject requests without the internal token when one is configured.
 
     Parameters
     ----------
     request : Request
         The scan request from the activist backend.
 
-    file : UploadFile | None, default=File(None)
-        The file to be scanned.
-
-    Returns
-    -------
-    JSONResponse
-        Successful scans return HTTP 200 with JSON including ``filename``,
-        ``malware_detected``, and ``detail``, plus optional ``signature``,
-        ``source``, ``quarantine_id``, and related fields when applicable.
-
-        Client or configuration errors may yield HTTP 400 (no file) or
-        403 (invalid ``X-Filescan-Token``). Scanner failures return HTTP
-        503 with an error ``detail``.
+    Raises
+    ------
+    HTTPException
+        403 if ``FILESCAN_INTERNAL_TOKEN`` is set and the request does not carry it.
     """
     if expected_token := os.getenv("FILESCAN_INTERNAL_TOKEN"):
         provided = request.headers.get("X-Filescan-Token")
@@ -88,33 +176,122 @@ async def scan_file(
             )
             raise HTTPException(status_code=403, detail="Unauthorized")
 
-    if file is None or not file.filename:
-        logger.warning("scan request rejected: no file or filename")
-        return JSONResponse(
-            content={
-                "detail": "No file was sent. Please include a file in the request."
-            },
-            status_code=400,
-        )
 
-    file_bytes = await file.read()
-    logger.info(
-        f"scan request received filename={file.filename} size={len(file_bytes)} content_type={getattr(file, 'content_type', None)}"
+def _shed(exc: Overloaded) -> JSONResponse:
+    """
+    Build the response to a scan that was not admitted.
+
+    Parameters
+    ----------
+    exc : Overloaded
+        The reason the scan was shed.
+
+    Returns
+    -------
+    JSONResponse
+        HTTP 429 or 503 with the ``detail`` and a ``Retry-After`` header.
+    """
+    logger.warning(
+        f"scan request shed status={exc.status_code} detail={exc.detail} "
+        f"queued={admission.queued} in_flight={admission.in_flight}"
+    )
+    return JSONResponse(
+        content={"detail": exc.detail},
+        status_code=exc.status_code,
+        headers={"Retry-After": str(exc.retry_after)},
     )
 
+
+async def _scan_upload(filename: str, upload: ByteStream) -> dict[str, str | bool]:
+    """
+    Scan an uploaded file and quarantine it if malware is detected.
+
+    Parameters
+    ----------
+    filename : str
+        The name of the uploaded file.
+
+    upload : ByteStream
+        The contents of the uploaded file, which are read in chunks.
+
+    Returns
+    -------
+    dict[str, str | bool]
+        The scan result with ``filename``, ``malware_detected`` and ``detail``, plus
+        optional ``signature``, ``source``, ``quarantine_id`` and related fields.
+
+    Raises
+    ------
+    RuntimeError
+        If a scanner is unavailable.
+
+    Notes
+    -----
+    The upload is copied in chunks to a spool file while being hashed, so memory
+    use does not grow with the size of the file. The scanners then stream the spool
+    file, and ClamAV skips the scan if it has a verdict for the hash. The spool file
+    is moved into quarantine on detection and removed otherwise.
+    """
+    spool = create_spool_file()
     try:
-        clamav_result, csam_result = await asyncio.gather(
-            scan_with_clamav(file_bytes),
-            scan_with_csam(file_bytes),
-        )
+        with spool:
+            reader = TeeReader(upload, spool)
+            await asyncio.to_thread(reader.drain)
+
+        sha256 = reader.sha256.hexdigest()
+        with open(spool.name, "rb") as for_clamav, open(spool.name, "rb") as for_csam:
+            clamav_result, csam_result = await asyncio.gather(
+                scan_with_clamav(for_clamav, sha256=sha256),
+                scan_with_csam(for_csam),
+            )
 
-    except RuntimeError as exc:
-        logger.error(f"scan failed: {exc}")
-        return JSONResponse(
-            content={"detail": str(exc)},
-            status_code=503,
+        content = _handle_scan_results(
+            filename=filename,
+            spool_path=spool.name,
+            size=reader.size,
+            clamav_result=clamav_result,
+            csam_result=csam_result,
         )
 
+    finally:
+        remove_spool_file(spool.name)
+
+    return content
+
+
+def _handle_scan_results(
+    filename: str,
+    spool_path: str,
+    size: int,
+    clamav_result: tuple[bool, str, str | None],
+    csam_result: tuple[bool, str, str | None],
+) -> dict[str, str | bool]:
+    """
+    Build the response to a scan and quarantine the spooled file on detection.
+
+    Parameters
+    ----------
+    filename : str
+        The name of the uploaded file.
+
+    spool_path : str
+        The path of the spooled copy of the uploaded file.
+
+    size : int
+        The size of the uploaded file in bytes.
+
+    clamav_result : tuple[bool, str, str | None]
+        The result of the ClamAV scan.
+
+    csam_result : tuple[bool, str, str | None]
+        The result of the CSAM scan.
+
+    Returns
+    -------
+    dict[str, str | bool]
+        The scan result with ``filename``, ``malware_detected`` and ``detail``, plus
+        optional ``signature``, ``source``, ``quarantine_id`` and related fields.
+    """
     # Use first positive result (ClamAV then CSAM).
     malware_detected = False
     detail = ""
@@ -136,7 +313,7 @@ async def scan_file(
     quarantine_path: str | None = None
 
     if malware_detected:
-        safe_name = os.path.basename(file.filename or "") or "unnamed"
+        safe_name = os.path.basename(filename or "") or "unnamed"
         safe_name = safe_name.replace(os.sep, "_")
         try:
             os.makedirs(QUARANTINE_DIR, exist_ok=True)
@@ -145,16 +322,15 @@ async def scan_file(
                 QUARANTINE_DIR,
                 f"{quarantine_id}__{safe_name}",
             )
-            with open(quarantine_path, "wb") as f_out:
-                f_out.write(file_bytes)
+            move_to_quarantine(spool_path, quarantine_path)
 
         except OSError as exc:
             logger.error(
-                f"failed to write quarantine file filename={file.filename} path={quarantine_path} error={exc}"
+                f"failed to write quarantine file filename={filename} path={quarantine_path} error={exc}"
             )
 
     content: dict[str, str | bool] = {
-        "filename": file.filename,
+        "filename": filename,
         "malware_detected": malware_detected,
         "detail": detail,
     }
@@ -171,12 +347,12 @@ async def scan_file(
     if malware_detected:
         logger.warning(
             f"scan response status=200 malware_detected={content['malware_detected']} "
-            f"detail={content['detail']} source={content.get('source')} "
+            f"detail={content['detail']} source={content.get('source')} size={size} "
             f"quarantine_id={quarantine_id} quarantine_path={quarantine_path}",
         )
         if quarantine_id is not None:
             event: dict[str, object] = {
-                "filename": file.filename,
+                "filename": filename,
                 "signature": signature,
                 "source": source,
                 "quarantine_id": quarantine_id,
@@ -186,7 +362,135 @@ async def scan_file(
     else:
         logger.info(
             f"scan response status=200 malware_detected={content['malware_detected']} "
-            f"detail={content['detail']} source={content.get('source')}"
+            f"detail={content['detail']} source={content.get('source')} size={size}"
+        )
+
+    return content
+
+
+@app.post("/scan")
+async def scan_file(
+    request: Request, file: UploadFile | None = File(None)
+) -> JSONResponse:
+    """
+    Scan a file that has been sent to the filescan service.
+
+    Parameters
+    ----------
+    request : Request
+        The scan request from the activist backend.
+
+    file : UploadFile | None, default=File(None)
+        The file to be scanned.
+
+    Returns
+    -------
+    JSONResponse
+        Successful scans return HTTP 200 with JSON including ``filename``,
+        ``malware_detected``, and ``detail``, plus optional ``signature``,
+        ``source``, ``quarantine_id``, and related fields when applicable.
+
+        Client or configuration errors may yield HTTP 400 (no file) or
+        403 (invalid ``X-Filescan-Token``). Scanner failures return HTTP
+        503 with an error ``detail``. Scans that are shed under load return
+        429 or 503 with a ``Retry-After`` header.
+    """
+    _check_token(request)
+
+    if file is None or not file.filename:
+        logger.warning("scan request rejected: no file or filename")
+        return JSONResponse(
+            content={
+                "detail": "No file was sent. Please include a file in the request."
+            },
+            status_code=400,
+        )
+
+    logger.info(
+        f"scan request received filename={file.filename} size={file.size} content_type={getattr(file, 'content_type', None)}"
+    )
+
+    try:
+        async with admission.admit(file.size or 0):
+            content = await _scan_upload(file.filename, file.file)
+
+    except Overloaded as exc:
+        return _shed(exc)
+
+    except RuntimeError as exc:
+        logger.error(f"scan failed: {exc}")
+        return JSONResponse(
+            content={"detail": str(exc)},
+            status_code=503,
         )
 
     return JSONResponse(content=content, status_code=200)
+
+
+@app.post("/scan/batch")
+async def scan_batch(
+    request: Request, files: list[UploadFile] | None = File(None)
+) -> JSONResponse:
+    """
+    Scan several files that have been sent to the filescan service in one request.
+
+    Parameters
+    ----------
+    request : Request
+        The scan request from the activist backend.
+
+    files : list[UploadFile] | None, default=File(None)
+        The files to be scanned.
+
+    Returns
+    -------
+    JSONResponse
+        Successful scans return HTTP 200 with ``results``, the result of each file
+        in the order they were sent as returned by ``/scan``, and
+        ``malware_detected`` if any file was flagged.
+
+        Requests without files or with unnamed files yield HTTP 400, an invalid
+        ``X-Filescan-Token`` yields 403 and scanner failures return HTTP 503.
+        Batches that are shed under load return 429 or 503 with a ``Retry-After``
+        header.
+    """
+    _check_token(request)
+
+    if not files or not all(file.filename for file in files):
+        logger.warning("batch scan request rejected: no files or missing filename")
+        return JSONResponse(
+            content={
+                "detail": "No files were sent. Please include files in the request."
+            },
+            status_code=400,
+        )
+
+    logger.info(
+        f"batch scan request received files={len(files)} size={sum(file.size or 0 for file in files)}"
+    )
+
+    try:
+        async with admission.admit(
+            sum(file.size or 0 for file in files), slots=len(files)
+        ):
+            results = await asyncio.gather(
+                *(_scan_upload(file.filename or "", file.file) for file in files)
+            )
+
+    except Overloaded as exc:
+        return _shed(exc)
+
+    except RuntimeError as exc:
+        logger.error(f"batch scan failed: {exc}")
+        return JSONResponse(
+            content={"detail": str(exc)},
+            status_code=503,
+        )
+
+    return JSONResponse(
+        content={
+            "results": results,
+            "malware_detected": any(r["malware_detected"] for r in results),
+        },
+        status_code=200,
+    )
@@ -10,10 +10,18 @@ import os
 from datetime import datetime, timezone
 from typing import Any
 
-import httpx
+from event_outbox import EventOutbox, get_outbox_dir
 
 logger = logging.getLogger(__name__)
 
+# Security events are delivered in the background so that scans never wait on them.
+outbox = EventOutbox(
+    spool_dir=get_outbox_dir(),
+    max_size=int(os.getenv("FILESCAN_OUTBOX_SIZE", "1000")),
+    batch_size=int(os.getenv("FILESCAN_OUTBOX_BATCH_SIZE", "50")),
+    max_backoff=float(os.getenv("FILESCAN_OUTBOX_MAX_BACKOFF", "60")),
+)
+
 
 def _build_malware_quarantined_envelope(event: dict[str, object]) -> dict[str, Any]:
     """
@@ -90,13 +98,13 @@ def _build_malware_quarantined_envelope(event: dict[str, object]) -> dict[str, A
 
 def _post_security_event(envelope: dict[str, Any]) -> None:
     """
-    Best-effort HTTP POST of a security event envelope to the backend.
+    Hand a security event envelope to the outbox that posts it to the backend.
 
     Reads configuration from environment at call time so that tests and
     different environments can control behavior via:
         - FILESCAN_ALERTS_ENABLED
         - ALERTS_BACKEND_URL
-        - ALERTS_BACKEND_TOKEN
+        - ALERTS_BACKEND_TOKEN (read by the outbox when posting)
 
     Parameters
     ----------
@@ -107,9 +115,9 @@ def _post_security_event(envelope: dict[str, Any]) -> None:
     Returns
     -------
     None
-        No return value. When posting is enabled and configured, sends the
-        envelope to the backend; otherwise logs and returns early. HTTP and
-        transport outcomes are logged.
+        No return value. When posting is enabled and configured, queues the
+        envelope for delivery in the background; otherwise logs and returns
+        early. Delivery outcomes are logged by the outbox.
     """
     alerts_enabled = os.getenv("FILESCAN_ALERTS_ENABLED", "false").lower() == "true"
     if not alerts_enabled:
@@ -118,44 +126,23 @@ def _post_security_event(envelope: dict[str, Any]) -> None:
         )
         return
 
-    backend_url = os.getenv("ALERTS_BACKEND_URL")
-    if not backend_url:
+    if not os.getenv("ALERTS_BACKEND_URL"):
         logger.error(
             "ALERTS_BACKEND_URL is not configured; cannot post security event."
         )
         return
 
-    headers: dict[str, str] = {"Content-Type": "application/json"}
-    token = os.getenv("ALERTS_BACKEND_TOKEN")
-    if token:
-        headers["X-Internal-Token"] = token
-
-    try:
-        response = httpx.post(backend_url, json=envelope, headers=headers, timeout=5.0)
-        if response.status_code >= 400:
-            logger.error(
-                f"Failed to post security event type={envelope.get('type')} "
-                f"status={response.status_code} body={response.text}"
-            )
-
-        else:
-            logger.info(
-                f"Posted security event type={envelope.get('type')} status={response.status_code}"
-            )
-
-    except httpx.RequestError as exc:
-        logger.error(
-            f"Error posting security event type={envelope.get('type')} error={exc}"
-        )
+    outbox.enqueue(envelope)
 
 
 def notify_malware_quarantined(event: dict[str, object]) -> None:
     """
     Hook for malware quarantine events.
 
-    Logs the raw event and, when enabled via configuration, emits a generic
-    security event envelope to the backend over HTTP so that the backend can
-    fan-out notifications to operators or downstream systems.
+    Logs the raw event and, when enabled via configuration, queues a generic
+    security event envelope that is posted to the backend in the background so
+    that the backend can fan-out notifications to operators or downstream
+    systems.
 
     Parameters
     ----------
@@ -165,8 +152,8 @@ def notify_malware_quarantined(event: dict[str, object]) -> None:
     Returns
     -------
     None
-        No return value. Builds and may POST an envelope when alerts are
-        enabled; logs envelope build failures and HTTP errors.
+        No return value. Builds and may queue an envelope when alerts are
+        enabled; logs envelope build failures.
     """
     logger.warning(f"malware quarantined event={event}.")
 
@@ -0,0 +1,28 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Scanners used by the filescan service.
+"""
+
+from typing import Protocol
+
+
+class ByteStream(Protocol):
+    """
+    A readable binary stream such as an open file or a ``TeeReader``.
+    """
+
+    def read(self, size: int = -1, /) -> bytes:
+        """
+        Read up to ``size`` bytes, or until EOF if ``size`` is negative.
+
+        Parameters
+        ----------
+        size : int, default=-1
+            The maximum number of bytes to read.
+
+        Returns
+        -------
+        bytes
+            The bytes read, empty at EOF.
+        """
+        ...
@@ -6,21 +6,85 @@ Methods for the ClamAV file scanner.
 import asyncio
 import io
 import os
+import threading
+from typing import BinaryIO, cast
 
-from clamav_client.clamd import ClamdUnixSocket
+from scanners import ByteStream
+from scanners.clamd_pool import ClamdPool, ClamdSession
+from scanners.verdict_cache import VerdictCache
 
 # Socket path must match clamd.conf (and entrypoint.sh). Default matches Alpine.
 CLAMAV_SOCKET = os.environ.get("CLAMAV_SOCKET_PATH", "/run/clamav/clamd.sock")
+CLAMAV_POOL_SIZE = int(os.environ.get("CLAMAV_POOL_SIZE", "8"))
+# Must stay below IdleTimeout in clamd.conf (default 30s) to keep sessions open.
+CLAMAV_LIVENESS_INTERVAL = float(os.environ.get("CLAMAV_LIVENESS_INTERVAL", "10"))
+CLAMAV_VERDICT_CACHE_SIZE = int(os.environ.get("CLAMAV_VERDICT_CACHE_SIZE", "10000"))
+CLAMAV_VERDICT_CACHE_TTL = float(os.environ.get("CLAMAV_VERDICT_CACHE_TTL", "86400"))
 
+verdict_cache = VerdictCache(
+    max_entries=CLAMAV_VERDICT_CACHE_SIZE, ttl=CLAMAV_VERDICT_CACHE_TTL
+)
 
-async def scan_with_clamav(file_bytes: bytes) -> tuple[bool, str, str | None]:
+_pool: ClamdPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ClamdPool:
+    """
+    Return the shared clamd session pool, starting its liveness checks on first use.
+
+    Returns
+    -------
+    ClamdPool
+        The pool of sessions with the ClamAV daemon.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                pool = ClamdPool(
+                    CLAMAV_SOCKET,
+                    size=CLAMAV_POOL_SIZE,
+                    client_factory=ClamdSession,
+                )
+                pool.start_liveness_checks(CLAMAV_LIVENESS_INTERVAL)
+                _pool = pool
+
+    return _pool
+
+
+async def check_clamav() -> None:
+    """
+    Async wrapper that checks that the ClamAV daemon is reachable.
+
+    Raises
+    ------
+    RuntimeError
+        If the ClamAV daemon is unavailable.
+
+    Notes
+    -----
+    The result of the last background liveness check is reused while it is fresh,
+    so health probes don't cost a scan or even a round trip to clamd.
+    """
+    pool = get_pool()
+    await asyncio.to_thread(pool.ensure_alive, CLAMAV_LIVENESS_INTERVAL * 2)
+
+
+async def scan_with_clamav(
+    file_bytes: bytes | ByteStream, sha256: str | None = None
+) -> tuple[bool, str, str | None]:
     """
     Async wrapper that scans file bytes with ClamAV in a worker thread.
 
     Parameters
     ----------
-    file_bytes : bytes
-        The bytes of a file to be scanned with ClamAV.
+    file_bytes : bytes | ByteStream
+        The bytes of a file to be scanned with ClamAV, or a stream of them that is
+        read in chunks.
+
+    sha256 : str | None, default=None
+        The hex SHA-256 of the file, which enables the verdict cache.
 
     Returns
     -------
@@ -32,17 +96,23 @@ async def scan_with_clamav(file_bytes: bytes) -> tuple[bool, str, str | None]:
     RuntimeError
         If the ClamAV daemon is unavailable.
     """
-    return await asyncio.to_thread(_scan_with_clamav_sync, file_bytes)
+    return await asyncio.to_thread(_scan_with_clamav_sync, file_bytes, sha256)
 
 
-def _scan_with_clamav_sync(file_bytes: bytes) -> tuple[bool, str, str | None]:
+def _scan_with_clamav_sync(
+    file_bytes: bytes | ByteStream, sha256: str | None = None
+) -> tuple[bool, str, str | None]:
     """
     Implementation used by the async wrapper to scan file bytes with ClamAV as well as unit tests.
 
     Parameters
     ----------
-    file_bytes : bytes
-        The bytes of a file to be scanned with ClamAV.
+    file_bytes : bytes | ByteStream
+        The bytes of a file to be scanned with ClamAV, or a stream of them that is
+        read in chunks.
+
+    sha256 : str | None, default=None
+        The hex SHA-256 of the file, which enables the verdict cache.
 
     Returns
     -------
@@ -54,29 +124,46 @@ def _scan_with_clamav_sync(file_bytes: bytes) -> tuple[bool, str, str | None]:
     RuntimeError
         If the ClamAV daemon is unavailable.
     """
-    client = ClamdUnixSocket(CLAMAV_SOCKET)
-
-    try:
-        # clamav-client returns the daemon reply (typically "PONG") on success.
-        if not client.ping().startswith("PONG"):
-            raise RuntimeError("ClamAV daemon is not responding to ping()")
-
-    except Exception as exc:  # noqa: BLE001
-        raise RuntimeError(f"Unable to connect to ClamAV daemon: {exc}") from exc
-
-    try:
-        # INSTREAM scan: empty dict means clean; otherwise values are (status, signature).
-        result = client.instream(io.BytesIO(file_bytes))
-
-    except Exception as exc:  # noqa: BLE001
-        raise RuntimeError(f"Unable to connect to ClamAV daemon: {exc}") from exc
+    pool = get_pool()
+    # Verdicts are only valid for the signatures that produced them.
+    db_version = pool.db_version
+    if sha256 is not None and db_version is not None:
+        if (cached := verdict_cache.get(sha256, db_version)) is not None:
+            return cached
+
+    with pool.session() as client:
+        try:
+            # INSTREAM scan: empty dict means clean; otherwise values are (status, signature).
+            # Streams are sent chunk by chunk as they are read, so files never have to
+            # be held in memory as a whole.
+            stream = (
+                io.BytesIO(file_bytes) if isinstance(file_bytes, bytes) else file_bytes
+            )
+            result = client.instream(cast(BinaryIO, stream))
+
+        except Exception as exc:  # noqa: BLE001
+            raise RuntimeError(f"Unable to connect to ClamAV daemon: {exc}") from exc
 
     if not result:
-        return (False, "No malware detected by ClamAV.", None)
-
-    _, (status, signature) = next(iter(result.items()))
-    malware_detected = status == "FOUND"
-    detail = (
-        "Malware detected by ClamAV." if malware_detected else "Unexpected scan status."
-    )
-    return (malware_detected, detail, signature)
+        verdict: tuple[bool, str, str | None] = (
+            False,
+            "No malware detected by ClamAV.",
+            None,
+        )
+
+    else:
+        _, (status, signature) = next(iter(result.items()))
+        malware_detected = status == "FOUND"
+        detail = (
+            "Malware detected by ClamAV."
+            if malware_detected
+            else "Unexpected scan status."
+        )
+        verdict = (malware_detected, detail, signature)
+        if status not in ("FOUND", "OK"):
+            return verdict
+
+    if sha256 is not None and db_version is not None:
+        verdict_cache.set(sha256, db_version, verdict)
+
+    return verdict
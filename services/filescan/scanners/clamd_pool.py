@@ -0,0 +1,358 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+A pool of persistent clamd sessions with background liveness checks.
+
+clamd closes a connection after every command unless the client opens a session
+with ``IDSESSION``, after which any number of commands can be sent over the same
+socket. The pool keeps such sessions open between scans. A background thread pings
+idle sessions so that clamd's ``IdleTimeout`` does not close them, drops sessions
+that stopped responding and records the signature database version.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+from clamav_client.clamd import ClamdUnixSocket
+
+logger = logging.getLogger(__name__)
+
+
+class ClamdSession(ClamdUnixSocket):
+    """
+    A clamd client that keeps its connection open as an ``IDSESSION`` session.
+
+    Parameters
+    ----------
+    path : str
+        The path of the clamd unix socket.
+
+    timeout : int | None, default=None
+        The socket timeout in seconds.
+    """
+
+    def __init__(self, path: str, timeout: int | None = None) -> None:
+        """
+        Create a session that connects on first use.
+
+        Parameters
+        ----------
+        path : str
+            The path of the clamd unix socket.
+
+        timeout : int | None, default=None
+            The socket timeout in seconds.
+        """
+        super().__init__(path, timeout)
+        self._connected = False
+
+    def _init_socket(self) -> None:
+        """
+        Connect and start a session unless the session is already open.
+        """
+        if not self._connected:
+            super()._init_socket()
+            self._send_command("IDSESSION")
+            self._connected = True
+
+    def _close_socket(self) -> None:
+        """
+        Keep the session open after each command; see ``close``.
+        """
+
+    def _recv_response(self) -> str:
+        """
+        Receive a reply and strip the ``<id>: `` prefix that clamd adds in sessions.
+
+        Returns
+        -------
+        str
+            The reply as it would be sent outside of a session.
+        """
+        response = super()._recv_response()
+        _, sep, reply = response.partition(": ")
+        return reply if sep else response
+
+    def close(self) -> None:
+        """
+        End the session and close its connection.
+        """
+        if not self._connected:
+            return
+
+        self._connected = False
+        try:
+            self._send_command("END")
+
+        except OSError:
+            pass
+
+        self.clamd_socket.close()
+
+
+def parse_db_version(version: str) -> str | None:
+    """
+    Extract the signature database version from a clamd ``VERSION`` reply.
+
+    Parameters
+    ----------
+    version : str
+        A reply such as ``ClamAV 1.4.1/27400/Mon Sep 30 08:40:00 2024``.
+
+    Returns
+    -------
+    str | None
+        The database version, e.g. ``27400``, or None if the reply has none.
+    """
+    parts = version.strip().split("/")
+    return parts[1] if len(parts) > 1 and parts[1] else None
+
+
+class ClamdPool:
+    """
+    A bounded pool of clamd sessions.
+
+    Parameters
+    ----------
+    socket_path : str
+        The path of the clamd unix socket.
+
+    size : int
+        The maximum number of sessions, which also bounds concurrent scans.
+
+    client_factory : Callable[[str], ClamdSession], default=ClamdSession
+        Creates a session for a socket path.
+    """
+
+    def __init__(
+        self,
+        socket_path: str,
+        size: int,
+        client_factory: Callable[[str], ClamdSession] = ClamdSession,
+    ) -> None:
+        """
+        Create a pool that opens its sessions on first use.
+
+        Parameters
+        ----------
+        socket_path : str
+            The path of the clamd unix socket.
+
+        size : int
+            The maximum number of sessions, which also bounds concurrent scans.
+
+        client_factory : Callable[[str], ClamdSession], default=ClamdSession
+            Creates a session for a socket path.
+        """
+        self.socket_path = socket_path
+        self.size = size
+        self.client_factory = client_factory
+        self.alive = False
+        self.db_version: str | None = None
+        self.last_check = 0.0
+        self._idle: deque[ClamdSession] = deque()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self._checker: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    # MARK: Sessions
+
+    def _open(self) -> ClamdSession:
+        """
+        Open a new session and verify that clamd answers on it.
+
+        Returns
+        -------
+        ClamdSession
+            The new session.
+
+        Raises
+        ------
+        RuntimeError
+            If the ClamAV daemon is unavailable.
+        """
+        client = self.client_factory(self.socket_path)
+        try:
+            # clamav-client returns the daemon reply (typically "PONG") on success.
+            if not client.ping().startswith("PONG"):
+                raise RuntimeError("ClamAV daemon is not responding to ping()")
+
+        except RuntimeError:
+            self._discard(client)
+            raise
+
+        except Exception as exc:  # noqa: BLE001
+            self._discard(client)
+            raise RuntimeError(f"Unable to connect to ClamAV daemon: {exc}") from exc
+
+        return client
+
+    def _discard(self, client: ClamdSession) -> None:
+        """
+        Close a session without raising.
+
+        Parameters
+        ----------
+        client : ClamdSession
+            The session to close.
+        """
+        try:
+            client.close()
+
+        except Exception:  # noqa: BLE001
+            pass
+
+    @contextmanager
+    def session(self) -> Iterator[ClamdSession]:
+        """
+        Check out a session for the duration of a ``with`` block.
+
+        Yields
+        ------
+        ClamdSession
+            An idle session, or a new one if none is idle.
+
+        Raises
+        ------
+        RuntimeError
+            If the ClamAV daemon is unavailable.
+
+        Notes
+        -----
+        Sessions that raise inside the block are closed rather than returned to the
+        pool, since clamd may have closed them.
+        """
+        with self._slots:
+            with self._lock:
+                client = self._idle.pop() if self._idle else None
+
+            if client is None:
+                client = self._open()
+
+            try:
+                yield client
+
+            except BaseException:
+                self._discard(client)
+                raise
+
+            with self._lock:
+                self._idle.append(client)
+
+    # MARK: Liveness
+
+    def check(self) -> bool:
+        """
+        Ping idle sessions, drop dead ones and refresh the database version.
+
+        Returns
+        -------
+        bool
+            Whether clamd is reachable.
+        """
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+
+        healthy: list[ClamdSession] = []
+        for client in idle:
+            try:
+                if client.ping().startswith("PONG"):
+                    healthy.append(client)
+                    continue
+
+            except Exception:  # noqa: BLE001
+                pass
+
+            self._discard(client)
+
+        try:
+            probe = healthy[0] if healthy else self._open()
+            self.db_version = parse_db_version(probe.version())
+            if not healthy:
+                healthy.append(probe)
+
+            self.alive = True
+
+        except Exception as exc:  # noqa: BLE001
+            if healthy:
+                self._discard(healthy.pop(0))
+
+            if self.alive:
+                logger.error(f"clamd liveness check failed: {exc}")
+
+            self.alive = False
+
+        with self._lock:
+            self._idle.extend(healthy)
+            # Sessions beyond the pool size can't be checked out; close the oldest.
+            while len(self._idle) > self.size:
+                self._discard(self._idle.popleft())
+
+        self.last_check = time.monotonic()
+        return self.alive
+
+    def ensure_alive(self, max_age: float) -> None:
+        """
+        Raise unless a recent liveness check found clamd reachable.
+
+        Parameters
+        ----------
+        max_age : float
+            The age in seconds after which the last check result is refreshed.
+
+        Raises
+        ------
+        RuntimeError
+            If the ClamAV daemon is unavailable.
+        """
+        if time.monotonic() - self.last_check > max_age:
+            self.check()
+
+        if not self.alive:
+            raise RuntimeError("ClamAV daemon is not responding")
+
+    def start_liveness_checks(self, interval: float) -> None:
+        """
+        Run liveness checks on a daemon thread every ``interval`` seconds.
+
+        Parameters
+        ----------
+        interval : float
+            The number of seconds between checks, which should be below clamd's
+            ``IdleTimeout`` so that idle sessions stay open.
+        """
+        if self._checker is not None:
+            return
+
+        def run() -> None:
+            """
+            Check the pool every interval until the pool is closed.
+            """
+            while not self._stop.wait(interval):
+                try:
+                    self.check()
+
+                except Exception:  # noqa: BLE001
+                    logger.exception("clamd liveness check crashed")
+
+        self._checker = threading.Thread(target=run, name="clamd-liveness", daemon=True)
+        self._checker.start()
+
+    def close(self) -> None:
+        """
+        Stop liveness checks and close all idle sessions.
+        """
+        self._stop.set()
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+
+        for client in idle:
+            self._discard(client)
@@ -8,15 +8,19 @@ Attn: The result of this scan is always "No CSAM detected.".
 
 import asyncio
 
+from scanners import ByteStream
 
-async def scan_with_csam(file_bytes: bytes) -> tuple[bool, str, str | None]:
+
+async def scan_with_csam(
+    file_bytes: bytes | ByteStream,
+) -> tuple[bool, str, str | None]:
     """
     Async wrapper that scans file bytes for CSAM in a worker thread.
 
     Parameters
     ----------
-    file_bytes : bytes
-        The bytes of a file to be scanned with CSAM.
+    file_bytes : bytes | ByteStream
+        The bytes of a file to be scanned with CSAM, or a stream of them.
 
     Returns
     -------
@@ -30,14 +34,16 @@ async def scan_with_csam(file_bytes: bytes) -> tuple[bool, str, str | None]:
     return await asyncio.to_thread(_scan_with_csam_sync, file_bytes)
 
 
-def _scan_with_csam_sync(file_bytes: bytes) -> tuple[bool, str, str | None]:
+def _scan_with_csam_sync(
+    file_bytes: bytes | ByteStream,
+) -> tuple[bool, str, str | None]:
     """
     Implementation used by the async wrapper to scan file bytes for CSAM as well as unit tests.
 
     Parameters
     ----------
-    file_bytes : bytes
-        The bytes of a file to be scanned with CSAM.
+    file_bytes : bytes | ByteStream
+        The bytes of a file to be scanned with CSAM, or a stream of them.
 
     Returns
     -------
@@ -0,0 +1,127 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+An in-memory LRU cache of scan verdicts keyed by file content.
+
+Verdicts are keyed by the SHA-256 of a file and the version of the signature
+database that produced them, so re-uploads of the same file (shared logos, retried
+requests) skip rescanning until freshclam loads new signatures.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+
+Verdict = tuple[bool, str, str | None]
+
+
+class VerdictCache:
+    """
+    A thread safe LRU cache of scan verdicts with a time to live.
+
+    Parameters
+    ----------
+    max_entries : int
+        The maximum number of verdicts kept; the least recently used are evicted.
+
+    ttl : float
+        The number of seconds a verdict stays valid.
+    """
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        """
+        Create an empty cache.
+
+        Parameters
+        ----------
+        max_entries : int
+            The maximum number of verdicts kept; the least recently used are evicted.
+
+        ttl : float
+            The number of seconds a verdict stays valid.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, str], tuple[float, Verdict]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """
+        Return the number of cached verdicts, including expired ones.
+
+        Returns
+        -------
+        int
+            The number of cached verdicts.
+        """
+        return len(self._entries)
+
+    def get(self, sha256: str, db_version: str) -> Verdict | None:
+        """
+        Return the cached verdict for a file.
+
+        Parameters
+        ----------
+        sha256 : str
+            The hex SHA-256 of the file.
+
+        db_version : str
+            The version of the signature database.
+
+        Returns
+        -------
+        Verdict | None
+            The verdict, or None on a miss.
+        """
+        key = (sha256, db_version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, sha256: str, db_version: str, verdict: Verdict) -> None:
+        """
+        Cache the verdict for a file.
+
+        Parameters
+        ----------
+        sha256 : str
+            The hex SHA-256 of the file.
+
+        db_version : str
+            The version of the signature database.
+
+        verdict : Verdict
+            The verdict to cache.
+        """
+        if self.max_entries <= 0:
+            return
+
+        key = (sha256, db_version)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, verdict)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Remove all verdicts and reset the hit and miss counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
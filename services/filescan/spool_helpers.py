@@ -0,0 +1,149 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Helpers for spooling uploads to disk while they are scanned.
+
+Uploads are never read into memory as a whole. They are copied in chunks through a
+``TeeReader`` that writes every chunk to a temporary spool file and hashes it on the
+way, so a single pass over the upload yields both the content hash that keys the
+verdict cache and a copy on disk that the scanners stream from. The spool file is
+moved into quarantine if malware is detected and removed otherwise.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import tempfile
+from typing import IO
+
+from scanners import ByteStream
+
+# Chunk size used when the remainder of an upload is copied to the spool file.
+SPOOL_CHUNK_SIZE = 64 * 1024
+
+
+def get_spool_dir() -> str | None:
+    """
+    Return the directory that uploads are spooled to while they are scanned.
+
+    Returns
+    -------
+    str | None
+        The value of ``FILESCAN_SPOOL_DIR``, or None for the system temp directory.
+
+    Notes
+    -----
+    When the spool directory is on the same filesystem as the quarantine directory,
+    quarantining a file is an atomic rename rather than a copy.
+    """
+    if spool_dir := os.getenv("FILESCAN_SPOOL_DIR"):
+        os.makedirs(spool_dir, exist_ok=True)
+        return spool_dir
+
+    return None
+
+
+def create_spool_file() -> IO[bytes]:
+    """
+    Create a temporary spool file for an upload.
+
+    Returns
+    -------
+    IO[bytes]
+        A named temporary file that is not deleted when it is closed.
+    """
+    return tempfile.NamedTemporaryFile(
+        dir=get_spool_dir(), prefix="scan-", suffix=".spool", delete=False
+    )
+
+
+def move_to_quarantine(spool_path: str, quarantine_path: str) -> None:
+    """
+    Move a spool file into quarantine.
+
+    Parameters
+    ----------
+    spool_path : str
+        The path of the spool file.
+
+    quarantine_path : str
+        The path of the quarantined file.
+    """
+    shutil.move(spool_path, quarantine_path)
+
+
+def remove_spool_file(spool_path: str) -> None:
+    """
+    Remove a spool file if it still exists.
+
+    Parameters
+    ----------
+    spool_path : str
+        The path of the spool file.
+    """
+    try:
+        os.remove(spool_path)
+
+    except FileNotFoundError:
+        pass
+
+
+class TeeReader:
+    """
+    A stream that copies everything read from a source to a sink and hashes it.
+
+    Parameters
+    ----------
+    source : ByteStream
+        The stream to read from, e.g. an uploaded file.
+
+    sink : IO[bytes]
+        The file that every chunk read from the source is written to.
+    """
+
+    def __init__(self, source: ByteStream, sink: IO[bytes]) -> None:
+        """
+        Wrap a source that is copied to a sink as it is read.
+
+        Parameters
+        ----------
+        source : ByteStream
+            The stream to read from, e.g. an uploaded file.
+
+        sink : IO[bytes]
+            The file that every chunk read from the source is written to.
+        """
+        self.source = source
+        self.sink = sink
+        self.size = 0
+        self.sha256 = hashlib.sha256()
+
+    def read(self, size: int = -1, /) -> bytes:
+        """
+        Read a chunk from the source, write it to the sink and add it to the hash.
+
+        Parameters
+        ----------
+        size : int, default=-1
+            The maximum number of bytes to read.
+
+        Returns
+        -------
+        bytes
+            The chunk read from the source, empty at EOF.
+        """
+        chunk = self.source.read(size)
+        if chunk:
+            self.sink.write(chunk)
+            self.sha256.update(chunk)
+            self.size += len(chunk)
+
+        return chunk
+
+    def drain(self) -> None:
+        """
+        Copy whatever has not been read yet from the source to the sink.
+        """
+        while self.read(SPOOL_CHUNK_SIZE):
+            pass
@@ -0,0 +1,102 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Tests for admission control of scans.
+"""
+
+import asyncio
+
+import pytest
+
+from admission import AdmissionController, Overloaded
+
+
+def _controller(**kwargs) -> AdmissionController:
+    options = {
+        "max_in_flight": 2,
+        "max_in_flight_bytes": 100,
+        "max_queue": 2,
+        "queue_timeout": 1,
+        "retry_after": 3,
+    }
+    options.update(kwargs)
+    return AdmissionController(**options)
+
+
+def test_admission_queues_until_capacity_is_released() -> None:
+    controller = _controller()
+    order: list[str] = []
+
+    async def scan(name: str, size: int, hold: asyncio.Event) -> None:
+        async with controller.admit(size):
+            order.append(name)
+            await hold.wait()
+
+    async def run() -> None:
+        first, second = asyncio.Event(), asyncio.Event()
+        running = asyncio.create_task(scan("a", 80, first))
+        await asyncio.sleep(0)
+        # Fits the number of scans but not the number of bytes.
+        waiting = asyncio.create_task(scan("b", 30, second))
+        await asyncio.sleep(0)
+        assert controller.queued == 1
+        assert order == ["a"]
+
+        first.set()
+        await running
+        await asyncio.sleep(0)
+        assert order == ["a", "b"]
+        assert controller.in_flight_bytes == 30
+
+        second.set()
+        await waiting
+
+    asyncio.run(run())
+
+    assert controller.stats()["in_flight"] == 0
+    assert controller.stats()["admitted"] == 2
+
+
+def test_admission_sheds_when_queue_is_full() -> None:
+    controller = _controller(max_in_flight=1, max_queue=0)
+
+    async def run() -> None:
+        async with controller.admit(1):
+            with pytest.raises(Overloaded) as exc_info:
+                async with controller.admit(1):
+                    pass
+
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.retry_after == 3
+
+    asyncio.run(run())
+
+    assert controller.shed == 1
+
+
+def test_admission_sheds_after_queue_timeout() -> None:
+    controller = _controller(max_in_flight=1, queue_timeout=0.01)
+
+    async def run() -> None:
+        async with controller.admit(1):
+            with pytest.raises(Overloaded) as exc_info:
+                async with controller.admit(1):
+                    pass
+
+        assert exc_info.value.status_code == 503
+
+    asyncio.run(run())
+
+    assert controller.queued == 0
+    assert controller.in_flight == 0
+
+
+def test_admission_admits_oversized_request_when_idle() -> None:
+    controller = _controller()
+
+    async def run() -> None:
+        async with controller.admit(1000, slots=5):
+            assert controller.in_flight == 5
+
+    asyncio.run(run())
+
+    assert controller.in_flight_bytes == 0
@@ -5,7 +5,10 @@ Tests for the ClamAV scanner.
 
 import io
 
+import pytest
+
 from scanners import clamav
+from scanners.clamd_pool import ClamdPool, ClamdSession, parse_db_version
 
 
 class _FakeClamdClient:
@@ -14,25 +17,50 @@ class _FakeClamdClient:
         ping_ok: bool,
         scan_result: dict | None,
         ping_raises: Exception | None = None,
+        instream_raises: Exception | None = None,
     ) -> None:
         self._ping_ok = ping_ok
         self._scan_result = scan_result
         self._ping_raises = ping_raises
+        self._instream_raises = instream_raises
+        self.pings = 0
+        self.scans = 0
+        self.closed = False
 
     def ping(self) -> str:
+        self.pings += 1
         if self._ping_raises is not None:
             raise self._ping_raises
         return "PONG" if self._ping_ok else ""
 
-    def instream(self, buff: io.BytesIO) -> dict:  # noqa: ARG002
+    def version(self) -> str:
+        return "ClamAV 1.4.1/27400/Mon Sep 30 08:40:00 2024"
+
+    def instream(self, buff: io.BytesIO) -> dict:
+        self.scans += 1
+        if self._instream_raises is not None:
+            raise self._instream_raises
+        self.scanned = buff.read()
         return self._scan_result if self._scan_result is not None else {}
 
+    def close(self) -> None:
+        self.closed = True
 
-def _mock_clamd(monkeypatch, client: _FakeClamdClient) -> None:
+
+def _mock_clamd(monkeypatch, client: _FakeClamdClient) -> ClamdPool:
     def _factory(_socket: str) -> _FakeClamdClient:  # noqa: ARG001
         return client
 
-    monkeypatch.setattr("scanners.clamav.ClamdUnixSocket", _factory)
+    pool = ClamdPool("/tmp/clamd.sock", size=2, client_factory=_factory)
+    monkeypatch.setattr("scanners.clamav._pool", pool)
+    return pool
+
+
+@pytest.fixture(autouse=True)
+def _clear_verdict_cache():
+    clamav.verdict_cache.clear()
+    yield
+    clamav.verdict_cache.clear()
 
 
 def test_scan_with_clamav_returns_clean_for_none_result(monkeypatch) -> None:
@@ -102,3 +130,108 @@ def test_scan_with_clamav_raises_when_ping_throws(monkeypatch) -> None:
 
     else:  # pragma: no cover - defensive
         assert False, "Expected RuntimeError when ping() raises"
+
+
+def test_scan_with_clamav_reads_stream(monkeypatch) -> None:
+    client = _FakeClamdClient(ping_ok=True, scan_result=None)
+    _mock_clamd(monkeypatch, client)
+
+    detected, _, _ = clamav._scan_with_clamav_sync(io.BytesIO(b"streamed-bytes"))
+
+    assert detected is False
+    assert client.scanned == b"streamed-bytes"
+
+
+def test_scan_with_clamav_reuses_pooled_session(monkeypatch) -> None:
+    client = _FakeClamdClient(ping_ok=True, scan_result=None)
+    _mock_clamd(monkeypatch, client)
+
+    clamav._scan_with_clamav_sync(b"first")
+    clamav._scan_with_clamav_sync(b"second")
+
+    assert client.scans == 2
+    # Only the new session is pinged, not every scan.
+    assert client.pings == 1
+
+
+def test_scan_with_clamav_discards_session_when_scan_fails(monkeypatch) -> None:
+    client = _FakeClamdClient(
+        ping_ok=True, scan_result=None, instream_raises=OSError("broken pipe")
+    )
+    _mock_clamd(monkeypatch, client)
+
+    with pytest.raises(RuntimeError, match="Unable to connect to ClamAV daemon"):
+        clamav._scan_with_clamav_sync(b"dummy-bytes")
+
+    assert client.closed is True
+
+
+def test_scan_with_clamav_caches_verdicts_by_hash_and_db_version(monkeypatch) -> None:
+    client = _FakeClamdClient(
+        ping_ok=True,
+        scan_result={"stream": ("FOUND", "Eicar-Test-Signature")},
+    )
+    pool = _mock_clamd(monkeypatch, client)
+    pool.check()
+
+    first = clamav._scan_with_clamav_sync(b"eicar", sha256="abc")
+    second = clamav._scan_with_clamav_sync(b"eicar", sha256="abc")
+
+    assert (
+        first == second == (True, "Malware detected by ClamAV.", "Eicar-Test-Signature")
+    )
+    assert client.scans == 1
+    assert clamav.verdict_cache.hits == 1
+
+    # New signatures invalidate cached verdicts.
+    pool.db_version = "27401"
+    clamav._scan_with_clamav_sync(b"eicar", sha256="abc")
+
+    assert client.scans == 2
+
+
+def test_scan_with_clamav_does_not_cache_without_db_version(monkeypatch) -> None:
+    client = _FakeClamdClient(ping_ok=True, scan_result=None)
+    _mock_clamd(monkeypatch, client)
+
+    clamav._scan_with_clamav_sync(b"logo", sha256="abc")
+    clamav._scan_with_clamav_sync(b"logo", sha256="abc")
+
+    assert client.scans == 2
+    assert len(clamav.verdict_cache) == 0
+
+
+def test_clamd_pool_check_drops_dead_sessions(monkeypatch) -> None:
+    client = _FakeClamdClient(ping_ok=True, scan_result=None)
+    pool = _mock_clamd(monkeypatch, client)
+
+    assert pool.check() is True
+    assert pool.db_version == "27400"
+
+    client._ping_raises = OSError("connection reset")
+
+    assert pool.check() is False
+    assert client.closed is True
+    with pytest.raises(RuntimeError):
+        pool.ensure_alive(max_age=60)
+
+
+def test_clamd_session_strips_session_id_prefix(monkeypatch) -> None:
+    replies = iter(["1: PONG", "2: stream: Eicar-Test-Signature FOUND"])
+    monkeypatch.setattr(
+        "clamav_client.clamd.ClamdUnixSocket._recv_response",
+        lambda self: next(replies),
+    )
+    session = ClamdSession("/tmp/clamd.sock")
+
+    assert session._recv_response() == "PONG"
+    assert session._parse_response(session._recv_response()) == (
+        "stream",
+        "Eicar-Test-Signature",
+        "FOUND",
+    )
+
+
+def test_parse_db_version() -> None:
+    assert parse_db_version("ClamAV 1.4.1/27400/Mon Sep 30 08:40:00 2024") == "27400"
+    assert parse_db_version("ClamAV 1.4.1") is None
@@ -0,0 +1,160 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+Tests for the background delivery of security events.
+"""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from event_outbox import EventOutbox
+from notification_helpers import notify_malware_quarantined, outbox
+
+BACKEND_URL = "http://backend/internal/security-events"
+
+
+def _envelope(filename: str) -> dict[str, Any]:
+    return {
+        "type": "malware_quarantined",
+        "occurred_at": "2025-01-01T12:34:56+00:00",
+        "source": "clamav",
+        "payload": {"filename": filename, "quarantine_id": "abc123"},
+    }
+
+
+def _recording_transport(
+    requests: list[httpx.Request], statuses: list[list[int] | int]
+) -> httpx.MockTransport:
+    """
+    Answer each request with the next entry of ``statuses``, which is either the
+    status of the whole request or the per-envelope results of a batch.
+    """
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        answer = statuses.pop(0) if statuses else 204
+        if isinstance(answer, int):
+            return httpx.Response(answer)
+
+        return httpx.Response(
+            200, json={"results": [{"status": status} for status in answer]}
+        )
+
+    return httpx.MockTransport(handler)
+
+
+def _run(box: EventOutbox, *envelopes: dict[str, Any]) -> None:
+    async def deliver() -> None:
+        for envelope in envelopes:
+            box.enqueue(envelope)
+
+        await box.start()
+        await asyncio.wait_for(box.flush(), timeout=5)
+        await box.stop()
+
+    asyncio.run(deliver())
+
+
+def test_event_outbox_posts_envelopes_in_batches(monkeypatch) -> None:
+    monkeypatch.setenv("ALERTS_BACKEND_URL", BACKEND_URL)
+    monkeypatch.setenv("ALERTS_BACKEND_TOKEN", "secret-token")
+    requests: list[httpx.Request] = []
+    box = EventOutbox(
+        spool_dir=None,
+        batch_size=2,
+        transport=_recording_transport(requests, [[204, 204], [204]]),
+    )
+
+    _run(box, _envelope("a"), _envelope("b"), _envelope("c"))
+
+    assert len(requests) == 2
+    assert requests[0].headers["X-Internal-Token"] == "secret-token"
+    batches = [json.loads(request.content) for request in requests]
+    assert [[e["payload"]["filename"] for e in batch] for batch in batches] == [
+        ["a", "b"],
+        ["c"],
+    ]
+
+
+def test_event_outbox_retries_only_failed_envelopes(
+    monkeypatch, tmp_path: Path
+) -> None:
+    monkeypatch.setenv("ALERTS_BACKEND_URL", BACKEND_URL)
+    requests: list[httpx.Request] = []
+    box = EventOutbox(
+        spool_dir=str(tmp_path),
+        initial_backoff=0,
+        transport=_recording_transport(requests, [503, [204, 400, 500], [204]]),
+    )
+
+    _run(box, _envelope("a"), _envelope("b"), _envelope("c"))
+
+    batches = [json.loads(request.content) for request in requests]
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    # Rejected envelopes are not retried, failed ones are.
+    assert batches[2][0]["payload"]["filename"] == "c"
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_event_outbox_delivers_spooled_envelopes_after_restart(
+    monkeypatch, tmp_path: Path
+) -> None:
+    monkeypatch.setenv("ALERTS_BACKEND_URL", BACKEND_URL)
+    EventOutbox(spool_dir=str(tmp_path)).enqueue(_envelope("a"))
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+    requests: list[httpx.Request] = []
+    box = EventOutbox(
+        spool_dir=str(tmp_path), transport=_recording_transport(requests, [[204]])
+    )
+    _run(box)
+
+    assert json.loads(requests[0].content)[0]["payload"]["filename"] == "a"
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_event_outbox_spools_envelopes_beyond_queue_size(
+    monkeypatch, tmp_path: Path
+) -> None:
+    monkeypatch.setenv("ALERTS_BACKEND_URL", BACKEND_URL)
+    requests: list[httpx.Request] = []
+    box = EventOutbox(
+        spool_dir=str(tmp_path),
+        max_size=1,
+        transport=_recording_transport(requests, []),
+    )
+
+    async def deliver() -> None:
+        box.enqueue(_envelope("a"))
+        box.enqueue(_envelope("b"))
+        assert len(box) == 1
+
+        await box.start()
+        for _ in range(100):
+            if len(requests) == 2 and not list(tmp_path.iterdir()):
+                break
+
+            await asyncio.sleep(0.01)
+
+        await box.stop()
+
+    asyncio.run(deliver())
+
+    filenames = [json.loads(r.content)[0]["payload"]["filename"] for r in requests]
+    assert filenames == ["a", "b"]
+    assert box.dropped == 0
+
+
+def test_notify_malware_quarantined_does_not_queue_when_disabled(
+    monkeypatch,
+) -> None:
+    queued: list[dict[str, Any]] = []
+    monkeypatch.setenv("FILESCAN_ALERTS_ENABLED", "false")
+    monkeypatch.setattr(outbox, "enqueue", queued.append)
+
+    notify_malware_quarantined({"filename": "eicar.txt", "quarantine_id": "abc123"})
+
+    assert queued == []
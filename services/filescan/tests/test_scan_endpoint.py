@@ -3,12 +3,17 @@
 Tests for the filescan service endpoint.
 """
 
+import hashlib
 from pathlib import Path
 from typing import Any
 
 from fastapi.testclient import TestClient
 
+from admission import AdmissionController
 from main import app, notify_malware_quarantined
+from scanners import ByteStream
+from scanners.clamav import verdict_cache
+from scanners.clamd_pool import ClamdPool
 from tests.eicar_payload import eicar_test_fileobj
 
 BASE_DIR = Path(__file__).parent
@@ -26,7 +31,9 @@ def _mock_scan_with_clamav(
     Patch main.scan_with_clamav to return a fixed result.
     """
 
-    async def _fake_scan(_file_bytes: bytes) -> tuple[bool, str, str | None]:
+    async def _fake_scan(
+        _upload: ByteStream, sha256: str | None = None
+    ) -> tuple[bool, str, str | None]:
         return result
 
     monkeypatch.setattr("main.scan_with_clamav", _fake_scan)
@@ -40,7 +47,7 @@ def _mock_scan_with_csam(
     Patch main.scan_with_csam to return a fixed result.
     """
 
-    async def _fake_scan(_file_bytes: bytes) -> tuple[bool, str, str | None]:
+    async def _fake_scan(_upload: ByteStream) -> tuple[bool, str, str | None]:
         return result
 
     monkeypatch.setattr("main.scan_with_csam", _fake_scan)
@@ -54,10 +61,17 @@ def test_healthcheck_returns_ok(monkeypatch) -> None:
     """
     Unit test: do not require a real ClamAV socket (CI has no clamd).
     """
-    _mock_scan_with_clamav(monkeypatch, CLEAN_RESULT)
+
+    async def _fake_check() -> None:
+        return None
+
+    monkeypatch.setattr("main.check_clamav", _fake_check)
     response = client.get("/health")
     assert response.status_code == 200
-    assert response.json() == {"status": "ok"}
+    body = response.json()
+    assert body["status"] == "ok"
+    assert body["admission"]["queued"] == 0
+    assert body["admission"]["in_flight"] == 0
 
 
 def test_scan_without_file_returns_400() -> None:
@@ -190,28 +204,14 @@ def test_scan_fake_binary_image_treated_as_clean(monkeypatch) -> None:
 
 def test_notify_malware_quarantined_builds_and_posts_event(monkeypatch) -> None:
     """
-    notify_malware_quarantined should build a generic envelope and POST it
-    to the configured backend URL when alerts are enabled.
+    notify_malware_quarantined should build a generic envelope and queue it
+    for delivery to the backend when alerts are enabled.
     """
-    posted: list[dict[str, Any]] = []
-
-    class DummyResponse:
-        def __init__(self) -> None:
-            self.status_code = 200
-            self.text = ""
-
-    def fake_post(
-        url: str, json: dict[str, Any], headers: dict[str, str], timeout: float
-    ) -> DummyResponse:
-        posted.append(
-            {"url": url, "json": json, "headers": headers, "timeout": timeout}
-        )
-        return DummyResponse()
+    queued: list[dict[str, Any]] = []
 
     monkeypatch.setenv("FILESCAN_ALERTS_ENABLED", "true")
     monkeypatch.setenv("ALERTS_BACKEND_URL", "http://backend/internal/security-events")
-    monkeypatch.setenv("ALERTS_BACKEND_TOKEN", "secret-token")
-    monkeypatch.setattr("notification_helpers.httpx.post", fake_post)
+    monkeypatch.setattr("notification_helpers.outbox.enqueue", queued.append)
 
     event = {
         "filename": "eicar.txt",
@@ -223,11 +223,8 @@ def test_notify_malware_quarantined_builds_and_posts_event(monkeypatch) -> None:
 
     notify_malware_quarantined(event)
 
-    assert posted, "Expected notify_malware_quarantined to POST an event"
-    sent = posted[0]
-    assert sent["url"] == "http://backend/internal/security-events"
-    assert sent["headers"]["X-Internal-Token"] == "secret-token"
-    envelope = sent["json"]
+    assert queued, "Expected notify_malware_quarantined to queue an event"
+    envelope = queued[0]
     assert envelope["type"] == "malware_quarantined"
     assert envelope["producer"] == "filescan"
     assert envelope["payload"]["filename"] == "eicar.txt"
@@ -235,10 +232,10 @@ def test_notify_malware_quarantined_builds_and_posts_event(monkeypatch) -> None:
 
 
 def test_healthcheck_returns_503_when_clamav_unavailable(monkeypatch) -> None:
-    async def _fake_scan(_file_bytes: bytes) -> tuple[bool, str, str | None]:
+    async def _fake_check() -> None:
         raise RuntimeError("ClamAV daemon is not responding")
 
-    monkeypatch.setattr("main.scan_with_clamav", _fake_scan)
+    monkeypatch.setattr("main.check_clamav", _fake_check)
 
     response = client.get("/health")
     assert response.status_code == 503
@@ -260,8 +257,32 @@ def test_scan_returns_403_when_token_invalid(monkeypatch) -> None:
     assert response.json()["detail"] == "Unauthorized"
 
 
+def test_scan_returns_429_with_retry_after_when_overloaded(monkeypatch) -> None:
+    _mock_scan_with_clamav(monkeypatch, CLEAN_RESULT)
+    _mock_scan_with_csam(monkeypatch, CLEAN_RESULT_CSAM)
+    busy = AdmissionController(
+        max_in_flight=1,
+        max_in_flight_bytes=1024,
+        max_queue=0,
+        queue_timeout=1,
+        retry_after=7,
+    )
+    busy.in_flight = 1
+    monkeypatch.setattr("main.admission", busy)
+
+    clean_path = TEST_FILES_DIR / "clean.txt"
+    with clean_path.open("rb") as f:
+        response = client.post("/scan", files={"file": ("clean.txt", f, "text/plain")})
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "7"
+    assert busy.shed == 1
+
+
 def test_scan_returns_503_when_scanner_raises(monkeypatch) -> None:
-    async def _fake_scan(_file_bytes: bytes) -> tuple[bool, str, str | None]:
+    async def _fake_scan(
+        _upload: ByteStream, sha256: str | None = None
+    ) -> tuple[bool, str, str | None]:
         raise RuntimeError("scanner failure")
 
     monkeypatch.setattr("main.scan_with_clamav", _fake_scan)
@@ -276,25 +297,11 @@ def test_scan_returns_503_when_scanner_raises(monkeypatch) -> None:
 
 
 def test_notify_malware_quarantined_optional_payload_fields(monkeypatch) -> None:
-    posted: list[dict[str, Any]] = []
-
-    class DummyResponse:
-        def __init__(self) -> None:
-            self.status_code = 200
-            self.text = ""
-
-    def fake_post(
-        url: str, json: dict[str, Any], headers: dict[str, str], timeout: float
-    ) -> DummyResponse:
-        posted.append(
-            {"url": url, "json": json, "headers": headers, "timeout": timeout}
-        )
-        return DummyResponse()
+    queued: list[dict[str, Any]] = []
 
     monkeypatch.setenv("FILESCAN_ALERTS_ENABLED", "true")
     monkeypatch.setenv("ALERTS_BACKEND_URL", "http://backend/internal/security-events")
-    monkeypatch.setenv("ALERTS_BACKEND_TOKEN", "secret-token")
-    monkeypatch.setattr("notification_helpers.httpx.post", fake_post)
+    monkeypatch.setattr("notification_helpers.outbox.enqueue", queued.append)
 
     event = {
         "filename": "eicar.txt",
@@ -309,8 +316,161 @@ def test_notify_malware_quarantined_optional_payload_fields(monkeypatch) -> None
 
     notify_malware_quarantined(event)
 
-    assert posted
-    payload = posted[0]["json"]["payload"]
+    assert queued
+    payload = queued[0]["payload"]
     assert payload["content_type"] == "text/plain"
     assert payload["size_bytes"] == 68
     assert payload["extra"] == {"note": "test"}
+
+
+def test_scan_batch_returns_result_per_file(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr("main.QUARANTINE_DIR", str(tmp_path))
+    monkeypatch.setattr("main.notify_malware_quarantined", lambda event: None)
+
+    async def _fake_clamav(
+        upload: ByteStream, sha256: str | None = None
+    ) -> tuple[bool, str, str | None]:
+        if b"EICAR" in upload.read():
+            return (True, "Malware detected by ClamAV.", "Eicar-Test-Signature")
+
+        return CLEAN_RESULT
+
+    monkeypatch.setattr("main.scan_with_clamav", _fake_clamav)
+    _mock_scan_with_csam(monkeypatch, CLEAN_RESULT_CSAM)
+
+    with (TEST_FILES_DIR / "clean.txt").open("rb") as f:
+        response = client.post(
+            "/scan/batch",
+            files=[
+                ("files", ("clean.txt", f, "text/plain")),
+                ("files", ("eicar.txt", eicar_test_fileobj(), "text/plain")),
+            ],
+        )
+
+    assert response.status_code == 200
+
+    body = response.json()
+    assert body["malware_detected"] is True
+    assert [r["filename"] for r in body["results"]] == ["clean.txt", "eicar.txt"]
+    assert [r["malware_detected"] for r in body["results"]] == [False, True]
+    assert body["results"][1]["source"] == "clamav"
+
+
+def test_scan_batch_without_files_returns_400() -> None:
+    response = client.post("/scan/batch")
+    assert response.status_code == 400
+
+
+def test_scan_batch_returns_403_when_token_invalid(monkeypatch) -> None:
+    monkeypatch.setenv("FILESCAN_INTERNAL_TOKEN", "expected-secret")
+
+    with (TEST_FILES_DIR / "clean.txt").open("rb") as f:
+        response = client.post(
+            "/scan/batch",
+            files=[("files", ("clean.txt", f, "text/plain"))],
+            headers={"X-Filescan-Token": "wrong-token"},
+        )
+
+    assert response.status_code == 403
+
+
+def test_scan_batch_returns_503_when_scanner_raises(monkeypatch) -> None:
+    async def _fake_scan(
+        _upload: ByteStream, sha256: str | None = None
+    ) -> tuple[bool, str, str | None]:
+        raise RuntimeError("scanner failure")
+
+    monkeypatch.setattr("main.scan_with_clamav", _fake_scan)
+    monkeypatch.setattr("main.scan_with_csam", _fake_scan)
+
+    with (TEST_FILES_DIR / "clean.txt").open("rb") as f:
+        response = client.post(
+            "/scan/batch", files=[("files", ("clean.txt", f, "text/plain"))]
+        )
+
+    assert response.status_code == 503
+
+
+def test_scan_streams_spooled_upload_and_quarantines_it(monkeypatch, tmp_path) -> None:
+    quarantine_dir = tmp_path / "quarantine"
+    spool_dir = tmp_path / "spool"
+    monkeypatch.setattr("main.QUARANTINE_DIR", str(quarantine_dir))
+    monkeypatch.setenv("FILESCAN_SPOOL_DIR", str(spool_dir))
+    monkeypatch.setattr("main.notify_malware_quarantined", lambda event: None)
+    _mock_scan_with_csam(monkeypatch, CLEAN_RESULT_CSAM)
+
+    chunk_sizes: list[int] = []
+
+    async def _fake_clamav(
+        upload: ByteStream, sha256: str | None = None
+    ) -> tuple[bool, str, str | None]:
+        # Read only part of the spooled upload in small chunks as clamd INSTREAM does.
+        for _ in range(4):
+            chunk_sizes.append(len(upload.read(1024)))
+
+        return (True, "Malware detected by ClamAV.", "Eicar-Test-Signature")
+
+    monkeypatch.setattr("main.scan_with_clamav", _fake_clamav)
+
+    payload = b"0123456789" * 100_000
+    response = client.post(
+        "/scan", files={"file": ("large.bin", payload, "application/octet-stream")}
+    )
+
+    assert response.status_code == 200
+    assert chunk_sizes == [1024] * 4
+
+    body = response.json()
+    quarantined = quarantine_dir / f"{body['quarantine_id']}__large.bin"
+    assert quarantined.read_bytes() == payload
+    assert list(spool_dir.iterdir()) == []
+
+
+def test_scan_clean_file_removes_spooled_copy(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("FILESCAN_SPOOL_DIR", str(tmp_path))
+    _mock_scan_with_clamav(monkeypatch, CLEAN_RESULT)
+    _mock_scan_with_csam(monkeypatch, CLEAN_RESULT_CSAM)
+
+    with (TEST_FILES_DIR / "clean.txt").open("rb") as f:
+        response = client.post("/scan", files={"file": ("clean.txt", f, "text/plain")})
+
+    assert response.status_code == 200
+    assert response.json()["malware_detected"] is False
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_scan_passes_content_hash_to_clamav(monkeypatch) -> None:
+    hashes: list[str | None] = []
+
+    async def _fake_clamav(
+        upload: ByteStream, sha256: str | None = None
+    ) -> tuple[bool, str, str | None]:
+        hashes.append(sha256)
+        return CLEAN_RESULT
+
+    monkeypatch.setattr("main.scan_with_clamav", _fake_clamav)
+    _mock_scan_with_csam(monkeypatch, CLEAN_RESULT_CSAM)
+
+    for _ in range(2):
+        response = client.post(
+            "/scan", files={"file": ("logo.png", b"logo-bytes", "image/png")}
+        )
+        assert response.status_code == 200
+
+    assert hashes == [hashlib.sha256(b"logo-bytes").hexdigest()] * 2
+
+
+def test_metrics_exposes_verdict_cache_hit_ratio(monkeypatch) -> None:
+    verdict_cache.clear()
+    verdict_cache.set("abc", "27400", CLEAN_RESULT)
+    verdict_cache.get("abc", "27400")
+    verdict_cache.get("def", "27400")
+    monkeypatch.setattr("main.get_pool", lambda: ClamdPool("/tmp/clamd.sock", size=1))
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert "filescan_verdict_cache_hits_total 1" in response.text
+    assert "filescan_verdict_cache_misses_total 1" in response.text
+    assert "filescan_verdict_cache_hit_ratio 0.5" in response.text
+    verdict_cache.clear()